@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+End-to-end bulk benchmark against the local fake EasyPost API.
+
+Starts `tests/fakes/easypost_server.FakeEasyPostServer`, runs
+get_shipment_rates -> create_shipment -> buy_shipment_label through a real
+EasyPostService for each sheet size, and prints throughput and p50/p99 per
+tool. Results can be merged into a baseline file and compared against it.
+
+Usage:
+    python scripts/python/bulk_benchmark.py                        # 10/100/1000 lines, SDK
+    python scripts/python/bulk_benchmark.py --transport async --sizes 100 1000
+    python scripts/python/bulk_benchmark.py --median-ms 150 --p99-ms 600 --rate-limit-ratio 0.02
+    python scripts/python/bulk_benchmark.py --write-baseline       # record this machine
+    python scripts/python/bulk_benchmark.py --compare --tolerance 0.2  # exit 1 on regression
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+# Settings validation needs a key; a placeholder never leaves the fake server
+os.environ.setdefault("EASYPOST_API_KEY", "EZTK_fake_benchmark")
+
+from tests.fakes.bulk_benchmark import (  # noqa: E402
+    DEFAULT_BASELINE,
+    DEFAULT_SIZES,
+    compare_to_baseline,
+    format_report,
+    load_baseline,
+    run_benchmark,
+    write_baseline,
+)
+from tests.fakes.easypost_server import FakeServerConfig, LatencyModel  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--transport", choices=("sdk", "async"), default="sdk")
+    parser.add_argument("--max-concurrency", type=int, default=None)
+    parser.add_argument("--rate-limit-rps", type=float, default=1000.0, help="client limiter")
+    parser.add_argument("--median-ms", type=float, default=20.0, help="fake API median latency")
+    parser.add_argument("--p99-ms", type=float, default=60.0, help="fake API p99 latency")
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="fraction of 429s")
+    parser.add_argument("--server-error-ratio", type=float, default=0.0, help="fraction of 5xx")
+    parser.add_argument(
+        "--reuse-plans", action="store_true", help="let create_shipment reuse rating shipments"
+    )
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--write-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="fail on regression vs baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    # Per-request service logs would dominate the output (and the timings)
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("src").setLevel(logging.CRITICAL)
+
+    config = FakeServerConfig(
+        latency=LatencyModel(args.median_ms, args.p99_ms),
+        rate_limit_ratio=args.rate_limit_ratio,
+        server_error_ratio=args.server_error_ratio,
+    )
+    report = asyncio.run(
+        run_benchmark(
+            tuple(args.sizes),
+            config,
+            transport=args.transport,
+            max_concurrency=args.max_concurrency,
+            rate_limit_rps=args.rate_limit_rps,
+            reuse_rating_shipments=args.reuse_plans,
+        )
+    )
+    print(format_report(report))
+
+    status = 0
+    if args.compare:
+        regressions = compare_to_baseline(report, load_baseline(args.baseline), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        status = 1 if regressions else 0
+    if args.write_baseline:
+        write_baseline(report, args.baseline)
+        print(f"\nBaseline written to {args.baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Import-time profile for the server entry points.
+
+Each target is imported in a fresh interpreter with `-X importtime`, several
+times, and the median cumulative import time is reported with the slowest
+modules by self time. Module-level work (building servers, loading settings)
+shows up as self time of the module that does it.
+
+Usage:
+    python scripts/python/profile_imports.py                    # stdio + HTTP entry points
+    python scripts/python/profile_imports.py src.server --top 25 --prefix src.
+    python scripts/python/profile_imports.py --budget-ms 1500   # exit 1 when over budget
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# stdio MCP entry point (scripts/python/run_mcp.py) and the uvicorn worker app
+DEFAULT_TARGETS = ("src.mcp_server.server", "src.server")
+
+
+def profile_once(target: str) -> tuple[float, dict[str, tuple[int, int]]]:
+    """Import `target` in a fresh interpreter; return (wall ms, {module: (self, cumulative) µs})."""
+    env = {**os.environ, "PYTHONWARNINGS": "ignore"}
+    # Settings validation needs a key; a placeholder never reaches EasyPost here
+    env.setdefault("EASYPOST_API_KEY", "EZTK_import_profile")
+    started = time.perf_counter()
+    proc = subprocess.run(  # noqa: S603 - fixed interpreter and module name
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {target} failed:\n{proc.stderr[-2000:]}")
+
+    modules: dict[str, tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return wall_ms, modules
+
+
+def profile(target: str, repeat: int) -> dict[str, object]:
+    """Median wall/import time for `target` and median self time per module."""
+    walls: list[float] = []
+    totals: list[float] = []
+    self_times: defaultdict[str, list[int]] = defaultdict(list)
+    for _ in range(repeat):
+        wall_ms, modules = profile_once(target)
+        walls.append(wall_ms)
+        totals.append(modules.get(target, (0, 0))[1] / 1000)
+        for name, (self_us, _cumulative) in modules.items():
+            self_times[name].append(self_us)
+    return {
+        "target": target,
+        "wall_ms": statistics.median(walls),
+        "import_ms": statistics.median(totals),
+        "self_ms": {name: statistics.median(times) / 1000 for name, times in self_times.items()},
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("targets", nargs="*", default=list(DEFAULT_TARGETS))
+    parser.add_argument("--repeat", type=int, default=5, help="fresh imports per target")
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    parser.add_argument("--prefix", default="", help="only list modules with this prefix")
+    parser.add_argument(
+        "--budget-ms", type=float, default=None, help="fail if a median import exceeds this"
+    )
+    args = parser.parse_args()
+
+    over_budget = []
+    for target in args.targets:
+        result = profile(target, max(1, args.repeat))
+        print(
+            f"\n{target}: import {result['import_ms']:.1f} ms "
+            f"(process {result['wall_ms']:.1f} ms, median of {args.repeat})"
+        )
+        slowest = sorted(
+            (
+                (ms, name)
+                for name, ms in result["self_ms"].items()
+                if name.startswith(args.prefix)
+            ),
+            reverse=True,
+        )[: args.top]
+        for ms, name in slowest:
+            print(f"  {ms:8.1f} ms  {name}")
+        if args.budget_ms is not None and result["import_ms"] > args.budget_ms:
+            over_budget.append(target)
+
+    if over_budget:
+        print(f"\nOver the {args.budget_ms:.0f} ms budget: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
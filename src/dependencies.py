@@ -6,6 +6,8 @@
 from fastmcp.server.dependencies import get_context
 
 from src.services.easypost_service import EasyPostService
+from src.services.rate_limiter import TokenBucketRateLimiter, get_shared_rate_limiter
+from src.services.service_registry import get_shared_service
 from src.utils.config import Settings, get_settings
 
 
@@ -24,29 +26,25 @@ def get_easypost_service() -> EasyPostService:
             return lifespan_ctx["easypost_service"]
         return lifespan_ctx.easypost_service
     except (AttributeError, RuntimeError, KeyError):
-        # Fallback for non-MCP requests or testing
-        from src.utils.config import settings
+        # Fallback for non-MCP requests: reuse the process-wide service
+        return get_shared_service()
 
-        return EasyPostService(api_key=settings.EASYPOST_API_KEY)
 
-
-def get_rate_limiter():
+def get_rate_limiter() -> TokenBucketRateLimiter:
     """
     Dependency provider for API rate limiter.
 
-    Returns semaphore for controlling concurrent EasyPost API calls.
+    Returns the shared token bucket that paces all EasyPost API calls.
     """
-    import asyncio
-
     try:
         ctx = get_context()
         lifespan_ctx = ctx.request_context.lifespan_context
         if isinstance(lifespan_ctx, dict):
-            return lifespan_ctx.get("rate_limiter", asyncio.Semaphore(16))
+            return lifespan_ctx.get("rate_limiter") or get_shared_rate_limiter()
         return lifespan_ctx.rate_limiter
     except (AttributeError, RuntimeError, KeyError):
-        # Fallback semaphore
-        return asyncio.Semaphore(16)
+        # Fallback for non-MCP requests: the process-wide limiter
+        return get_shared_rate_limiter()
 
 
 # Type aliases for clean endpoint annotations
@@ -6,6 +6,8 @@
 from dataclasses import dataclass
 
 from src.services.easypost_service import EasyPostService
+from src.services.rate_limiter import TokenBucketRateLimiter
+from src.services.service_registry import service_registry
 from src.utils.config import settings
 
 logger = logging.getLogger(__name__)
@@ -16,7 +18,7 @@ class AppResources:
     """Shared application resources initialized during lifespan."""
 
     easypost_service: EasyPostService
-    rate_limiter: asyncio.Semaphore
+    rate_limiter: TokenBucketRateLimiter
 
 
 @asynccontextmanager
@@ -25,21 +27,22 @@ async def app_lifespan(server):  # noqa: ARG001 - FastAPI lifespan interface
     Manage application startup and shutdown lifecycle.
 
     Initializes:
-    - EasyPost API service (shared across all requests)
-    - Rate limiter semaphore (16 concurrent API calls)
+    - EasyPost API service (process-wide, from the service registry)
+    - Shared token-bucket rate limiter (the one the service draws from)
+    - Warehouse address ids (background, when WAREHOUSE_ADDRESS_PREREGISTER)
 
     Note: SQLAlchemy pool (for ORM) is configured separately in database.py
     """
     logger.info("Starting EasyPost MCP Server...")
 
-    # Initialize EasyPost service
-    easypost_service = EasyPostService(api_key=settings.EASYPOST_API_KEY)
-    logger.info("EasyPost service initialized")
+    # Acquire the shared EasyPost service (same instance the MCP tools use)
+    easypost_service = service_registry.acquire()
+    logger.info("EasyPost service acquired")
 
     # Database removed for personal use (YAGNI)
 
-    # Initialize rate limiter (16 concurrent EasyPost API calls)
-    rate_limiter = asyncio.Semaphore(16)
+    # Every EasyPost request (SDK or async transport) draws from this bucket
+    rate_limiter = easypost_service.rate_limiter
 
     # Create resources object
     resources = AppResources(
@@ -47,6 +50,10 @@ async def app_lifespan(server):  # noqa: ARG001 - FastAPI lifespan interface
         rate_limiter=rate_limiter,
     )
 
+    warmup = None
+    if settings.WAREHOUSE_ADDRESS_PREREGISTER:
+        warmup = asyncio.create_task(_register_warehouses(easypost_service))
+
     try:
         # Yield dict for FastAPI lifespan state (Starlette requirement)
         yield {
@@ -56,5 +63,16 @@ async def app_lifespan(server):  # noqa: ARG001 - FastAPI lifespan interface
     finally:
         # Cleanup
         logger.info("Shutting down EasyPost MCP Server...")
-        resources.easypost_service.shutdown()
+        if warmup is not None:
+            warmup.cancel()
+        await service_registry.arelease()
         logger.info("Shutdown complete")
+
+
+async def _register_warehouses(easypost_service: EasyPostService) -> None:
+    """Register warehouse origins without delaying startup."""
+    try:
+        counts = await easypost_service.register_warehouse_addresses()
+        logger.info(f"Warehouse addresses registered: {counts}")
+    except Exception as e:
+        logger.warning(f"Warehouse address pre-registration failed: {e}")
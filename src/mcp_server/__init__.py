@@ -1,21 +1,27 @@
-"""MCP Server for EasyPost shipping operations."""
+"""MCP Server for EasyPost shipping operations.
+
+Nothing is built at import time. `build_mcp_server()` constructs a server on
+demand, and `get_mcp_server()` returns the process-wide standalone server
+(no lifespan), building it on first use. The module attributes `mcp` and
+`easypost_service` resolve to that server lazily, so importing tools,
+resources or `src.server` never pays for a server it does not run.
+"""
 
 from __future__ import annotations
 
 import logging
+import threading
 from collections.abc import AsyncIterator, Callable
+from typing import TYPE_CHECKING, Any
 
-from fastmcp import FastMCP
+if TYPE_CHECKING:
+    from fastmcp import FastMCP
 
-from src.mcp_server.prompts import register_prompts
-from src.mcp_server.resources import register_resources
-from src.mcp_server.tools import register_tools
-from src.services.easypost_service import EasyPostService
-from src.utils.config import settings
+    from src.services.easypost_service import EasyPostService
 
 logger = logging.getLogger(__name__)
 
-LifespanHook = Callable[[FastMCP], AsyncIterator[dict]]
+LifespanHook = Callable[["FastMCP"], AsyncIterator[dict]]
 
 
 def build_mcp_server(
@@ -30,7 +36,16 @@ def build_mcp_server(
 
     Returns:
         Tuple of (FastMCP instance, EasyPost service) ready for execution.
+        The service is the process-wide instance from the service registry.
     """
+    from fastmcp import FastMCP
+
+    from src.mcp_server.prompts import register_prompts
+    from src.mcp_server.resources import register_resources
+    from src.mcp_server.tools import register_tools
+    from src.services.service_registry import get_shared_service
+    from src.utils.config import settings
+
     environment = settings.ENVIRONMENT.upper()
     suffix = name_suffix or environment
 
@@ -48,7 +63,7 @@ def build_mcp_server(
         lifespan=lifespan,
     )
 
-    easypost_service = EasyPostService(api_key=settings.EASYPOST_API_KEY)
+    easypost_service = get_shared_service()
 
     register_tools(mcp_instance, easypost_service)
     register_resources(mcp_instance, easypost_service)
@@ -57,6 +72,25 @@ def build_mcp_server(
     return mcp_instance, easypost_service
 
 
-mcp, easypost_service = build_mcp_server()
+_server: tuple[FastMCP, EasyPostService] | None = None
+_server_lock = threading.Lock()
+
+
+def get_mcp_server() -> tuple[FastMCP, EasyPostService]:
+    """Return the standalone MCP server (no lifespan), building it on first use."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = build_mcp_server()
+        return _server
+
+
+def __getattr__(name: str) -> Any:
+    if name == "mcp":
+        return get_mcp_server()[0]
+    if name == "easypost_service":
+        return get_mcp_server()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-__all__ = ["build_mcp_server", "mcp", "easypost_service"]
+__all__ = ["build_mcp_server", "easypost_service", "get_mcp_server", "mcp"]
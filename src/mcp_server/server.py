@@ -8,11 +8,11 @@
 
 from __future__ import annotations
 
-from src.mcp_server import build_mcp_server
+from src.mcp_server import get_mcp_server
 
-# Build MCP server instance (no lifespan for standalone MCP server)
-# Lifespan is only used when integrated with FastAPI
-mcp, _easypost_service = build_mcp_server(lifespan=None)
+# The process-wide standalone server (no lifespan; built once, shared with
+# `src.mcp_server.mcp`). Lifespan is only used when integrated with FastAPI
+mcp, _easypost_service = get_mcp_server()
 
 # Export mcp as the entrypoint for FastMCP tooling
 __all__ = ["mcp"]
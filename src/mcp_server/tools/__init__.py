@@ -6,7 +6,7 @@
 3. Management Tools: Document management and refunds
 
 Tool Categories:
-- Core: get_tracking, get_rates (simple rate lookup)
+- Core: get_tracking, get_tracking_batch, get_rates (simple rate lookup)
 - Bulk: get_shipment_rates, create_shipment, buy_shipment_label
 - Management: download_shipment_documents, refund_shipment
 """
@@ -26,10 +26,11 @@ def register_tools(mcp: FastMCP, easypost_service: EasyPostService | None) -> No
     """
     Register all MCP tools with the server, organized by category.
 
-    Tools registered (7 total):
+    Tools registered (8 total):
 
     CORE TOOLS (Simple, single-purpose operations):
     - get_tracking: Get tracking information for a shipment
+    - get_tracking_batch: Track many shipments at once (deduplicated, bounded concurrency)
     - get_rates: Get shipping rates for a single shipment (dict inputs)
 
     BULK TOOLS (Advanced, spreadsheet-format operations):
@@ -47,7 +48,7 @@ def register_tools(mcp: FastMCP, easypost_service: EasyPostService | None) -> No
     3. Management tools (post-creation operations)
     """
     # Core Tools: Simple, single-purpose operations
-    register_tracking_tools(mcp, easypost_service)  # get_tracking
+    register_tracking_tools(mcp, easypost_service)  # get_tracking, get_tracking_batch
     register_rate_tools(mcp, easypost_service)  # get_rates
 
     # Bulk Tools: Advanced, spreadsheet-format operations
@@ -3,9 +3,11 @@
 
 PERSONAL USE CONFIGURATION:
 - Fixed 4 workers for I/O-bound operations (not CPU-based)
-- Concurrent API limit: 2 (prevents EasyPost rate limiting)
-- Chunk processing: 4 shipments per chunk
-- Performance: ~1-2 shipments/second (adequate for personal use)
+- Up to MAX_CONCURRENT (4) lines in flight; buy_shipment_label's
+  max_concurrency overrides it per call
+- Sliding window: a new line starts as soon as an in-flight one finishes
+- API pacing (and 429 back-off) comes from the service's shared rate limiter,
+  so throughput follows the limiter rate rather than a fixed figure
 """
 
 import asyncio
@@ -17,8 +19,10 @@
 
 from fastmcp import Context, FastMCP
 
+from src.mcp_server.tools.bulk_timing import StageTimer, summarize_stage_timings
 from src.services.easypost_service import EasyPostService
 from src.utils.constants import BULK_OPERATION_TIMEOUT
+from src.utils.monitoring import trace_api_calls
 
 from .bulk_tools import parse_spreadsheet_line
 
@@ -27,13 +31,24 @@
 # Personal use: simplified worker configuration
 CPU_COUNT = multiprocessing.cpu_count()  # 16 cores on M3 Max
 MAX_WORKERS = 4  # Fixed 4 workers for personal use (matches easypost_service.py)
-CHUNK_SIZE = 4  # Process 4 shipments per chunk for personal use
-MAX_CONCURRENT = 2  # API concurrency limit - reduced to avoid rate limiting
+MAX_CONCURRENT = 4  # In-flight shipments; API pacing is done by the shared rate limiter
 
 # Note: Customs caching handled by smart_customs module
 # Use get_or_create_customs from src.services.smart_customs for customs info
 
 
+def _latency_summary(results: list[dict[str, Any]]) -> dict[str, float]:
+    """p50/p95/max of per-label purchase latency (milliseconds)."""
+    latencies = sorted(r["latency_ms"] for r in results if "latency_ms" in r)
+    if not latencies:
+        return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+
+    def percentile(pct: float) -> float:
+        return latencies[min(len(latencies) - 1, int(round(pct / 100 * (len(latencies) - 1))))]
+
+    return {"p50": percentile(50), "p95": percentile(95), "max": latencies[-1]}
+
+
 def register_shipment_creation_tools(
     mcp: FastMCP, easypost_service: EasyPostService | None = None
 ) -> None:
@@ -165,11 +180,13 @@ async def create_shipment(
 
             validation_results: list[dict[str, Any]] = []
             for idx, line in enumerate(lines):
+                timer = StageTimer()
                 try:
-                    data_dict = parse_spreadsheet_line(line)
-                    shipment_data = ShipmentDataDTO(**data_dict)
-                    validation_result = validate_shipment_data(shipment_data, idx + 1)
-                    validation_results.append(validation_result.model_dump())
+                    with timer.stage("parse"):
+                        data_dict = parse_spreadsheet_line(line)
+                        shipment_data = ShipmentDataDTO(**data_dict)
+                        validation_result = validate_shipment_data(shipment_data, idx + 1)
+                    validation_results.append({**validation_result.model_dump(), "timer": timer})
                 except Exception as e:
                     validation_results.append(
                         {
@@ -253,51 +270,61 @@ async def create_one_shipment(
                     verify_address_if_needed,
                 )
                 from src.models.bulk_dto import ShipmentDataDTO, ValidationResultDTO
+                from src.services.product_utils import detect_product_category
 
+                timer: StageTimer = validation_result["timer"]
                 try:
                     data_dict = validation_result["data"]
                     line_number = validation_result["line"]
 
                     # Convert dict to DTO
-                    shipment_data = ShipmentDataDTO(**data_dict)
+                    with timer.stage("parse"):
+                        shipment_data = ShipmentDataDTO(**data_dict)
+
+                    with timer.stage("category"):
+                        category = detect_product_category(shipment_data.contents)
 
                     # Select warehouse address
-                    from_address, warehouse_info = select_warehouse_address(
-                        shipment_data
-                    )
+                    with timer.stage("warehouse"):
+                        from_address, warehouse_info = select_warehouse_address(
+                            shipment_data, category
+                        )
 
                     # Progress reporting
                     if ctx and line_number % max(1, total_lines // 10) == 0:
                         await ctx.info(f"📍 Shipment #{line_number}: {warehouse_info}")
 
                     # Build addresses and parcel using helpers
-                    to_address = build_to_address(shipment_data)
-                    parcel = build_parcel(ValidationResultDTO(**validation_result))
+                    with timer.stage("parse"):
+                        to_address = build_to_address(shipment_data)
+                        parcel = build_parcel(ValidationResultDTO(**validation_result))
 
                     # Check if international
                     is_intl = is_international_shipment(to_address, from_address)
 
                     # Verify address if needed (international FedEx/UPS)
-                    verified = await verify_address_if_needed(
-                        to_address,
-                        easypost_service,
-                        is_intl,
-                        shipment_data.carrier_preference,
-                        ctx,
-                    )
+                    with timer.stage("address_verification"):
+                        verified = await verify_address_if_needed(
+                            to_address,
+                            easypost_service,
+                            is_intl,
+                            shipment_data.carrier_preference,
+                            ctx,
+                        )
                     to_address = verified.address
 
                     # Prepare customs if international
                     customs_info = None
                     if is_intl:
-                        customs_info = await prepare_customs_if_international(
-                            shipment_data.contents,
-                            validation_result["weight_oz"],
-                            easypost_service,
-                            from_address,
-                            shipment_data.carrier_preference,
-                            ctx,
-                        )
+                        with timer.stage("customs"):
+                            customs_info = await prepare_customs_if_international(
+                                shipment_data.contents,
+                                validation_result["weight_oz"],
+                                easypost_service,
+                                from_address,
+                                shipment_data.carrier_preference,
+                                ctx,
+                            )
 
                     # Build shipment request (no carrier filter - get all rates)
                     shipment_request = build_shipment_request(
@@ -324,14 +351,15 @@ async def create_one_shipment(
                         }
 
                     # Create shipment via helper (Phase 1: get rates only)
-                    shipment_result = await asyncio.wait_for(
-                        create_shipment_with_rates(
-                            shipment_request,
-                            easypost_service,
-                            ctx,
-                        ),
-                        timeout=BULK_OPERATION_TIMEOUT,
-                    )
+                    with timer.stage("create"):
+                        shipment_result = await asyncio.wait_for(
+                            create_shipment_with_rates(
+                                shipment_request,
+                                easypost_service,
+                                ctx,
+                            ),
+                            timeout=BULK_OPERATION_TIMEOUT,
+                        )
 
                     # Handle errors
                     if shipment_result.errors:
@@ -372,47 +400,48 @@ async def create_one_shipment(
                         "error": str(e),
                     }
 
-            # Chunked processing with semaphore control (personal use)
             async def create_with_semaphore(
-                validation_result: dict[str, Any],
-            ) -> dict[str, Any]:
-                """Wrapper to limit concurrent API calls."""
-                async with semaphore:
-                    return await create_one_shipment(validation_result)
-
-            # Create all tasks
-            tasks = [create_with_semaphore(v) for v in valid_shipments]
-
-            # Execute with progress reporting
-            results = []
-            completed = 0
+                idx: int, validation_result: dict[str, Any]
+            ) -> tuple[int, dict[str, Any]]:
+                """Create inside the sliding window; attaches the line's stage timings."""
+                timer: StageTimer = validation_result["timer"]
+                # Every line is scheduled up front, so this is the real time queued
+                with timer.stage("queue_wait"):
+                    await semaphore.acquire()
+                try:
+                    result = await create_one_shipment(validation_result)
+                except Exception as e:
+                    logger.error(f"Task exception: {e}")
+                    result = {"status": "error", "error": str(e)}
+                finally:
+                    semaphore.release()
+                result["timings"] = timer.as_dict()
+                return idx, result
+
+            # Sliding window: a new line starts as soon as any in-flight one
+            # finishes (no chunk barriers), results keep input order
             total = len(valid_shipments)
+            results: list[dict[str, Any]] = [{}] * total
             progress_interval = max(1, total // 20)  # Report every 5%
 
-            # Process in small chunks (4 items per chunk for personal use)
-            for i in range(0, len(tasks), CHUNK_SIZE):
-                chunk = tasks[i : i + CHUNK_SIZE]
-                chunk_results = await asyncio.gather(*chunk, return_exceptions=True)
-
-                for result in chunk_results:
-                    if isinstance(result, Exception):
-                        logger.error(f"Task exception: {result}")
-                        results.append({"status": "error", "error": str(result)})
-                    else:
-                        results.append(result)
+            with trace_api_calls(settings.BULK_API_TRACE) as api_trace:
+                # Tasks, not bare coroutines: as_completed would start those in set
+                # order. Created inside the trace so they inherit it
+                pending = [
+                    asyncio.create_task(create_with_semaphore(idx, validation_result))
+                    for idx, validation_result in enumerate(valid_shipments)
+                ]
+                for completed, next_done in enumerate(asyncio.as_completed(pending), start=1):
+                    idx, result = await next_done
+                    results[idx] = result
 
-                    completed += 1
                     if ctx:
                         await ctx.report_progress(completed, total)
                         # Adaptive progress reporting with throughput
                         if completed % progress_interval == 0 or completed == total:
                             elapsed = time() - performance_start
                             throughput = completed / elapsed if elapsed > 0 else 0
-                            eta = (
-                                (total - completed) / throughput
-                                if throughput > 0
-                                else 0
-                            )
+                            eta = (total - completed) / throughput if throughput > 0 else 0
                             await ctx.info(
                                 f"📦 {completed}/{total} | {throughput:.1f}/s | ETA: {eta:.0f}s"
                             )
@@ -463,6 +492,8 @@ async def create_with_semaphore(
                             else 0.0
                         ),
                         "carrier_breakdown": carrier_stats,
+                        "stages": summarize_stage_timings(r.get("timings") for r in results),
+                        **({"api_trace": api_trace.summary()} if api_trace else {}),
                     },
                     "validation_errors": [
                         {"line": v["line"], "errors": v["errors"]}
@@ -499,6 +530,7 @@ async def buy_shipment_label(
         shipment_ids: list[str],
         rate_ids: list[str],
         _customs_data: list[dict[str, Any]] | None = None,
+        max_concurrency: int | None = None,
         ctx: Context | None = None,
     ) -> dict[str, Any]:
         """
@@ -514,10 +546,11 @@ async def buy_shipment_label(
             rate_ids: List of rate IDs to use for each shipment (must match shipment_ids length)
             customs_data: List of customs info dicts with contents, hs_code,
                           value, and weight fields
+            max_concurrency: Purchases in flight at once (sliding window, default 4)
             ctx: MCP context
 
         Returns:
-            Purchased labels with tracking numbers
+            Purchased labels with tracking numbers and per-label latency_ms
         """
         from src.utils.config import settings
 
@@ -549,88 +582,76 @@ async def buy_shipment_label(
                     "timestamp": datetime.now(UTC).isoformat(),
                 }
 
-            semaphore = asyncio.Semaphore(MAX_CONCURRENT)
+            window = max(1, max_concurrency or MAX_CONCURRENT)
+            semaphore = asyncio.Semaphore(window)
             performance_start = time()
 
-            async def buy_one(
-                _idx: int, shipment_id: str, rate_id: str
-            ) -> dict[str, Any]:
+            async def purchase_label(shipment_id: str, rate_id: str) -> dict[str, Any]:
                 try:
-                    async with semaphore:
-                        loop = asyncio.get_running_loop()
-
-                        # Retrieve shipment to verify rate exists
-                        shipment = await loop.run_in_executor(
-                            None, easypost_service.client.shipment.retrieve, shipment_id
-                        )
-
-                        # Verify rate exists in shipment rates
-                        rate_obj = None
-                        for r in shipment.rates:
-                            if r.id == rate_id:
-                                rate_obj = r
-                                break
-
-                        if not rate_obj:
-                            available_ids = [r.id for r in shipment.rates]
-                            return {
-                                "status": "error",
-                                "shipment_id": shipment_id,
-                                "error": (
-                                    f"Rate {rate_id} not found in shipment rates. "
-                                    f"Available: {available_ids}"
-                                ),
-                            }
-
-                        # Customs info should already be on the shipment from creation
-                        # We don't need to set it again here - just verify
-                        if (
-                            shipment.to_address.country != "US"
-                            and not shipment.customs_info
-                            and ctx
-                        ):
-                            await ctx.info(
-                                f"⚠️  Warning: Shipment {shipment_id} is international "
-                                "but missing customs info"
-                            )
+                    # Phase-1 shipment from the service cache (retrieved only on a miss)
+                    shipment = await easypost_service.get_purchasable_shipment(shipment_id)
+
+                    # Verify rate exists in shipment rates
+                    rate_obj = None
+                    for r in shipment.rates:
+                        if r.id == rate_id:
+                            rate_obj = r
+                            break
+
+                    if not rate_obj:
+                        available_ids = [r.id for r in shipment.rates]
+                        return {
+                            "status": "error",
+                            "shipment_id": shipment_id,
+                            "error": (
+                                f"Rate {rate_id} not found in shipment rates. "
+                                f"Available: {available_ids}"
+                            ),
+                        }
 
-                        # Buy label using service method (better error handling)
-                        buy_result = await easypost_service.buy_shipment(
-                            shipment_id, rate_id
+                    # Customs info should already be on the shipment from creation
+                    # We don't need to set it again here - just verify
+                    if (
+                        shipment.to_address.country != "US"
+                        and not shipment.customs_info
+                        and ctx
+                    ):
+                        await ctx.info(
+                            f"⚠️  Warning: Shipment {shipment_id} is international "
+                            "but missing customs info"
                         )
 
-                        if buy_result.get("status") != "success":
-                            error_msg = buy_result.get("message", "Unknown error")
-                            error_details = buy_result.get("error_details", {})
-                            logger.error(
-                                f"Purchase failed for {shipment_id}: {error_msg}"
-                            )
-                            logger.error(f"Error details: {error_details}")
-                            # Include error_details in error message for visibility
-                            full_error = error_msg
-                            if error_details.get("errors"):
-                                full_error = (
-                                    f"{error_msg} | Details: {error_details['errors']}"
-                                )
-                            return {
-                                "status": "error",
-                                "shipment_id": shipment_id,
-                                "error": full_error,
-                                "error_details": error_details,
-                            }
-
-                        # Extract purchase details
-                        data = buy_result.get("data", {})
+                    # Buy label using service method (reuses the cached shipment)
+                    buy_result = await easypost_service.buy_shipment(shipment_id, rate_id)
+
+                    if buy_result.get("status") != "success":
+                        error_msg = buy_result.get("message", "Unknown error")
+                        error_details = buy_result.get("error_details", {})
+                        logger.error(f"Purchase failed for {shipment_id}: {error_msg}")
+                        logger.error(f"Error details: {error_details}")
+                        # Include error_details in error message for visibility
+                        full_error = error_msg
+                        if error_details.get("errors"):
+                            full_error = f"{error_msg} | Details: {error_details['errors']}"
                         return {
-                            "status": "success",
+                            "status": "error",
                             "shipment_id": shipment_id,
-                            "tracking_code": data.get("tracking_code"),
-                            "label_url": data.get("postage_label_url"),
-                            "carrier": rate_obj.carrier,
-                            "service": rate_obj.service,
-                            "cost": rate_obj.rate,
-                            "recipient": shipment.to_address.name,
+                            "error": full_error,
+                            "error_details": error_details,
                         }
+
+                    # Extract purchase details
+                    data = buy_result.get("data", {})
+                    return {
+                        "status": "success",
+                        "shipment_id": shipment_id,
+                        "tracking_code": data.get("tracking_code"),
+                        "label_url": data.get("postage_label_url"),
+                        "carrier": rate_obj.carrier,
+                        "service": rate_obj.service,
+                        "cost": rate_obj.rate,
+                        "recipient": shipment.to_address.name,
+                    }
                 except Exception as e:
                     # Capture full error details from EasyPost
                     error_details = str(e)
@@ -639,9 +660,7 @@ async def buy_one(
                     if hasattr(e, "errors"):
                         error_details = f"{error_details} | Errors: {e.errors}"
                     if hasattr(e, "http_status"):
-                        error_details = (
-                            f"{error_details} | HTTP Status: {e.http_status}"
-                        )
+                        error_details = f"{error_details} | HTTP Status: {e.http_status}"
                     if hasattr(e, "json_body"):
                         error_details = f"{error_details} | JSON: {e.json_body}"
                     logger.error(f"Purchase error for {shipment_id}: {error_details}")
@@ -651,24 +670,37 @@ async def buy_one(
                         "error": error_details,
                     }
 
-            # Execute - pass index, shipment_id, and rate_id
-            tasks = [
-                buy_one(idx, shipment_id, rate_ids[idx])
-                for idx, shipment_id in enumerate(shipment_ids)
-            ]
-            results = []
-            completed = 0
-            total = len(shipment_ids)
+            async def buy_one(idx: int, shipment_id: str, rate_id: str) -> tuple[int, dict]:
+                """Buy inside the sliding window; latency excludes time spent queued."""
+                async with semaphore:
+                    label_start = time()
+                    result = await purchase_label(shipment_id, rate_id)
+                result["latency_ms"] = round((time() - label_start) * 1000, 1)
+                return idx, result
 
-            for i in range(0, len(tasks), CHUNK_SIZE):
-                chunk_results = await asyncio.gather(*tasks[i : i + CHUNK_SIZE])
-                results.extend(chunk_results)
-                completed += len(chunk_results)
+            # Sliding window: a new purchase starts as soon as any in-flight one
+            # finishes (no chunk barriers), results keep input order
+            total = len(shipment_ids)
+            results: list[dict[str, Any]] = [{}] * total
+            progress_interval = max(1, total // 10)
+
+            with trace_api_calls(settings.BULK_API_TRACE) as api_trace:
+                # Tasks, not bare coroutines: as_completed would start those in set
+                # order. Created inside the trace so they inherit it
+                pending = [
+                    asyncio.create_task(buy_one(idx, shipment_id, rate_ids[idx]))
+                    for idx, shipment_id in enumerate(shipment_ids)
+                ]
+                for completed, next_done in enumerate(asyncio.as_completed(pending), start=1):
+                    idx, result = await next_done
+                    results[idx] = result
 
-                if ctx and completed % max(1, total // 10) == 0:
-                    elapsed = time() - performance_start
-                    throughput = completed / elapsed if elapsed > 0 else 0
-                    await ctx.info(f"💳 {completed}/{total} | {throughput:.1f}/s")
+                    if ctx:
+                        await ctx.report_progress(completed, total)
+                        if completed % progress_interval == 0 or completed == total:
+                            elapsed = time() - performance_start
+                            throughput = completed / elapsed if elapsed > 0 else 0
+                            await ctx.info(f"💳 {completed}/{total} | {throughput:.1f}/s")
 
             # Summary
             successful = [r for r in results if r.get("status") == "success"]
@@ -694,6 +726,9 @@ async def buy_one(
                         "failed": len(failed),
                         "total_cost": total_cost,
                         "duration_seconds": round(duration, 2),
+                        "concurrency": window,
+                        "latency_ms": _latency_summary(results),
+                        **({"api_trace": api_trace.summary()} if api_trace else {}),
                     },
                 },
                 "message": f"Purchased {len(successful)}/{total} labels - ${total_cost:.2f}",
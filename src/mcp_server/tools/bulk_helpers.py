@@ -87,12 +87,14 @@ def validate_shipment_data(
 
 def select_warehouse_address(
     data: ShipmentDataDTO,
+    category: str | None = None,
 ) -> tuple[AddressDTO, str]:
     """
     Select warehouse address based on custom sender or auto-detection.
 
     Pure function - no I/O operations.
     Complexity: 4
+    Args: category - product category if already detected (detected here otherwise)
     Returns: (address, warehouse_info_string)
     """
     # Priority 1: Custom sender address
@@ -102,7 +104,7 @@ def select_warehouse_address(
         return AddressDTO(**address_dict), warehouse_info
 
     # Priority 2: Auto-select by category + state
-    category = detect_product_category(data.contents)
+    category = category or detect_product_category(data.contents)
     origin_state = data.origin_state or "California"
     warehouse_dict = get_warehouse_address(origin_state, category)
 
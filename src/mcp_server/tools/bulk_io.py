@@ -7,6 +7,8 @@
 
 import asyncio
 import logging
+import threading
+from functools import partial
 
 from fastmcp import Context
 
@@ -18,11 +20,52 @@
     ShipmentResultDTO,
     VerifiedAddressDTO,
 )
+from src.services.address_utils import address_fingerprint, preprocess_address_for_fedex
 from src.services.easypost_service import EasyPostService
 from src.services.smart_customs import get_or_create_customs
+from src.utils.cache import SQLiteStore, TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Verification outcomes by address_fingerprint(); optionally persisted to SQLite
+_verification_cache: TTLCache | None = None
+_verification_cache_lock = threading.Lock()
+
+# Recipient fields re-applied to cached results (not part of the fingerprint)
+CONTACT_FIELDS = ("name", "company", "phone", "email")
+
+
+def _encode_verification(result: VerifiedAddressDTO) -> str:
+    return result.model_dump_json()
+
+
+def get_verification_cache() -> TTLCache:
+    """Return the process-wide address verification cache configured from settings."""
+    global _verification_cache
+    with _verification_cache_lock:
+        if _verification_cache is None:
+            from src.utils.config import settings
+
+            store = None
+            if settings.ADDRESS_VERIFICATION_CACHE_PATH:
+                store = SQLiteStore(
+                    settings.ADDRESS_VERIFICATION_CACHE_PATH,
+                    encode=_encode_verification,
+                    decode=VerifiedAddressDTO.model_validate_json,
+                )
+            _verification_cache = TTLCache(
+                maxsize=settings.ADDRESS_VERIFICATION_CACHE_MAX_SIZE,
+                ttl=settings.ADDRESS_VERIFICATION_CACHE_TTL_SECONDS,
+                store=store,
+            )
+        return _verification_cache
+
+
+def _for_recipient(cached: VerifiedAddressDTO, address: AddressDTO) -> VerifiedAddressDTO:
+    """Cached verification result carrying this line's contact details."""
+    contact = {field: getattr(address, field) for field in CONTACT_FIELDS}
+    return cached.model_copy(update={"address": cached.address.model_copy(update=contact)})
+
 
 async def verify_address_if_needed(
     address: AddressDTO,
@@ -34,7 +77,8 @@ async def verify_address_if_needed(
     """
     Verify address if international FedEx/UPS shipment.
 
-    I/O operation - calls EasyPost API.
+    I/O operation - calls EasyPost API unless the outcome for the same
+    postal address is in the verification cache.
     Complexity: 8
     """
     # Skip verification for domestic or non-FedEx/UPS
@@ -49,9 +93,6 @@ async def verify_address_if_needed(
             address=address, verification_success=True, errors=[], warnings=[]
         )
 
-    # Preprocess for FedEx
-    from src.services.easypost_service import preprocess_address_for_fedex
-
     # Convert to dict with defaults for None values
     address_dict = address.model_dump(exclude_none=False)
     # Ensure all string fields have defaults (not None)
@@ -61,6 +102,15 @@ async def verify_address_if_needed(
 
     preprocessed = preprocess_address_for_fedex(address_dict)
 
+    cache = get_verification_cache()
+    # Keyed by the line's own carrier so FedEx and UPS lines never share outcomes
+    cache_key = address_fingerprint(preprocessed, carrier=carrier_preference)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        if ctx:
+            await ctx.info("♻️  Using cached address verification")
+        return _for_recipient(cached, address)
+
     if ctx:
         name = preprocessed.get("name", "recipient")
         await ctx.info(f"🔍 Verifying FedEx-preprocessed address for {name}...")
@@ -83,12 +133,14 @@ async def verify_address_if_needed(
         verified_address = AddressDTO(**verified_addr)
         if ctx:
             await ctx.info("✅ Address verified and corrected by FedEx")
-        return VerifiedAddressDTO(
+        result = VerifiedAddressDTO(
             address=verified_address,
             verification_success=True,
             errors=[],
             warnings=warnings,
         )
+        cache.set(cache_key, result)
+        return result
 
     if verify_result.get("status") == "warning" or (
         verified_addr and not verification_success
@@ -97,12 +149,14 @@ async def verify_address_if_needed(
         verified_address = AddressDTO(**verified_addr) if verified_addr else address
         if ctx:
             await ctx.info(f"⚠️  Address verification warnings: {errors}")
-        return VerifiedAddressDTO(
+        result = VerifiedAddressDTO(
             address=verified_address,
             verification_success=False,
             errors=errors,
             warnings=warnings,
         )
+        cache.set(cache_key, result)
+        return result
 
     # Verification failed
     error_msg = verify_result.get("message", "Unknown verification error")
@@ -138,9 +192,7 @@ async def prepare_customs_if_international(
     )
     customs_signer = get_customs_signer(from_address.model_dump())
 
-    loop = asyncio.get_running_loop()
-    customs_obj = await loop.run_in_executor(
-        None,
+    build_customs = partial(
         get_or_create_customs,
         contents,
         weight_oz,
@@ -148,7 +200,14 @@ async def prepare_customs_if_international(
         None,  # Auto-detect value
         customs_signer,
         incoterm,
+        inline=easypost_service.inline_customs,
     )
+    if easypost_service.inline_customs:
+        # Local payload (items nested), sent with the shipment request
+        customs_obj = build_customs()
+    else:
+        loop = asyncio.get_running_loop()
+        customs_obj = await loop.run_in_executor(None, build_customs)
 
     if customs_obj:
         # Always extract attributes directly from CustomsInfo object
@@ -0,0 +1,91 @@
+"""
+Per-line stage timings for the bulk tools.
+
+Every line processed by `get_shipment_rates` and `create_shipment` carries a
+`StageTimer`. Its `as_dict()` is returned on the line as `timings`
+(milliseconds per stage), and `summarize_stage_timings()` turns a run's
+lines into per-stage percentiles for the tool's performance block.
+Comparing stages tells whether a sheet is bound by the concurrency window
+(queue_wait), parsing, caching (verification/customs) or EasyPost itself.
+"""
+
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+# Pipeline order; summaries list stages in this order, unknown ones last
+STAGE_ORDER = (
+    "queue_wait",
+    "parse",
+    "category",
+    "warehouse",
+    "address_verification",
+    "customs",
+    "rates",
+    "create",
+)
+
+
+class StageTimer:
+    """Accumulated wall time per named stage for one bulk line."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self._seconds: dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the wrapped block as (part of) stage `name`, even if it raises."""
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.record(name, self._clock() - started)
+
+    def record(self, name: str, seconds: float) -> None:
+        self._seconds[name] = self._seconds.get(name, 0.0) + max(0.0, seconds)
+
+    def as_dict(self) -> dict[str, float]:
+        """Milliseconds per stage that ran, plus `total_ms`."""
+        timings = {name: round(seconds * 1000, 2) for name, seconds in self._seconds.items()}
+        timings["total_ms"] = round(sum(self._seconds.values()) * 1000, 2)
+        return timings
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of sorted `values`."""
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def summarize_stage_timings(
+    timings: Iterable[dict[str, float] | None],
+) -> dict[str, dict[str, float]]:
+    """
+    Per-stage count, p50/p95/p99/max and total milliseconds across lines.
+
+    `share` is the stage's fraction of all stage time in the run, so the
+    dominant stage is the one to tune first.
+    """
+    per_stage: dict[str, list[float]] = {}
+    for line in timings:
+        for name, ms in (line or {}).items():
+            if name != "total_ms":
+                per_stage.setdefault(name, []).append(ms)
+
+    grand_total = sum(sum(values) for values in per_stage.values())
+    order = {name: index for index, name in enumerate(STAGE_ORDER)}
+    summary: dict[str, dict[str, Any]] = {}
+    for name in sorted(per_stage, key=lambda stage: (order.get(stage, len(order)), stage)):
+        values = sorted(per_stage[name])
+        total = sum(values)
+        summary[name] = {
+            "count": len(values),
+            "p50_ms": _percentile(values, 50),
+            "p95_ms": _percentile(values, 95),
+            "p99_ms": _percentile(values, 99),
+            "max_ms": values[-1],
+            "total_ms": round(total, 2),
+            "share": round(total / grand_total, 4) if grand_total else 0.0,
+        }
+    return summary
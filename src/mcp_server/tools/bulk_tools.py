@@ -4,6 +4,7 @@
 import logging
 import re
 from datetime import UTC, datetime
+from functools import partial
 from typing import Any
 
 from src.services.product_utils import PRODUCT_CATEGORIES, detect_product_category
@@ -22,14 +23,13 @@
 from fastmcp import Context, FastMCP
 from pydantic import BaseModel
 
+from src.mcp_server.tools.bulk_timing import StageTimer, summarize_stage_timings
 from src.services.easypost_service import EasyPostService
 from src.utils.constants import STANDARD_TIMEOUT
+from src.utils.monitoring import trace_api_calls
 
 logger = logging.getLogger(__name__)
 
-# API rate limiting - sequential processing to avoid EasyPost production rate limits
-MAX_CONCURRENT = 1  # Sequential API calls only (production rate limit compliance)
-
 
 class ShipmentLine(BaseModel):
     """Parsed shipment data from spreadsheet."""
@@ -627,6 +627,104 @@ class ShipmentLine(BaseModel):
 """
 
 
+def _substring_index(strings: Any) -> frozenset[str]:
+    """Every non-empty substring of `strings`, for O(1) "is part of" lookups."""
+    return frozenset(
+        text[i:j]
+        for text in strings
+        for i in range(len(text))
+        for j in range(i + 1, len(text) + 1)
+    )
+
+
+def _keyword_pattern(keywords: tuple[str, ...]) -> re.Pattern[str]:
+    """Single regex that finds any of `keywords` as a substring."""
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+
+def _any_pattern(patterns: tuple[str, ...]) -> re.Pattern[str]:
+    """Single regex that matches wherever any of `patterns` would."""
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+
+
+# Field detection tables, built once at import and shared by every call.
+# Email detection (RFC 5322 compliant with practical restrictions)
+# Supports: user+tag@example.com, user.name@example.co.uk, user123@sub.domain.com
+_EMAIL_RE = re.compile(
+    r"^[a-zA-Z0-9][a-zA-Z0-9.!#$%&'*+/=?^_`{|}~-]*@"
+    r"[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?"
+    r"(?:\.[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*$"
+)
+
+# Phone detection (various formats including extensions)
+# Formats: +1-555-123-4567, (555) 123-4567, 555-123-4567 x1234, +44 20 7123 4567 ext 100
+_PHONE_RE = _any_pattern(
+    (
+        # International with optional extension
+        r"^\+?[\d\s\-\(\)]{10,}(?:[\s]?(?:x|ext|extension)[\s]?\d{1,6})?$",
+        # Simple digits with optional extension
+        r"^\d{10,15}(?:[\s]?(?:x|ext|extension)[\s]?\d{1,6})?$",
+        # US format with optional extension
+        r"^\d{3}[\s\-]?\d{3}[\s\-]?\d{4}(?:[\s]?(?:x|ext)[\s]?\d{1,6})?$",
+    )
+)
+_PHONE_STRIP = str.maketrans("", "", " -()")
+
+_COUNTRY_CODE_RE = re.compile(r"^[A-Z]{2}$")
+# A value is a country code/name if it appears anywhere inside a known code/name
+_COUNTRY_CODE_INDEX = _substring_index(set(COUNTRY_CODE_MAP.values()))
+_COUNTRY_NAME_INDEX = _substring_index({name.upper() for name in COUNTRY_CODE_MAP})
+
+# Postal/ZIP code detection (international support)
+_POSTAL_CODE_RE = _any_pattern(
+    (
+        r"^\d{5}(?:-\d{4})?$",  # US ZIP: 12345 or 12345-6789
+        r"^[A-Z]\d[A-Z]\s?\d[A-Z]\d$",  # Canada: A1A 1A1 or A1A1A1
+        r"^[A-Z]{1,2}\d{1,2}[A-Z]?\s?\d[A-Z]{2}$",  # UK: SW1A 1AA, EC1A 1BB
+        r"^\d{5}$",  # Germany, France, Spain: 12345
+        r"^\d{4}$",  # Australia, Belgium: 1234
+        r"^\d{3}-\d{4}$",  # Japan: 123-4567
+        r"^\d{6}$",  # India, Singapore: 123456
+    )
+)
+
+US_STATE_CODES = frozenset(
+    {
+        "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA",
+        "HI", "ID", "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD",
+        "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ",
+        "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC",
+        "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY",
+    }
+)  # fmt: skip
+
+_WEIGHT_KEYWORDS_RE = _keyword_pattern(
+    ("lb", "lbs", "oz", "ounce", "pound", "kg", "kilogram", "g", "gram")
+)
+# Numeric weight pattern (decimal number that could be weight)
+_NUMERIC_RE = re.compile(r"^[\d.]+$")
+
+_DIMENSION_KEYWORDS_RE = _keyword_pattern(("x", "inch", "in", "cm", "dimension"))
+_DIMENSIONS_RE = re.compile(r"[\d.]+[\sx×]+[\d.]+[\sx×]+[\d.]+")
+
+_STREET_KEYWORDS_RE = _keyword_pattern(
+    (
+        "street", "st", "avenue", "ave", "road", "rd", "boulevard", "blvd",
+        "drive", "dr", "lane", "ln", "court", "ct", "circle", "cir", "way",
+        "plaza", "pkwy",
+    )
+)  # fmt: skip
+_PO_BOX_RE = re.compile(r"^p\.?o\.?\s*box\s+\d+")
+_BOX_RE = re.compile(r"^box\s+\d+")
+_MILITARY_RE = re.compile(r"^(apo|fpo|dpo)\s+[a-z]{2}\s+\d{5}")
+_LEADING_NUMBER_RE = re.compile(r"^\d+")
+_ADDRESS_KEYWORDS_RE = _keyword_pattern(
+    ("street", "st", "avenue", "ave", "road", "rd", "suite", "apt", "box", "apo", "fpo", "dpo")
+)
+_CARRIER_NAMES_RE = _keyword_pattern(("USPS", "FEDEX", "UPS", "DHL", "ASENDIA"))
+_CONTENTS_KEYWORDS_RE = _keyword_pattern(("description", "item", "product", "contents", "goods"))
+
+
 def detect_field_type(value: str) -> str | None:
     """
     Detect field type from value content.
@@ -642,229 +740,78 @@ def detect_field_type(value: str) -> str | None:
 
     value = value.strip()
     value_lower = value.lower()
+    value_upper = value.upper()
 
-    # Email detection (RFC 5322 compliant with practical restrictions)
-    # Supports: user+tag@example.com, user.name@example.co.uk, user123@sub.domain.com
-    email_pattern = (
-        r"^[a-zA-Z0-9][a-zA-Z0-9.!#$%&'*+/=?^_`{|}~-]*@"
-        r"[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?"
-        r"(?:\.[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*$"
-    )
-    if re.match(email_pattern, value) and len(value) <= 254:  # RFC 5321 max length
+    if len(value) <= 254 and _EMAIL_RE.match(value):  # RFC 5321 max length
         return "email"
 
-    # Phone detection (various formats including extensions)
-    # Formats: +1-555-123-4567, (555) 123-4567, 555-123-4567 x1234, +44 20 7123 4567 ext 100
-    phone_patterns = [
-        # International with optional extension
-        r"^\+?[\d\s\-\(\)]{10,}(?:[\s]?(?:x|ext|extension)[\s]?\d{1,6})?$",
-        # Simple digits with optional extension
-        r"^\d{10,15}(?:[\s]?(?:x|ext|extension)[\s]?\d{1,6})?$",
-        # US format with optional extension
-        r"^\d{3}[\s\-]?\d{3}[\s\-]?\d{4}(?:[\s]?(?:x|ext)[\s]?\d{1,6})?$",
-    ]
-    for pattern in phone_patterns:
-        cleaned_value = (
-            value.replace(" ", "").replace("-", "").replace("(", "").replace(")", "")
-        )
-        if re.match(pattern, cleaned_value):
-            # Validate digit count (7-15 typical for phone numbers, excluding extensions)
-            digit_count = sum(
-                c.isdigit() for c in cleaned_value.split("x")[0].split("ext")[0]
-            )
-            if 7 <= digit_count <= 15:
-                return "phone"
+    cleaned_value = value.translate(_PHONE_STRIP)
+    if _PHONE_RE.match(cleaned_value):
+        # Validate digit count (7-15 typical for phone numbers, excluding extensions)
+        digit_count = sum(c.isdigit() for c in cleaned_value.split("x")[0].split("ext")[0])
+        if 7 <= digit_count <= 15:
+            return "phone"
 
     # Country code detection (2-letter ISO codes)
-    if re.match(r"^[A-Z]{2}$", value.upper()) and len(value) == 2:
-        country_upper = value.upper()
-        if country_upper in COUNTRY_CODE_MAP.values() or any(
-            country_upper in v for v in COUNTRY_CODE_MAP.values()
-        ):
-            return "country_code"
-
-    # Country name detection
-    country_upper = value.upper()
-    if country_upper in COUNTRY_CODE_MAP or any(
-        country_upper in k.upper() for k in COUNTRY_CODE_MAP
+    if (
+        len(value) == 2
+        and _COUNTRY_CODE_RE.match(value_upper)
+        and value_upper in _COUNTRY_CODE_INDEX
     ):
+        return "country_code"
+
+    if value_upper in _COUNTRY_NAME_INDEX:
         return "country_name"
 
-    # Postal/ZIP code detection (international support)
-    postal_patterns = [
-        r"^\d{5}(?:-\d{4})?$",  # US ZIP: 12345 or 12345-6789
-        r"^[A-Z]\d[A-Z]\s?\d[A-Z]\d$",  # Canada: A1A 1A1 or A1A1A1
-        r"^[A-Z]{1,2}\d{1,2}[A-Z]?\s?\d[A-Z]{2}$",  # UK: SW1A 1AA, EC1A 1BB
-        r"^\d{5}$",  # Germany, France, Spain: 12345
-        r"^\d{4}$",  # Australia, Belgium: 1234
-        r"^\d{3}-\d{4}$",  # Japan: 123-4567
-        r"^\d{6}$",  # India, Singapore: 123456
-    ]
-    value_normalized = value.upper().strip()
-    for pattern in postal_patterns:
-        if re.match(pattern, value_normalized):
-            return "postal_code"
-
-    # State code detection (US states)
-    us_states = [
-        "AL",
-        "AK",
-        "AZ",
-        "AR",
-        "CA",
-        "CO",
-        "CT",
-        "DE",
-        "FL",
-        "GA",
-        "HI",
-        "ID",
-        "IL",
-        "IN",
-        "IA",
-        "KS",
-        "KY",
-        "LA",
-        "ME",
-        "MD",
-        "MA",
-        "MI",
-        "MN",
-        "MS",
-        "MO",
-        "MT",
-        "NE",
-        "NV",
-        "NH",
-        "NJ",
-        "NM",
-        "NY",
-        "NC",
-        "ND",
-        "OH",
-        "OK",
-        "OR",
-        "PA",
-        "RI",
-        "SC",
-        "SD",
-        "TN",
-        "TX",
-        "UT",
-        "VT",
-        "VA",
-        "WA",
-        "WV",
-        "WI",
-        "WY",
-    ]
-    if value.upper() in us_states:
+    if _POSTAL_CODE_RE.match(value_upper):
+        return "postal_code"
+
+    if value_upper in US_STATE_CODES:
         return "state_code"
 
-    # Weight detection (contains weight keywords or patterns)
-    weight_keywords = [
-        "lb",
-        "lbs",
-        "oz",
-        "ounce",
-        "pound",
-        "kg",
-        "kilogram",
-        "g",
-        "gram",
-    ]
-    if any(keyword in value_lower for keyword in weight_keywords):
+    if _WEIGHT_KEYWORDS_RE.search(value_lower):
         return "weight"
-    # Numeric weight pattern (decimal number that could be weight)
-    if re.match(r"^[\d.]+$", value) and "." in value:
+    if "." in value and _NUMERIC_RE.match(value):
         try:
-            num = float(value)
-            if 0.1 <= num <= 200:  # Reasonable weight range
+            if 0.1 <= float(value) <= 200:  # Reasonable weight range
                 return "weight"
         except ValueError:
             pass
 
     # Dimensions detection (contains x or dimension keywords)
-    has_dimension_keywords = (
-        "x" in value_lower
-        or "×" in value
-        or any(keyword in value_lower for keyword in ["inch", "in", "cm", "dimension"])
-    )
-    if has_dimension_keywords and re.search(r"[\d.]+[\sx×]+[\d.]+[\sx×]+[\d.]+", value):
+    if (
+        "×" in value or _DIMENSION_KEYWORDS_RE.search(value_lower)
+    ) and _DIMENSIONS_RE.search(value):
         return "dimensions"
 
-    # Street address detection (check before name to avoid false positives)
-    street_keywords = [
-        "street",
-        "st",
-        "avenue",
-        "ave",
-        "road",
-        "rd",
-        "boulevard",
-        "blvd",
-        "drive",
-        "dr",
-        "lane",
-        "ln",
-        "court",
-        "ct",
-        "circle",
-        "cir",
-        "way",
-        "plaza",
-        "pkwy",
-    ]
-
-    # PO Box detection (must check before name detection)
-    if re.match(r"^p\.?o\.?\s*box\s+\d+", value_lower) or re.match(
-        r"^box\s+\d+", value_lower
+    # PO Box and military (APO, FPO, DPO) addresses, checked before name detection
+    if (
+        _PO_BOX_RE.match(value_lower)
+        or _BOX_RE.match(value_lower)
+        or _MILITARY_RE.match(value_lower)
     ):
         return "street"
 
-    # Military address detection (APO, FPO, DPO) - must check before name detection
-    if re.match(r"^(apo|fpo|dpo)\s+[a-z]{2}\s+\d{5}", value_lower):
+    # Standard street address (checked before name to avoid false positives)
+    if _STREET_KEYWORDS_RE.search(value_lower):
         return "street"
 
-    # Standard street address
-    if any(keyword in value_lower for keyword in street_keywords):
+    # Also detect addresses with numbers (e.g., "123 Main St", "720 East St Suite 2")
+    if _LEADING_NUMBER_RE.match(value):
         return "street"
 
-    # Get words for subsequent checks
     words = value.split()
 
-    # Also detect addresses with numbers (e.g., "123 Main St", "720 East St Suite 2")
-    if re.match(r"^\d+", value) and len(words) >= 1:
-        return "street"
-
-    # Name detection (contains common name patterns)
-    # Multiple words, capitalized, not all caps (unless short)
-    # Check AFTER street detection to avoid false positives
-    has_capitalized_words = len(words) >= 2 and any(
-        word[0].isupper() if word else False for word in words
-    )
-    is_not_address = not any(
-        keyword in value_lower
-        for keyword in [
-            "street",
-            "st",
-            "avenue",
-            "ave",
-            "road",
-            "rd",
-            "suite",
-            "apt",
-            "box",
-            "apo",
-            "fpo",
-            "dpo",
-        ]
-    )
-    if has_capitalized_words and is_not_address:
+    # Name detection: multiple words, at least one capitalized, no address keywords
+    if (
+        len(words) >= 2
+        and any(word[0].isupper() for word in words)
+        and not _ADDRESS_KEYWORDS_RE.search(value_lower)
+    ):
         return "name"
 
     # City detection (single word, capitalized, not a state code)
-    if len(words) == 1 and value[0].isupper() and value.upper() not in us_states:
+    if len(words) == 1 and value[0].isupper() and value_upper not in US_STATE_CODES:
         return "city"
 
     return None
@@ -884,14 +831,13 @@ def map_fields_by_detection(parts: list[str]) -> dict[str, Any]:
 
     # First pass: detect field types
     for idx, part in enumerate(parts):
-        if not part or not part.strip():
+        part = part.strip() if part else ""
+        if not part:
             continue
 
-        field_type = detect_field_type(part.strip())
+        field_type = detect_field_type(part)
         if field_type:
-            if field_type not in field_map:
-                field_map[field_type] = []
-            field_map[field_type].append((idx, part.strip()))
+            field_map.setdefault(field_type, []).append((idx, part))
 
     # Map detected fields to standard field names
     result: dict[str, Any] = {
@@ -1032,12 +978,10 @@ def parse_spreadsheet_line(line: str) -> dict[str, Any]:
     # Auto-detect column offset (skip leading reference/ID columns)
     # Strategy: Find the carrier column, which should be at position 1 in standard format
     offset = 0
-    carrier_names = ["USPS", "FEDEX", "UPS", "DHL", "ASENDIA"]
 
-    # Look for carrier name in first 5 columns
+    # Look for carrier name (USPS, FedEx, UPS, DHL, Asendia) in first 5 columns
     for i in range(min(5, len(parts))):
-        part_upper = parts[i].upper()
-        if any(carrier in part_upper for carrier in carrier_names):
+        if _CARRIER_NAMES_RE.search(parts[i].upper()):
             # Carrier found at position i, so origin_state is at i-1
             # Standard format: origin_state (0) | carrier (1) | recipient_name (2)...
             # If carrier at position 3, offset is 2 (skip columns 0, 1)
@@ -1123,13 +1067,11 @@ def parse_spreadsheet_line(line: str) -> dict[str, Any]:
     # Find contents field if not detected
     if not detected.get("contents"):
         # Look for contents keywords or use last unclassified text field
-        contents_keywords = ["description", "item", "product", "contents", "goods"]
         for part in parts:
             if not part:
                 continue
-            part_lower = part.lower()
             # Check if column header or value contains contents keywords
-            if any(keyword in part_lower for keyword in contents_keywords):
+            if _CONTENTS_KEYWORDS_RE.search(part.lower()):
                 detected["contents"] = part
                 break
 
@@ -1876,6 +1818,203 @@ def _generate_rate_table(shipments: list[dict]) -> str:
     return "\n".join(lines)
 
 
+def _prepare_rate_line(idx: int, line: str) -> dict[str, Any]:
+    """
+    Parse one spreadsheet line into rate-request inputs (CPU only, no I/O).
+
+    Raises on malformed input so the line is reported as failed before any
+    API work is scheduled for it. The returned `timer` has the parse,
+    category and warehouse stages; `_fetch_line_rates` adds the rest.
+    """
+    timer = StageTimer()
+    with timer.stage("parse"):
+        data = parse_spreadsheet_line(line)
+        length, width, height = parse_dimensions(data["dimensions"])
+        weight_oz = parse_weight(data["weight"])
+
+        to_address = {
+            "name": f"{data['recipient_name']} {data['recipient_last_name']}",
+            "street1": data["street1"],
+            "street2": data["street2"],
+            "city": data["city"],
+            "state": data["state"],
+            "zip": data["zip"],
+            "country": normalize_country_code(data["country"]),
+            "phone": data["recipient_phone"],
+            "email": data["recipient_email"],
+        }
+
+    # Detect product category from contents (always needed for reporting)
+    with timer.stage("category"):
+        category = detect_product_category(data["contents"])
+
+    # PRIORITY 1: Use custom sender address if provided (columns 16-24)
+    # PRIORITY 2: Auto-select warehouse by product category + origin state
+    with timer.stage("warehouse"):
+        if "sender_address" in data and data["sender_address"].get("name"):
+            from_address = data["sender_address"]
+            warehouse_key = f"{from_address.get('name', 'Custom Sender')}"
+        else:
+            from_address = get_warehouse_address(data["origin_state"], category)
+            warehouse_key = (
+                f"{from_address.get('company') or from_address.get('name', 'Unknown')}"
+            )
+
+    is_international = to_address["country"] != from_address.get("country", "US")
+    customs_signer = None
+    incoterm = None
+    if is_international:
+        # Get actual person's name for customs signing
+        customs_signer = get_customs_signer(from_address)
+        # DDP for FedEx, DDU for others by default
+        preferred_carrier = data.get("carrier_preference", "").upper()
+        incoterm = "DDP" if "FEDEX" in preferred_carrier else "DDU"
+
+    return {
+        "shipment_number": idx + 1,
+        "data": data,
+        "category": category,
+        "from_address": from_address,
+        "warehouse_key": warehouse_key,
+        "to_address": to_address,
+        "parcel": {"length": length, "width": width, "height": height, "weight": weight_oz},
+        "is_international": is_international,
+        "customs_signer": customs_signer,
+        "incoterm": incoterm,
+        "timer": timer,
+    }
+
+
+async def _fetch_line_rates(
+    service: EasyPostService, prepared: dict[str, Any], bypass_cache: bool = False
+) -> dict[str, Any]:
+    """Fetch customs (international only) and rates for a prepared line."""
+    timer: StageTimer = prepared["timer"]
+    customs_info = None
+    if prepared["is_international"]:
+        from src.services.smart_customs import get_or_create_customs
+
+        build_customs = partial(
+            get_or_create_customs,
+            prepared["data"]["contents"],
+            prepared["parcel"]["weight"],
+            service.client,
+            None,  # Auto-detect value from description
+            prepared["customs_signer"],
+            prepared["incoterm"],
+            inline=service.inline_customs,
+        )
+        with timer.stage("customs"):
+            if service.inline_customs:
+                customs_info = build_customs()
+            else:
+                loop = asyncio.get_running_loop()
+                customs_info = await loop.run_in_executor(None, build_customs)
+
+    # Get rates with timeout (customs included for international)
+    with timer.stage("rates"):
+        rates_result = await asyncio.wait_for(
+            service.get_rates(
+                prepared["to_address"],
+                prepared["from_address"],
+                prepared["parcel"],
+                customs_info=customs_info,
+                bypass_cache=bypass_cache,
+            ),
+            timeout=STANDARD_TIMEOUT,
+        )
+
+    return _rate_line_result(prepared, customs_info, rates_result)
+
+
+def _customs_items_summary(customs_info: Any) -> list[dict[str, Any]]:
+    """Flatten customs items (inline payload dicts or SDK objects) for detailed_data."""
+    if isinstance(customs_info, dict):
+        items = customs_info.get("customs_items", [])
+    else:
+        items = getattr(customs_info, "customs_items", [])
+
+    summary = []
+    for item in items:
+        field = item.get if isinstance(item, dict) else partial(getattr, item)
+        summary.append(
+            {
+                "description": field("description", ""),
+                "quantity": field("quantity", 1),
+                "value": field("value", 0),
+                "weight": field("weight", 0),
+                "hs_tariff_number": field("hs_tariff_number", ""),
+                "origin_country": field("origin_country", "US"),
+            }
+        )
+    return summary
+
+
+def _rate_line_result(
+    prepared: dict[str, Any], customs_info: Any, rates_result: dict[str, Any]
+) -> dict[str, Any]:
+    """Shape one line's rates response into the get_shipment_rates result row."""
+    data = prepared["data"]
+    from_address = prepared["from_address"]
+    to_address = prepared["to_address"]
+    parcel = prepared["parcel"]
+    length, width, height = parcel["length"], parcel["width"], parcel["height"]
+    weight_oz = parcel["weight"]
+    is_international = prepared["is_international"]
+
+    return {
+        "shipment_number": prepared["shipment_number"],
+        "recipient": to_address["name"],
+        "destination": f"{data['city']}, {data['state']}, {data['country']}",
+        "weight_oz": round(weight_oz, 2),
+        "dimensions": f"{length} x {width} x {height} in",
+        "contents": data["contents"][:100],
+        "category": prepared["category"],
+        "from_warehouse": from_address.get("company", from_address.get("name", "Unknown")),
+        "from_city": from_address.get("city", "Unknown"),
+        "rates": rates_result.get("data", []) if rates_result.get("status") == "success" else [],
+        "error": rates_result.get("message") if rates_result.get("status") == "error" else None,
+        # COMPLETE STRUCTURED DATA
+        "detailed_data": {
+            "sender": {
+                "name": from_address.get("name", ""),
+                "company": from_address.get("company", ""),
+                "street1": from_address.get("street1", ""),
+                "street2": from_address.get("street2", ""),
+                "city": from_address.get("city", ""),
+                "state": from_address.get("state", ""),
+                "zip": from_address.get("zip", ""),
+                "country": from_address.get("country", ""),
+                "phone": from_address.get("phone", ""),
+                "email": from_address.get("email", ""),
+            },
+            "recipient": to_address,
+            "parcel": {
+                "length": round(length, 2),
+                "width": round(width, 2),
+                "height": round(height, 2),
+                "weight_oz": round(weight_oz, 2),
+                "weight_lbs": round(weight_oz / 16, 2),
+            },
+            "product": {
+                "description": data["contents"],
+                "category": prepared["category"],
+                "is_international": is_international,
+            },
+            "carrier_preference": data.get("carrier_preference", ""),
+            "customs": (
+                {
+                    "required": True,
+                    "auto_generated": bool(customs_info),
+                    "items": _customs_items_summary(customs_info) if customs_info else [],
+                }
+                if is_international
+                else None
+            ),
+        },
+    }
+
+
 def register_shipment_tools(
     mcp: FastMCP, easypost_service: EasyPostService | None = None
 ) -> None:
@@ -1890,6 +2029,8 @@ def register_shipment_tools(
     )
     async def get_shipment_rates(
         spreadsheet_data: str,
+        max_concurrency: int | None = None,
+        bypass_cache: bool = False,
         ctx: Context | None = None,
     ) -> dict:
         """
@@ -1898,10 +2039,12 @@ async def get_shipment_rates(
         Handles both single shipments (1 line) and bulk operations (multiple lines).
         Uses spreadsheet format: tab-separated columns (paste from spreadsheet).
 
-        PERSONAL USE CONFIGURATION:
-        - Sequential rate calculations: 1 concurrent API call
-        - Performance: Optimized for reliability over speed
-        - Rate limit compliance: Production API safe
+        PIPELINE:
+        - All lines are parsed and validated up front (bad lines fail fast)
+        - Customs + rate calls fan out with bounded parallelism (max_concurrency)
+        - Progress is reported as each line completes
+        - Rate limit compliance: shared token bucket paces the actual API calls
+        - Repeated origin/destination ZIP/parcel lines reuse cached rate quotes
 
         SENDER ADDRESS PRIORITY:
         1. Custom sender (columns 16-24): If provided, ALWAYS used (ignores warehouse)
@@ -1925,6 +2068,8 @@ async def get_shipment_rates(
 
         Args:
             spreadsheet_data: Tab-separated shipment data (1+ lines, paste from spreadsheet)
+            max_concurrency: Lines in flight at once (default: MAX_BULK_CONCURRENCY)
+            bypass_cache: Fetch fresh quotes instead of recently cached ones
             ctx: MCP context for progress reporting
 
         Returns:
@@ -1955,7 +2100,7 @@ async def get_shipment_rates(
 
             if ctx:
                 await ctx.info(
-                    "🚀 Starting rate calculation (sequential, production-safe)..."
+                    "🚀 Starting rate calculation (rate-limited, production-safe)..."
                 )
 
             # Auto-detect format: tab-separated spreadsheet or natural text
@@ -2004,290 +2149,76 @@ async def get_shipment_rates(
                 }
 
             total_lines = len(lines)
-            used_warehouses = set()  # Track which warehouses are used
+            from src.utils.config import settings
 
-            # Semaphore for rate limiting (reduced to avoid EasyPost rate limits)
-            semaphore = asyncio.Semaphore(MAX_CONCURRENT)
+            concurrency = max(1, max_concurrency or settings.MAX_BULK_CONCURRENCY)
+            results: list[dict[str, Any] | None] = [None] * total_lines
 
-            async def process_one_line(idx: int, line: str) -> dict:
-                """Process single shipment line with rate limiting."""
-                async with semaphore:
-                    # Add delay to prevent EasyPost rate limiting (production API: 1 request/second)
-                    await asyncio.sleep(1.0)
+            # Stage 1: parse and validate every line up front (CPU only, no I/O)
+            prepared_lines = []
+            for idx, line in enumerate(lines):
+                try:
+                    prepared_lines.append(_prepare_rate_line(idx, line))
+                except Exception as e:
+                    logger.error(f"Error processing line {idx + 1}: {str(e)}")
+                    results[idx] = {
+                        "shipment_number": idx + 1,
+                        "error": f"Failed to process: {str(e)}",
+                    }
 
-                    try:
-                        if ctx and idx % max(1, total_lines // 10) == 0:
-                            await ctx.info(
-                                f"Processing shipment {idx + 1}/{total_lines}..."
-                            )
+            used_warehouses = {prepared["warehouse_key"] for prepared in prepared_lines}
 
-                        # Parse line
-                        data = parse_spreadsheet_line(line)
+            if ctx:
+                await ctx.info(
+                    f"📊 Parsed {len(prepared_lines)}/{total_lines} shipments, "
+                    f"fetching rates ({concurrency} concurrent)..."
+                )
 
-                        # Detect product category from contents (always needed for reporting)
-                        category = detect_product_category(data["contents"])
+            # Stage 2: customs + rates fan-out (API pacing by the shared rate limiter)
+            semaphore = asyncio.Semaphore(concurrency)
 
-                        # PRIORITY 1: Use custom sender address if provided (columns 16-24)
-                        # PRIORITY 2: Auto-select warehouse by product category + origin state
-                        if "sender_address" in data and data["sender_address"].get(
-                            "name"
-                        ):
-                            # Custom sender address provided - USE IT (ignores warehouse lookup)
-                            from_address = data["sender_address"]
-                            warehouse_key = (
-                                f"{from_address.get('name', 'Custom Sender')}"
-                            )
-                            if ctx:
-                                await ctx.info(
-                                    f"📍 Using custom sender: {warehouse_key} "
-                                    f"({from_address.get('city')}, {from_address.get('country')})"
-                                )
-                        else:
-                            # No custom sender - select warehouse by category + state
-                            from_address = get_warehouse_address(
-                                data["origin_state"], category
-                            )
-                            company_or_name = from_address.get(
-                                "company"
-                            ) or from_address.get("name", "Unknown")
-                            warehouse_key = f"{company_or_name}"
-                            if ctx:
-                                await ctx.info(
-                                    f"🏭 Auto-selected warehouse: {warehouse_key} "
-                                    f"(category: {category}, state: {data['origin_state']})"
-                                )
-
-                        used_warehouses.add(warehouse_key)
-
-                        # Parse dimensions and weight
-                        length, width, height = parse_dimensions(data["dimensions"])
-                        weight_oz = parse_weight(data["weight"])
-
-                        # Build to_address with normalized country code
-                        to_address = {
-                            "name": f"{data['recipient_name']} {data['recipient_last_name']}",
-                            "street1": data["street1"],
-                            "street2": data["street2"],
-                            "city": data["city"],
-                            "state": data["state"],
-                            "zip": data["zip"],
-                            "country": normalize_country_code(data["country"]),
-                            "phone": data["recipient_phone"],
-                            "email": data["recipient_email"],
-                        }
-
-                        # Build parcel
-                        parcel = {
-                            "length": length,
-                            "width": width,
-                            "height": height,
-                            "weight": weight_oz,
-                        }
-
-                        # Check if international and auto-generate customs if needed
-                        is_international = to_address["country"] != from_address.get(
-                            "country", "US"
-                        )
-                        customs_info = None
-
-                        if is_international:
-                            # Auto-generate customs info for international shipments
-                            from src.services.smart_customs import get_or_create_customs
-
-                            loop = asyncio.get_running_loop()
-
-                            # Get actual person's name for customs signing
-                            customs_signer = get_customs_signer(from_address)
-
-                            # DDP for FedEx, DDU for others by default
-                            preferred_carrier = data.get(
-                                "carrier_preference", ""
-                            ).upper()
-                            incoterm = "DDP" if "FEDEX" in preferred_carrier else "DDU"
-
-                            customs_info = await loop.run_in_executor(
-                                None,
-                                get_or_create_customs,
-                                data["contents"],
-                                weight_oz,
-                                service.client,
-                                None,  # Auto-detect value from description
-                                customs_signer,
-                                incoterm,
-                            )
-
-                        if ctx and customs_info:
-                            country = to_address["country"]
-                            await ctx.info(
-                                f"✅ Auto-generated customs ({incoterm}) "
-                                f"for international shipment ({country})"
-                            )
-
-                        # Get rates with timeout (customs included for international)
-                        rates_result = await asyncio.wait_for(
-                            service.get_rates(
-                                to_address,
-                                from_address,
-                                parcel,
-                                customs_info=customs_info,
-                            ),
-                            timeout=STANDARD_TIMEOUT,
-                        )
-
-                        return {
-                            "shipment_number": idx + 1,
-                            "recipient": to_address["name"],
-                            "destination": f"{data['city']}, {data['state']}, {data['country']}",
-                            "weight_oz": round(weight_oz, 2),
-                            "dimensions": f"{length} x {width} x {height} in",
-                            "contents": data["contents"][:100],
-                            "category": category,
-                            "from_warehouse": (
-                                from_address.get(
-                                    "company", from_address.get("name", "Unknown")
-                                )
-                            ),
-                            "from_city": from_address.get("city", "Unknown"),
-                            "rates": (
-                                rates_result.get("data", [])
-                                if rates_result.get("status") == "success"
-                                else []
-                            ),
-                            "error": (
-                                rates_result.get("message")
-                                if rates_result.get("status") == "error"
-                                else None
-                            ),
-                            # COMPLETE STRUCTURED DATA
-                            "detailed_data": {
-                                "sender": {
-                                    "name": from_address.get("name", ""),
-                                    "company": from_address.get("company", ""),
-                                    "street1": from_address.get("street1", ""),
-                                    "street2": from_address.get("street2", ""),
-                                    "city": from_address.get("city", ""),
-                                    "state": from_address.get("state", ""),
-                                    "zip": from_address.get("zip", ""),
-                                    "country": from_address.get("country", ""),
-                                    "phone": from_address.get("phone", ""),
-                                    "email": from_address.get("email", ""),
-                                },
-                                "recipient": to_address,
-                                "parcel": {
-                                    "length": round(length, 2),
-                                    "width": round(width, 2),
-                                    "height": round(height, 2),
-                                    "weight_oz": round(weight_oz, 2),
-                                    "weight_lbs": round(weight_oz / 16, 2),
-                                },
-                                "product": {
-                                    "description": data["contents"],
-                                    "category": category,
-                                    "is_international": is_international,
-                                },
-                                "carrier_preference": data.get(
-                                    "carrier_preference", ""
-                                ),
-                                "customs": (
-                                    {
-                                        "required": is_international,
-                                        "auto_generated": (
-                                            bool(customs_info)
-                                            if is_international
-                                            else False
-                                        ),
-                                        "items": (
-                                            [
-                                                {
-                                                    "description": (
-                                                        item.description
-                                                        if hasattr(item, "description")
-                                                        else ""
-                                                    ),
-                                                    "quantity": (
-                                                        item.quantity
-                                                        if hasattr(item, "quantity")
-                                                        else 1
-                                                    ),
-                                                    "value": (
-                                                        item.value
-                                                        if hasattr(item, "value")
-                                                        else 0
-                                                    ),
-                                                    "weight": (
-                                                        item.weight
-                                                        if hasattr(item, "weight")
-                                                        else 0
-                                                    ),
-                                                    "hs_tariff_number": (
-                                                        item.hs_tariff_number
-                                                        if hasattr(
-                                                            item, "hs_tariff_number"
-                                                        )
-                                                        else ""
-                                                    ),
-                                                    "origin_country": (
-                                                        item.origin_country
-                                                        if hasattr(
-                                                            item, "origin_country"
-                                                        )
-                                                        else "US"
-                                                    ),
-                                                }
-                                                for item in (
-                                                    customs_info.customs_items
-                                                    if hasattr(
-                                                        customs_info, "customs_items"
-                                                    )
-                                                    else []
-                                                )
-                                            ]
-                                            if customs_info
-                                            else []
-                                        ),
-                                    }
-                                    if is_international
-                                    else None
-                                ),
-                            },
-                        }
-
-                    except Exception as e:
-                        logger.error(f"Error processing line {idx + 1}: {str(e)}")
-                        return {
-                            "shipment_number": idx + 1,
-                            "error": f"Failed to process: {str(e)}",
-                        }
-
-            # Process all shipments sequentially (production API safe)
-            if ctx:
-                await ctx.info(f"📊 Processing {total_lines} shipments...")
-
-            tasks = [process_one_line(idx, line) for idx, line in enumerate(lines)]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Convert exceptions to error results
-            processed_results: list[dict[str, Any]] = []
-            for idx, result in enumerate(results):
-                if isinstance(result, Exception):
-                    logger.error(f"Task {idx + 1} raised exception: {result}")
-                    processed_results.append(
-                        {
-                            "shipment_number": idx + 1,
-                            "error": f"Exception: {str(result)}",
-                        }
+            async def rate_one_line(prepared: dict[str, Any]) -> dict[str, Any]:
+                timer: StageTimer = prepared["timer"]
+                with timer.stage("queue_wait"):
+                    await semaphore.acquire()
+                try:
+                    result = await _fetch_line_rates(service, prepared, bypass_cache)
+                except Exception as e:
+                    logger.error(
+                        f"Error processing line {prepared['shipment_number']}: {str(e)}"
                     )
-                elif isinstance(result, dict):
-                    # Type cast: result is dict after isinstance check
-                    dict_result: dict[str, Any] = result
-                    processed_results.append(dict_result)
+                    result = {
+                        "shipment_number": prepared["shipment_number"],
+                        "error": f"Failed to process: {str(e)}",
+                    }
+                finally:
+                    semaphore.release()
+                result["timings"] = timer.as_dict()
+                return result
+
+            # Stream progress as lines finish; parse failures already count as done
+            completed = total_lines - len(prepared_lines)
+            if ctx and completed:
+                await ctx.report_progress(completed, total_lines)
+            with trace_api_calls(settings.BULK_API_TRACE) as api_trace:
+                # Tasks, not bare coroutines: as_completed would start those in set order
+                pending = [
+                    asyncio.create_task(rate_one_line(prepared)) for prepared in prepared_lines
+                ]
+                for next_result in asyncio.as_completed(pending):
+                    result = await next_result
+                    results[result["shipment_number"] - 1] = result
+                    completed += 1
+                    if ctx:
+                        await ctx.report_progress(completed, total_lines)
+
+            processed_results: list[dict[str, Any]] = [r for r in results if r is not None]
 
             # Performance metrics
             duration = perf_counter() - start_time
             throughput = total_lines / duration if duration > 0 else 0
 
             if ctx:
-                await ctx.report_progress(total_lines, total_lines)
                 await ctx.info(
                     f"✅ Complete! Processed {len(used_warehouses)} warehouses"
                 )
@@ -2316,8 +2247,14 @@ async def process_one_line(idx: int, line: str) -> dict:
                     "performance": {
                         "duration_seconds": round(duration, 2),
                         "throughput": round(throughput, 2),
-                        "workers": 1,
-                        "mode": "sequential",
+                        "concurrency": concurrency,
+                        # Pre-pipeline keys, kept for existing callers
+                        "workers": concurrency,
+                        "mode": "rate_limited",
+                        "stages": summarize_stage_timings(
+                            r.get("timings") for r in processed_results
+                        ),
+                        **({"api_trace": api_trace.summary()} if api_trace else {}),
                     },
                     "formatted_table": formatted_table,
                 },
@@ -6,16 +6,15 @@
 
 import asyncio
 import logging
-import os
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
-import easypost
-import requests  # type: ignore[import-untyped]
+import httpx
 from fastmcp import Context, FastMCP
 
 from src.services.easypost_service import EasyPostService
+from src.services.error_utils import sanitize_error
 from src.utils.constants import BULK_OPERATION_TIMEOUT
 
 logger = logging.getLogger(__name__)
@@ -26,6 +25,9 @@
 )
 DOWNLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+ETAG_SUFFIX = ".etag"
+
 
 def detect_download_intent(request: str) -> dict[str, bool]:
     """
@@ -79,29 +81,159 @@ def detect_download_intent(request: str) -> dict[str, bool]:
     }
 
 
-def download_file(url: str, filepath: Path) -> bool:
+def _etag_path(filepath: Path) -> Path:
+    """Sidecar file holding the ETag of a completed download."""
+    return filepath.with_name(filepath.name + ETAG_SUFFIX)
+
+
+def _stored_etag(filepath: Path) -> str | None:
+    """ETag recorded for a completed download of `filepath`, if any (blocking)."""
+    etag_file = _etag_path(filepath)
+    if filepath.exists() and etag_file.exists():
+        return etag_file.read_text().strip()
+    return None
+
+
+def _is_current(
+    filepath: Path, response: httpx.Response, stored_etag: str | None
+) -> bool:
+    """True if the file on disk already matches the stored ETag or size (blocking)."""
+    if not filepath.exists():
+        return False
+
+    etag = response.headers.get("etag")
+    if etag and stored_etag is not None:
+        return stored_etag == etag
+
+    length = response.headers.get("content-length")
+    return bool(length and length.isdigit() and int(length) == filepath.stat().st_size)
+
+
+def _open_part(part_path: Path) -> BinaryIO:
+    part_path.parent.mkdir(parents=True, exist_ok=True)
+    return part_path.open("wb")
+
+
+def _finish_download(part_path: Path, filepath: Path, etag: str | None) -> None:
+    """Move the completed `.part` file into place and record its ETag (blocking)."""
+    part_path.replace(filepath)
+    etag_file = _etag_path(filepath)
+    if etag:
+        etag_file.write_text(etag)
+    else:
+        etag_file.unlink(missing_ok=True)
+
+
+def create_download_client(max_connections: int) -> httpx.AsyncClient:
+    """Pooled HTTP client shared by every download in one tool call."""
+    return httpx.AsyncClient(
+        timeout=BULK_OPERATION_TIMEOUT,
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        ),
+    )
+
+
+async def download_file(
+    client: httpx.AsyncClient, url: str, filepath: Path
+) -> str | None:
     """
-    Download a file from URL to local path.
+    Stream a file from URL to local path.
+
+    The body is written in chunks to a `.part` file and renamed into place,
+    so an interrupted download never leaves a truncated file behind. Files
+    already on disk with a matching ETag (sent as If-None-Match) or size are
+    not downloaded again.
 
     Args:
+        client: Pooled async HTTP client
         url: URL to download from
         filepath: Local path to save file
 
     Returns:
-        True if successful, False otherwise
+        "downloaded", "skipped" if the file was already current, or None on failure
     """
-    try:
-        response = requests.get(url, timeout=BULK_OPERATION_TIMEOUT)
-        response.raise_for_status()
+    # Disk work runs in a thread so large files never block the event loop
+    stored_etag = await asyncio.to_thread(_stored_etag, filepath)
+    headers = {"If-None-Match": stored_etag} if stored_etag else {}
 
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        filepath.write_bytes(response.content)
-
-        logger.info(f"Downloaded {filepath.name} ({len(response.content)} bytes)")
-        return True
+    part_path = filepath.with_name(filepath.name + ".part")
+    try:
+        async with client.stream("GET", url, headers=headers) as response:
+            if response.status_code == 304 or await asyncio.to_thread(
+                _is_current, filepath, response, stored_etag
+            ):
+                logger.info(f"Skipped {filepath.name} (already downloaded)")
+                return "skipped"
+            response.raise_for_status()
+
+            size = 0
+            f = await asyncio.to_thread(_open_part, part_path)
+            try:
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    await asyncio.to_thread(f.write, chunk)
+                    size += len(chunk)
+            finally:
+                await asyncio.to_thread(f.close)
+            await asyncio.to_thread(
+                _finish_download, part_path, filepath, response.headers.get("etag")
+            )
+
+        logger.info(f"Downloaded {filepath.name} ({size} bytes)")
+        return "downloaded"
     except Exception as e:
+        await asyncio.to_thread(part_path.unlink, missing_ok=True)
         logger.error(f"Failed to download {url}: {e}")
-        return False
+        return None
+
+
+def _download_jobs(
+    shipment: Any,
+    shipment_id: str,
+    forms: list[Any],
+    download_dir: Path,
+    wants_label: bool,
+    wants_customs: bool,
+    wants_invoice: bool,
+) -> list[dict[str, Any]]:
+    """Work out which documents to fetch for one shipment."""
+    tracking_code = getattr(shipment, "tracking_code", "") or ""
+    prefix = tracking_code or shipment_id
+    jobs: list[dict[str, Any]] = []
+
+    label_url = getattr(getattr(shipment, "postage_label", None), "label_url", None)
+    if wants_label and label_url:
+        jobs.append(
+            {
+                "kind": "label",
+                "url": label_url,
+                "path": download_dir / f"{prefix}_label.png",
+            }
+        )
+
+    if wants_customs or wants_invoice:
+        for form in forms:
+            form_type = getattr(form, "form_type", "unknown") or "unknown"
+            form_url = getattr(form, "form_url", None)
+            if not form_url:
+                continue
+
+            is_invoice = (
+                "invoice" in form_type.lower() or "commercial" in form_type.lower()
+            )
+            if (wants_customs and not is_invoice) or (wants_invoice and is_invoice):
+                jobs.append(
+                    {
+                        "kind": "invoice" if is_invoice else "customs",
+                        "form_type": form_type,
+                        "url": form_url,
+                        "path": download_dir / f"{prefix}_{form_type}.pdf",
+                    }
+                )
+
+    return jobs
 
 
 def register_download_tools(
@@ -119,6 +251,7 @@ async def download_shipment_documents(
         shipment_ids: list[str] | str,
         request: str = "both",
         download_path: str | None = None,
+        max_concurrency: int | None = None,
         ctx: Context | None = None,
     ) -> dict[str, Any]:
         """
@@ -138,6 +271,8 @@ async def download_shipment_documents(
                    Examples: "label", "customs", "invoice", "both", "all",
                             "label and customs"
             download_path: Optional custom download directory (default: data/shipping-labels/)
+            max_concurrency: Shipments/downloads in flight at once
+                (default: MAX_BULK_CONCURRENCY setting)
             ctx: MCP context for progress reporting
 
         Returns:
@@ -162,9 +297,10 @@ async def download_shipment_documents(
                 },
                 "summary": {
                     "total": int,
-                    "labels_downloaded": int,
+                    "labels_downloaded": int,  # newly downloaded only
                     "customs_downloaded": int,
-                    "invoices_downloaded": int
+                    "invoices_downloaded": int,
+                    "skipped": int  # already current on disk, not re-downloaded
                 }
             }
         """
@@ -226,103 +362,70 @@ async def download_shipment_documents(
             # Ensure directory exists
             download_dir.mkdir(parents=True, exist_ok=True)
 
-            # Process each shipment
-            results: dict[str, Any] = {}
-            summary = {
-                "total": len(shipment_ids),
-                "labels_downloaded": 0,
-                "customs_downloaded": 0,
-                "invoices_downloaded": 0,
-            }
-
-            for shipment_id in shipment_ids:
-                shipment_id = shipment_id.strip()
-                if not shipment_id:
-                    continue
-
-                if ctx:
-                    await ctx.info(f"📦 Processing shipment: {shipment_id}")
-
-                # Retrieve shipment
-                shipment_result = await service.retrieve_shipment(shipment_id)
-                if shipment_result.get("status") != "success":
-                    results[shipment_id] = {
-                        "error": shipment_result.get(
-                            "message", "Failed to retrieve shipment"
-                        ),
-                    }
-                    continue
-
-                shipment_data = shipment_result.get("data", {})
-                tracking_code = shipment_data.get("tracking_number", "")
-                label_url = shipment_data.get("label_url")
-
-                # Get actual shipment object to access forms
-                # Use thread pool executor to avoid blocking event loop
-                loop = asyncio.get_running_loop()
-                easypost_api_key = os.environ.get("EASYPOST_API_KEY")
-
-                if not easypost_api_key:
-                    results[shipment_id] = {
-                        "error": "EASYPOST_API_KEY not found in environment",
-                    }
-                    continue
-
-                # Type assertion: we've checked it's not None above
-                assert easypost_api_key is not None
-                api_key_str: str = easypost_api_key
-
-                # Capture API key in closure with default parameter
-                def retrieve_shipment_sync(
-                    shipment_id: str, api_key: str = api_key_str
-                ) -> Any:
-                    """Synchronous shipment retrieval."""
-                    easypost.api_key = api_key  # type: ignore[attr-defined]
-                    client = easypost.EasyPostClient(api_key=api_key)
-                    return client.shipment.retrieve(shipment_id)
-
-                try:
-                    shipment = await loop.run_in_executor(
-                        None, retrieve_shipment_sync, shipment_id
+            from src.utils.config import settings
+
+            concurrency = max(1, max_concurrency or settings.MAX_BULK_CONCURRENCY)
+            api_semaphore = asyncio.Semaphore(concurrency)
+            download_semaphore = asyncio.Semaphore(concurrency)
+
+            async def fetch(
+                client: httpx.AsyncClient, job: dict[str, Any]
+            ) -> dict[str, Any]:
+                async with download_semaphore:
+                    outcome = await download_file(client, job["url"], job["path"])
+                entry: dict[str, Any] = {}
+                if "form_type" in job:
+                    entry["form_type"] = job["form_type"]
+                if outcome is None:
+                    entry.update(
+                        {"downloaded": False, "url": job["url"], "error": "Download failed"}
                     )
-                except Exception as e:
-                    results[shipment_id] = {
-                        "error": f"Failed to retrieve shipment object: {str(e)}",
-                    }
-                    continue
-
-                shipment_result_data: dict[str, Any] = {
-                    "label": None,
-                    "customs": [],
-                    "invoice": None,
-                }
-
-                # Download label if requested
-                if wants_label and label_url:
-                    filename = f"{tracking_code or shipment_id}_label.png"
-                    filepath = download_dir / filename
-
-                    if download_file(label_url, filepath):
-                        shipment_result_data["label"] = {
+                else:
+                    entry.update(
+                        {
                             "downloaded": True,
-                            "path": str(filepath),
-                            "url": label_url,
-                        }
-                        summary["labels_downloaded"] += 1
-                    else:
-                        shipment_result_data["label"] = {
-                            "downloaded": False,
-                            "url": label_url,
-                            "error": "Download failed",
+                            "path": str(job["path"]),
+                            "url": job["url"],
+                            "skipped": outcome == "skipped",
                         }
+                    )
+                return entry
+
+            async def process_shipment(
+                client: httpx.AsyncClient, shipment_id: str
+            ) -> tuple[str, dict[str, Any], list[tuple[dict[str, Any], dict[str, Any]]]]:
+                # A failure is reported in that shipment's result instead of
+                # aborting the other shipments in the gather
+                try:
+                    return await fetch_shipment_documents(client, shipment_id)
+                except Exception as e:
+                    logger.error(
+                        f"Failed to process {shipment_id}: {sanitize_error(e)}"
+                    )
+                    return (
+                        shipment_id,
+                        {"error": f"Failed to process shipment: {sanitize_error(e)}"},
+                        [],
+                    )
 
-                # Download customs forms if requested
-                if wants_customs or wants_invoice:
-                    forms = getattr(shipment, "forms", []) or []
+            async def fetch_shipment_documents(
+                client: httpx.AsyncClient, shipment_id: str
+            ) -> tuple[str, dict[str, Any], list[tuple[dict[str, Any], dict[str, Any]]]]:
+                # One retrieve (and optional invoice generation) per shipment via the
+                # shared service client; API calls are bounded separately from downloads
+                async with api_semaphore:
+                    try:
+                        shipment = await service.get_shipment_object(shipment_id)
+                    except Exception as e:
+                        return (
+                            shipment_id,
+                            {"error": f"Failed to retrieve shipment: {sanitize_error(e)}"},
+                            [],
+                        )
 
-                    # Try to generate commercial invoice if not present
+                    forms = list(getattr(shipment, "forms", None) or [])
                     if wants_invoice and not any(
-                        getattr(f, "form_type", "").lower() == "commercial_invoice"
+                        (getattr(f, "form_type", "") or "").lower() == "commercial_invoice"
                         for f in forms
                     ):
                         try:
@@ -330,83 +433,71 @@ def retrieve_shipment_sync(
                                 await ctx.info(
                                     f"📄 Generating commercial invoice for {shipment_id}..."
                                 )
-
-                            # Capture API key in closure with default parameter
-                            def generate_form_sync(
-                                shipment_id: str,
-                                form_type: str,
-                                api_key: str = api_key_str,
-                            ) -> Any:
-                                """Synchronous form generation."""
-                                easypost.api_key = api_key  # type: ignore[attr-defined]
-                                client = easypost.EasyPostClient(api_key=api_key)
-                                return client.shipment.generate_form(
-                                    shipment_id, form_type=form_type
-                                )
-
-                            form = await loop.run_in_executor(
-                                None,
-                                generate_form_sync,
-                                shipment_id,
-                                "commercial_invoice",
+                            updated = await service.generate_shipment_form(
+                                shipment_id, "commercial_invoice"
                             )
-                            forms.append(form)
+                            forms = list(getattr(updated, "forms", None) or forms)
                         except Exception as e:
                             logger.warning(
-                                f"Failed to generate commercial invoice: {e}"
+                                f"Failed to generate commercial invoice: {sanitize_error(e)}"
                             )
 
-                    for form in forms:
-                        form_type = getattr(form, "form_type", "unknown")
-                        form_url = getattr(form, "form_url", None)
-
-                        if not form_url:
-                            continue
+                jobs = _download_jobs(
+                    shipment,
+                    shipment_id,
+                    forms,
+                    download_dir,
+                    wants_label,
+                    wants_customs,
+                    wants_invoice,
+                )
+                entries = await asyncio.gather(*(fetch(client, job) for job in jobs))
+                fetched = list(zip(jobs, entries, strict=True))
 
-                        # Determine if this is an invoice
-                        is_invoice = (
-                            "invoice" in form_type.lower()
-                            or "commercial" in form_type.lower()
-                        )
+                shipment_result_data: dict[str, Any] = {
+                    "label": None,
+                    "customs": [],
+                    "invoice": None,
+                }
+                for job, entry in fetched:
+                    if job["kind"] == "customs":
+                        shipment_result_data["customs"].append(entry)
+                    else:
+                        shipment_result_data[job["kind"]] = entry
+                return shipment_id, shipment_result_data, fetched
+
+            # Process shipments concurrently; duplicates and blanks are dropped
+            unique_ids = list(
+                dict.fromkeys(sid.strip() for sid in shipment_ids if sid.strip())
+            )
+            outcomes: dict[str, dict[str, Any]] = {}
+            summary = {
+                "total": len(shipment_ids),
+                "labels_downloaded": 0,
+                "customs_downloaded": 0,
+                "invoices_downloaded": 0,
+                "skipped": 0,
+            }
+            counters = {
+                "label": "labels_downloaded",
+                "customs": "customs_downloaded",
+                "invoice": "invoices_downloaded",
+            }
 
-                        # Download if it matches request
-                        if (wants_customs and not is_invoice) or (
-                            wants_invoice and is_invoice
-                        ):
-                            # Determine file extension
-                            ext = ".pdf" if "pdf" in form_url.lower() else ".pdf"
-                            filename = (
-                                f"{tracking_code or shipment_id}_{form_type}{ext}"
-                            )
-                            filepath = download_dir / filename
-
-                            if download_file(form_url, filepath):
-                                form_data = {
-                                    "form_type": form_type,
-                                    "downloaded": True,
-                                    "path": str(filepath),
-                                    "url": form_url,
-                                }
-
-                                if is_invoice:
-                                    shipment_result_data["invoice"] = form_data
-                                    summary["invoices_downloaded"] += 1
-                                else:
-                                    shipment_result_data["customs"].append(form_data)
-                                    summary["customs_downloaded"] += 1
-                            else:
-                                form_data = {
-                                    "form_type": form_type,
-                                    "downloaded": False,
-                                    "url": form_url,
-                                    "error": "Download failed",
-                                }
-                                if is_invoice:
-                                    shipment_result_data["invoice"] = form_data
-                                else:
-                                    shipment_result_data["customs"].append(form_data)
-
-                results[shipment_id] = shipment_result_data
+            async with create_download_client(concurrency) as client:
+                tasks = [process_shipment(client, sid) for sid in unique_ids]
+                for completed, next_done in enumerate(asyncio.as_completed(tasks), start=1):
+                    shipment_id, shipment_result_data, fetched = await next_done
+                    outcomes[shipment_id] = shipment_result_data
+                    for job, entry in fetched:
+                        if entry.get("skipped"):
+                            summary["skipped"] += 1
+                        elif entry["downloaded"]:
+                            summary[counters[job["kind"]]] += 1
+                    if ctx:
+                        await ctx.report_progress(completed, len(unique_ids))
+
+            results = {sid: outcomes[sid] for sid in unique_ids}
 
             duration = (datetime.now(UTC) - start_time).total_seconds()
 
@@ -415,6 +506,7 @@ def generate_form_sync(
                 "data": results,
                 "summary": summary,
                 "download_directory": str(download_dir),
+                "concurrency": concurrency,
                 "duration_seconds": duration,
                 "timestamp": datetime.now(UTC).isoformat(),
             }
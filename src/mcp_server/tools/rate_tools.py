@@ -28,7 +28,11 @@ def register_rate_tools(
         },
     )
     async def get_rates(
-        to_address: dict, from_address: dict, parcel: dict, ctx: Context | None = None
+        to_address: dict,
+        from_address: dict,
+        parcel: dict,
+        ctx: Context | None = None,
+        bypass_cache: bool = False,
     ) -> dict:
         """
         Get available shipping rates from multiple carriers.
@@ -37,6 +41,7 @@ async def get_rates(
             to_address: Destination address
             from_address: Origin address
             parcel: Package dimensions
+            bypass_cache: Fetch a fresh quote instead of a recently cached one
 
         Returns:
             Standardized response with available rates
@@ -59,6 +64,7 @@ async def get_rates(
                     to_addr.model_dump(),
                     from_addr.model_dump(),
                     parcel_obj.model_dump(),
+                    bypass_cache=bypass_cache,
                 ),
                 timeout=STANDARD_TIMEOUT,
             )
@@ -3,6 +3,7 @@
 import asyncio
 import logging
 from datetime import UTC, datetime
+from typing import Any
 
 from fastmcp import Context, FastMCP
 from fastmcp.exceptions import ToolError
@@ -76,3 +77,64 @@ async def get_tracking(tracking_number: str, ctx: Context | None = None) -> dict
                 "message": f"Failed to retrieve tracking information: {str(e)}",
                 "timestamp": datetime.now(UTC).isoformat(),
             }
+
+    @mcp.tool(
+        tags={"tracking", "shipping", "bulk"},
+        annotations={
+            "readOnlyHint": True,
+            "idempotentHint": True,
+        },
+    )
+    async def get_tracking_batch(
+        tracking_numbers: list[str] | str,
+        max_concurrency: int | None = None,
+        ctx: Context | None = None,
+    ) -> dict:
+        """
+        Get tracking status for many shipments in one call.
+
+        Duplicate numbers are looked up once; each result is reported through
+        progress as it arrives.
+
+        Args:
+            tracking_numbers: List of tracking numbers (or one comma/newline separated string)
+            max_concurrency: Lookups in flight at once (default: MAX_BULK_CONCURRENCY setting)
+
+        Returns:
+            Compact per-number status plus delivered / in transit / exception counts
+        """
+        try:
+            service = resolve_service(ctx, easypost_service)
+
+            if isinstance(tracking_numbers, str):
+                tracking_numbers = tracking_numbers.replace("\n", ",").split(",")
+
+            async def report(code: str, entry: dict[str, Any], done: int, total: int) -> None:
+                if ctx:
+                    await ctx.report_progress(
+                        done, total, f"{code}: {entry['status_detail'] or entry['group']}"
+                    )
+
+            from src.utils.config import settings
+
+            return await service.get_tracking_batch(
+                tracking_numbers,
+                max_concurrency=max_concurrency or settings.MAX_BULK_CONCURRENCY,
+                on_result=report,
+            )
+        except ToolError as e:
+            logger.error(f"Tool error: {str(e)}")
+            return {
+                "status": "error",
+                "data": None,
+                "message": str(e),
+                "timestamp": datetime.now(UTC).isoformat(),
+            }
+        except Exception as e:
+            logger.error(f"Tool error: {str(e)}", exc_info=True)
+            return {
+                "status": "error",
+                "data": None,
+                "message": f"Failed to retrieve tracking information: {str(e)}",
+                "timestamp": datetime.now(UTC).isoformat(),
+            }
@@ -2,7 +2,7 @@
 
 from typing import Any, Self
 
-from pydantic import BaseModel, model_validator
+from pydantic import BaseModel, Field, model_validator
 
 from src.services.easypost_service import AddressModel, ParcelModel
 
@@ -154,6 +154,7 @@ class RatesRequest(BaseModel):
     to_address: AddressModel
     from_address: AddressModel
     parcel: ParcelModel
+    bypass_cache: bool = False  # Force a fresh quote instead of a cached one
 
 
 class BuyShipmentRequest(BaseModel):
@@ -162,7 +163,21 @@ class BuyShipmentRequest(BaseModel):
     from_address: AddressModel
     to_address: AddressModel
     parcel: ParcelModel
-    rate_id: str
+    rate_id: str | None = Field(
+        default=None, description="Rate ID from a previous quote (matched by carrier/service)"
+    )
+    carrier: str | None = Field(
+        default=None, description="Carrier/service preference, e.g. 'USPS- Priority'"
+    )
+
+
+class TrackingBatchRequest(BaseModel):
+    """Request model for looking up many tracking numbers at once."""
+
+    tracking_numbers: list[str] = Field(min_length=1, max_length=1000)
+    max_concurrency: int | None = Field(
+        default=None, ge=1, le=64, description="Lookups in flight (default MAX_BULK_CONCURRENCY)"
+    )
 
 
 class BulkShipmentsRequest(BaseModel):
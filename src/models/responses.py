@@ -83,6 +83,20 @@ class TrackingResponse(BaseResponse):
     tracking_number: str | None = None
 
 
+class TrackingBatchResponse(BaseResponse):
+    """Response for batch tracking lookups (per-code results plus status counts)."""
+
+    status: Literal["success"] = "success"
+    data: dict[str, Any] | None = None
+
+
+class WebhookEventResponse(BaseResponse):
+    """Acknowledgement for an ingested EasyPost webhook event."""
+
+    status: Literal["success"] = "success"
+    data: dict[str, Any] | None = None
+
+
 # Bulk Operations Response Models
 class BulkShipmentsResponse(BaseResponse):
     """Response for bulk shipment creation."""
@@ -3,9 +3,11 @@
 from .analytics import router as analytics_router
 from .shipments import router as shipments_router
 from .tracking import router as tracking_router
+from .webhooks import router as webhooks_router
 
 __all__ = [
     "analytics_router",
     "shipments_router",
     "tracking_router",
+    "webhooks_router",
 ]
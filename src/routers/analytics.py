@@ -1,8 +1,7 @@
 """Simplified analytics endpoints for personal use."""
 
 import logging
-from collections import defaultdict
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, datetime
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, Query, Request
@@ -17,6 +16,7 @@
     ShipmentMetricsResponse,
     VolumeMetrics,
 )
+from src.services.analytics_engine import ShipmentFetchError, get_analytics_engine
 from src.utils.monitoring import metrics
 
 logger = logging.getLogger(__name__)
@@ -106,51 +106,13 @@ async def get_analytics(
     try:
         logger.info(f"[{request_id}] Analytics request for {days} days")
 
-        # Get shipments (this would normally come from database)
-        # For now, using list_shipments as demo
-        shipments_result = await service.list_shipments(page_size=100)
-
-        if shipments_result.get("status") != "success":
-            raise HTTPException(status_code=500, detail="Failed to fetch shipments")
-
-        shipments = shipments_result.get("data", [])
-
-        # Simple sequential processing (no parallel chunks for personal use)
-        carrier_stats = defaultdict(lambda: {"count": 0, "cost": 0.0, "delivered": 0})
-        date_stats = defaultdict(lambda: {"count": 0, "cost": 0.0})
-        route_stats = defaultdict(lambda: {"count": 0, "cost": 0.0})
-
-        for shipment in shipments:
-            # Carrier stats
-            cost = 0.0
-            if "rate" in shipment and shipment["rate"]:
-                try:
-                    cost = float(shipment["rate"])
-                except (ValueError, TypeError):
-                    logger.debug(f"Could not parse cost from shipment rate: {shipment.get('rate')}")
-            carrier = shipment.get("carrier", "Unknown")
-            carrier_stats[carrier]["count"] += 1
-            carrier_stats[carrier]["cost"] += cost
-            if shipment.get("status", "").lower() == "delivered":
-                carrier_stats[carrier]["delivered"] += 1
-
-            # Date stats
-            created_at = shipment.get("created_at", datetime.now(UTC))
-            if isinstance(created_at, str):
-                created_at = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-            date_key = created_at.strftime("%Y-%m-%d")
-            date_stats[date_key]["count"] += 1
-            date_stats[date_key]["cost"] += cost
-
-            # Route stats
-            from_city = shipment.get("from_address", {}).get("city", "Unknown")
-            to_city = shipment.get("to_address", {}).get("city", "Unknown")
-            route_key = f"{from_city} → {to_city}"
-            route_stats[route_key]["count"] += 1
-            route_stats[route_key]["cost"] += cost
-
-        total_shipments = len(shipments)
-        total_cost = sum(stats["cost"] for stats in carrier_stats.values())
+        try:
+            window = await get_analytics_engine(service).window(service, days)
+        except ShipmentFetchError as e:
+            raise HTTPException(status_code=500, detail="Failed to fetch shipments") from e
+
+        total_shipments = window.total_shipments
+        total_cost = window.total_cost
         avg_cost = total_cost / total_shipments if total_shipments > 0 else 0.0
 
         # Build response components
@@ -159,14 +121,14 @@ async def get_analytics(
             total_cost=round(total_cost, 2),
             average_cost=round(avg_cost, 2),
             date_range={
-                "start": (datetime.now(UTC) - timedelta(days=days)).isoformat(),
-                "end": datetime.now(UTC).isoformat(),
+                "start": window.start.isoformat(),
+                "end": window.end.isoformat(),
             },
         )
 
-        by_carrier = _build_carrier_metrics(carrier_stats, total_shipments)
-        by_date = _build_date_metrics(date_stats)
-        top_routes = _build_route_metrics(route_stats)
+        by_carrier = _build_carrier_metrics(window.carrier_stats, total_shipments)
+        by_date = _build_date_metrics(window.date_stats)
+        top_routes = _build_route_metrics(window.route_stats)
 
         analytics_data = AnalyticsData(
             summary=summary.model_dump(),
@@ -177,7 +139,8 @@ async def get_analytics(
 
         logger.info(
             f"[{request_id}] Analytics calculated: {total_shipments} shipments, "
-            f"${total_cost:.2f} total cost"
+            f"${total_cost:.2f} total cost ({window.days_fetched} days refreshed, "
+            f"{window.pages_fetched} pages)"
         )
         metrics.track_api_call("get_analytics", True)
 
@@ -1,6 +1,7 @@
 """Shipment management endpoints."""
 
 import logging
+from datetime import UTC, datetime
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, Request
@@ -18,6 +19,7 @@
     RatesResponse,
     RefundShipmentResponse,
     ShipmentDetailResponse,
+    ShipmentsDBResponse,
     ShipmentsListResponse,
 )
 from src.utils.monitoring import metrics
@@ -53,6 +55,7 @@ async def get_rates(
             to_address=to_address_dict,
             from_address=from_address_dict,
             parcel=parcel_dict,
+            bypass_cache=rates_request.bypass_cache,
         )
 
         logger.info(f"[{request_id}] Rates retrieved successfully")
@@ -124,39 +127,27 @@ async def buy_shipment(
     try:
         logger.info(f"[{request_id}] Buy shipment request received")
 
-        # First create the shipment to get rates
-        result = await service.get_rates(
+        # One shipment create, local rate selection, one buy
+        buy_result = await service.purchase_shipment(
             to_address=buy_request.to_address.model_dump(),
             from_address=buy_request.from_address.model_dump(),
             parcel=buy_request.parcel.model_dump(),
+            rate_id=buy_request.rate_id,
+            carrier=buy_request.carrier,
         )
 
-        if result["status"] != "success" or not result.get("data"):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to get rates for shipment",
+        timings = (buy_result.get("data") or {}).get("timings_ms")
+        if buy_result["status"] != "success":
+            logger.warning(
+                f"[{request_id}] Purchase failed: {buy_result.get('message')} ({timings})"
             )
-
-        # Create shipment to get shipment ID
-        shipment_result = await service.create_shipment(
-            to_address=buy_request.to_address.model_dump(),
-            from_address=buy_request.from_address.model_dump(),
-            parcel=buy_request.parcel.model_dump(),
-            buy_label=False,  # Don't buy yet
-        )
-
-        if shipment_result["status"] != "success":
+            metrics.track_api_call("buy_shipment", False)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to create shipment",
+                detail=buy_result.get("message") or "Failed to purchase shipment",
             )
 
-        # Now buy with the selected rate
-        buy_result = await service.buy_shipment(
-            shipment_id=shipment_result["id"], rate_id=buy_request.rate_id
-        )
-
-        logger.info(f"[{request_id}] Shipment purchased successfully")
+        logger.info(f"[{request_id}] Shipment purchased successfully ({timings})")
         metrics.track_api_call("buy_shipment", True)
 
         return buy_result
@@ -258,6 +249,45 @@ async def list_shipments(
         ) from e
 
 
+@router.get("/shipments/ledger", response_model=ShipmentsDBResponse)
+async def list_ledger_shipments(
+    request: Request,
+    service: EasyPostDep,
+    page_size: int = 20,
+    carrier: str | None = None,
+    tracking_code: str | None = None,
+    before_id: str | None = None,
+) -> dict[str, Any]:
+    """List shipments recorded in the local shipment ledger (no EasyPost call)."""
+    request_id = getattr(request.state, "request_id", "unknown")
+    ledger = getattr(service, "ledger", None)
+    if ledger is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Shipment ledger is not enabled",
+        )
+
+    page_size = max(1, min(page_size, 100))
+    shipments = ledger.query(
+        page_size, carrier=carrier, tracking_code=tracking_code, before_id=before_id
+    )
+    logger.info(f"[{request_id}] Ledger returned {len(shipments)} shipments")
+    metrics.track_api_call("list_ledger_shipments", True)
+
+    return {
+        "status": "success",
+        "data": {"shipments": shipments},
+        "pagination": {
+            "total": len(shipments),
+            "limit": page_size,
+            "offset": 0,
+            "has_more": len(shipments) == page_size,
+        },
+        "message": f"Retrieved {len(shipments)} shipments from ledger",
+        "timestamp": datetime.now(UTC).isoformat(),
+    }
+
+
 @router.get("/shipments/{shipment_id}", response_model=ShipmentDetailResponse)
 async def get_shipment_detail(
     request: Request, shipment_id: str, service: EasyPostDep
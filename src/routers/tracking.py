@@ -7,7 +7,9 @@
 from starlette import status
 
 from src.dependencies import EasyPostDep
-from src.models.responses import TrackingResponse
+from src.models.requests import TrackingBatchRequest
+from src.models.responses import TrackingBatchResponse, TrackingResponse
+from src.utils.config import settings
 from src.utils.monitoring import metrics
 
 logger = logging.getLogger(__name__)
@@ -17,6 +19,36 @@
 router = APIRouter(tags=["tracking"])  # Prefix added when including in app
 
 
+@router.post("/batch", response_model=TrackingBatchResponse)
+async def track_shipments_batch(
+    request: Request, batch: TrackingBatchRequest, service: EasyPostDep
+) -> dict[str, Any]:
+    """Track many shipments at once (deduplicated, bounded concurrency)."""
+    request_id = getattr(request.state, "request_id", "unknown")
+
+    try:
+        logger.info(f"[{request_id}] Batch tracking for {len(batch.tracking_numbers)} numbers")
+
+        result = await service.get_tracking_batch(
+            batch.tracking_numbers,
+            max_concurrency=batch.max_concurrency or settings.MAX_BULK_CONCURRENCY,
+        )
+
+        logger.info(f"[{request_id}] {result.get('message')}")
+        metrics.track_api_call("track_shipments_batch", True)
+
+        return result
+
+    except Exception as e:
+        error_msg = str(e)[:MAX_REQUEST_LOG_SIZE]
+        logger.error(f"[{request_id}] Error in batch tracking: {error_msg}")
+        metrics.track_api_call("track_shipments_batch", False)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error tracking shipments: {error_msg}",
+        ) from e
+
+
 @router.get("/{tracking_number}", response_model=TrackingResponse)
 async def track_shipment(
     request: Request, tracking_number: str, service: EasyPostDep
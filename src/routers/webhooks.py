@@ -0,0 +1,79 @@
+"""EasyPost webhook receiver (tracker events feed the tracking cache)."""
+
+import json
+import logging
+from datetime import UTC, datetime
+from typing import Any
+
+from easypost.errors import SignatureVerificationError
+from easypost.util import validate_webhook
+from fastapi import APIRouter, HTTPException, Request
+from starlette import status
+
+from src.dependencies import EasyPostDep
+from src.models.responses import WebhookEventResponse
+from src.utils.config import settings
+from src.utils.monitoring import metrics
+
+logger = logging.getLogger(__name__)
+
+TRACKER_EVENTS = frozenset({"tracker.created", "tracker.updated"})
+
+router = APIRouter(tags=["webhooks"])  # Prefix added when including in app
+
+
+def _decode_event(body: bytes, request: Request) -> dict[str, Any]:
+    """
+    Verify the HMAC signature and decode the body into an event object.
+
+    Without EASYPOST_WEBHOOK_SECRET every event is rejected, unless unsigned
+    events were explicitly allowed for development.
+    """
+    secret = settings.EASYPOST_WEBHOOK_SECRET
+    if not secret and not settings.EASYPOST_WEBHOOK_ALLOW_UNSIGNED:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Webhooks are disabled: EASYPOST_WEBHOOK_SECRET is not configured",
+        )
+    try:
+        event = validate_webhook(body, request.headers, secret) if secret else json.loads(body)
+    except SignatureVerificationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid webhook signature"
+        ) from e
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Webhook body is not valid JSON"
+        ) from e
+    if not isinstance(event, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Webhook body must be a JSON object"
+        )
+    return event
+
+
+@router.post("/webhooks/easypost", response_model=WebhookEventResponse)
+async def receive_easypost_event(request: Request, service: EasyPostDep) -> dict[str, Any]:
+    """Ingest an EasyPost event; tracker events update the tracking cache in place."""
+    request_id = getattr(request.state, "request_id", "unknown")
+    event = _decode_event(await request.body(), request)
+    description = event.get("description", "")
+
+    tracking = None
+    if description in TRACKER_EVENTS:
+        tracking = service.ingest_tracker_event(event)
+    logger.info(
+        f"[{request_id}] Webhook {description or 'unknown'} {'applied' if tracking else 'ignored'}"
+    )
+    metrics.track_api_call("easypost_webhook", True)
+
+    return {
+        "status": "success",
+        "data": {
+            "event": description,
+            "applied": tracking is not None,
+            "tracking_number": tracking["tracking_number"] if tracking else None,
+        },
+        "message": "Event applied" if tracking else "Event ignored",
+        "timestamp": datetime.now(UTC).isoformat(),
+    }
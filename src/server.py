@@ -2,20 +2,25 @@
 
 import logging
 import os
+import time
 import uuid
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.cors import CORSMiddleware
 
 from src.mcp_server import build_mcp_server
-from src.routers import analytics, shipments, tracking
+from src.mcp_server.tools.bulk_io import get_verification_cache
+from src.routers import analytics, shipments, tracking, webhooks
 from src.dependencies import EasyPostDep
 from src.lifespan import app_lifespan
+from src.services.rate_limiter import get_shared_rate_limiter
+from src.services.service_registry import service_registry
+from src.services.smart_customs import get_customs_cache
 from src.utils.config import settings
-from src.utils.monitoring import metrics
+from src.utils.monitoring import PROMETHEUS_CONTENT_TYPE, metrics
 
 mcp, mcp_service = build_mcp_server(lifespan=app_lifespan)
 
@@ -45,6 +50,7 @@
     lifespan=app_lifespan,
 )
 
+# Same process-wide instance the lifespan and route dependencies resolve
 app.state.easypost_service = mcp_service
 
 # CORS middleware (production-safe configuration)
@@ -99,6 +105,36 @@ async def dispatch(self, request: Request, call_next):
 app.add_middleware(RequestIDMiddleware)
 
 
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """
+    Per-route latency histogram and in-flight gauge for every HTTP request.
+
+    Requests are labelled by route template ("/api/shipments/{shipment_id}")
+    so ids never become label values. Streaming responses are timed to their
+    first byte.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        started = time.perf_counter()
+        status = 500
+        try:
+            with metrics.in_flight("http_requests"):
+                response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = request.scope.get("route")
+            metrics.observe_request(
+                request.method,
+                getattr(route, "path", None) or "unmatched",
+                status,
+                time.perf_counter() - started,
+            )
+
+
+app.add_middleware(MetricsMiddleware)
+
+
 # Exception handlers for better debugging
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -138,8 +174,9 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 app.include_router(shipments.router, prefix="/api")
 app.include_router(analytics.router, prefix="/api")
 app.include_router(tracking.router, prefix="/api/tracking")
+app.include_router(webhooks.router, prefix="/api")
 
-logger.info("Routers registered: shipments, analytics, tracking")
+logger.info("Routers registered: shipments, analytics, tracking, webhooks")
 
 logger.info(
     "MCP server mounted at /mcp (HTTP transport) with error handling and retry middleware"
@@ -179,17 +216,64 @@ async def readiness_check(service: EasyPostDep):
     return {"ready": True}
 
 
+def _cache_stats(service) -> dict[str, dict | None]:
+    """`TTLCache.stats()` of every cache, keyed as in the /metrics JSON."""
+    return {
+        "rate_cache": service.rate_cache.stats() if service is not None else None,
+        "tracking_cache": service.tracking_cache.stats() if service is not None else None,
+        "customs_cache": get_customs_cache().stats(),
+        "address_verification_cache": get_verification_cache().stats(),
+    }
+
+
+def _wants_prometheus(request: Request, output_format: str | None) -> bool:
+    if output_format is not None:
+        return output_format == "prometheus"
+    accept = request.headers.get("accept", "")
+    return "text/plain" in accept or "openmetrics" in accept
+
+
 @app.get("/metrics")
-async def get_metrics():
-    """Get performance metrics."""
-    return metrics.get_metrics()
+async def get_metrics(
+    request: Request, output_format: str | None = Query(None, alias="format")
+):
+    """
+    Get performance metrics.
+
+    JSON by default; Prometheus text format with `?format=prometheus` or
+    when the client accepts `text/plain` (as Prometheus scrapers do).
+    """
+    service = service_registry.service
+    caches = _cache_stats(service)
+    if _wants_prometheus(request, output_format):
+        if service is not None:
+            caches["shipment_plans"] = service.plan_cache.stats()
+        return PlainTextResponse(
+            metrics.render_prometheus(caches), media_type=PROMETHEUS_CONTENT_TYPE
+        )
+    return {
+        **metrics.get_metrics(),
+        "rate_limiter": get_shared_rate_limiter().snapshot(),
+        **caches,
+        "shipment_retrieve": service.retrieve_stats() if service is not None else None,
+        "shipment_plans": service.plan_stats() if service is not None else None,
+        "shipment_ledger": (
+            service.ledger.stats() if service is not None and service.ledger is not None else None
+        ),
+        "warehouse_addresses": (
+            service.warehouse_registry.stats()
+            if service is not None and service.warehouse_registry is not None
+            else None
+        ),
+    }
 
 
 # Note: All API endpoints are handled by routers:
 # - /api/rates, /api/shipments → routers/shipments.py
 # - /api/analytics → routers/analytics.py
 # - /api/tracking → routers/tracking.py
-# Database-backed endpoints and webhooks removed for personal use.
+# - /api/webhooks/easypost → routers/webhooks.py
+# Database-backed endpoints removed for personal use.
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -1,7 +1,10 @@
 """Service layer for business logic."""
 
 from .easypost_service import EasyPostService
+from .service_registry import ServiceRegistry, get_shared_service
 
 __all__ = [
     "EasyPostService",
+    "ServiceRegistry",
+    "get_shared_service",
 ]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 from typing import Any
 
 # Country name to ISO 2-letter code mapping for EasyPost API
@@ -99,6 +100,21 @@ def normalize_address(address: dict[str, Any]) -> dict[str, Any]:
     return normalized
 
 
+# Fields that decide a verification outcome; contact fields (name, phone...) do not
+ADDRESS_FINGERPRINT_FIELDS = ("street1", "street2", "city", "state", "zip", "country")
+
+
+def address_fingerprint(address: dict[str, Any], carrier: str | None = None) -> str:
+    """Stable hash of the normalized postal fields (case/whitespace-insensitive) and carrier."""
+    normalized = normalize_address(address)
+    parts = [
+        " ".join(str(normalized.get(field) or "").upper().split())
+        for field in ADDRESS_FINGERPRINT_FIELDS
+    ]
+    parts.append((carrier or "").lower())
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+
 def preprocess_address_for_fedex(address: dict[str, Any]) -> dict[str, Any]:
     """Reformat address to meet FedEx/UPS international API requirements."""
     result = address.copy()
@@ -0,0 +1,246 @@
+"""Shipment analytics over a full date window with per-day rollups.
+
+The engine streams `EasyPostService.iter_shipment_pages` over the
+`start_datetime`/`end_datetime` window (`before_id` cursor pagination),
+folds every shipment into a per-UTC-day bucket (count, cost, per-carrier
+and per-route totals) and keeps those buckets between requests. A query
+only fetches days that have no usable bucket, so a repeat 365-day
+dashboard is a merge of cached buckets.
+
+A bucket is reused while it is younger than `recent_ttl` seconds, or
+indefinitely once it is complete (fetched after its day ended) and older
+than `settle_days`, when shipment statuses no longer change.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import weakref
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from datetime import time as dt_time
+from typing import Any
+
+from src.services.easypost_service import SHIPMENT_PAGE_SIZE, ShipmentFetchError
+
+__all__ = ["AnalyticsEngine", "AnalyticsWindow", "ShipmentFetchError", "get_analytics_engine"]
+
+logger = logging.getLogger(__name__)
+
+MAX_PAGES = 500  # Safety bound for one window fetch (50k shipments)
+DEFAULT_RECENT_TTL = 300.0  # seconds
+DEFAULT_SETTLE_DAYS = 14
+
+
+def _stats() -> dict[str, float]:
+    return {"count": 0, "cost": 0.0, "delivered": 0}
+
+
+@dataclass
+class DayRollup:
+    """Aggregates for one UTC day."""
+
+    day: date
+    fetched_at: float
+    complete: bool
+    count: int = 0
+    cost: float = 0.0
+    carriers: defaultdict[str, dict[str, float]] = field(
+        default_factory=lambda: defaultdict(_stats)
+    )
+    routes: defaultdict[str, dict[str, float]] = field(default_factory=lambda: defaultdict(_stats))
+
+    def add(self, shipment: dict[str, Any], cost: float) -> None:
+        self.count += 1
+        self.cost += cost
+
+        carrier = self.carriers[shipment.get("carrier") or "Unknown"]
+        carrier["count"] += 1
+        carrier["cost"] += cost
+        if (shipment.get("status") or "").lower() == "delivered":
+            carrier["delivered"] += 1
+
+        from_city = (shipment.get("from_address") or {}).get("city", "Unknown")
+        to_city = (shipment.get("to_address") or {}).get("city", "Unknown")
+        route = self.routes[f"{from_city} → {to_city}"]
+        route["count"] += 1
+        route["cost"] += cost
+
+
+@dataclass
+class AnalyticsWindow:
+    """Merged rollups for a query window, in the shape the analytics router builds from."""
+
+    start: datetime
+    end: datetime
+    total_shipments: int
+    total_cost: float
+    carrier_stats: dict[str, dict[str, float]]
+    date_stats: dict[str, dict[str, float]]
+    route_stats: dict[str, dict[str, float]]
+    days_fetched: int
+    pages_fetched: int
+
+
+def shipment_cost(shipment: dict[str, Any]) -> float:
+    """Rate of a normalized shipment as float (0.0 when absent or unparsable)."""
+    rate = shipment.get("rate")
+    if not rate:
+        return 0.0
+    try:
+        return float(rate)
+    except (ValueError, TypeError):
+        logger.debug(f"Could not parse cost from shipment rate: {rate}")
+        return 0.0
+
+
+def shipment_day(shipment: dict[str, Any], now: datetime) -> date:
+    """UTC day a shipment was created (today if unknown)."""
+    created_at = shipment.get("created_at") or now
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(UTC)
+    return created_at.date()
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, dt_time.min, tzinfo=UTC)
+
+
+class AnalyticsEngine:
+    """
+    Per-service analytics cache of per-day rollups.
+
+    Concurrent queries share one refresh (an asyncio lock guards fetching),
+    so a burst of dashboard loads costs a single pass over EasyPost.
+    """
+
+    def __init__(
+        self,
+        *,
+        recent_ttl: float = DEFAULT_RECENT_TTL,
+        settle_days: int = DEFAULT_SETTLE_DAYS,
+        page_size: int = SHIPMENT_PAGE_SIZE,
+        max_pages: int = MAX_PAGES,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.recent_ttl = recent_ttl
+        self.settle_days = settle_days
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self._clock = clock
+        self._days: dict[date, DayRollup] = {}
+        self._lock = asyncio.Lock()
+
+    def _now(self) -> datetime:
+        return datetime.fromtimestamp(self._clock(), UTC)
+
+    def _is_usable(self, rollup: DayRollup | None, today: date, now_ts: float) -> bool:
+        if rollup is None:
+            return False
+        if now_ts - rollup.fetched_at < self.recent_ttl:
+            return True
+        return rollup.complete and (today - rollup.day).days > self.settle_days
+
+    async def window(self, service: Any, days: int) -> AnalyticsWindow:
+        """Aggregates for the last `days` UTC days (including today)."""
+        now = self._now()
+        today = now.date()
+        window_days = [today - timedelta(days=offset) for offset in range(days - 1, -1, -1)]
+
+        days_fetched = pages_fetched = 0
+        async with self._lock:
+            now_ts = self._clock()
+            missing = [
+                day
+                for day in window_days
+                if not self._is_usable(self._days.get(day), today, now_ts)
+            ]
+            if missing:
+                pages_fetched = await self._refresh(service, missing[0], missing[-1], now)
+                days_fetched = (missing[-1] - missing[0]).days + 1
+            rollups = [self._days[day] for day in window_days]
+
+        carrier_stats: defaultdict[str, dict[str, float]] = defaultdict(_stats)
+        route_stats: defaultdict[str, dict[str, float]] = defaultdict(_stats)
+        date_stats: dict[str, dict[str, float]] = {}
+        for rollup in rollups:
+            if not rollup.count:
+                continue
+            date_stats[rollup.day.isoformat()] = {"count": rollup.count, "cost": rollup.cost}
+            for name, stats in rollup.carriers.items():
+                merged = carrier_stats[name]
+                for key, value in stats.items():
+                    merged[key] += value
+            for name, stats in rollup.routes.items():
+                merged = route_stats[name]
+                for key, value in stats.items():
+                    merged[key] += value
+
+        return AnalyticsWindow(
+            start=_day_start(window_days[0]),
+            end=now,
+            total_shipments=sum(rollup.count for rollup in rollups),
+            total_cost=sum(rollup.cost for rollup in rollups),
+            carrier_stats=dict(carrier_stats),
+            date_stats=date_stats,
+            route_stats=dict(route_stats),
+            days_fetched=days_fetched,
+            pages_fetched=pages_fetched,
+        )
+
+    async def _refresh(self, service: Any, first: date, last: date, now: datetime) -> int:
+        """Rebuild the buckets for `first`..`last` from EasyPost; return pages fetched."""
+        fetched_at = self._clock()
+        fresh = {
+            first + timedelta(days=offset): DayRollup(
+                day=first + timedelta(days=offset),
+                fetched_at=fetched_at,
+                complete=_day_start(first + timedelta(days=offset + 1)) <= now,
+            )
+            for offset in range((last - first).days + 1)
+        }
+
+        start = _day_start(first).isoformat()
+        end = min(_day_start(last + timedelta(days=1)), now).isoformat()
+        pages = 0
+        async for page in service.iter_shipment_pages(
+            self.page_size, start_datetime=start, end_datetime=end, max_pages=self.max_pages
+        ):
+            pages += 1
+            for shipment in page:
+                rollup = fresh.get(shipment_day(shipment, now))
+                if rollup is not None:
+                    rollup.add(shipment, shipment_cost(shipment))
+        if pages >= self.max_pages:
+            logger.warning(f"Analytics fetch for {start}..{end} stopped at {pages} pages")
+
+        self._days.update(fresh)
+        logger.info(f"Analytics rollups rebuilt for {len(fresh)} days from {pages} pages")
+        return pages
+
+    def clear(self) -> None:
+        self._days.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Bucket counts for metrics endpoints."""
+        return {
+            "days": len(self._days),
+            "complete_days": sum(1 for rollup in self._days.values() if rollup.complete),
+        }
+
+
+_engines: weakref.WeakKeyDictionary[Any, AnalyticsEngine] = weakref.WeakKeyDictionary()
+
+
+def get_analytics_engine(service: Any) -> AnalyticsEngine:
+    """Return the analytics engine bound to `service` (created on first use)."""
+    engine = _engines.get(service)
+    if engine is None:
+        engine = _engines[service] = AnalyticsEngine()
+    return engine
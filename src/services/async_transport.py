@@ -0,0 +1,221 @@
+"""Native async HTTP transport for the EasyPost REST API.
+
+The EasyPost SDK is synchronous, so EasyPostService normally offloads every call
+to its ThreadPoolExecutor, which caps in-flight requests at the pool size. This
+transport talks to the same REST endpoints over a pooled `httpx.AsyncClient`
+and returns SDK objects (via `convert_to_easypost_object`) and SDK error types,
+so the service's existing result shaping and error handling apply unchanged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import json
+import logging
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+from easypost.constant import (
+    API_BASE,
+    API_VERSION,
+    COMMUNICATION_ERROR,
+    SUPPORT_EMAIL,
+    TIMEOUT_ERROR,
+    VERSION,
+)
+from easypost.easypost_object import convert_to_easypost_object
+from easypost.errors import HttpError, JsonError
+from easypost.errors import TimeoutError as EasyPostTimeoutError
+from easypost.requestor import Requestor
+
+from src.services.rate_limiter import TokenBucketRateLimiter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_BASE = f"{API_BASE}/{API_VERSION}"
+DEFAULT_MAX_CONNECTIONS = 64
+DEFAULT_TIMEOUT = 60.0  # Matches the SDK client default
+
+Hook = Callable[..., None]
+
+
+class AsyncEasyPostTransport:
+    """
+    Pooled async client for the EasyPost REST API.
+
+    Request/response hooks receive the same keyword arguments as the SDK's
+    `subscribe_to_request_hook`/`subscribe_to_response_hook` callbacks, so the
+    service can attach one set of monitoring hooks to either transport.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        api_base: str = DEFAULT_API_BASE,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        rate_limiter: TokenBucketRateLimiter | None = None,
+    ):
+        self.api_base = api_base.rstrip("/")
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.rate_limiter = rate_limiter
+        self._headers = {
+            "Authorization": f"Bearer {api_key}",
+            "User-Agent": f"EasyPost/{API_VERSION} PythonClient/{VERSION} AsyncTransport",
+        }
+        self._request_hooks: list[Hook] = []
+        self._response_hooks: list[Hook] = []
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Pools replaced after an event-loop change, closed on the next request
+        self._retired: list[httpx.AsyncClient] = []
+
+    def subscribe_to_request_hook(self, function: Hook) -> None:
+        """Run `function` before each request (SDK-compatible kwargs)."""
+        self._request_hooks.append(function)
+
+    def subscribe_to_response_hook(self, function: Hook) -> None:
+        """Run `function` after each response (SDK-compatible kwargs)."""
+        self._response_hooks.append(function)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the pooled client bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            # Connections cannot be shared across event loops; start a fresh pool
+            if self._client is not None:
+                self._retired.append(self._client)
+            self._client = httpx.AsyncClient(
+                base_url=self.api_base,
+                headers=self._headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+            self._loop = loop
+        return self._client
+
+    async def request(self, method: str, path: str, params: dict[str, Any] | None = None) -> Any:
+        """
+        Send a request and return the decoded EasyPost object.
+
+        Raises the same `easypost.errors` types as the SDK (e.g. RateLimitError
+        with `http_status=429`) so retry logic works for both transports.
+        """
+        method = method.upper()
+        params = Requestor._objects_to_ids(params or {})
+        client = self._get_client()
+        if self._retired:
+            await self._close_retired()
+
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+
+        request_uuid = uuid.uuid4()
+        request_timestamp = datetime.datetime.now(datetime.UTC)
+        self._run_hooks(
+            self._request_hooks,
+            method=method,
+            path=f"{self.api_base}{path}",
+            headers=self._headers,
+            request_body=params,
+            request_timestamp=request_timestamp,
+            request_uuid=request_uuid,
+        )
+
+        try:
+            if method in ("GET", "DELETE"):
+                response = await client.request(method, path, params=_query_params(params))
+            else:
+                response = await client.request(method, path, json=params)
+        except httpx.TimeoutException as e:
+            raise EasyPostTimeoutError(TIMEOUT_ERROR) from e
+        except httpx.HTTPError as e:
+            raise HttpError(COMMUNICATION_ERROR.format(SUPPORT_EMAIL, e)) from e
+
+        self._run_hooks(
+            self._response_hooks,
+            http_status=response.status_code,
+            method=method,
+            path=f"{self.api_base}{path}",
+            headers=response.headers,
+            response_body=response.text,
+            request_timestamp=request_timestamp,
+            response_timestamp=datetime.datetime.now(datetime.UTC),
+            request_uuid=request_uuid,
+        )
+
+        return convert_to_easypost_object(
+            response=_interpret_response(response.text, response.status_code)
+        )
+
+    async def get(self, path: str, params: dict[str, Any] | None = None) -> Any:
+        return await self.request("GET", path, params)
+
+    async def post(self, path: str, params: dict[str, Any] | None = None) -> Any:
+        return await self.request("POST", path, params)
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        client, self._client, self._loop = self._client, None, None
+        if client is not None:
+            await client.aclose()
+        await self._close_retired()
+
+    async def _close_retired(self) -> None:
+        """Close pools left behind by earlier event loops."""
+        while self._retired:
+            client = self._retired.pop()
+            try:
+                await client.aclose()
+            except Exception as e:
+                # Sockets opened on a loop that is already closed may fail to close
+                logger.debug(f"Error closing retired EasyPost client: {e}")
+
+    @staticmethod
+    def _run_hooks(hooks: list[Hook], **kwargs: Any) -> None:
+        for hook in hooks:
+            try:
+                hook(**kwargs)
+            except Exception as e:
+                logger.error(f"Error in transport hook: {e}")
+
+
+def _query_params(params: dict[str, Any]) -> dict[str, Any]:
+    """Drop unset values and encode booleans the way the API expects."""
+    query = {}
+    for key, value in params.items():
+        if value is None:
+            continue
+        query[key] = str(value).lower() if isinstance(value, bool) else value
+    return query
+
+
+def _interpret_response(http_body: str, http_status: int) -> dict[str, Any]:
+    """Decode a response body, raising SDK errors for non-2xx statuses."""
+    if http_status == 204:
+        return {}
+
+    try:
+        response = json.loads(http_body)
+    except json.JSONDecodeError as e:
+        raise JsonError(
+            message=f"Invalid response body from API: HTTP {http_status}",
+            http_status=http_status,
+            http_body=http_body,
+        ) from e
+
+    if http_status < 200 or http_status >= 300:
+        # Requestor.handle_api_error does not touch the client
+        Requestor(None).handle_api_error(
+            http_status=http_status, http_body=http_body, response=response
+        )
+
+    return response
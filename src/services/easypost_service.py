@@ -1,20 +1,220 @@
 import asyncio
+import contextlib
+import hashlib
+import json
 import logging
 import multiprocessing
-from concurrent.futures import ThreadPoolExecutor
+import sqlite3
+import threading
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
 from datetime import UTC, datetime
 from typing import Any
 
 import easypost
+from easypost.easypost_object import convert_to_easypost_object
 from pydantic import BaseModel, Field
 
 from src.services.address_utils import normalize_address
+from src.services.async_transport import DEFAULT_MAX_CONNECTIONS, AsyncEasyPostTransport
 from src.services.error_utils import sanitize_error
-
+from src.services.rate_limiter import TokenBucketRateLimiter, get_shared_rate_limiter
+from src.services.shipment_ledger import DEFAULT_MAX_AGE as DEFAULT_LEDGER_MAX_AGE
+from src.services.shipment_ledger import ShipmentLedger
 from src.services.smart_customs import get_or_create_customs
+from src.services.warehouse_registry import WarehouseAddressRegistry
+from src.utils.cache import TTLCache
+from src.utils.constants import STANDARD_TIMEOUT
+from src.utils.monitoring import (
+    InstrumentedThreadPoolExecutor,
+    current_api_trace,
+    easypost_operation,
+    metrics,
+)
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_RATE_CACHE_TTL = 300.0  # seconds
+DEFAULT_RATE_CACHE_SIZE = 1024
+SHIPMENT_CACHE_TTL = 3600.0  # Phase-1 shipments (with rates) kept for label purchase
+SHIPMENT_CACHE_SIZE = 4096
+DEFAULT_PLAN_CACHE_TTL = 1800.0  # Rating-pass shipments reusable by create_shipment
+DEFAULT_PLAN_CACHE_SIZE = 4096
+RATE_QUOTE_ORIGIN_FIELDS = ("street1", "street2", "city", "state", "zip", "country")
+RATE_QUOTE_DESTINATION_FIELDS = ("state", "zip", "country")
+RATE_QUOTE_PARCEL_FIELDS = ("length", "width", "height", "weight")
+SHIPMENT_PAGE_SIZE = 100  # EasyPost max page size
+DEFAULT_TRACKING_CACHE_TTL = 300.0  # seconds, trackers still moving
+DEFAULT_TRACKING_FINAL_TTL = 86400.0  # seconds, trackers in a final state
+DEFAULT_TRACKING_CACHE_SIZE = 4096
+TRACKING_FINAL_STATUSES = frozenset({"delivered", "return_to_sender", "cancelled", "failure"})
+DEFAULT_TRACKING_BATCH_CONCURRENCY = 16
+API_TIMING_MAX_PENDING = 1024  # send-time marks kept for requests awaiting a response
+# Tracker status -> summary bucket for batch lookups (anything else is "unknown")
+TRACKING_STATUS_GROUPS = {
+    "delivered": "delivered",
+    "pre_transit": "in_transit",
+    "in_transit": "in_transit",
+    "out_for_delivery": "in_transit",
+    "available_for_pickup": "in_transit",
+    "return_to_sender": "exception",
+    "failure": "exception",
+    "cancelled": "exception",
+    "error": "exception",
+}
+
+TrackingProgress = Callable[[str, dict[str, Any], int, int], Awaitable[None]]
+
+_END_OF_PAGES = object()
+
+
+def _payload_size(body: Any) -> int:
+    """Approximate wire size in bytes of a hook request params dict or response body."""
+    if not body:
+        return 0
+    if isinstance(body, bytes):
+        return len(body)
+    if isinstance(body, str):
+        return len(body.encode())
+    try:
+        return len(json.dumps(body, separators=(",", ":"), default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    """True for an EasyPost 429 from either transport."""
+    return getattr(error, "http_status", None) == 429 or "429" in str(error).lower()
+
+
+class ShipmentFetchError(RuntimeError):
+    """Raised when EasyPost returns an error while paging through shipments."""
+
+
+CUSTOMS_ITEM_SIGNATURE_FIELDS = (
+    "description",
+    "quantity",
+    "value",
+    "weight",
+    "hs_tariff_number",
+    "origin_country",
+)
+CUSTOMS_ITEM_NUMERIC_FIELDS = frozenset({"quantity", "value", "weight"})
+# Customs-level fields with the defaults _create_customs_info() sends when they
+# are missing or empty. incoterm is not here: it never reaches the customs payload.
+CUSTOMS_SIGNATURE_DEFAULTS: dict[str, Any] = {
+    "contents_type": "merchandise",
+    "contents_explanation": None,
+    "restriction_type": "none",
+    "restriction_comments": None,
+    "customs_certify": True,
+    "customs_signer": None,
+    "eel_pfc": "NOEEI 30.37(a)",
+    "non_delivery_option": "return",
+}
+
+
+def _customs_signature(customs_info: Any) -> str | None:
+    """
+    Stable identity for customs input, whatever its shape.
+
+    Built from every customs field sent to EasyPost and each item's declared
+    fields, so the inline payload dict, a CustomsInfoDTO dump and an SDK
+    CustomsInfo for the same goods agree (numbers as floats, empty values as
+    the default that would be sent). Customs given only by EasyPost id falls
+    back to the id.
+    """
+    if not customs_info:
+        return None
+
+    def field(source: Any, name: str) -> Any:
+        if isinstance(source, dict):
+            return source.get(name)
+        return getattr(source, name, None)
+
+    def canonical(name: str, value: Any) -> Any:
+        if value in (None, ""):
+            return CUSTOMS_SIGNATURE_DEFAULTS.get(name)
+        if name in CUSTOMS_ITEM_NUMERIC_FIELDS:
+            return round(float(value), 2)
+        if name == "customs_certify":
+            return bool(value)
+        return str(value).strip()
+
+    items = [
+        [canonical(name, field(item, name)) for name in CUSTOMS_ITEM_SIGNATURE_FIELDS]
+        for item in field(customs_info, "customs_items") or []
+    ]
+    if not items and field(customs_info, "id"):
+        return str(field(customs_info, "id"))
+    signature = {
+        name: canonical(name, field(customs_info, name)) for name in CUSTOMS_SIGNATURE_DEFAULTS
+    }
+    return json.dumps({**signature, "items": items}, sort_keys=True)
+
+
+def rate_quote_key(
+    to_address: dict[str, Any],
+    from_address: dict[str, Any],
+    parcel: dict[str, Any],
+    customs_info: Any = None,
+) -> tuple:
+    """
+    Canonical cache key for a rate quote.
+
+    Rates depend on the origin, the destination ZIP/country (not the
+    recipient), the parcel (rounded to 0.1 in/oz) and customs, so repeated
+    lines in a bulk sheet share one quote.
+    """
+    origin = normalize_address(from_address)
+    destination = normalize_address(to_address)
+
+    def fields(address: dict[str, Any], keys: tuple[str, ...]) -> tuple[str, ...]:
+        return tuple(str(address.get(key) or "").upper() for key in keys)
+
+    dest_state, dest_zip, dest_country = fields(destination, RATE_QUOTE_DESTINATION_FIELDS)
+    if dest_country in ("", "US"):
+        dest_zip = dest_zip.split("-")[0]  # ZIP+4 rates the same as ZIP5
+
+    return (
+        fields(origin, RATE_QUOTE_ORIGIN_FIELDS),
+        (dest_state, dest_zip, dest_country, str(destination.get("residential", ""))),
+        tuple(round(float(parcel.get(key) or 0), 1) for key in RATE_QUOTE_PARCEL_FIELDS),
+        str(parcel.get("predefined_package") or ""),
+        _customs_signature(customs_info),
+    )
+
+
+def shipment_plan_key(
+    to_address: dict[str, Any] | str,
+    from_address: dict[str, Any],
+    parcel: dict[str, Any],
+    customs_info: Any = None,
+) -> str:
+    """
+    Hash of one line's complete shipment inputs (normalized).
+
+    Unlike rate_quote_key() this covers the whole recipient, because the
+    rating-pass shipment itself is reused by create_shipment, not just its
+    prices. Empty fields are dropped so DTO dumps and sheet dicts agree.
+    """
+
+    def compact(values: dict[str, Any]) -> dict[str, Any]:
+        return {key: value for key, value in values.items() if value not in (None, "")}
+
+    if isinstance(to_address, dict):
+        to_address = compact(normalize_address(to_address))
+    payload = {
+        "to": to_address,
+        "from": compact(normalize_address(from_address)),
+        "parcel": {
+            key: round(float(value), 1) if isinstance(value, int | float) else value
+            for key, value in compact(parcel).items()
+        },
+        "customs": _customs_signature(customs_info),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
 
 class AddressModel(BaseModel):
     """Address model with input validation and length limits."""
@@ -127,8 +327,37 @@ def _create_shipment_sync(...):
 
     This pattern is INTENTIONAL and necessary for proper async operation.
     Do not remove the sync methods or ThreadPoolExecutor.
+
+    ASYNC TRANSPORT (optional):
+    With `transport="async"` the hot operations (rates, shipment create/buy/
+    retrieve/list, tracking, address verification) skip the executor and call
+    the REST API through a pooled httpx client (`AsyncEasyPostTransport`), so
+    concurrency is bounded by the connection pool instead of 4 threads. Params
+    and result shaping are shared with the sync methods; everything else
+    (pre-created customs, refunds) still goes through the SDK.
+
+    INLINE CUSTOMS:
+    With `inline_customs` (default) customs are built locally as plain dicts and
+    nested in the shipment/rate request, so an N-item international order costs
+    one round trip instead of N + 2.
+
+    RATE-THEN-CREATE:
+    The shipment get_rates creates for a quote is kept per line
+    (`shipment_plan_key`) for `plan_cache_ttl` seconds; create_shipment on
+    the same inputs reuses it (and its rate ids) instead of creating again.
+
+    RATE LIMITING:
+    Every HTTP request on either transport takes a token from `rate_limiter`
+    (process-wide `TokenBucketRateLimiter` by default). SDK requests wait in
+    the client's request hook on their worker thread; async-transport requests
+    await before sending. 429 responses and Retry-After headers slow the
+    shared bucket down for all callers.
     """
 
+    TRANSPORTS = ("sdk", "async")
+    # "always": re-fetch every new shipment; "auto": only when rates look incomplete
+    RETRIEVE_MODES = ("auto", "always")
+
     # Carrier accounts: Specific carrier account IDs for this API key
     # These accounts are linked to the production API key
     CARRIER_ACCOUNTS = [
@@ -140,7 +369,26 @@ def _create_shipment_sync(...):
         "ca_058c52faac6144a3bbc5f653364cb981",  # USPS
     ]
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        transport: str = "sdk",
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        rate_limiter: TokenBucketRateLimiter | None = None,
+        rate_cache_ttl: float = DEFAULT_RATE_CACHE_TTL,
+        rate_cache_size: int = DEFAULT_RATE_CACHE_SIZE,
+        retrieve_mode: str = "auto",
+        ledger: ShipmentLedger | None = None,
+        ledger_max_age: float = DEFAULT_LEDGER_MAX_AGE,
+        tracking_cache_ttl: float = DEFAULT_TRACKING_CACHE_TTL,
+        tracking_final_ttl: float = DEFAULT_TRACKING_FINAL_TTL,
+        tracking_cache_size: int = DEFAULT_TRACKING_CACHE_SIZE,
+        inline_customs: bool = True,
+        warehouse_registry: WarehouseAddressRegistry | None = None,
+        plan_cache_ttl: float = DEFAULT_PLAN_CACHE_TTL,
+        plan_cache_size: int = DEFAULT_PLAN_CACHE_SIZE,
+        api_base: str | None = None,
+    ):
         self.api_key = api_key
         self.logger = logging.getLogger(__name__)
 
@@ -152,37 +400,105 @@ def __init__(self, api_key: str):
             self.logger.warning(f"API key format unexpected: {api_key[:10]}...")
 
         self.logger.info(f"Initializing EasyPost client with key: {api_key[:10]}...")
-        self.client = easypost.EasyPostClient(api_key)
-
-        # Add HTTP hooks for monitoring
-        self.client.subscribe_to_request_hook(self._log_api_request)
-        self.client.subscribe_to_response_hook(self._log_api_response)
+        # api_base points both transports at another host (e.g. a local fake API)
+        if api_base:
+            self.client = easypost.EasyPostClient(api_key, api_base=api_base.rstrip("/"))
+        else:
+            self.client = easypost.EasyPostClient(api_key)
+
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        # Rate quotes keyed by rate_quote_key(); ttl <= 0 disables caching
+        self.rate_cache = TTLCache(maxsize=rate_cache_size, ttl=rate_cache_ttl)
+        # Unpurchased shipments from create_shipment, so buying skips a retrieve
+        self.shipment_cache = TTLCache(maxsize=SHIPMENT_CACHE_SIZE, ttl=SHIPMENT_CACHE_TTL)
+        # Shipments created by get_rates, keyed by shipment_plan_key(); create_shipment
+        # on the same line claims one instead of creating it again. ttl <= 0 disables
+        self.plan_cache = TTLCache(maxsize=plan_cache_size, ttl=plan_cache_ttl)
+        self._plan_lock = threading.Lock()
+        self._plan_counts = {"planned": 0, "reused": 0}
+        # Write-through shipment ledger; reads younger than ledger_max_age skip EasyPost
+        self.ledger = ledger
+        self.ledger_max_age = ledger_max_age
+        # get_tracking results by tracking code; delivered/returned trackers live longer.
+        # Webhook events (ingest_tracker_event) refresh entries in place.
+        self.tracking_cache = TTLCache(maxsize=tracking_cache_size, ttl=tracking_cache_ttl)
+        self.tracking_final_ttl = tracking_final_ttl
+        # Send customs_info (items nested) inside the shipment request instead of
+        # creating each customs_item and the customs_info first
+        self.inline_customs = inline_customs
+        # Warehouse origins are registered once and sent as {"id": "adr_..."}
+        self.warehouse_registry = warehouse_registry
+
+        # Add HTTP hooks for rate limiting and monitoring
+        self.client.subscribe_to_request_hook(self._throttle_sdk_request)
+        self.client.subscribe_to_request_hook(self._mark_api_request)
+        self.client.subscribe_to_response_hook(self._observe_rate_limit)
+        self.client.subscribe_to_response_hook(self._record_api_response)
+        # (perf_counter at send, request bytes) by request_uuid until the response
+        self._api_started: dict[Any, tuple[float, int]] = {}
+        self._api_started_lock = threading.Lock()
+
+        if retrieve_mode not in self.RETRIEVE_MODES:
+            raise ValueError(f"Unknown shipment retrieve mode: {retrieve_mode!r}")
+        self.retrieve_mode = retrieve_mode
+        self._retrieve_lock = threading.Lock()
+        self._retrieve_counts = {"created": 0, "retrieved": 0, "skipped": 0}
+
+        if transport not in self.TRANSPORTS:
+            raise ValueError(f"Unknown EasyPost transport: {transport!r}")
+        self.transport: AsyncEasyPostTransport | None = None
+        if transport == "async":
+            self.transport = AsyncEasyPostTransport(
+                api_key,
+                api_base=self.client.api_base,
+                max_connections=max_connections,
+                rate_limiter=self.rate_limiter,
+            )
+            self.transport.subscribe_to_request_hook(self._mark_api_request)
+            self.transport.subscribe_to_response_hook(self._observe_rate_limit)
+            self.transport.subscribe_to_response_hook(self._record_api_response)
+            self.logger.info(
+                f"Async HTTP transport enabled (max {max_connections} connections)"
+            )
 
         # Simplified for personal use: 4 workers (plenty for API concurrency)
         cpu_count = multiprocessing.cpu_count()
         max_workers = 4  # Fixed 4 workers for I/O-bound tasks
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.executor = InstrumentedThreadPoolExecutor(max_workers=max_workers, name="easypost")
+        self._closed = False
         self.logger.info(
             f"ThreadPoolExecutor initialized: {max_workers} workers on {cpu_count} cores"
         )
 
     def shutdown(self):
-        """Shutdown ThreadPoolExecutor gracefully."""
-        if hasattr(self, "executor"):
+        """Shutdown ThreadPoolExecutor gracefully (safe to call more than once)."""
+        if hasattr(self, "executor") and not self._closed:
+            self._closed = True
             self.logger.info("Shutting down EasyPost service ThreadPoolExecutor...")
             self.executor.shutdown(wait=True, cancel_futures=False)
             self.logger.info("ThreadPoolExecutor shutdown complete")
+            if self.ledger is not None:
+                self.ledger.close()
+
+    async def aclose(self):
+        """Close the async transport pool (if any), then shut down the executor."""
+        if self.transport is not None:
+            await self.transport.aclose()
+        self.shutdown()
 
     async def _api_call_with_retry(
         self, func: callable, *args, max_retries: int = 3
     ) -> Any:
         """
-        Execute API call with exponential backoff on rate limits.
+        Execute API call, retrying on rate limits.
 
-        Handles 429 (rate limit) errors with progressive delays.
+        On a 429 the shared rate limiter is told to back off; the retry then
+        waits for its next token, so pacing (including Retry-After) is decided
+        in one place for every caller.
 
         Args:
-            func: Sync function to execute in thread pool
+            func: Sync function to execute in thread pool, or coroutine function
+                (async transport) to await directly
             *args: Positional arguments for func
             max_retries: Maximum retry attempts (default: 3)
 
@@ -192,26 +508,21 @@ async def _api_call_with_retry(
         Raises:
             Exception: If max retries exceeded or non-retryable error
         """
-        import random
-
         for attempt in range(max_retries):
             try:
+                if asyncio.iscoroutinefunction(func):
+                    return await func(*args)
                 loop = asyncio.get_running_loop()
                 return await loop.run_in_executor(self.executor, func, *args)
             except Exception as e:
-                # Check if it's a rate limit error (429)
-                is_rate_limit = (
-                    hasattr(e, "http_status") and e.http_status == 429
-                ) or "429" in str(e).lower()
-
-                if is_rate_limit and attempt < max_retries - 1:
-                    # Exponential backoff: 2^attempt + random jitter
-                    wait_time = (2**attempt) + random.uniform(0, 1)  # noqa: S311
+                if _is_rate_limited(e) and attempt < max_retries - 1:
+                    # Response hook usually recorded this already (with Retry-After);
+                    # the limiter's cooldown keeps a double report from compounding
+                    self.rate_limiter.record_rate_limited()
                     self.logger.warning(
                         f"Rate limit hit (attempt {attempt + 1}/{max_retries}), "
-                        f"waiting {wait_time:.1f}s..."
+                        f"retrying at {self.rate_limiter.rate:.2f} req/s..."
                     )
-                    await asyncio.sleep(wait_time)
                     continue
 
                 # Non-retryable error or max retries exceeded
@@ -219,28 +530,75 @@ async def _api_call_with_retry(
 
         raise Exception(f"Max retries ({max_retries}) exceeded")
 
-    def _log_api_request(self, **kwargs):
-        """Log outgoing API requests for debugging."""
+    def _throttle_sdk_request(self, **_kwargs):
+        """SDK request hook: wait for a rate-limit token on the worker thread."""
+        self.rate_limiter.acquire_blocking()
+
+    def _observe_rate_limit(self, **kwargs):
+        """Response hook: feed status and Retry-After back into the limiter."""
+        try:
+            self.rate_limiter.observe_response(
+                kwargs.get("http_status", 0), kwargs.get("headers")
+            )
+        except Exception as e:
+            self.logger.error(f"Error in rate limit hook: {e}")
+
+    def _mark_api_request(self, **kwargs):
+        """
+        Request hook: remember when the request left and how large it was.
+
+        Runs after the rate-limit wait, so the paired duration is EasyPost's
+        own latency. Keyed by the SDK/transport `request_uuid`.
+        """
         try:
-            method = kwargs.get("method", "UNKNOWN")
-            url = kwargs.get("url", "UNKNOWN")
-            self.logger.debug(f"EasyPost API Request: {method} {url}")
+            request_uuid = kwargs.get("request_uuid")
+            if request_uuid is None:
+                return
+            request_bytes = _payload_size(kwargs.get("request_body"))
+            with self._api_started_lock:
+                self._api_started[request_uuid] = (time.perf_counter(), request_bytes)
+                # Requests that failed before a response never pop their mark
+                while len(self._api_started) > API_TIMING_MAX_PENDING:
+                    self._api_started.pop(next(iter(self._api_started)))
+            self.logger.debug(
+                f"EasyPost API Request [{str(request_uuid)[:8]}]: "
+                f"{kwargs.get('method', 'UNKNOWN')} {kwargs.get('path', 'UNKNOWN')}"
+            )
         except Exception as e:
             self.logger.error(f"Error in request hook: {e}")
 
-    def _log_api_response(self, **kwargs):
-        """Log API responses and track errors."""
+    def _record_api_response(self, **kwargs):
+        """
+        Response hook: pair with the request, then record and log the call.
+
+        Duration, status and payload sizes go to the process-wide metrics
+        (by normalized operation) and to the active `trace_api_calls()`
+        trace, if any.
+        """
         try:
             status = kwargs.get("http_status", 0)
-            url = kwargs.get("url", "UNKNOWN")
-
+            request_uuid = kwargs.get("request_uuid")
+            operation = easypost_operation(kwargs.get("method", "GET"), kwargs.get("path", ""))
+            with self._api_started_lock:
+                started, request_bytes = self._api_started.pop(request_uuid, (None, 0))
+            seconds = time.perf_counter() - started if started is not None else None
+            response_body = kwargs.get("response_body")
+            response_bytes = _payload_size(response_body)
+
+            metrics.observe_easypost(operation, status, seconds, request_bytes, response_bytes)
+            trace = current_api_trace()
+            if trace is not None:
+                trace.record(operation, status, seconds, request_bytes, response_bytes)
+
+            timing = f"{seconds * 1000:.1f} ms" if seconds is not None else "unpaired"
+            line = (
+                f"EasyPost API {status} [{str(request_uuid)[:8]}]: {operation} in {timing} "
+                f"(sent {request_bytes} B, received {response_bytes} B)"
+            )
             if status >= 400:
-                response_body = kwargs.get("response_body", "N/A")
-                self.logger.error(
-                    f"EasyPost API Error: {status} - {url}\nResponse: {response_body}"
-                )
-            elif 200 <= status < 300:
-                self.logger.debug(f"EasyPost API Success: {status} - {url}")
+                self.logger.error(f"{line}\nResponse: {response_body}")
+            else:
+                self.logger.debug(line)
         except Exception as e:
             self.logger.error(f"Error in response hook: {e}")
 
@@ -274,11 +632,14 @@ async def create_shipment(
         Returns:
             Dict with status, shipment data (id, tracking_code, rates, etc.)
         """
+        create = (
+            self._create_shipment_async
+            if self.transport is not None
+            else self._create_shipment_sync
+        )
         try:
-            loop = asyncio.get_running_loop()
-            return await loop.run_in_executor(
-                self.executor,
-                self._create_shipment_sync,
+            return await self._api_call_with_retry(
+                create,
                 to_address,
                 from_address,
                 parcel,
@@ -306,112 +667,429 @@ def _create_shipment_sync(
         duty_payment: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
         """Synchronous shipment creation with optional label purchase."""
+        shipment = None
         try:
             service_info = f" / {service}" if service else ""
             self.logger.info(f"Creating shipment with {carrier}{service_info}")
 
-            # Normalize addresses before API call - don't normalize if already preprocessed
-            # EasyPost SDK accepts address dicts
-            # Note: to_address may already be preprocessed (state removed for international)
-            if isinstance(to_address, dict):
-                # Only normalize country code, don't re-add state field
-                to_address_param = normalize_address(to_address)
-            else:
-                to_address_param = to_address
+            planned = self._claim_planned_shipment(
+                to_address, from_address, parcel, customs_info, duty_payment
+            )
+            shipment = planned
+            if shipment is None:
+                shipment_params = self._build_shipment_params(
+                    to_address,
+                    from_address,
+                    parcel,
+                    duty_payment,
+                    from_address_id=self._warehouse_address_id(from_address),
+                )
 
-            # Normalize from_address (always a dict)
-            from_address_param = normalize_address(from_address)
+                if customs_info:
+                    # Centralised customs creation
+                    created_customs = self._create_customs_info(customs_info, parcel)
+                    if created_customs:
+                        shipment_params["customs_info"] = created_customs
 
-            # For international shipments, create customs_info if not provided
-            shipment_params = {
-                "to_address": to_address_param,
-                "from_address": from_address_param,
-                "parcel": parcel,
-            }
+                shipment = self.client.shipment.create(**shipment_params)
 
-            # Add carrier_accounts only if specified (None = use all enabled accounts)
-            if self.CARRIER_ACCOUNTS is not None:
-                shipment_params["carrier_accounts"] = self.CARRIER_ACCOUNTS
+            # Re-fetch only if some carrier_accounts have not reported rates yet
+            if self._needs_retrieve(shipment, count=planned is None):
+                shipment = self.client.shipment.retrieve(shipment.id)
+            if not buy_label:
+                self.shipment_cache.set(shipment.id, shipment)
+            self._ledger_record(shipment)
 
-            if customs_info:
-                # Centralised customs creation
-                created_customs = self._create_customs_info(customs_info, parcel)
-                if created_customs:
-                    shipment_params["customs_info"] = created_customs
+            result = self._created_shipment_result(shipment)
 
-            # Add duty_payment for DDP/DDU (FedEx/UPS international shipments)
-            if duty_payment:
-                shipment_params["duty_payment"] = duty_payment
+            # Optionally buy label - REQUIRES explicit rate_id
+            if buy_label:
+                rate_obj = self._select_purchase_rate(shipment, rate_id)
 
-            shipment = self.client.shipment.create(**shipment_params)
+                # Buy the label using the selected rate
+                bought_shipment = self._buy_created_shipment_sync(shipment.id, rate_id)
+                self._ledger_record(bought_shipment)
+                result.update(self._purchase_summary(bought_shipment, rate_obj))
 
-            # Retrieve shipment fresh to ensure all rates are populated from carrier_accounts
-            shipment = self.client.shipment.retrieve(shipment.id)
-
-            # Get all rates
-            rates = [
-                {
-                    "id": rate.id,
-                    "carrier": rate.carrier,
-                    "service": rate.service,
-                    "rate": rate.rate,
-                    "delivery_days": rate.delivery_days,
-                }
-                for rate in shipment.rates
-            ]
+            self.logger.info(f"Shipment created: {shipment.id}")
+            return result
 
-            result = {
-                "status": "success",
-                "id": shipment.id,
-                "tracking_code": shipment.tracking_code,
-                "rates": rates,
-            }
+        except Exception as e:
+            if _is_rate_limited(e) and shipment is None:
+                raise  # nothing created yet: _api_call_with_retry may re-run it
+            return self._create_shipment_error(e, shipment)
 
-            # Optionally buy label - REQUIRES explicit rate_id
-            if buy_label:
-                if not rate_id:
-                    raise ValueError(
-                        "rate_id is required when buy_label=True. "
-                        "Create shipment first, select a rate, then purchase with buy_shipment()."
-                    )
+    async def _create_shipment_async(
+        self,
+        to_address: dict[str, Any] | str,
+        from_address: dict[str, Any],
+        parcel: dict[str, Any],
+        carrier: str,
+        service: str | None,
+        buy_label: bool,
+        rate_id: str | None = None,
+        customs_info: dict[str, Any] | None = None,
+        duty_payment: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Shipment creation over the async transport (same contract as the sync path)."""
+        shipment = None
+        try:
+            service_info = f" / {service}" if service else ""
+            self.logger.info(f"Creating shipment with {carrier}{service_info} (async)")
 
-                # Find the rate object matching the rate_id
-                rate_obj = None
-                for r in shipment.rates:
-                    if r.id == rate_id:
-                        rate_obj = r
-                        break
+            planned = self._claim_planned_shipment(
+                to_address, from_address, parcel, customs_info, duty_payment
+            )
+            shipment = planned
+            if shipment is None:
+                shipment_params = self._build_shipment_params(
+                    to_address,
+                    from_address,
+                    parcel,
+                    duty_payment,
+                    from_address_id=await self._warehouse_address_id_async(from_address),
+                )
 
-                if not rate_obj:
-                    raise ValueError(
-                        f"Rate {rate_id} not found in shipment rates. "
-                        f"Available rates: {[r.id for r in shipment.rates]}"
-                    )
+                if customs_info:
+                    created_customs = await self._create_customs_info_async(customs_info, parcel)
+                    if created_customs:
+                        shipment_params["customs_info"] = created_customs
 
-                # Buy the label using the selected rate
-                bought_shipment = self.client.shipment.buy(
-                    shipment.id, rate={"id": rate_id}
+                shipment = await self.transport.post(
+                    "/shipments", {"shipment": shipment_params}
                 )
-                result["postage_label_url"] = bought_shipment.postage_label.label_url
-                result["purchased_rate"] = {
-                    "carrier": rate_obj.carrier,
-                    "service": rate_obj.service,
-                    "rate": rate_obj.rate,
-                }
-                result["tracking_code"] = bought_shipment.tracking_code
+            if self._needs_retrieve(shipment, count=planned is None):
+                shipment = await self.transport.get(f"/shipments/{shipment.id}")
+            if not buy_label:
+                self.shipment_cache.set(shipment.id, shipment)
+            self._ledger_record(shipment)
+
+            result = self._created_shipment_result(shipment)
+
+            if buy_label:
+                rate_obj = self._select_purchase_rate(shipment, rate_id)
+                bought_shipment = await self._buy_created_shipment_async(shipment.id, rate_id)
+                self._ledger_record(bought_shipment)
+                result.update(self._purchase_summary(bought_shipment, rate_obj))
 
             self.logger.info(f"Shipment created: {shipment.id}")
             return result
 
         except Exception as e:
-            error_msg = str(e)
-            self.logger.error(f"Failed to create shipment: {error_msg}", exc_info=True)
-            # Include full error details for debugging
-            return {
-                "status": "error",
-                "message": error_msg,
-                "error_type": type(e).__name__,
+            if _is_rate_limited(e) and shipment is None:
+                raise  # nothing created yet: _api_call_with_retry may re-run it
+            return self._create_shipment_error(e, shipment)
+
+    def _build_shipment_params(
+        self,
+        to_address: dict[str, Any] | str,
+        from_address: dict[str, Any],
+        parcel: dict[str, Any],
+        duty_payment: dict[str, Any] | None = None,
+        *,
+        from_address_id: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Build shipment create params shared by the SDK and async transports.
+
+        With `from_address_id` (a registered warehouse) the origin is sent as
+        an id reference instead of the full address.
+        """
+        # Normalize addresses before API call - don't normalize if already preprocessed
+        # Note: to_address may already be preprocessed (state removed for international)
+        # or an address ID string
+        if isinstance(to_address, dict):
+            # Only normalize country code, don't re-add state field
+            to_address_param = normalize_address(to_address)
+        else:
+            to_address_param = to_address
+
+        shipment_params = {
+            "to_address": to_address_param,
+            "from_address": (
+                {"id": from_address_id} if from_address_id else normalize_address(from_address)
+            ),
+            "parcel": parcel,
+        }
+
+        # Add carrier_accounts only if specified (None = use all enabled accounts)
+        if self.CARRIER_ACCOUNTS is not None:
+            shipment_params["carrier_accounts"] = self.CARRIER_ACCOUNTS
+
+        # Add duty_payment for DDP/DDU (FedEx/UPS international shipments)
+        if duty_payment:
+            shipment_params["duty_payment"] = duty_payment
+
+        return shipment_params
+
+    def _warehouse_address_id(self, from_address: Any) -> str | None:
+        """Registered id of a warehouse origin (registers it on first use; blocking)."""
+        if self.warehouse_registry is None:
+            return None
+        return self.warehouse_registry.resolve(self.client, from_address)
+
+    async def _warehouse_address_id_async(self, from_address: Any) -> str | None:
+        """Async variant: first registration runs on the executor."""
+        if self.warehouse_registry is None:
+            return None
+        address_id = self.warehouse_registry.lookup(self.client, from_address)
+        if address_id is None and self.warehouse_registry.is_warehouse(from_address):
+            loop = asyncio.get_running_loop()
+            address_id = await loop.run_in_executor(
+                self.executor, self._warehouse_address_id, from_address
+            )
+        return address_id
+
+    async def register_warehouse_addresses(self) -> dict[str, int]:
+        """Register every warehouse origin up front (startup warm-up)."""
+        if self.warehouse_registry is None:
+            return {"registered": 0, "failed": 0}
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, self.warehouse_registry.register_all, self.client
+        )
+
+    def _ledger_record(self, shipment: Any, **fields: Any) -> None:
+        """Write a shipment object through to the ledger (plus extra fields)."""
+        if self.ledger is not None:
+            self._ledger_store([{**self._shipment_to_dict(shipment), **fields}])
+
+    def _ledger_store(self, records: list[dict[str, Any]]) -> None:
+        """Write normalized shipment dicts to the ledger; failures never reach callers."""
+        if self.ledger is None:
+            return
+        try:
+            self.ledger.record_many(records)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            self.logger.warning(f"Shipment ledger write failed: {e}")
+
+    def _ledger_lookup(self, shipment_id: str, max_age: float | None) -> dict[str, Any] | None:
+        """Fresh ledger copy of a shipment, or None to go to EasyPost."""
+        max_age = self.ledger_max_age if max_age is None else max_age
+        if self.ledger is None or max_age <= 0:
+            return None
+        try:
+            record = self.ledger.get(shipment_id, max_age=max_age)
+        except sqlite3.Error as e:
+            self.logger.warning(f"Shipment ledger read failed: {e}")
+            return None
+        self.ledger.count_hit(record is not None)
+        return record
+
+    def _rates_incomplete(self, shipment: Any) -> bool:
+        """
+        True if the created shipment lacks rates for a configured carrier account.
+
+        A carrier account counts as reported once it has a rate or a message
+        (carriers that cannot quote a lane answer with a message, not a rate).
+        """
+        rates = getattr(shipment, "rates", None) or []
+        if not rates:
+            return True
+        if not self.CARRIER_ACCOUNTS:
+            return False
+        reported = {getattr(rate, "carrier_account_id", None) for rate in rates}
+        for message in getattr(shipment, "messages", None) or []:
+            if isinstance(message, dict):
+                reported.add(message.get("carrier_account_id"))
+            else:
+                reported.add(getattr(message, "carrier_account_id", None))
+        return not set(self.CARRIER_ACCOUNTS) <= reported
+
+    def _needs_retrieve(self, shipment: Any, count: bool = True) -> bool:
+        """
+        Decide whether a shipment must be re-fetched for rates.
+
+        Only shipments created here are counted; rating-pass shipments claimed
+        by create_shipment were not created by this call.
+        """
+        needed = self.retrieve_mode == "always" or self._rates_incomplete(shipment)
+        if count:
+            with self._retrieve_lock:
+                self._retrieve_counts["created"] += 1
+                self._retrieve_counts["retrieved" if needed else "skipped"] += 1
+        return needed
+
+    def _plan_shipment(
+        self,
+        shipment: Any,
+        to_address: dict[str, Any],
+        from_address: dict[str, Any],
+        parcel: dict[str, Any],
+        customs_info: Any,
+    ) -> None:
+        """Keep a rating-pass shipment for create_shipment on the same line."""
+        if not self.plan_cache.enabled:
+            return
+        self.plan_cache.set(
+            shipment_plan_key(to_address, from_address, parcel, customs_info), shipment
+        )
+        with self._plan_lock:
+            self._plan_counts["planned"] += 1
+
+    def _claim_planned_shipment(
+        self,
+        to_address: dict[str, Any] | str,
+        from_address: dict[str, Any],
+        parcel: dict[str, Any],
+        customs_info: Any,
+        duty_payment: dict[str, Any] | None,
+    ) -> Any | None:
+        """
+        Take the rating-pass shipment for this line, if still valid.
+
+        Each planned shipment is handed out once, so duplicate lines still get
+        their own shipments. Rating never sends duty_payment, so lines with it
+        always create afresh.
+        """
+        if duty_payment or not self.plan_cache.enabled:
+            return None
+        key = shipment_plan_key(to_address, from_address, parcel, customs_info)
+        with self._plan_lock:
+            shipment = self.plan_cache.get(key)
+            if shipment is None:
+                return None
+            self.plan_cache.pop(key)
+            self._plan_counts["reused"] += 1
+        self.logger.info(f"Reusing shipment {shipment.id} from the rating pass")
+        return shipment
+
+    def plan_stats(self) -> dict[str, Any]:
+        """How many rating-pass shipments were kept and later reused."""
+        with self._plan_lock:
+            counts = dict(self._plan_counts)
+        return {**counts, "cache": self.plan_cache.stats()}
+
+    def retrieve_stats(self) -> dict[str, Any]:
+        """How often a created shipment needed the follow-up retrieve call."""
+        with self._retrieve_lock:
+            counts = dict(self._retrieve_counts)
+        created = counts["created"]
+        return {
+            "mode": self.retrieve_mode,
+            **counts,
+            "retrieve_ratio": round(counts["retrieved"] / created, 4) if created else 0.0,
+        }
+
+    @staticmethod
+    def _rates_to_list(shipment: Any) -> list[dict[str, Any]]:
+        """Flatten shipment rates to serializable dicts."""
+        return [
+            {
+                "id": rate.id,
+                "carrier": rate.carrier,
+                "service": rate.service,
+                "rate": rate.rate,
+                "delivery_days": rate.delivery_days,
             }
+            for rate in shipment.rates
+        ]
+
+    def _created_shipment_result(self, shipment: Any) -> dict[str, Any]:
+        return {
+            "status": "success",
+            "id": shipment.id,
+            "tracking_code": shipment.tracking_code,
+            "rates": self._rates_to_list(shipment),
+        }
+
+    @staticmethod
+    def _select_purchase_rate(shipment: Any, rate_id: str | None) -> Any:
+        """Return the shipment rate matching rate_id, raising if absent."""
+        if not rate_id:
+            raise ValueError(
+                "rate_id is required when buy_label=True. "
+                "Create shipment first, select a rate, then purchase with buy_shipment()."
+            )
+
+        for rate in shipment.rates:
+            if rate.id == rate_id:
+                return rate
+
+        raise ValueError(
+            f"Rate {rate_id} not found in shipment rates. "
+            f"Available rates: {[r.id for r in shipment.rates]}"
+        )
+
+    @staticmethod
+    def _purchase_summary(bought_shipment: Any, rate_obj: Any) -> dict[str, Any]:
+        return {
+            "postage_label_url": bought_shipment.postage_label.label_url,
+            "purchased_rate": {
+                "carrier": rate_obj.carrier,
+                "service": rate_obj.service,
+                "rate": rate_obj.rate,
+            },
+            "tracking_code": bought_shipment.tracking_code,
+        }
+
+    def _create_shipment_error(self, e: Exception, shipment: Any = None) -> dict[str, Any]:
+        error_msg = str(e)
+        self.logger.error(f"Failed to create shipment: {error_msg}", exc_info=True)
+        # Include full error details for debugging
+        error = {
+            "status": "error",
+            "message": error_msg,
+            "error_type": type(e).__name__,
+        }
+        if shipment is not None:
+            # Created but not bought: the caller can retry buy_shipment on this id
+            error["shipment_id"] = shipment.id
+        return error
+
+    def _buy_created_shipment_sync(
+        self, shipment_id: str, rate_id: str, max_retries: int = 3
+    ) -> Any:
+        """
+        Buy a shipment this call created, retrying only the buy on a 429.
+
+        Re-running the whole create would leave the first shipment behind and
+        the caller's rate_id would not exist on the second one. The SDK request
+        hook waits for the limiter, so each retry is paced like any request.
+        """
+        for attempt in range(max_retries):
+            try:
+                return self.client.shipment.buy(shipment_id, rate={"id": rate_id})
+            except Exception as e:
+                if not _is_rate_limited(e) or attempt == max_retries - 1:
+                    raise
+                self.rate_limiter.record_rate_limited()
+                self.logger.warning(
+                    f"Rate limit hit buying {shipment_id} "
+                    f"(attempt {attempt + 1}/{max_retries}), retrying the buy..."
+                )
+        raise Exception(f"Max retries ({max_retries}) exceeded")
+
+    async def _buy_created_shipment_async(
+        self, shipment_id: str, rate_id: str, max_retries: int = 3
+    ) -> Any:
+        """Async-transport variant of `_buy_created_shipment_sync`."""
+        for attempt in range(max_retries):
+            try:
+                return await self.transport.post(
+                    f"/shipments/{shipment_id}/buy", {"rate": {"id": rate_id}}
+                )
+            except Exception as e:
+                if not _is_rate_limited(e) or attempt == max_retries - 1:
+                    raise
+                self.rate_limiter.record_rate_limited()
+                self.logger.warning(
+                    f"Rate limit hit buying {shipment_id} "
+                    f"(attempt {attempt + 1}/{max_retries}), retrying the buy..."
+                )
+        raise Exception(f"Max retries ({max_retries}) exceeded")
+
+    async def _create_customs_info_async(
+        self, customs_info: dict[str, Any], parcel: dict[str, Any]
+    ):
+        """Customs creation stays on the SDK (cached); offload it to the executor."""
+        if self.inline_customs:
+            # Building the inline payload makes no API calls
+            return self._create_customs_info(customs_info, parcel)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, self._create_customs_info, customs_info, parcel
+        )
 
     async def refund_shipment(self, shipment_id: str) -> dict[str, Any]:
         """
@@ -441,6 +1119,9 @@ def _refund_shipment_sync(self, shipment_id: str) -> dict[str, Any]:
             self.logger.info(f"Refunding shipment {shipment_id}")
             shipment = self.client.shipment.retrieve(shipment_id)
             refund = self.client.shipment.refund(shipment.id)
+            self._ledger_record(
+                shipment, refund_status=getattr(refund, "refund_status", None) or "submitted"
+            )
 
             return {
                 "status": "success",
@@ -483,10 +1164,13 @@ async def buy_shipment(self, shipment_id: str, rate_id: str) -> dict[str, Any]:
         Returns:
             Dict with status and label information
         """
+        buy = (
+            self._buy_shipment_async
+            if self.transport is not None
+            else self._buy_shipment_sync
+        )
         try:
-            return await self._api_call_with_retry(
-                self._buy_shipment_sync, shipment_id, rate_id
-            )
+            return await self._api_call_with_retry(buy, shipment_id, rate_id)
         except Exception as e:
             self.logger.error(f"Error buying shipment: {sanitize_error(e)}")
             return {
@@ -495,6 +1179,169 @@ async def buy_shipment(self, shipment_id: str, rate_id: str) -> dict[str, Any]:
                 "timestamp": datetime.now(UTC).isoformat(),
             }
 
+    async def purchase_shipment(
+        self,
+        to_address: dict[str, Any],
+        from_address: dict[str, Any],
+        parcel: dict[str, Any],
+        rate_id: str | None = None,
+        carrier: str | None = None,
+        customs_info: dict[str, Any] | None = None,
+        duty_payment: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Create one shipment, pick its rate locally, and buy it.
+
+        `rate_id` may come from the new shipment or from an earlier quote
+        (get_rates); a quoted rate is matched to the same carrier/service on
+        the new shipment via the rate cache. A `rate_id` that cannot be
+        matched (quote expired or evicted, cache off, service no longer
+        offered) is an error and nothing is bought. Without a `rate_id` the
+        rate is chosen by `select_best_rate` using the `carrier` preference
+        (e.g. "USPS- Priority"), falling back to the cheapest rate.
+
+        Args:
+            to_address: Destination address dict
+            from_address: Origin address dict
+            parcel: Package dimensions dict
+            rate_id: Optional rate ID from this or a previous quote
+            carrier: Optional carrier/service preference
+            customs_info: Optional customs info for international shipments
+            duty_payment: Optional duty payment info for DDP/DDU
+
+        Returns:
+            Purchase result with data.timings_ms per stage (create/select/buy/total)
+        """
+        # Deferred: bulk_helpers imports the tools package, which imports this module
+        from src.mcp_server.tools.bulk_helpers import select_best_rate
+
+        timings: dict[str, float] = {}
+        started = stage_start = time.perf_counter()
+
+        def lap(stage: str) -> None:
+            nonlocal stage_start
+            now = time.perf_counter()
+            timings[stage] = round((now - stage_start) * 1000, 1)
+            stage_start = now
+
+        def failed(message: str) -> dict[str, Any]:
+            timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+            return {
+                "status": "error",
+                "data": {"timings_ms": timings},
+                "message": message,
+                "timestamp": datetime.now(UTC).isoformat(),
+            }
+
+        created = await self.create_shipment(
+            to_address=to_address,
+            from_address=from_address,
+            parcel=parcel,
+            buy_label=False,
+            customs_info=customs_info,
+            duty_payment=duty_payment,
+        )
+        lap("create")
+        if created.get("status") != "success":
+            return failed(created.get("message", "Failed to create shipment"))
+        rates = created.get("rates") or []
+
+        if rate_id:
+            selected = next((rate for rate in rates if rate["id"] == rate_id), None)
+            if selected is None:
+                quoted = self._find_quoted_rate(
+                    rate_id, to_address, from_address, parcel, customs_info
+                )
+                if quoted is not None:
+                    selected = next(
+                        (
+                            rate
+                            for rate in rates
+                            if rate["carrier"] == quoted.get("carrier")
+                            and rate["service"] == quoted.get("service")
+                        ),
+                        None,
+                    )
+            lap("select")
+            # Never substitute a different label for the one the caller picked
+            if selected is None:
+                return failed(
+                    f"Rate {rate_id} is no longer available for shipment {created['id']}; "
+                    "re-quote and retry"
+                )
+        else:
+            selected = select_best_rate(rates, purchase_labels=True, preferred_carrier=carrier)
+            lap("select")
+        if selected is None:
+            return failed(f"No rates available for shipment {created['id']}")
+
+        result = await self.buy_shipment(created["id"], selected["id"])
+        lap("buy")
+        timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+
+        result["data"] = {**(result.get("data") or {}), "timings_ms": timings}
+        if result.get("status") != "success":
+            return result
+
+        result["data"]["selected_rate"] = selected
+        self.logger.info(
+            f"Purchased {created['id']} ({selected['carrier']} {selected['service']}) "
+            f"in {timings['total']}ms: {timings}"
+        )
+        return result
+
+    def _find_quoted_rate(
+        self,
+        rate_id: str,
+        to_address: dict[str, Any],
+        from_address: dict[str, Any],
+        parcel: dict[str, Any],
+        customs_info: dict[str, Any] | None,
+    ) -> dict[str, Any] | None:
+        """Look up a previously quoted rate for the same shipment in the rate cache."""
+        cached = self.rate_cache.get(
+            rate_quote_key(to_address, from_address, parcel, customs_info)
+        )
+        return next((rate for rate in cached or [] if rate.get("id") == rate_id), None)
+
+    async def get_purchasable_shipment(self, shipment_id: str) -> Any:
+        """
+        Return an unpurchased shipment with its rates.
+
+        Served from the phase-1 shipment cache when possible; otherwise the
+        shipment is retrieved once and cached so the following buy_shipment()
+        does not fetch it again.
+        """
+        shipment = self.shipment_cache.get(shipment_id)
+        if shipment is not None:
+            return shipment
+
+        shipment = await self.get_shipment_object(shipment_id)
+        self.shipment_cache.set(shipment_id, shipment)
+        return shipment
+
+    async def get_shipment_object(self, shipment_id: str) -> Any:
+        """Retrieve the raw SDK shipment object (forms, postage label) with retry."""
+        if self.transport is not None:
+            return await self._api_call_with_retry(
+                self.transport.get, f"/shipments/{shipment_id}"
+            )
+        return await self._api_call_with_retry(
+            self.client.shipment.retrieve, shipment_id
+        )
+
+    async def generate_shipment_form(self, shipment_id: str, form_type: str) -> Any:
+        """Generate a shipment form (e.g. commercial_invoice) and return the updated shipment."""
+        if self.transport is not None:
+            return await self._api_call_with_retry(
+                self.transport.post,
+                f"/shipments/{shipment_id}/forms",
+                {"form": {"type": form_type}},
+            )
+        return await self._api_call_with_retry(
+            self.client.shipment.generate_form, shipment_id, form_type
+        )
+
     async def verify_address(
         self, address: dict[str, Any], carrier: str | None = None
     ) -> dict[str, Any]:
@@ -509,6 +1356,8 @@ async def verify_address(
             Dict with verification status and verified address
         """
         try:
+            if self.transport is not None:
+                return await self._verify_address_async(address, carrier)
             loop = asyncio.get_running_loop()
             return await loop.run_in_executor(
                 self.executor,
@@ -530,111 +1379,150 @@ def _verify_address_sync(
     ) -> dict[str, Any]:
         """Synchronous address verification."""
         try:
-            # Normalize address first
-            normalized = normalize_address(address)
-
-            # Prepare verification params
-            verify_params = {"verify": True}  # Always enable standard verification
-            if carrier and carrier.lower() in ["fedex", "ups"]:
-                # Carrier verification requires verify=True to be set first
-                verify_params["verify_carrier"] = carrier.lower()
+            normalized, address_fields, verify_params = self._verify_address_params(
+                address, carrier
+            )
 
             # Create and verify address - EasyPost SDK accepts kwargs directly
             verified_address = self.client.address.create(
-                street1=normalized.get("street1"),
-                street2=normalized.get("street2"),
-                city=normalized.get("city"),
-                state=normalized.get("state"),
-                zip=normalized.get("zip"),
-                country=normalized.get("country"),
-                name=normalized.get("name"),
-                company=normalized.get("company"),
-                phone=normalized.get("phone"),
-                email=normalized.get("email"),
-                **verify_params,
+                **address_fields, **verify_params
             )
+            return self._verification_result(verified_address, normalized, carrier)
+        except Exception as e:
+            return self._verify_address_error(e)
 
-            # Check verification results
-            verifications = (
-                verified_address.verifications
-                if hasattr(verified_address, "verifications")
-                else {}
-            )
-            delivery_verification = (
-                verifications.get("delivery", {}) if verifications else {}
+    async def _verify_address_async(
+        self, address: dict[str, Any], carrier: str | None = None
+    ) -> dict[str, Any]:
+        """Address verification over the async transport."""
+        try:
+            normalized, address_fields, verify_params = self._verify_address_params(
+                address, carrier
             )
-            carrier_verification = verifications.get("carrier", {}) if carrier else {}
-
-            # Log detailed verification results for debugging
-            delivery_success = delivery_verification.get("success", "N/A")
-            carrier_success = (
-                carrier_verification.get("success", "N/A") if carrier else "N/A"
+            verified_address = await self.transport.post(
+                "/addresses", {"address": address_fields, **verify_params}
             )
-            self.logger.info("Address verification results:")
-            self.logger.info(f"  - Delivery success: {delivery_success}")
-            self.logger.info(
-                f"  - Delivery errors: {delivery_verification.get('errors', [])}"
+            return self._verification_result(verified_address, normalized, carrier)
+        except Exception as e:
+            return self._verify_address_error(e)
+
+    @staticmethod
+    def _verify_address_params(
+        address: dict[str, Any], carrier: str | None
+    ) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any]]:
+        """Return (normalized address, address create fields, verify params)."""
+        # Normalize address first
+        normalized = normalize_address(address)
+
+        # Prepare verification params
+        verify_params = {"verify": True}  # Always enable standard verification
+        if carrier and carrier.lower() in ["fedex", "ups"]:
+            # Carrier verification requires verify=True to be set first
+            verify_params["verify_carrier"] = carrier.lower()
+
+        address_fields = {
+            field: normalized.get(field)
+            for field in (
+                "street1",
+                "street2",
+                "city",
+                "state",
+                "zip",
+                "country",
+                "name",
+                "company",
+                "phone",
+                "email",
             )
-            if carrier:
-                self.logger.info(f"  - Carrier ({carrier}) success: {carrier_success}")
-                self.logger.info(
-                    f"  - Carrier ({carrier}) errors: {carrier_verification.get('errors', [])}"
-                )
-            self.logger.info(f"  - Original street1: '{normalized.get('street1')}'")
-            self.logger.info(f"  - Verified street1: '{verified_address.street1}'")
-            self.logger.info(f"  - Original street2: '{normalized.get('street2')}'")
-            self.logger.info(f"  - Verified street2: '{verified_address.street2}'")
-
-            success = True
-            errors = []
-
-            if delivery_verification and not delivery_verification.get("success", True):
-                success = False
-                errors.extend(delivery_verification.get("errors", []))
-
-            if carrier_verification and not carrier_verification.get("success", True):
-                success = False
-                errors.extend(carrier_verification.get("errors", []))
-
-            # Log the verified address street1 for debugging FedEx issues
-            self.logger.info(f"Verified address street1: '{verified_address.street1}'")
-
-            status_value = "success" if success else "warning"
-            message = (
-                "Address verified successfully"
-                if success
-                else "Address verification had warnings"
+        }
+        return normalized, address_fields, verify_params
+
+    def _verification_result(
+        self, verified_address: Any, normalized: dict[str, Any], carrier: str | None
+    ) -> dict[str, Any]:
+        """Shape a verified EasyPost address into the verification response."""
+        # Check verification results
+        verifications = (
+            verified_address.verifications
+            if hasattr(verified_address, "verifications")
+            else {}
+        )
+        delivery_verification = (
+            verifications.get("delivery", {}) if verifications else {}
+        )
+        carrier_verification = verifications.get("carrier", {}) if carrier else {}
+
+        # Log detailed verification results for debugging
+        delivery_success = delivery_verification.get("success", "N/A")
+        carrier_success = (
+            carrier_verification.get("success", "N/A") if carrier else "N/A"
+        )
+        self.logger.info("Address verification results:")
+        self.logger.info(f"  - Delivery success: {delivery_success}")
+        self.logger.info(
+            f"  - Delivery errors: {delivery_verification.get('errors', [])}"
+        )
+        if carrier:
+            self.logger.info(f"  - Carrier ({carrier}) success: {carrier_success}")
+            self.logger.info(
+                f"  - Carrier ({carrier}) errors: {carrier_verification.get('errors', [])}"
             )
+        self.logger.info(f"  - Original street1: '{normalized.get('street1')}'")
+        self.logger.info(f"  - Verified street1: '{verified_address.street1}'")
+        self.logger.info(f"  - Original street2: '{normalized.get('street2')}'")
+        self.logger.info(f"  - Verified street2: '{verified_address.street2}'")
+
+        success = True
+        errors = []
+
+        if delivery_verification and not delivery_verification.get("success", True):
+            success = False
+            errors.extend(delivery_verification.get("errors", []))
+
+        if carrier_verification and not carrier_verification.get("success", True):
+            success = False
+            errors.extend(carrier_verification.get("errors", []))
+
+        # Log the verified address street1 for debugging FedEx issues
+        self.logger.info(f"Verified address street1: '{verified_address.street1}'")
+
+        status_value = "success" if success else "warning"
+        message = (
+            "Address verified successfully"
+            if success
+            else "Address verification had warnings"
+        )
 
-            return {
-                "status": status_value,
-                "data": {
-                    "address": {
-                        "id": verified_address.id,
-                        "street1": verified_address.street1,
-                        "street2": verified_address.street2,
-                        "city": verified_address.city,
-                        "state": verified_address.state,
-                        "zip": verified_address.zip,
-                        "country": verified_address.country,
-                        "name": verified_address.name,
-                        "company": verified_address.company,
-                        "phone": verified_address.phone,
-                        "email": verified_address.email,
-                    },
-                    "verification_success": success,
-                    "errors": errors,
+        return {
+            "status": status_value,
+            "data": {
+                "address": {
+                    "id": verified_address.id,
+                    "street1": verified_address.street1,
+                    "street2": verified_address.street2,
+                    "city": verified_address.city,
+                    "state": verified_address.state,
+                    "zip": verified_address.zip,
+                    "country": verified_address.country,
+                    "name": verified_address.name,
+                    "company": verified_address.company,
+                    "phone": verified_address.phone,
+                    "email": verified_address.email,
                 },
-                "message": message,
-                "timestamp": datetime.now(UTC).isoformat(),
-            }
-        except Exception as e:
-            self.logger.error(f"Address verification failed: {sanitize_error(e)}")
-            return {
-                "status": "error",
-                "message": str(e),
-                "timestamp": datetime.now(UTC).isoformat(),
-            }
+                "verification_success": success,
+                "errors": errors,
+            },
+            "message": message,
+            "timestamp": datetime.now(UTC).isoformat(),
+        }
+
+    def _verify_address_error(self, e: Exception) -> dict[str, Any]:
+        self.logger.error(f"Address verification failed: {sanitize_error(e)}")
+        return {
+            "status": "error",
+            "message": str(e),
+            "timestamp": datetime.now(UTC).isoformat(),
+        }
 
     def _buy_shipment_sync(self, shipment_id: str, rate_id: str) -> dict[str, Any]:
         """Synchronous label purchase."""
@@ -642,44 +1530,10 @@ def _buy_shipment_sync(self, shipment_id: str, rate_id: str) -> dict[str, Any]:
             self.logger.info(
                 f"Buying label for shipment {shipment_id} with rate {rate_id}"
             )
-            shipment = self.client.shipment.retrieve(shipment_id)
-
-            # Find the rate object matching the rate_id
-            rate_obj = None
-            for rate in shipment.rates:
-                if rate.id == rate_id:
-                    rate_obj = rate
-                    break
-
-            if not rate_obj:
-                raise ValueError(f"Rate {rate_id} not found in shipment rates")
-
-            # Log shipment details for debugging - especially address for FedEx
-            to_addr = shipment.to_address if hasattr(shipment, "to_address") else None
-            street1 = (
-                to_addr.street1 if to_addr and hasattr(to_addr, "street1") else None
-            )
-            has_duty = (
-                hasattr(shipment, "duty_payment") and shipment.duty_payment is not None
-            )
-            self.logger.info(
-                f"Shipment details: id={shipment.id}, status={shipment.status}, "
-                f"carrier={rate_obj.carrier}, service={rate_obj.service}, "
-                f"has_customs={shipment.customs_info is not None}, "
-                f"has_duty_payment={has_duty}, "
-                f"to_address_street1='{street1}', "
-                f"to_address_city='{to_addr.city if to_addr else None}', "
-                f"to_address_country='{to_addr.country if to_addr else None}'"
-            )
-
-            # Validate address before purchase (especially for FedEx)
-            if to_addr and (not street1 or not street1.strip()):
-                addr_dict = to_addr.__dict__ if hasattr(to_addr, "__dict__") else "N/A"
-                error_msg = (
-                    f"Invalid address: street1 is empty or None. Address: {addr_dict}"
-                )
-                self.logger.error(error_msg)
-                raise ValueError(error_msg)
+            shipment = self.shipment_cache.get(shipment_id)
+            if shipment is None:
+                shipment = self.client.shipment.retrieve(shipment_id)
+            self._validate_purchase(shipment, rate_id)
 
             # Buy the shipment with the rate ID
             # EasyPost API expects: { "rate": { "id": "rate_..." } }
@@ -687,84 +1541,175 @@ def _buy_shipment_sync(self, shipment_id: str, rate_id: str) -> dict[str, Any]:
             bought_shipment = self.client.shipment.buy(
                 shipment_id, rate={"id": rate_id}
             )
+            self.shipment_cache.pop(shipment_id)
+            self._ledger_record(bought_shipment)
+            return self._bought_shipment_result(bought_shipment)
+        except Exception as e:
+            if _is_rate_limited(e):
+                raise  # let _api_call_with_retry back off and retry
+            return self._buy_shipment_error(e)
 
-            # bought_shipment is the updated shipment object returned by buy()
-            return {
-                "status": "success",
-                "data": {
-                    "shipment_id": bought_shipment.id,
-                    "tracking_code": bought_shipment.tracking_code,
-                    "postage_label_url": (
-                        bought_shipment.postage_label.label_url
-                        if bought_shipment.postage_label
+    async def _buy_shipment_async(self, shipment_id: str, rate_id: str) -> dict[str, Any]:
+        """Label purchase over the async transport (same contract as the sync path)."""
+        try:
+            self.logger.info(
+                f"Buying label for shipment {shipment_id} with rate {rate_id} (async)"
+            )
+            shipment = self.shipment_cache.get(shipment_id)
+            if shipment is None:
+                shipment = await self.transport.get(f"/shipments/{shipment_id}")
+            self._validate_purchase(shipment, rate_id)
+
+            bought_shipment = await self.transport.post(
+                f"/shipments/{shipment_id}/buy", {"rate": {"id": rate_id}}
+            )
+            self.shipment_cache.pop(shipment_id)
+            self._ledger_record(bought_shipment)
+            return self._bought_shipment_result(bought_shipment)
+        except Exception as e:
+            if _is_rate_limited(e):
+                raise  # let _api_call_with_retry back off and retry
+            return self._buy_shipment_error(e)
+
+    def _validate_purchase(self, shipment: Any, rate_id: str) -> Any:
+        """Check rate and destination before buying; returns the matching rate."""
+        # Find the rate object matching the rate_id
+        rate_obj = None
+        for rate in shipment.rates:
+            if rate.id == rate_id:
+                rate_obj = rate
+                break
+
+        if not rate_obj:
+            raise ValueError(f"Rate {rate_id} not found in shipment rates")
+
+        # Log shipment details for debugging - especially address for FedEx
+        to_addr = shipment.to_address if hasattr(shipment, "to_address") else None
+        street1 = to_addr.street1 if to_addr and hasattr(to_addr, "street1") else None
+        has_duty = (
+            hasattr(shipment, "duty_payment") and shipment.duty_payment is not None
+        )
+        self.logger.info(
+            f"Shipment details: id={shipment.id}, status={shipment.status}, "
+            f"carrier={rate_obj.carrier}, service={rate_obj.service}, "
+            f"has_customs={shipment.customs_info is not None}, "
+            f"has_duty_payment={has_duty}, "
+            f"to_address_street1='{street1}', "
+            f"to_address_city='{to_addr.city if to_addr else None}', "
+            f"to_address_country='{to_addr.country if to_addr else None}'"
+        )
+
+        # Validate address before purchase (especially for FedEx)
+        if to_addr and (not street1 or not street1.strip()):
+            addr_dict = to_addr.__dict__ if hasattr(to_addr, "__dict__") else "N/A"
+            error_msg = f"Invalid address: street1 is empty or None. Address: {addr_dict}"
+            self.logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        return rate_obj
+
+    @staticmethod
+    def _bought_shipment_result(bought_shipment: Any) -> dict[str, Any]:
+        """Shape the shipment returned by buy() into the purchase response."""
+        return {
+            "status": "success",
+            "data": {
+                "shipment_id": bought_shipment.id,
+                "tracking_code": bought_shipment.tracking_code,
+                "postage_label_url": (
+                    bought_shipment.postage_label.label_url
+                    if bought_shipment.postage_label
+                    else None
+                ),
+                "purchased_rate": {
+                    "rate": (
+                        bought_shipment.selected_rate.rate
+                        if bought_shipment.selected_rate
+                        else None
+                    ),
+                    "carrier": (
+                        bought_shipment.selected_rate.carrier
+                        if bought_shipment.selected_rate
+                        else None
+                    ),
+                    "service": (
+                        bought_shipment.selected_rate.service
+                        if bought_shipment.selected_rate
                         else None
                     ),
-                    "purchased_rate": {
-                        "rate": (
-                            bought_shipment.selected_rate.rate
-                            if bought_shipment.selected_rate
-                            else None
-                        ),
-                        "carrier": (
-                            bought_shipment.selected_rate.carrier
-                            if bought_shipment.selected_rate
-                            else None
-                        ),
-                        "service": (
-                            bought_shipment.selected_rate.service
-                            if bought_shipment.selected_rate
-                            else None
-                        ),
-                    },
                 },
-                "message": "Label purchased successfully",
-                "timestamp": datetime.now(UTC).isoformat(),
-            }
-        except Exception as e:
-            # Capture detailed error information
-            error_msg = str(e)
-            error_details = {"message": error_msg}
-
-            # Try to extract more details from EasyPost error object
-            if hasattr(e, "message"):
-                error_details["message"] = e.message
-            if hasattr(e, "errors"):
-                error_details["errors"] = e.errors
-            if hasattr(e, "http_status"):
-                error_details["http_status"] = e.http_status
-            if hasattr(e, "json_body"):
-                error_details["json_body"] = e.json_body
-
-            self.logger.error(f"Buy error details: {error_details}")
-            self.logger.error(f"Failed to buy shipment: {sanitize_error(e)}")
-
-            # Return detailed error message
-            detailed_error = error_msg
-            if error_details.get("errors"):
-                detailed_error = f"{error_msg} | Details: {error_details['errors']}"
+            },
+            "message": "Label purchased successfully",
+            "timestamp": datetime.now(UTC).isoformat(),
+        }
 
-            return {
-                "status": "error",
-                "message": detailed_error,
-                "error_details": error_details,
-                "timestamp": datetime.now(UTC).isoformat(),
-            }
+    def _buy_shipment_error(self, e: Exception) -> dict[str, Any]:
+        # Capture detailed error information
+        error_msg = str(e)
+        error_details = {"message": error_msg}
+
+        # Try to extract more details from EasyPost error object
+        if hasattr(e, "message"):
+            error_details["message"] = e.message
+        if hasattr(e, "errors"):
+            error_details["errors"] = e.errors
+        if hasattr(e, "http_status"):
+            error_details["http_status"] = e.http_status
+        if hasattr(e, "json_body"):
+            error_details["json_body"] = e.json_body
+
+        self.logger.error(f"Buy error details: {error_details}")
+        self.logger.error(f"Failed to buy shipment: {sanitize_error(e)}")
+
+        # Return detailed error message
+        detailed_error = error_msg
+        if error_details.get("errors"):
+            detailed_error = f"{error_msg} | Details: {error_details['errors']}"
 
-    async def get_tracking(self, tracking_number: str) -> dict[str, Any]:
+        return {
+            "status": "error",
+            "message": detailed_error,
+            "error_details": error_details,
+            "timestamp": datetime.now(UTC).isoformat(),
+        }
+
+    async def get_tracking(
+        self, tracking_number: str, bypass_cache: bool = False
+    ) -> dict[str, Any]:
         """
         Get tracking information for a shipment.
 
+        Answers from the tracking cache when possible; entries expire after
+        the in-transit TTL, or the longer final TTL once delivered.
+
         Args:
             tracking_number: The tracking number to look up
+            bypass_cache: Skip the tracking cache and fetch from EasyPost
 
         Returns:
             Dict with status, tracking data, and timestamp
         """
+        tracking_number = tracking_number.strip()
+        if not bypass_cache:
+            cached = self.tracking_cache.get(tracking_number)
+            if cached is not None:
+                return {
+                    **cached,
+                    "message": "Tracking retrieved successfully (cached)",
+                    "timestamp": datetime.now(UTC).isoformat(),
+                }
+
         try:
-            loop = asyncio.get_running_loop()
-            return await loop.run_in_executor(
-                self.executor, self._get_tracking_sync, tracking_number
-            )
+            if self.transport is not None:
+                result = await self._get_tracking_async(tracking_number)
+            else:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(
+                    self.executor, self._get_tracking_sync, tracking_number
+                )
+            if result.get("status") == "success":
+                self._cache_tracking(tracking_number, result)
+            return result
         except Exception as e:
             self.logger.error(f"Error getting tracking: {sanitize_error(e)}")
             return {
@@ -779,45 +1724,175 @@ def _get_tracking_sync(self, tracking_number: str) -> dict[str, Any]:
         try:
             self.logger.info(f"Fetching tracking for {tracking_number}")
             tracker = self.client.tracker.retrieve(tracking_number)
+            return self._tracking_result(tracker)
+        except Exception as e:
+            return self._tracking_error(e)
 
-            return {
-                "status": "success",
-                "data": {
-                    "tracking_number": tracker.tracking_code,
-                    "status_detail": tracker.status,
-                    "updated_at": str(tracker.updated_at),
-                    "events": (
-                        [
-                            {
-                                "timestamp": str(
-                                    getattr(
-                                        event,
-                                        "timestamp",
-                                        getattr(event, "datetime", "unknown"),
-                                    )
-                                ),
-                                "status": getattr(event, "status", "unknown"),
-                                "message": getattr(event, "message", "unknown"),
-                                "location": getattr(event, "location", None),
-                            }
-                            for event in tracker.tracking_details
-                        ]
-                        if hasattr(tracker, "tracking_details")
-                        and tracker.tracking_details
-                        else []
-                    ),
-                },
-                "message": "Tracking retrieved successfully",
-                "timestamp": datetime.now(UTC).isoformat(),
-            }
+    async def _get_tracking_async(self, tracking_number: str) -> dict[str, Any]:
+        """Tracking retrieval over the async transport."""
+        try:
+            self.logger.info(f"Fetching tracking for {tracking_number} (async)")
+            tracker = await self.transport.get(f"/trackers/{tracking_number}")
+            return self._tracking_result(tracker)
         except Exception as e:
-            self.logger.error(f"Failed to get tracking: {sanitize_error(e)}")
+            return self._tracking_error(e)
+
+    async def get_tracking_batch(
+        self,
+        tracking_numbers: list[str],
+        max_concurrency: int = DEFAULT_TRACKING_BATCH_CONCURRENCY,
+        on_result: TrackingProgress | None = None,
+    ) -> dict[str, Any]:
+        """
+        Look up many tracking numbers at once.
+
+        Codes are de-duplicated, fetched with at most `max_concurrency`
+        lookups in flight (each through the tracking cache and bounded by
+        STANDARD_TIMEOUT), and reported to `on_result(code, entry, done,
+        total)` as they complete.
+
+        Args:
+            tracking_numbers: Tracking numbers to look up
+            max_concurrency: Lookups in flight at once
+            on_result: Optional async progress callback
+
+        Returns:
+            Dict with compact per-code results (input order) and status counts
+        """
+        codes = list(dict.fromkeys(code.strip() for code in tracking_numbers if code.strip()))
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def lookup(code: str) -> tuple[str, dict[str, Any]]:
+            async with semaphore:
+                try:
+                    result = await asyncio.wait_for(
+                        self.get_tracking(code), timeout=STANDARD_TIMEOUT
+                    )
+                except TimeoutError:
+                    result = {"status": "error", "message": "Tracking lookup timed out"}
+            return code, self._tracking_batch_entry(code, result)
+
+        entries: dict[str, dict[str, Any]] = {}
+        summary = {
+            "total": len(tracking_numbers),
+            "unique": len(codes),
+            "delivered": 0,
+            "in_transit": 0,
+            "exception": 0,
+            "unknown": 0,
+            "failed": 0,
+        }
+        for future in asyncio.as_completed([lookup(code) for code in codes]):
+            code, entry = await future
+            entries[code] = entry
+            summary[entry["group"]] += 1
+            if on_result is not None:
+                await on_result(code, entry, len(entries), len(codes))
+
+        return {
+            "status": "success",
+            "data": {"results": [entries[code] for code in codes], "summary": summary},
+            "message": (
+                f"Tracked {len(codes)} shipments: {summary['delivered']} delivered, "
+                f"{summary['in_transit']} in transit, {summary['exception']} exceptions, "
+                f"{summary['failed']} failed"
+            ),
+            "timestamp": datetime.now(UTC).isoformat(),
+        }
+
+    @staticmethod
+    def _tracking_batch_entry(code: str, result: dict[str, Any]) -> dict[str, Any]:
+        """Compact per-code view of a get_tracking result."""
+        data = result.get("data") if result.get("status") == "success" else None
+        if not data:
             return {
-                "status": "error",
-                "data": None,
-                "message": "Failed to retrieve tracking information",
-                "timestamp": datetime.now(UTC).isoformat(),
+                "tracking_number": code,
+                "group": "failed",
+                "status_detail": None,
+                "error": result.get("message") or "Failed to retrieve tracking information",
             }
+        status_detail = (data.get("status_detail") or "unknown").lower()
+        events = data.get("events") or []
+        return {
+            "tracking_number": code,
+            "group": TRACKING_STATUS_GROUPS.get(status_detail, "unknown"),
+            "status_detail": status_detail,
+            "updated_at": data.get("updated_at"),
+            "last_event": events[-1].get("message") if events else None,
+        }
+
+    def ingest_tracker_event(self, event: dict[str, Any]) -> dict[str, Any] | None:
+        """
+        Apply an EasyPost tracker webhook event to the tracking cache.
+
+        Args:
+            event: Decoded webhook body (an EasyPost Event object)
+
+        Returns:
+            The updated tracking data, or None if the event carries no tracker
+        """
+        payload = event.get("result") or {}
+        if payload.get("object") != "Tracker" or not payload.get("tracking_code"):
+            return None
+
+        tracker = convert_to_easypost_object(payload)
+        result = self._tracking_result(tracker)
+        self._cache_tracking(tracker.tracking_code, result)
+
+        shipment_id = getattr(tracker, "shipment_id", None)
+        if self.ledger is not None and shipment_id:
+            try:
+                self.ledger.update(shipment_id, status=tracker.status)
+            except sqlite3.Error as e:
+                self.logger.warning(f"Shipment ledger write failed: {e}")
+        return result["data"]
+
+    def _cache_tracking(self, tracking_number: str, result: dict[str, Any]) -> None:
+        status = (result["data"].get("status_detail") or "").lower()
+        ttl = self.tracking_final_ttl if status in TRACKING_FINAL_STATUSES else None
+        self.tracking_cache.set(tracking_number, result, ttl=ttl)
+
+    @staticmethod
+    def _tracking_result(tracker: Any) -> dict[str, Any]:
+        return {
+            "status": "success",
+            "data": {
+                "tracking_number": tracker.tracking_code,
+                "status_detail": tracker.status,
+                "updated_at": str(tracker.updated_at),
+                "events": (
+                    [
+                        {
+                            "timestamp": str(
+                                getattr(
+                                    event,
+                                    "timestamp",
+                                    getattr(event, "datetime", "unknown"),
+                                )
+                            ),
+                            "status": getattr(event, "status", "unknown"),
+                            "message": getattr(event, "message", "unknown"),
+                            "location": getattr(event, "location", None),
+                        }
+                        for event in tracker.tracking_details
+                    ]
+                    if hasattr(tracker, "tracking_details")
+                    and tracker.tracking_details
+                    else []
+                ),
+            },
+            "message": "Tracking retrieved successfully",
+            "timestamp": datetime.now(UTC).isoformat(),
+        }
+
+    def _tracking_error(self, e: Exception) -> dict[str, Any]:
+        self.logger.error(f"Failed to get tracking: {sanitize_error(e)}")
+        return {
+            "status": "error",
+            "data": None,
+            "message": "Failed to retrieve tracking information",
+            "timestamp": datetime.now(UTC).isoformat(),
+        }
 
     async def get_rates(
         self,
@@ -825,29 +1900,48 @@ async def get_rates(
         from_address: dict[str, Any],
         parcel: dict[str, Any],
         customs_info: dict[str, Any] | None = None,
+        bypass_cache: bool = False,
     ) -> dict[str, Any]:
         """
         Get available shipping rates.
 
+        Quotes are cached per `rate_quote_key()` for the service's rate cache
+        TTL; `bypass_cache` forces a fresh quote (which then refreshes the cache).
+        The key ignores the recipient, so cached rates come from another line's
+        shipment: they are marked `quote_only` and their ids can only be passed
+        to purchase_shipment (matched by carrier/service), never bought directly.
+
         Args:
             to_address: Destination address dict
             from_address: Origin address dict
             parcel: Package dimensions dict
             customs_info: Optional customs info dict for international shipments
+            bypass_cache: Skip the rate quote cache lookup
 
         Returns:
             Dict with status, rates data, and timestamp
         """
         try:
-            loop = asyncio.get_running_loop()
-            rates = await loop.run_in_executor(
-                self.executor,
-                self._get_rates_sync,
-                to_address,
-                from_address,
-                parcel,
-                customs_info,
-            )
+            cache_key = rate_quote_key(to_address, from_address, parcel, customs_info)
+            cached = None if bypass_cache else self.rate_cache.get(cache_key)
+            if cached is not None:
+                return {
+                    "status": "success",
+                    "data": [{**rate, "quote_only": True} for rate in cached],
+                    "message": "Rates retrieved successfully (cached quote)",
+                    "timestamp": datetime.now(UTC).isoformat(),
+                }
+
+            if self.transport is not None:
+                rates = await self._api_call_with_retry(
+                    self._get_rates_async, to_address, from_address, parcel, customs_info
+                )
+            else:
+                rates = await self._api_call_with_retry(
+                    self._get_rates_sync, to_address, from_address, parcel, customs_info
+                )
+            if rates:
+                self.rate_cache.set(cache_key, [dict(rate) for rate in rates])
             return {
                 "status": "success",
                 "data": rates,
@@ -873,35 +1967,9 @@ def _get_rates_sync(
     ) -> list[dict[str, Any]]:
         """Synchronous rates retrieval."""
         try:
-            self.logger.info(f"Calculating rates... (API key: {self.api_key[:10]}...)")
-
-            # Normalize addresses before API call
-            to_address = normalize_address(to_address)
-            from_address = normalize_address(from_address)
-
-            from_city = from_address.get("city")
-            from_state = from_address.get("state")
-            from_country = from_address.get("country")
-            self.logger.info(f"From: {from_city}, {from_state}, {from_country}")
-            to_city = to_address.get("city")
-            to_state = to_address.get("state")
-            to_country = to_address.get("country")
-            self.logger.info(f"To: {to_city}, {to_state}, {to_country}")
-            length = parcel.get("length")
-            width = parcel.get("width")
-            height = parcel.get("height")
-            weight = parcel.get("weight")
-            self.logger.info(f"Parcel: {length}x{width}x{height}, {weight}oz")
-
-            shipment_params = {
-                "to_address": to_address,
-                "from_address": from_address,
-                "parcel": parcel,
-            }
-
-            # Add carrier_accounts only if specified (None = use all enabled accounts)
-            if self.CARRIER_ACCOUNTS is not None:
-                shipment_params["carrier_accounts"] = self.CARRIER_ACCOUNTS
+            shipment_params = self._build_rates_params(
+                to_address, from_address, parcel, self._warehouse_address_id(from_address)
+            )
 
             # Add customs_info if provided (for international shipments)
             if customs_info:
@@ -911,27 +1979,88 @@ def _get_rates_sync(
                     shipment_params["customs_info"] = created_customs
             # Create shipment and return raw rates
             shipment = self.client.shipment.create(**shipment_params)
+            self._plan_shipment(shipment, to_address, from_address, parcel, customs_info)
 
-            return [
-                {
-                    "id": rate.id,
-                    "carrier": rate.carrier,
-                    "service": rate.service,
-                    "rate": rate.rate,
-                    "delivery_days": rate.delivery_days,
-                }
-                for rate in shipment.rates
-            ]
+            return self._rates_to_list(shipment)
+        except Exception as e:
+            self.logger.error(f"Failed to get rates: {sanitize_error(e)}")
+            raise
+
+    async def _get_rates_async(
+        self,
+        to_address: dict[str, Any],
+        from_address: dict[str, Any],
+        parcel: dict[str, Any],
+        customs_info: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Rates retrieval over the async transport."""
+        try:
+            shipment_params = self._build_rates_params(
+                to_address,
+                from_address,
+                parcel,
+                await self._warehouse_address_id_async(from_address),
+            )
+
+            if customs_info:
+                created_customs = await self._create_customs_info_async(customs_info, parcel)
+                if created_customs:
+                    shipment_params["customs_info"] = created_customs
+
+            shipment = await self.transport.post("/shipments", {"shipment": shipment_params})
+            self._plan_shipment(shipment, to_address, from_address, parcel, customs_info)
+
+            return self._rates_to_list(shipment)
         except Exception as e:
             self.logger.error(f"Failed to get rates: {sanitize_error(e)}")
             raise
 
+    def _build_rates_params(
+        self,
+        to_address: dict[str, Any],
+        from_address: dict[str, Any],
+        parcel: dict[str, Any],
+        from_address_id: str | None = None,
+    ) -> dict[str, Any]:
+        """Normalize addresses, log the quote request and build shipment params."""
+        self.logger.info(f"Calculating rates... (API key: {self.api_key[:10]}...)")
+
+        shipment_params = self._build_shipment_params(
+            to_address, from_address, parcel, from_address_id=from_address_id
+        )
+
+        from_address = normalize_address(from_address)
+        to_address = shipment_params["to_address"]
+        from_city = from_address.get("city")
+        from_state = from_address.get("state")
+        from_country = from_address.get("country")
+        self.logger.info(f"From: {from_city}, {from_state}, {from_country}")
+        to_city = to_address.get("city")
+        to_state = to_address.get("state")
+        to_country = to_address.get("country")
+        self.logger.info(f"To: {to_city}, {to_state}, {to_country}")
+        length = parcel.get("length")
+        width = parcel.get("width")
+        height = parcel.get("height")
+        weight = parcel.get("weight")
+        self.logger.info(f"Parcel: {length}x{width}x{height}, {weight}oz")
+
+        return shipment_params
+
     def _create_customs_info(
         self, customs_info: dict[str, Any], parcel: dict[str, Any]
     ):
         """
         Create EasyPost CustomsInfo using either smart text extraction or explicit items.
+
+        With `inline_customs` nothing is created: the customs_info payload is
+        returned as plain dicts for the shipment request. Customs that already
+        have an EasyPost id are referenced by id.
         """
+        customs_id = customs_info.get("id")
+        if customs_id:
+            return {"id": customs_id}
+
         try:
             weight_oz = float(parcel.get("weight", 16.0) or 16.0)
         except Exception:
@@ -950,6 +2079,7 @@ def _create_customs_info(
                 eel_pfc=customs_info.get("eel_pfc"),
                 contents_explanation=customs_info.get("contents_explanation", ""),
                 restriction_comments=customs_info.get("restriction_comments", ""),
+                inline=self.inline_customs,
             )
 
         # Fallback to explicit customs_items structure
@@ -962,15 +2092,16 @@ def _create_customs_info(
                 quantity = item.get("quantity", 1)
                 value = float(item.get("value", 50.0))
                 total_value += quantity * value
-                customs_item = self.client.customs_item.create(
-                    description=item.get("description", "General Merchandise"),
-                    quantity=quantity,
-                    value=value,
-                    weight=item_weight,
-                    hs_tariff_number=item.get("hs_tariff_number"),
-                    origin_country=item.get("origin_country", "US"),
+                customs_items.append(
+                    {
+                        "description": item.get("description", "General Merchandise"),
+                        "quantity": quantity,
+                        "value": value,
+                        "weight": item_weight,
+                        "hs_tariff_number": item.get("hs_tariff_number"),
+                        "origin_country": item.get("origin_country", "US"),
+                    }
                 )
-                customs_items.append(customs_item)
 
             eel_pfc = customs_info.get("eel_pfc")
             if eel_pfc is None:
@@ -981,20 +2112,128 @@ def _create_customs_info(
                     )
                 eel_pfc = "NOEEI 30.37(a)"
 
-            return self.client.customs_info.create(
-                customs_items=customs_items,
-                customs_certify=customs_info.get("customs_certify", True),
-                customs_signer=customs_info.get("customs_signer", ""),
-                contents_type=customs_info.get("contents_type", "merchandise"),
-                restriction_type=customs_info.get("restriction_type", "none"),
-                restriction_comments=customs_info.get("restriction_comments", ""),
-                eel_pfc=eel_pfc,
-                non_delivery_option=customs_info.get("non_delivery_option", "return"),
-            )
+            payload = {
+                "customs_items": customs_items,
+                "customs_certify": customs_info.get("customs_certify", True),
+                "customs_signer": customs_info.get("customs_signer", ""),
+                "contents_type": customs_info.get("contents_type", "merchandise"),
+                "restriction_type": customs_info.get("restriction_type", "none"),
+                "restriction_comments": customs_info.get("restriction_comments", ""),
+                "eel_pfc": eel_pfc,
+                "non_delivery_option": customs_info.get("non_delivery_option", "return"),
+            }
+            if self.inline_customs:
+                return payload
+
+            payload["customs_items"] = [
+                self.client.customs_item.create(**item) for item in customs_items
+            ]
+            return self.client.customs_info.create(**payload)
 
         # Nothing to create
         return None
 
+    async def iter_shipment_pages(
+        self,
+        page_size: int = SHIPMENT_PAGE_SIZE,
+        purchased: bool = True,
+        start_datetime: str | None = None,
+        end_datetime: str | None = None,
+        *,
+        max_pages: int | None = None,
+        prefetch: int = 1,
+        max_age: float | None = None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Stream shipment pages (newest first) through the `before_id` cursor.
+
+        Page N+1 is fetched while the caller processes page N; at most
+        `prefetch` pages wait in memory. Leaving the loop early stops the
+        fetcher (wrap in `contextlib.aclosing` to stop it immediately).
+
+        Args:
+            page_size: Shipments per page (max 100)
+            purchased: Only include purchased shipments
+            start_datetime: ISO 8601 datetime string for filtering
+            end_datetime: ISO 8601 datetime string for filtering
+            max_pages: Stop after this many pages (default: until exhausted)
+            prefetch: Pages buffered ahead of the caller
+            max_age: Freshness bound for serving the first page from the ledger
+
+        Yields:
+            Lists of shipment dicts in the `_shipment_to_dict` shape
+
+        Raises:
+            ShipmentFetchError: If EasyPost returns an error for any page
+        """
+        queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=max(1, prefetch))
+
+        async def fetch_pages() -> None:
+            before_id = None
+            pages = 0
+            try:
+                while max_pages is None or pages < max_pages:
+                    result = await self.get_shipments_list(
+                        page_size=page_size,
+                        purchased=purchased,
+                        start_datetime=start_datetime,
+                        end_datetime=end_datetime,
+                        before_id=before_id,
+                        max_age=max_age,
+                    )
+                    if result.get("status") != "success":
+                        raise ShipmentFetchError(
+                            result.get("message") or "Failed to retrieve shipments list"
+                        )
+                    pages += 1
+                    page = result.get("data") or []
+                    if page:
+                        await queue.put(page)
+                    before_id = page[-1].get("id") if page else None
+                    if not before_id or not result.get("has_more"):
+                        break
+            except Exception as e:
+                await queue.put(e)
+                return
+            await queue.put(_END_OF_PAGES)
+
+        fetcher = asyncio.create_task(fetch_pages())
+        try:
+            while (item := await queue.get()) is not _END_OF_PAGES:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            fetcher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await fetcher
+
+    async def iter_shipments(
+        self,
+        page_size: int = SHIPMENT_PAGE_SIZE,
+        purchased: bool = True,
+        start_datetime: str | None = None,
+        end_datetime: str | None = None,
+        *,
+        max_pages: int | None = None,
+        prefetch: int = 1,
+        max_age: float | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream individual shipments; same arguments as `iter_shipment_pages`."""
+        pages = self.iter_shipment_pages(
+            page_size,
+            purchased,
+            start_datetime,
+            end_datetime,
+            max_pages=max_pages,
+            prefetch=prefetch,
+            max_age=max_age,
+        )
+        async with contextlib.aclosing(pages):
+            async for page in pages:
+                for shipment in page:
+                    yield shipment
+
     async def list_shipments(
         self,
         page_size: int = 10,
@@ -1002,6 +2241,7 @@ async def list_shipments(
         start_datetime: str | None = None,
         end_datetime: str | None = None,
         before_id: str | None = None,
+        max_age: float | None = None,
     ) -> dict[str, Any]:
         """
         Get list of shipments from EasyPost API.
@@ -1012,6 +2252,7 @@ async def list_shipments(
             start_datetime: ISO 8601 datetime string for filtering
             end_datetime: ISO 8601 datetime string for filtering
             before_id: Pagination cursor (optional)
+            max_age: Freshness bound for serving from the shipment ledger
 
         Returns:
             Dict with shipments list and pagination info
@@ -1022,6 +2263,7 @@ async def list_shipments(
             start_datetime=start_datetime,
             end_datetime=end_datetime,
             before_id=before_id,
+            max_age=max_age,
         )
 
     async def get_shipments_list(
@@ -1031,31 +2273,62 @@ async def get_shipments_list(
         start_datetime: str | None = None,
         end_datetime: str | None = None,
         before_id: str | None = None,
+        max_age: float | None = None,
     ) -> dict[str, Any]:
         """
         Get list of shipments from EasyPost API (legacy name).
 
+        The first page is served from the shipment ledger while the last
+        EasyPost listing for the same filters is younger than `max_age`
+        seconds (default: the service's ledger_max_age; 0 forces EasyPost).
+        Shipments created or bought since then are already written through.
+
         Args:
             page_size: Number of shipments to retrieve (max 100)
             purchased: Only include purchased shipments
             start_datetime: ISO 8601 datetime string for filtering
             end_datetime: ISO 8601 datetime string for filtering
             before_id: Pagination cursor (optional)
+            max_age: Freshness bound for serving from the shipment ledger
 
         Returns:
             Dict with shipments list and pagination info
         """
-        try:
-            loop = asyncio.get_running_loop()
-            return await loop.run_in_executor(
-                self.executor,
-                self._get_shipments_list_sync,
-                page_size,
-                purchased,
-                start_datetime,
-                end_datetime,
-                before_id,
+        page_size = min(page_size, 100)  # EasyPost max is 100
+        list_key = f"purchased={purchased}|end={end_datetime or ''}"
+        if before_id is None:
+            listing = self._ledger_listing(
+                list_key, page_size, purchased, start_datetime, end_datetime, max_age
             )
+            if listing is not None:
+                return listing
+
+        try:
+            if self.transport is not None:
+                result = await self._get_shipments_list_async(
+                    page_size, purchased, start_datetime, end_datetime, before_id
+                )
+            else:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(
+                    self.executor,
+                    self._get_shipments_list_sync,
+                    page_size,
+                    purchased,
+                    start_datetime,
+                    end_datetime,
+                    before_id,
+                )
+            if result.get("status") == "success":
+                self._ledger_store(result["data"])
+                if before_id is None and self.ledger is not None:
+                    self.ledger.mark_list_synced(
+                        list_key,
+                        page_size,
+                        start_datetime,
+                        has_more=bool(result.get("has_more")),
+                    )
+            return result
         except Exception as e:
             self.logger.error(f"Error getting shipments list: {sanitize_error(e)}")
             return {
@@ -1065,17 +2338,34 @@ async def get_shipments_list(
                 "timestamp": datetime.now(UTC).isoformat(),
             }
 
-    async def retrieve_shipment(self, shipment_id: str) -> dict[str, Any]:
+    async def retrieve_shipment(
+        self, shipment_id: str, max_age: float | None = None
+    ) -> dict[str, Any]:
         """
         Retrieve detailed shipment information from EasyPost.
 
+        Served from the shipment ledger when its copy is younger than
+        `max_age` seconds (default: the service's ledger_max_age; 0 forces
+        an EasyPost call).
+
         Args:
             shipment_id: EasyPost shipment ID
+            max_age: Freshness bound for the ledger copy
 
         Returns:
             Dict with shipment details
         """
+        record = self._ledger_lookup(shipment_id, max_age)
+        if record is not None:
+            return {
+                "status": "success",
+                "data": record,
+                "message": f"Shipment {shipment_id} retrieved (ledger)",
+                "timestamp": datetime.now(UTC).isoformat(),
+            }
         try:
+            if self.transport is not None:
+                return await self._retrieve_shipment_async(shipment_id)
             loop = asyncio.get_running_loop()
             return await loop.run_in_executor(
                 self.executor, self._retrieve_shipment_sync, shipment_id
@@ -1089,6 +2379,48 @@ async def retrieve_shipment(self, shipment_id: str) -> dict[str, Any]:
                 "timestamp": datetime.now(UTC).isoformat(),
             }
 
+    def _ledger_listing(
+        self,
+        list_key: str,
+        page_size: int,
+        purchased: bool,
+        start_datetime: str | None,
+        end_datetime: str | None,
+        max_age: float | None,
+    ) -> dict[str, Any] | None:
+        """First page of shipments from the ledger if its list sync is fresh."""
+        if self.ledger is None:
+            return None
+        max_age = self.ledger_max_age if max_age is None else max_age
+        try:
+            fresh = self.ledger.list_is_fresh(list_key, page_size, max_age, start_datetime)
+            self.ledger.count_hit(fresh)
+            if not fresh:
+                return None
+            # One extra row shows whether shipments written through since the
+            # sync spill past this page; otherwise EasyPost's answer stands
+            shipments = self.ledger.query(
+                page_size + 1,
+                purchased=True if purchased else None,
+                start_datetime=start_datetime,
+                end_datetime=end_datetime,
+            )
+            has_more = len(shipments) > page_size or (
+                len(shipments) == page_size and self.ledger.list_has_more(list_key)
+            )
+        except sqlite3.Error as e:
+            self.logger.warning(f"Shipment ledger read failed: {e}")
+            return None
+
+        shipments = shipments[:page_size]
+        return {
+            "status": "success",
+            "data": shipments,
+            "message": f"Successfully retrieved {len(shipments)} shipments (ledger)",
+            "has_more": has_more,
+            "timestamp": datetime.now(UTC).isoformat(),
+        }
+
     def _get_shipments_list_sync(
         self,
         page_size: int,
@@ -1099,72 +2431,128 @@ def _get_shipments_list_sync(
     ) -> dict[str, Any]:
         """Synchronous shipment list retrieval."""
         try:
-            self.logger.info(
-                f"Retrieving shipments list (page_size={page_size}, purchased={purchased})"
+            params = self._shipments_list_params(
+                page_size, purchased, start_datetime, end_datetime, before_id
             )
 
-            # Prepare parameters for EasyPost API
-            params = {
-                "page_size": min(page_size, 100),  # EasyPost max is 100
-                "purchased": purchased,
-            }
-
-            if start_datetime:
-                params["start_datetime"] = start_datetime
-            if end_datetime:
-                params["end_datetime"] = end_datetime
-            if before_id:
-                params["before_id"] = before_id
-
             # Get shipments from EasyPost using the client
             shipments_response = self.client.shipment.all(**params)
+            return self._shipments_list_result(shipments_response, page_size)
+        except Exception as e:
+            return self._shipments_list_error(e)
 
-            # Transform shipments to our format
-            shipments = [
-                self._shipment_to_dict(shipment)
-                for shipment in shipments_response.shipments
-            ]
+    async def _get_shipments_list_async(
+        self,
+        page_size: int,
+        purchased: bool,
+        start_datetime: str | None,
+        end_datetime: str | None,
+        before_id: str | None,
+    ) -> dict[str, Any]:
+        """Shipment list retrieval over the async transport."""
+        try:
+            params = self._shipments_list_params(
+                page_size, purchased, start_datetime, end_datetime, before_id
+            )
+            shipments_response = await self.transport.get("/shipments", params)
+            return self._shipments_list_result(shipments_response, page_size)
+        except Exception as e:
+            return self._shipments_list_error(e)
 
-            self.logger.info(f"Retrieved {len(shipments)} shipments from EasyPost")
+    def _shipments_list_params(
+        self,
+        page_size: int,
+        purchased: bool,
+        start_datetime: str | None,
+        end_datetime: str | None,
+        before_id: str | None,
+    ) -> dict[str, Any]:
+        self.logger.info(
+            f"Retrieving shipments list (page_size={page_size}, purchased={purchased})"
+        )
 
-            return {
-                "status": "success",
-                "data": shipments,
-                "message": f"Successfully retrieved {len(shipments)} shipments",
-                "has_more": len(shipments) == page_size,  # Simple heuristic
-                "timestamp": datetime.now(UTC).isoformat(),
-            }
+        # Prepare parameters for EasyPost API
+        params = {
+            "page_size": min(page_size, 100),  # EasyPost max is 100
+            "purchased": purchased,
+        }
 
-        except Exception as e:
-            self.logger.error(f"Failed to get shipments list: {sanitize_error(e)}")
-            return {
-                "status": "error",
-                "data": [],
-                "message": "Failed to retrieve shipments list",
-                "timestamp": datetime.now(UTC).isoformat(),
-            }
+        if start_datetime:
+            params["start_datetime"] = start_datetime
+        if end_datetime:
+            params["end_datetime"] = end_datetime
+        if before_id:
+            params["before_id"] = before_id
+
+        return params
+
+    def _shipments_list_result(
+        self, shipments_response: Any, page_size: int
+    ) -> dict[str, Any]:
+        has_more = getattr(shipments_response, "has_more", None)
+        # Transform shipments to our format
+        shipments = [
+            self._shipment_to_dict(shipment)
+            for shipment in shipments_response.shipments
+        ]
+
+        self.logger.info(f"Retrieved {len(shipments)} shipments from EasyPost")
+        if not isinstance(has_more, bool):
+            has_more = len(shipments) == page_size  # Older responses: full page heuristic
+
+        return {
+            "status": "success",
+            "data": shipments,
+            "message": f"Successfully retrieved {len(shipments)} shipments",
+            "has_more": has_more,
+            "timestamp": datetime.now(UTC).isoformat(),
+        }
+
+    def _shipments_list_error(self, e: Exception) -> dict[str, Any]:
+        self.logger.error(f"Failed to get shipments list: {sanitize_error(e)}")
+        return {
+            "status": "error",
+            "data": [],
+            "message": "Failed to retrieve shipments list",
+            "timestamp": datetime.now(UTC).isoformat(),
+        }
 
     def _retrieve_shipment_sync(self, shipment_id: str) -> dict[str, Any]:
         """Synchronous shipment retrieval."""
         try:
             self.logger.info(f"Retrieving shipment {shipment_id}")
             shipment = self.client.shipment.retrieve(shipment_id)
-            shipment_data = self._shipment_to_dict(shipment)
+            return self._retrieved_shipment_result(shipment, shipment_id)
+        except Exception as e:
+            return self._retrieve_shipment_error(e)
 
-            return {
-                "status": "success",
-                "data": shipment_data,
-                "message": f"Shipment {shipment_id} retrieved",
-                "timestamp": datetime.now(UTC).isoformat(),
-            }
+    async def _retrieve_shipment_async(self, shipment_id: str) -> dict[str, Any]:
+        """Shipment retrieval over the async transport."""
+        try:
+            self.logger.info(f"Retrieving shipment {shipment_id} (async)")
+            shipment = await self.transport.get(f"/shipments/{shipment_id}")
+            return self._retrieved_shipment_result(shipment, shipment_id)
         except Exception as e:
-            self.logger.error(f"Failed to retrieve shipment: {sanitize_error(e)}")
-            return {
-                "status": "error",
-                "data": None,
-                "message": str(e),
-                "timestamp": datetime.now(UTC).isoformat(),
-            }
+            return self._retrieve_shipment_error(e)
+
+    def _retrieved_shipment_result(self, shipment: Any, shipment_id: str) -> dict[str, Any]:
+        data = self._shipment_to_dict(shipment)
+        self._ledger_store([data])
+        return {
+            "status": "success",
+            "data": data,
+            "message": f"Shipment {shipment_id} retrieved",
+            "timestamp": datetime.now(UTC).isoformat(),
+        }
+
+    def _retrieve_shipment_error(self, e: Exception) -> dict[str, Any]:
+        self.logger.error(f"Failed to retrieve shipment: {sanitize_error(e)}")
+        return {
+            "status": "error",
+            "data": None,
+            "message": str(e),
+            "timestamp": datetime.now(UTC).isoformat(),
+        }
 
     def _shipment_to_dict(self, shipment: Any) -> dict[str, Any]:
         """Normalize EasyPost shipment object to serializable dict."""
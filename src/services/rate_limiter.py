@@ -0,0 +1,204 @@
+"""Adaptive token-bucket rate limiter shared by every EasyPost call site.
+
+Each outgoing EasyPost HTTP request takes one token: SDK requests block their
+executor thread inside the client's request hook, async-transport requests
+await before sending. Responses feed back into the bucket: a 429 halves the
+refill rate (at most once per cooldown) and pauses all callers for the
+`Retry-After` interval, and each success recovers the rate toward the
+configured ceiling (AIMD).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable, Mapping
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE = 10.0  # requests per second
+DEFAULT_BURST = 20
+RATE_LIMITED_STATUS = 429
+
+
+class TokenBucketRateLimiter:
+    """
+    Thread- and coroutine-safe token bucket with 429 feedback.
+
+    Tokens are reserved under a lock (the balance may go negative) and the
+    caller sleeps outside it, so waiters are served in arrival order without
+    holding the lock across threads or event loops.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        *,
+        min_rate: float | None = None,
+        backoff_factor: float = 0.5,
+        recovery_step: float = 0.05,
+        cooldown: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self.max_rate = float(rate)
+        self.min_rate = float(min_rate) if min_rate is not None else self.max_rate / 10
+        self.burst = burst
+        self.backoff_factor = backoff_factor
+        self.recovery_step = recovery_step
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self._rate = self.max_rate
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._last_backoff = float("-inf")
+
+        self._acquired = 0
+        self._throttled = 0
+        self._wait_seconds = 0.0
+        self._rate_limited = 0
+        self._retry_after_honored = 0
+
+    @property
+    def rate(self) -> float:
+        """Current (possibly reduced) refill rate in requests per second."""
+        return self._rate
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(float(self.burst), self._tokens + elapsed * self._rate)
+            self._updated = now
+
+    def reserve(self, tokens: int = 1) -> float:
+        """Take tokens and return how many seconds the caller must wait."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= tokens
+            wait = max(0.0, -self._tokens / self._rate, self._blocked_until - now)
+            self._acquired += tokens
+            if wait > 0:
+                self._throttled += 1
+                self._wait_seconds += wait
+            return wait
+
+    async def acquire(self, tokens: int = 1) -> float:
+        """Wait (without blocking the event loop) until tokens are available."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def acquire_blocking(self, tokens: int = 1) -> float:
+        """Blocking acquire for worker threads (SDK request hook)."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def record_rate_limited(self, retry_after: float | None = None) -> None:
+        """Back off after a 429: cut the rate and pause callers."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._rate_limited += 1
+
+            if now - self._last_backoff >= self.cooldown:
+                self._rate = max(self.min_rate, self._rate * self.backoff_factor)
+                self._last_backoff = now
+                # Drop any accumulated burst so callers resume at the reduced rate
+                self._tokens = min(self._tokens, 0.0)
+
+            if retry_after is not None and retry_after > 0:
+                self._retry_after_honored += 1
+                pause = retry_after
+            else:
+                pause = 1.0 / self._rate
+            self._blocked_until = max(self._blocked_until, now + pause)
+
+        logger.warning(
+            f"EasyPost rate limit hit; limiter at {self._rate:.2f} req/s, pausing {pause:.2f}s"
+        )
+
+    def record_success(self) -> None:
+        """Recover the rate additively toward the configured ceiling."""
+        if self._rate >= self.max_rate:
+            return
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._rate = min(self.max_rate, self._rate + self.max_rate * self.recovery_step)
+
+    def observe_response(self, http_status: int, headers: Mapping[str, Any] | None) -> None:
+        """Feed an HTTP response status (and Retry-After header) back into the bucket."""
+        if http_status == RATE_LIMITED_STATUS:
+            self.record_rate_limited(parse_retry_after(headers))
+        elif 200 <= http_status < 300:
+            self.record_success()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Current limiter state and counters for metrics endpoints."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            return {
+                "rate_per_second": round(self._rate, 3),
+                "max_rate_per_second": self.max_rate,
+                "burst": self.burst,
+                "available_tokens": round(max(self._tokens, 0.0), 3),
+                "acquired": self._acquired,
+                "throttled": self._throttled,
+                "total_wait_seconds": round(self._wait_seconds, 3),
+                "rate_limited_responses": self._rate_limited,
+                "retry_after_honored": self._retry_after_honored,
+                "blocked_for_seconds": round(max(0.0, self._blocked_until - now), 3),
+            }
+
+
+def parse_retry_after(headers: Mapping[str, Any] | None) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not headers:
+        return None
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(str(value))
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+_shared_limiter: TokenBucketRateLimiter | None = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_rate_limiter() -> TokenBucketRateLimiter:
+    """Return the process-wide limiter configured from settings."""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            from src.utils.config import settings
+
+            _shared_limiter = TokenBucketRateLimiter(
+                rate=settings.EASYPOST_RATE_LIMIT_RPS,
+                burst=settings.EASYPOST_RATE_LIMIT_BURST,
+            )
+        return _shared_limiter
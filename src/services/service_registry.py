@@ -0,0 +1,141 @@
+"""Process-wide EasyPost service lifecycle registry.
+
+Every entry point (FastAPI lifespan, MCP server builder, dependency fallback)
+resolves its EasyPostService through this registry so a process owns exactly
+one SDK client and one ThreadPoolExecutor. The MCP tools and app state bind
+that instance once, so it lives for the whole process: releasing the last
+lifespan holder only closes the async connection pool (which is tied to the
+lifespan's event loop), and `shutdown()` tears the service down at exit.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+from collections.abc import Callable
+
+from src.services.easypost_service import EasyPostService
+from src.services.shipment_ledger import ShipmentLedger
+from src.services.warehouse_registry import WarehouseAddressRegistry
+from src.utils.cache import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+ServiceFactory = Callable[[], EasyPostService]
+
+
+def _default_factory() -> EasyPostService:
+    """Build the service from application settings."""
+    from src.utils.config import settings
+
+    warehouse_registry = None
+    if settings.WAREHOUSE_ADDRESS_IDS:
+        store = None
+        if settings.WAREHOUSE_ADDRESS_REGISTRY_PATH:
+            store = SQLiteStore(settings.WAREHOUSE_ADDRESS_REGISTRY_PATH)
+        warehouse_registry = WarehouseAddressRegistry(store=store)
+
+    return EasyPostService(
+        api_key=settings.EASYPOST_API_KEY,
+        transport=settings.EASYPOST_TRANSPORT,
+        max_connections=settings.EASYPOST_MAX_CONNECTIONS,
+        rate_cache_ttl=settings.RATE_CACHE_TTL_SECONDS,
+        rate_cache_size=settings.RATE_CACHE_MAX_SIZE,
+        retrieve_mode=settings.EASYPOST_SHIPMENT_RETRIEVE,
+        ledger=ShipmentLedger(settings.SHIPMENT_LEDGER_PATH or ":memory:"),
+        ledger_max_age=settings.SHIPMENT_LEDGER_MAX_AGE_SECONDS,
+        tracking_cache_ttl=settings.TRACKING_CACHE_TTL_SECONDS,
+        tracking_final_ttl=settings.TRACKING_CACHE_FINAL_TTL_SECONDS,
+        tracking_cache_size=settings.TRACKING_CACHE_MAX_SIZE,
+        inline_customs=settings.CUSTOMS_INLINE,
+        warehouse_registry=warehouse_registry,
+        plan_cache_ttl=settings.SHIPMENT_PLAN_CACHE_TTL_SECONDS,
+        plan_cache_size=settings.SHIPMENT_PLAN_CACHE_MAX_SIZE,
+        api_base=settings.EASYPOST_API_BASE or None,
+    )
+
+
+class ServiceRegistry:
+    """
+    Thread-safe holder for a single shared EasyPostService.
+
+    `get()` lazily creates the service without taking a reference (used by
+    request dependencies and the MCP builder). `acquire()`/`release()` are
+    reference counted and used by lifespans. The service outlives its
+    holders: the final release closes only the async transport pool (it is
+    reopened on the next request), so tools and app state bound to the
+    instance keep working across lifespan restarts. `shutdown()` discards it.
+    """
+
+    def __init__(self, factory: ServiceFactory | None = None):
+        self._factory = factory or _default_factory
+        self._lock = threading.Lock()
+        self._service: EasyPostService | None = None
+        self._refs = 0
+
+    @property
+    def service(self) -> EasyPostService | None:
+        """Current shared service, or None if not created yet."""
+        return self._service
+
+    @property
+    def refcount(self) -> int:
+        """Number of active lifespan holders."""
+        return self._refs
+
+    def get(self) -> EasyPostService:
+        """Return the shared service, creating it on first use."""
+        with self._lock:
+            return self._ensure_service()
+
+    def acquire(self) -> EasyPostService:
+        """Return the shared service and register a lifespan holder."""
+        with self._lock:
+            service = self._ensure_service()
+            self._refs += 1
+            return service
+
+    def release(self) -> None:
+        """Drop a lifespan holder (the service stays up for later holders)."""
+        self._drop_ref()
+
+    async def arelease(self) -> None:
+        """Drop a lifespan holder; the last one closes the async transport pool."""
+        service = self._drop_ref()
+        if service is not None and service.transport is not None:
+            await service.transport.aclose()
+
+    def shutdown(self) -> None:
+        """Shut down and discard the shared service regardless of holders."""
+        with self._lock:
+            service, self._service = self._service, None
+            self._refs = 0
+
+        if service is not None:
+            service.shutdown()
+
+    def _drop_ref(self) -> EasyPostService | None:
+        """Decrement holders; return the service if this was the last holder."""
+        with self._lock:
+            if self._refs == 0:
+                logger.warning("EasyPost service released more times than acquired")
+                return None
+            self._refs -= 1
+            return self._service if self._refs == 0 else None
+
+    def _ensure_service(self) -> EasyPostService:
+        if self._service is None:
+            self._service = self._factory()
+            logger.info("Shared EasyPost service created")
+        return self._service
+
+
+service_registry = ServiceRegistry()
+# The shared service is torn down once, when the process exits
+atexit.register(service_registry.shutdown)
+
+
+def get_shared_service() -> EasyPostService:
+    """Return the process-wide EasyPost service."""
+    return service_registry.get()
@@ -0,0 +1,271 @@
+"""Local write-through ledger of EasyPost shipments (embedded SQLite).
+
+EasyPostService records every shipment it creates, buys, refunds, retrieves
+or lists, in the `_shipment_to_dict` shape. Read paths can then answer from
+the ledger while the row (or, for lists, the last full list sync) is younger
+than a freshness bound, instead of making another EasyPost round trip.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_AGE = 900.0  # seconds
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS shipments ("
+    " id TEXT PRIMARY KEY,"
+    " tracking_code TEXT,"
+    " created_at TEXT,"
+    " carrier TEXT,"
+    " status TEXT,"
+    " purchased INTEGER NOT NULL,"
+    " data TEXT NOT NULL,"
+    " synced_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS shipments_tracking_code ON shipments (tracking_code)",
+    "CREATE INDEX IF NOT EXISTS shipments_created_at ON shipments (created_at)",
+    "CREATE INDEX IF NOT EXISTS shipments_carrier ON shipments (carrier)",
+    "CREATE TABLE IF NOT EXISTS list_syncs ("
+    " query TEXT PRIMARY KEY,"
+    " start_datetime TEXT,"
+    " page_size INTEGER NOT NULL,"
+    " has_more INTEGER NOT NULL DEFAULT 1,"
+    " synced_at REAL NOT NULL)",
+)
+
+
+class ShipmentLedger:
+    """
+    Thread-safe SQLite store of normalized shipment dicts.
+
+    Rows are indexed by id, tracking code, created_at and carrier. Each row
+    remembers when it was last written from EasyPost (`synced_at`, wall
+    clock) so readers can apply a freshness bound.
+    """
+
+    def __init__(self, path: str | Path = ":memory:", *, clock: Callable[[], float] = time.time):
+        self.path = str(path)
+        self._clock = clock
+        self._lock = threading.Lock()
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            if self.path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(list_syncs)")}
+            if "has_more" not in columns:
+                # Ledgers written before has_more was tracked: assume more pages
+                self._conn.execute(
+                    "ALTER TABLE list_syncs ADD COLUMN has_more INTEGER NOT NULL DEFAULT 1"
+                )
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def record(self, shipment: dict[str, Any]) -> None:
+        """Insert or refresh one shipment (shape of `_shipment_to_dict`)."""
+        self.record_many([shipment])
+
+    def record_many(self, shipments: Iterable[dict[str, Any]]) -> None:
+        now = self._clock()
+        rows = [
+            (
+                shipment["id"],
+                shipment.get("tracking_number") or None,
+                shipment.get("created_at"),
+                shipment.get("carrier") or None,
+                shipment.get("status"),
+                int(bool(shipment.get("carrier") or shipment.get("label_url"))),
+                json.dumps(shipment, default=str),
+                now,
+            )
+            for shipment in shipments
+            if shipment.get("id")
+        ]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO shipments "
+                "(id, tracking_code, created_at, carrier, status, purchased, data, synced_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.writes += len(rows)
+
+    def update(self, shipment_id: str, **fields: Any) -> None:
+        """Patch fields of a known shipment (e.g. refund_status after a refund)."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT data FROM shipments WHERE id = ?", (shipment_id,)
+            ).fetchone()
+            if row is None:
+                return
+            data = {**json.loads(row[0]), **fields}
+            self._conn.execute(
+                "UPDATE shipments SET status = ?, data = ?, synced_at = ? WHERE id = ?",
+                (data.get("status"), json.dumps(data, default=str), self._clock(), shipment_id),
+            )
+            self.writes += 1
+
+    def get(self, shipment_id: str, max_age: float | None = None) -> dict[str, Any] | None:
+        """Return the shipment if known and synced within `max_age` seconds."""
+        return self._get_one("id = ?", shipment_id, max_age)
+
+    def get_by_tracking_code(
+        self, tracking_code: str, max_age: float | None = None
+    ) -> dict[str, Any] | None:
+        return self._get_one("tracking_code = ?", tracking_code, max_age)
+
+    def query(
+        self,
+        page_size: int = 20,
+        *,
+        purchased: bool | None = None,
+        carrier: str | None = None,
+        tracking_code: str | None = None,
+        start_datetime: str | None = None,
+        end_datetime: str | None = None,
+        before_id: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Newest-first shipments matching the filters (no freshness check)."""
+        clauses: list[str] = []
+        params: list[Any] = []
+        if purchased is not None:
+            clauses.append("purchased = ?")
+            params.append(int(purchased))
+        if carrier:
+            clauses.append("carrier = ? COLLATE NOCASE")
+            params.append(carrier)
+        if tracking_code:
+            clauses.append("tracking_code = ?")
+            params.append(tracking_code)
+        if start_datetime:
+            clauses.append("created_at >= ?")
+            params.append(start_datetime)
+        if end_datetime:
+            clauses.append("created_at <= ?")
+            params.append(end_datetime)
+        if before_id:
+            clauses.append("created_at < (SELECT created_at FROM shipments WHERE id = ?)")
+            params.append(before_id)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(max(1, page_size))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT data FROM shipments {where} "  # noqa: S608 - fixed column clauses
+                "ORDER BY created_at DESC, id DESC LIMIT ?",
+                params,
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def mark_list_synced(
+        self,
+        query: str,
+        page_size: int,
+        start_datetime: str | None = None,
+        has_more: bool = True,
+    ) -> None:
+        """
+        Remember that EasyPost's newest `page_size` shipments for `query` are
+        stored, and whether EasyPost reported more beyond them.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO list_syncs "
+                "(query, start_datetime, page_size, has_more, synced_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (query, start_datetime, page_size, int(has_more), self._clock()),
+            )
+
+    def list_has_more(self, query: str) -> bool:
+        """EasyPost's `has_more` from the last list sync for `query` (True if unknown)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT has_more FROM list_syncs WHERE query = ?", (query,)
+            ).fetchone()
+        return row is None or bool(row[0])
+
+    def list_is_fresh(
+        self,
+        query: str,
+        page_size: int,
+        max_age: float,
+        start_datetime: str | None = None,
+    ) -> bool:
+        """
+        True if a list sync for `query` covering `page_size` rows and the
+        requested start bound happened within `max_age` seconds.
+
+        Shipments written through since that sync are already in the ledger.
+        """
+        if max_age <= 0:
+            return False
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT start_datetime, page_size, synced_at FROM list_syncs WHERE query = ?",
+                (query,),
+            ).fetchone()
+        if row is None:
+            return False
+        synced_start, synced_size, synced_at = row
+        covers_start = synced_start is None or (
+            start_datetime is not None and start_datetime >= synced_start
+        )
+        return covers_start and synced_size >= page_size and synced_at >= self._clock() - max_age
+
+    def count_hit(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Row count and read counters for metrics endpoints."""
+        with self._lock:
+            rows = self._conn.execute("SELECT COUNT(*) FROM shipments").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "path": self.path,
+                "shipments": rows,
+                "writes": self.writes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM shipments")
+            self._conn.execute("DELETE FROM list_syncs")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _get_one(self, where: str, value: str, max_age: float | None) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT data, synced_at FROM shipments WHERE {where}",  # noqa: S608 - fixed
+                (value,),
+            ).fetchone()
+        if row is None:
+            return None
+        if max_age is not None and row[1] < self._clock() - max_age:
+            return None
+        return json.loads(row[0])
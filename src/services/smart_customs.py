@@ -4,10 +4,17 @@
 M3 MAX OPTIMIZED: Uses caching and pattern matching for instant customs generation.
 """
 
+import hashlib
+import json
 import logging
 import re
+import threading
 from typing import Any
 
+from easypost.easypost_object import convert_to_easypost_object
+
+from src.utils.cache import SQLiteStore, TTLCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -143,20 +150,23 @@ def detect_hs_code_from_description(description: str) -> tuple[str, str, float]:
     return HTS_CODE_PATTERNS["default"] + (VALUE_ESTIMATES["default"],)
 
 
-def extract_customs_smart(
+def build_customs_payload(
     contents: str,
     weight_oz: float,
-    easypost_client,
     default_value: float | None = None,
     customs_signer: str = "Sender",
     _incoterm: str = "DDP",
     eel_pfc: str | None = None,
     contents_explanation: str = "",
     restriction_comments: str = "",
-) -> Any | None:
+) -> dict[str, Any]:
     """
     Smart customs extraction with auto-fill for missing data.
 
+    Builds the customs_info payload locally as plain dicts (customs_items
+    nested), ready to send inline with a shipment or rate request so EasyPost
+    creates everything in the same round trip. No API calls are made.
+
     Handles 3 formats:
     1. Full format: "(qty) Description HTS Code: XXXX.XX.XXXX ($value each)"
     2. Partial: "Description with some info"
@@ -176,7 +186,6 @@ def extract_customs_smart(
     Args:
         contents: Item description (any format)
         weight_oz: Package weight in ounces (from actual parcel)
-        easypost_client: EasyPost client instance
         default_value: Override value estimation
         customs_signer: Name of person certifying customs (required)
         eel_pfc: Exemption Legend or Proof of Filing (auto-set if None)
@@ -184,12 +193,12 @@ def extract_customs_smart(
         restriction_comments: Required if restriction_type != 'none'
 
     Returns:
-        CustomsInfo object or None
+        customs_info dict with nested customs_items
 
     Raises:
         ValueError: If shipment value ≥ $2,500 and no eel_pfc provided
     """
-    customs_items = []
+    customs_items: list[dict[str, Any]] = []
 
     # Pattern for multiple items: "(qty) Description ($value each)" or "($value/each)"
     # Match: (2) Summit Series Technical Denim Jeans ($22 each)
@@ -245,14 +254,14 @@ def extract_customs_smart(
             )
 
             customs_items.append(
-                easypost_client.customs_item.create(
-                    description=item_desc,
-                    hs_tariff_number=shared_hs_code,
-                    origin_country="US",
-                    quantity=item_qty,
-                    value=item_val,
-                    weight=item_weight,
-                )
+                {
+                    "description": item_desc,
+                    "hs_tariff_number": shared_hs_code,
+                    "origin_country": "US",
+                    "quantity": item_qty,
+                    "value": item_val,
+                    "weight": item_weight,
+                }
             )
 
         # Enforce UPS 100-item limit
@@ -277,26 +286,9 @@ def extract_customs_smart(
                 )
             eel_pfc = "NOEEI 30.37(a)"
 
-        # Create customs_info with all items
-        try:
-            customs_params = {
-                "customs_items": customs_items,
-                "customs_certify": True,
-                "customs_signer": customs_signer,
-                "contents_type": "merchandise",
-                "restriction_type": "none",
-                "eel_pfc": eel_pfc,
-                "non_delivery_option": "return",
-            }
-
-            # Always include optional fields for consistency (even if empty)
-            customs_params["contents_explanation"] = contents_explanation or ""
-            customs_params["restriction_comments"] = restriction_comments or ""
-
-            return easypost_client.customs_info.create(**customs_params)
-        except Exception as e:
-            logger.error(f"Failed to create multi-item customs: {str(e)}")
-            raise CustomsCreationError(f"Failed to create multi-item customs: {str(e)}") from e
+        return _customs_info_payload(
+            customs_items, customs_signer, eel_pfc, contents_explanation, restriction_comments
+        )
 
     # Single item - use original logic
     quantity = 1
@@ -423,43 +415,160 @@ def extract_customs_smart(
             )
         eel_pfc = "NOEEI 30.37(a)"
 
-    try:
-        customs_item = easypost_client.customs_item.create(
-            description=description,
-            hs_tariff_number=hs_code,
-            origin_country="US",
-            quantity=quantity,
-            value=value,
-            weight=item_weight,  # Item weight (not parcel weight)
-        )
-
-        # Create customs_info with proper fields (no incoterm - not supported by EasyPost API)
-        customs_params = {
-            "customs_items": [customs_item],
-            "customs_certify": True,
-            "customs_signer": customs_signer,
-            "contents_type": "merchandise",
-            "restriction_type": "none",
-            "eel_pfc": eel_pfc,
-            "non_delivery_option": "return",
+    customs_items.append(
+        {
+            "description": description,
+            "hs_tariff_number": hs_code,
+            "origin_country": "US",
+            "quantity": quantity,
+            "value": value,
+            "weight": item_weight,  # Item weight (not parcel weight)
         }
+    )
+    return _customs_info_payload(
+        customs_items, customs_signer, eel_pfc, contents_explanation, restriction_comments
+    )
+
 
+def _customs_info_payload(
+    customs_items: list[dict[str, Any]],
+    customs_signer: str,
+    eel_pfc: str,
+    contents_explanation: str,
+    restriction_comments: str,
+) -> dict[str, Any]:
+    # No incoterm: DDP/DDU is handled at shipment options level, not customs_info
+    return {
+        "customs_items": customs_items,
+        "customs_certify": True,
+        "customs_signer": customs_signer,
+        "contents_type": "merchandise",
+        "restriction_type": "none",
+        "eel_pfc": eel_pfc,
+        "non_delivery_option": "return",
         # Always include optional fields for consistency (even if empty)
-        customs_params["contents_explanation"] = contents_explanation or ""
-        customs_params["restriction_comments"] = restriction_comments or ""
+        "contents_explanation": contents_explanation or "",
+        "restriction_comments": restriction_comments or "",
+    }
 
-        # Note: DDP/DDU is handled at shipment options level, not customs_info
-        # incoterm field doesn't exist in EasyPost customs_info API
 
-        return easypost_client.customs_info.create(**customs_params)
+def extract_customs_smart(
+    contents: str,
+    weight_oz: float,
+    easypost_client,
+    default_value: float | None = None,
+    customs_signer: str = "Sender",
+    _incoterm: str = "DDP",
+    eel_pfc: str | None = None,
+    contents_explanation: str = "",
+    restriction_comments: str = "",
+) -> Any | None:
+    """
+    Create an EasyPost CustomsInfo from free-text contents.
+
+    Same extraction as build_customs_payload(), but every customs item and
+    the customs_info are created up front (1 + N API calls). Prefer sending
+    the payload inline unless a reusable customs_info id is needed.
 
+    Returns:
+        CustomsInfo object
+
+    Raises:
+        ValueError: If shipment value ≥ $2,500 and no eel_pfc provided
+        CustomsCreationError: If EasyPost rejects an item or the customs_info
+    """
+    payload = build_customs_payload(
+        contents,
+        weight_oz,
+        default_value,
+        customs_signer,
+        _incoterm,
+        eel_pfc,
+        contents_explanation,
+        restriction_comments,
+    )
+    kind = "multi-item customs" if len(payload["customs_items"]) > 1 else "customs"
+    try:
+        customs_items = [
+            easypost_client.customs_item.create(**item) for item in payload["customs_items"]
+        ]
+        return easypost_client.customs_info.create(**{**payload, "customs_items": customs_items})
     except Exception as e:
-        logger.error(f"Failed to create customs: {str(e)}")
-        raise CustomsCreationError(f"Failed to create customs: {str(e)}") from e
+        logger.error(f"Failed to create {kind}: {str(e)}")
+        raise CustomsCreationError(f"Failed to create {kind}: {str(e)}") from e
+
+
+# Customs cache: bounded LRU + TTL, single-flight, optionally persisted to SQLite
+CUSTOMS_WEIGHT_BUCKET_OZ = 0.1  # Weights within a bucket share one customs_info
+
+_customs_cache: TTLCache | None = None
+_customs_cache_lock = threading.Lock()
+
+
+def _encode_customs(customs: Any) -> str:
+    return json.dumps(customs.to_dict())
+
+
+def _decode_customs(payload: str) -> Any:
+    return convert_to_easypost_object(json.loads(payload))
+
+
+def get_customs_cache() -> TTLCache:
+    """Return the process-wide customs cache configured from settings."""
+    global _customs_cache
+    with _customs_cache_lock:
+        if _customs_cache is None:
+            from src.utils.config import settings
+
+            store = None
+            if settings.CUSTOMS_CACHE_PATH:
+                store = SQLiteStore(
+                    settings.CUSTOMS_CACHE_PATH,
+                    encode=_encode_customs,
+                    decode=_decode_customs,
+                )
+            _customs_cache = TTLCache(
+                maxsize=settings.CUSTOMS_CACHE_MAX_SIZE,
+                ttl=settings.CUSTOMS_CACHE_TTL_SECONDS,
+                store=store,
+            )
+        return _customs_cache
 
 
-# Customs cache for performance (M3 Max: 128GB RAM)
-_smart_customs_cache: dict[str, Any] = {}
+def customs_cache_key(
+    contents: str,
+    weight_oz: float,
+    easypost_client,
+    value: float | None = None,
+    customs_signer: str = "Sender",
+    incoterm: str = "DDP",
+    eel_pfc: str | None = None,
+    contents_explanation: str = "",
+    restriction_comments: str = "",
+) -> str:
+    """
+    Normalized customs cache key.
+
+    Whitespace is collapsed, weight is bucketed to CUSTOMS_WEIGHT_BUCKET_OZ and
+    value rounded to cents. The API key is fingerprinted in because customs_info
+    ids belong to one account (and test/production modes differ).
+    """
+    api_key = str(getattr(easypost_client, "api_key", ""))
+    account = hashlib.sha256(api_key.encode()).hexdigest()[:12]
+    weight_bucket = round(float(weight_oz) / CUSTOMS_WEIGHT_BUCKET_OZ) * CUSTOMS_WEIGHT_BUCKET_OZ
+    value_key = "auto" if value is None else f"{float(value):.2f}"
+    parts = (
+        account,
+        " ".join(contents.split()),
+        f"{weight_bucket:.2f}",
+        value_key,
+        customs_signer.strip(),
+        incoterm.strip().upper(),
+        eel_pfc or "",
+        contents_explanation.strip(),
+        restriction_comments.strip(),
+    )
+    return "|".join(parts)
 
 
 def get_or_create_customs(
@@ -472,11 +581,15 @@ def get_or_create_customs(
     eel_pfc: str | None = None,
     contents_explanation: str = "",
     restriction_comments: str = "",
+    *,
+    inline: bool = False,
 ) -> Any | None:
     """
     Get cached customs or create new with smart defaults.
 
-    M3 MAX OPTIMIZATION: 95% cache hit rate for bulk orders.
+    Results are cached per customs_cache_key() (see get_customs_cache()).
+    With `inline=True` nothing is created: the customs_info payload from
+    build_customs_payload() is returned for sending nested in the shipment.
 
     Args:
         contents: Product description with HTS code
@@ -488,14 +601,21 @@ def get_or_create_customs(
         eel_pfc: Exemption Legend or Proof of Filing (auto-set if None)
         contents_explanation: Required if contents_type='other'
         restriction_comments: Required if restriction_type != 'none'
+        inline: Return the local payload instead of an EasyPost CustomsInfo
     """
-    cache_key = f"{contents}:{weight_oz}:{value}:{customs_signer}:{incoterm}:{eel_pfc}"
-
-    if cache_key in _smart_customs_cache:
-        logger.debug(f"Customs cache hit: {contents[:30]}...")
-        return _smart_customs_cache[cache_key]
+    if inline:
+        return build_customs_payload(
+            contents,
+            weight_oz,
+            value,
+            customs_signer,
+            incoterm,
+            eel_pfc,
+            contents_explanation,
+            restriction_comments,
+        )
 
-    customs = extract_customs_smart(
+    cache_key = customs_cache_key(
         contents,
         weight_oz,
         easypost_client,
@@ -507,7 +627,18 @@ def get_or_create_customs(
         restriction_comments,
     )
 
-    if customs:
-        _smart_customs_cache[cache_key] = customs
-
-    return customs
+    # Concurrent identical requests (bulk workers) share one creation
+    return get_customs_cache().get_or_create(
+        cache_key,
+        lambda: extract_customs_smart(
+            contents,
+            weight_oz,
+            easypost_client,
+            value,
+            customs_signer,
+            incoterm,
+            eel_pfc,
+            contents_explanation,
+            restriction_comments,
+        ),
+    )
@@ -0,0 +1,143 @@
+"""EasyPost address ids for the fixed warehouse origins.
+
+Every bulk line ships from one of the `WAREHOUSE_BY_CATEGORY` addresses.
+Instead of sending the full address with each rate/shipment request (which
+EasyPost re-parses and stores every time), each warehouse is created once
+and later requests reference it as `{"id": "adr_..."}`.
+
+Ids are keyed by account and a hash of the normalized address content, so
+editing a warehouse entry registers a new address automatically.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from src.services.address_utils import normalize_address
+from src.services.warehouse_utils import WAREHOUSE_BY_CATEGORY
+from src.utils.cache import SQLiteStore, TTLCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 30 * 86400.0  # seconds; EasyPost addresses do not expire
+FAILURE_BACKOFF = 300.0  # seconds before retrying a failed registration
+
+
+def address_content_hash(address: dict[str, Any]) -> str:
+    """Hash of the normalized address exactly as it would be sent to EasyPost."""
+    normalized = {
+        key: value for key, value in normalize_address(address).items() if value not in (None, "")
+    }
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True).encode()).hexdigest()
+
+
+def warehouse_addresses() -> list[dict[str, Any]]:
+    """Distinct warehouse origins from `WAREHOUSE_BY_CATEGORY`."""
+    unique: dict[str, dict[str, Any]] = {}
+    for state_warehouses in WAREHOUSE_BY_CATEGORY.values():
+        for address in state_warehouses.values():
+            unique.setdefault(address_content_hash(address), address)
+    return list(unique.values())
+
+
+def _account(easypost_client) -> str:
+    api_key = str(getattr(easypost_client, "api_key", ""))
+    return hashlib.sha256(api_key.encode()).hexdigest()[:12]
+
+
+class WarehouseAddressRegistry:
+    """
+    Thread-safe map of warehouse address content -> EasyPost address id.
+
+    Only addresses in the registry's warehouse set are registered; custom
+    sender addresses are always sent in full. Concurrent first uses of one
+    warehouse share a single `address.create` call.
+    """
+
+    def __init__(
+        self,
+        addresses: Iterable[dict[str, Any]] | None = None,
+        *,
+        ttl: float = DEFAULT_TTL,
+        store: SQLiteStore | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        # Distinct warehouse set by content hash; register_all() registers exactly these
+        self._addresses: dict[str, dict[str, Any]] = {}
+        for address in warehouse_addresses() if addresses is None else addresses:
+            self._addresses.setdefault(address_content_hash(address), address)
+        self._ids = TTLCache(maxsize=max(64, 4 * len(self._addresses)), ttl=ttl, store=store)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failed_at: dict[str, float] = {}
+        self.registered = 0
+        self.failures = 0
+
+    def is_warehouse(self, address: Any) -> bool:
+        return isinstance(address, dict) and address_content_hash(address) in self._addresses
+
+    def lookup(self, easypost_client, address: Any) -> str | None:
+        """Registered id for `address`, without calling EasyPost."""
+        if not self.is_warehouse(address):
+            return None
+        return self._ids.get(self._key(easypost_client, address))
+
+    def resolve(self, easypost_client, address: Any) -> str | None:
+        """
+        Registered id for a warehouse `address`, creating it on first use.
+
+        Returns None for non-warehouse addresses and when registration fails
+        (callers then send the full address).
+        """
+        if not self.is_warehouse(address):
+            return None
+        key = self._key(easypost_client, address)
+        with self._lock:
+            failed_at = self._failed_at.get(key)
+            if failed_at is not None and self._clock() - failed_at < FAILURE_BACKOFF:
+                return None
+        try:
+            return self._ids.get_or_create(key, lambda: self._create(easypost_client, address))
+        except Exception as e:
+            with self._lock:
+                self._failed_at[key] = self._clock()
+                self.failures += 1
+            logger.warning(f"Warehouse address registration failed, sending full address: {e}")
+            return None
+
+    def register_all(self, easypost_client) -> dict[str, int]:
+        """Register every warehouse in this registry's set (e.g. at startup); returns counts."""
+        ids = [self.resolve(easypost_client, address) for address in self._addresses.values()]
+        registered = sum(1 for address_id in ids if address_id)
+        return {"registered": registered, "failed": len(ids) - registered}
+
+    def stats(self) -> dict[str, Any]:
+        """Registration counters for metrics endpoints."""
+        with self._lock:
+            return {
+                "warehouses": len(self._addresses),
+                "registered": self.registered,
+                "failures": self.failures,
+                "cache": self._ids.stats(),
+            }
+
+    def clear(self) -> None:
+        self._ids.clear()
+        with self._lock:
+            self._failed_at.clear()
+
+    def _key(self, easypost_client, address: dict[str, Any]) -> str:
+        return f"{_account(easypost_client)}|{address_content_hash(address)}"
+
+    def _create(self, easypost_client, address: dict[str, Any]) -> str:
+        created = easypost_client.address.create(**normalize_address(address))
+        with self._lock:
+            self.registered += 1
+        logger.info(f"Registered warehouse address {address.get('name')} as {created.id}")
+        return created.id
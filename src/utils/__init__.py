@@ -1,12 +1,24 @@
 """Utility modules for configuration and monitoring."""
 
-from .config import settings
+from typing import Any
+
+from .cache import TTLCache
 from .constants import BULK_OPERATION_TIMEOUT, STANDARD_TIMEOUT
 from .monitoring import metrics
 
 __all__ = [
     "settings",
     "metrics",
+    "TTLCache",
     "STANDARD_TIMEOUT",
     "BULK_OPERATION_TIMEOUT",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # Settings load env files, so they are built on first access, not on import
+    if name == "settings":
+        from .config import settings
+
+        return settings
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,295 @@
+"""In-process TTL + LRU cache with hit/miss counters and an optional SQLite store."""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class _Flight:
+    """One in-progress `get_or_create` computation shared by concurrent callers."""
+
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class SQLiteStore:
+    """
+    Persistent key/value backing for TTLCache (survives restarts).
+
+    Values are serialized with `encode`/`decode` (JSON by default). Expiry is
+    stored as wall-clock time so entries age correctly across processes.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        encode: Callable[[Any], str] = json.dumps,
+        decode: Callable[[str], Any] = json.loads,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = str(path)
+        self._encode = encode
+        self._decode = decode
+        self._clock = clock
+        self._lock = threading.Lock()
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.execute("DELETE FROM entries WHERE expires_at <= ?", (self._clock(),))
+
+    def get(self, key: Hashable) -> Any:
+        """Return the stored value, or `_MISSING` if absent, expired or undecodable."""
+        entry = self.get_entry(key)
+        return entry if entry is _MISSING else entry[0]
+
+    def get_entry(self, key: Hashable) -> tuple[Any, float] | Any:
+        """`(value, seconds left before expiry)`, or `_MISSING` like `get`."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (str(key),)
+            ).fetchone()
+        if row is None:
+            return _MISSING
+        remaining = row[1] - self._clock()
+        if remaining <= 0:
+            return _MISSING
+        try:
+            return self._decode(row[0]), remaining
+        except Exception as e:
+            logger.warning(f"Dropping undecodable cache entry: {e}")
+            self.delete(key)
+            return _MISSING
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        try:
+            encoded = self._encode(value)
+        except Exception as e:
+            logger.debug(f"Value not persisted (not serializable): {e}")
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (str(key), encoded, self._clock() + ttl),
+            )
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (str(key),))
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class TTLCache:
+    """
+    Thread-safe mapping whose entries expire after `ttl` seconds.
+
+    Size is bounded by `maxsize`; the least recently used entry is evicted
+    first. A `ttl` of 0 (or less) disables caching entirely. With a `store`,
+    entries are written through to disk and memory misses fall back to it.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 300.0,
+        *,
+        store: SQLiteStore | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = float(ttl)
+        self.store = store
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, _Flight] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.store_hits = 0
+        self.coalesced = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or `default` if absent or expired."""
+        if not self.enabled:
+            return default
+        with self._lock:
+            value = self._lookup(key)
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+
+        entry = self._load_from_store(key)
+        with self._lock:
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            value, remaining = entry
+            self.hits += 1
+            self.store_hits += 1
+            # Keep the stored expiry: a reload must not extend a persisted entry
+            self._insert(key, value, remaining)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """
+        Store `value`, evicting least recently used entries past `maxsize`.
+
+        `ttl` overrides the cache default for this entry only.
+        """
+        if not self.enabled:
+            return
+        ttl = self.ttl if ttl is None else float(ttl)
+        with self._lock:
+            self._insert(key, value, ttl)
+        if self.store is not None:
+            try:
+                self.store.set(key, value, ttl)
+            except sqlite3.Error as e:
+                logger.warning(f"Cache store write failed: {e}")
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Return the cached value or build it with `factory` (single-flight).
+
+        Concurrent callers for the same missing key wait for one `factory()`
+        call and share its result (or exception). None results are not cached.
+        """
+        if not self.enabled:
+            return factory()
+
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            # Another leader may have finished between the miss and here
+            value = self._lookup(key)
+            if value is not _MISSING:
+                return value
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = factory()
+            if flight.value is not None:
+                self.set(key, flight.value)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove and return an entry regardless of expiry."""
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+        if self.store is not None:
+            self.store.delete(key)
+        return default if entry is _MISSING else entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Counters and occupancy for metrics endpoints."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "enabled": self.enabled,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "coalesced": self.coalesced,
+            }
+            if self.store is not None:
+                stats["store_hits"] = self.store_hits
+            return stats
+
+    def _lookup(self, key: Hashable) -> Any:
+        """Fresh in-memory value (refreshing LRU order) or `_MISSING`. Lock held."""
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            return _MISSING
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._data[key]
+            return _MISSING
+        self._data.move_to_end(key)
+        return value
+
+    def _insert(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Insert and evict past `maxsize`. Lock held."""
+        self._data[key] = (self._clock() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def _load_from_store(self, key: Hashable) -> tuple[Any, float] | Any:
+        """`(value, remaining ttl)` from the store, or `_MISSING`."""
+        if self.store is None:
+            return _MISSING
+        try:
+            return self.store.get_entry(key)
+        except sqlite3.Error as e:
+            logger.warning(f"Cache store read failed: {e}")
+            return _MISSING
@@ -61,10 +61,60 @@ class Settings:
     CORS_ALLOW_HEADERS: tuple[str, ...]
     ENVIRONMENT: str
     MAX_BULK_CONCURRENCY: int
+    EASYPOST_TRANSPORT: str
+    EASYPOST_MAX_CONNECTIONS: int
+    EASYPOST_API_BASE: str
+    EASYPOST_RATE_LIMIT_RPS: float
+    EASYPOST_RATE_LIMIT_BURST: int
+    RATE_CACHE_TTL_SECONDS: float
+    RATE_CACHE_MAX_SIZE: int
+    CUSTOMS_CACHE_TTL_SECONDS: float
+    CUSTOMS_CACHE_MAX_SIZE: int
+    CUSTOMS_CACHE_PATH: str
+    CUSTOMS_INLINE: bool
+    EASYPOST_SHIPMENT_RETRIEVE: str
+    SHIPMENT_LEDGER_PATH: str
+    SHIPMENT_LEDGER_MAX_AGE_SECONDS: float
+    TRACKING_CACHE_TTL_SECONDS: float
+    TRACKING_CACHE_FINAL_TTL_SECONDS: float
+    TRACKING_CACHE_MAX_SIZE: int
+    EASYPOST_WEBHOOK_SECRET: str
+    EASYPOST_WEBHOOK_ALLOW_UNSIGNED: bool
+    ADDRESS_VERIFICATION_CACHE_TTL_SECONDS: float
+    ADDRESS_VERIFICATION_CACHE_MAX_SIZE: int
+    ADDRESS_VERIFICATION_CACHE_PATH: str
+    WAREHOUSE_ADDRESS_IDS: bool
+    WAREHOUSE_ADDRESS_REGISTRY_PATH: str
+    WAREHOUSE_ADDRESS_PREREGISTER: bool
+    SHIPMENT_PLAN_CACHE_TTL_SECONDS: float
+    SHIPMENT_PLAN_CACHE_MAX_SIZE: int
+    BULK_API_TRACE: bool
 
     def validate(self) -> None:
         if not self.EASYPOST_API_KEY:
             raise ValueError("EASYPOST_API_KEY is required")
+        if self.EASYPOST_TRANSPORT not in ("sdk", "async"):
+            raise ValueError("EASYPOST_TRANSPORT must be 'sdk' or 'async'")
+        if self.EASYPOST_RATE_LIMIT_RPS <= 0 or self.EASYPOST_RATE_LIMIT_BURST < 1:
+            raise ValueError(
+                "EASYPOST_RATE_LIMIT_RPS and EASYPOST_RATE_LIMIT_BURST must be positive"
+            )
+        if self.RATE_CACHE_MAX_SIZE < 1:
+            raise ValueError("RATE_CACHE_MAX_SIZE must be at least 1")
+        if self.EASYPOST_SHIPMENT_RETRIEVE not in ("auto", "always"):
+            raise ValueError("EASYPOST_SHIPMENT_RETRIEVE must be 'auto' or 'always'")
+        if self.CUSTOMS_CACHE_MAX_SIZE < 1:
+            raise ValueError("CUSTOMS_CACHE_MAX_SIZE must be at least 1")
+        if self.SHIPMENT_LEDGER_MAX_AGE_SECONDS < 0:
+            raise ValueError("SHIPMENT_LEDGER_MAX_AGE_SECONDS must not be negative")
+        if self.TRACKING_CACHE_MAX_SIZE < 1:
+            raise ValueError("TRACKING_CACHE_MAX_SIZE must be at least 1")
+        if self.EASYPOST_WEBHOOK_ALLOW_UNSIGNED and self.ENVIRONMENT == "production":
+            raise ValueError("EASYPOST_WEBHOOK_ALLOW_UNSIGNED is not allowed in production")
+        if self.ADDRESS_VERIFICATION_CACHE_MAX_SIZE < 1:
+            raise ValueError("ADDRESS_VERIFICATION_CACHE_MAX_SIZE must be at least 1")
+        if self.SHIPMENT_PLAN_CACHE_MAX_SIZE < 1:
+            raise ValueError("SHIPMENT_PLAN_CACHE_MAX_SIZE must be at least 1")
 
 
 def _build_settings() -> Settings:
@@ -87,6 +137,44 @@ def _build_settings() -> Settings:
         ),
         ENVIRONMENT=os.getenv("ENVIRONMENT", "development"),
         MAX_BULK_CONCURRENCY=int(os.getenv("MAX_BULK_CONCURRENCY", "16")),
+        EASYPOST_TRANSPORT=os.getenv("EASYPOST_TRANSPORT", "sdk").strip().lower(),
+        EASYPOST_MAX_CONNECTIONS=int(os.getenv("EASYPOST_MAX_CONNECTIONS", "64")),
+        EASYPOST_API_BASE=os.getenv("EASYPOST_API_BASE", "").strip(),
+        EASYPOST_RATE_LIMIT_RPS=float(os.getenv("EASYPOST_RATE_LIMIT_RPS", "10")),
+        EASYPOST_RATE_LIMIT_BURST=int(os.getenv("EASYPOST_RATE_LIMIT_BURST", "20")),
+        RATE_CACHE_TTL_SECONDS=float(os.getenv("RATE_CACHE_TTL_SECONDS", "300")),
+        RATE_CACHE_MAX_SIZE=int(os.getenv("RATE_CACHE_MAX_SIZE", "1024")),
+        CUSTOMS_CACHE_TTL_SECONDS=float(os.getenv("CUSTOMS_CACHE_TTL_SECONDS", "86400")),
+        CUSTOMS_CACHE_MAX_SIZE=int(os.getenv("CUSTOMS_CACHE_MAX_SIZE", "2048")),
+        CUSTOMS_CACHE_PATH=os.getenv("CUSTOMS_CACHE_PATH", "").strip(),
+        CUSTOMS_INLINE=_parse_bool(os.getenv("CUSTOMS_INLINE"), default=True),
+        EASYPOST_SHIPMENT_RETRIEVE=os.getenv("EASYPOST_SHIPMENT_RETRIEVE", "auto").strip().lower(),
+        SHIPMENT_LEDGER_PATH=os.getenv("SHIPMENT_LEDGER_PATH", "").strip(),
+        SHIPMENT_LEDGER_MAX_AGE_SECONDS=float(os.getenv("SHIPMENT_LEDGER_MAX_AGE_SECONDS", "900")),
+        TRACKING_CACHE_TTL_SECONDS=float(os.getenv("TRACKING_CACHE_TTL_SECONDS", "300")),
+        TRACKING_CACHE_FINAL_TTL_SECONDS=float(
+            os.getenv("TRACKING_CACHE_FINAL_TTL_SECONDS", "86400")
+        ),
+        TRACKING_CACHE_MAX_SIZE=int(os.getenv("TRACKING_CACHE_MAX_SIZE", "4096")),
+        EASYPOST_WEBHOOK_SECRET=os.getenv("EASYPOST_WEBHOOK_SECRET", ""),
+        EASYPOST_WEBHOOK_ALLOW_UNSIGNED=_parse_bool(
+            os.getenv("EASYPOST_WEBHOOK_ALLOW_UNSIGNED"), default=False
+        ),
+        ADDRESS_VERIFICATION_CACHE_TTL_SECONDS=float(
+            os.getenv("ADDRESS_VERIFICATION_CACHE_TTL_SECONDS", "604800")
+        ),
+        ADDRESS_VERIFICATION_CACHE_MAX_SIZE=int(
+            os.getenv("ADDRESS_VERIFICATION_CACHE_MAX_SIZE", "4096")
+        ),
+        ADDRESS_VERIFICATION_CACHE_PATH=os.getenv("ADDRESS_VERIFICATION_CACHE_PATH", "").strip(),
+        WAREHOUSE_ADDRESS_IDS=_parse_bool(os.getenv("WAREHOUSE_ADDRESS_IDS"), default=True),
+        WAREHOUSE_ADDRESS_REGISTRY_PATH=os.getenv("WAREHOUSE_ADDRESS_REGISTRY_PATH", "").strip(),
+        WAREHOUSE_ADDRESS_PREREGISTER=_parse_bool(
+            os.getenv("WAREHOUSE_ADDRESS_PREREGISTER"), default=False
+        ),
+        SHIPMENT_PLAN_CACHE_TTL_SECONDS=float(os.getenv("SHIPMENT_PLAN_CACHE_TTL_SECONDS", "1800")),
+        SHIPMENT_PLAN_CACHE_MAX_SIZE=int(os.getenv("SHIPMENT_PLAN_CACHE_MAX_SIZE", "4096")),
+        BULK_API_TRACE=_parse_bool(os.getenv("BULK_API_TRACE"), default=False),
     )
     settings.validate()
     return settings
@@ -94,8 +182,12 @@ def _build_settings() -> Settings:
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Return cached Settings instance."""
+    """Return cached Settings instance (env files are loaded on first call)."""
     return _build_settings()
 
 
-settings = get_settings()
+def __getattr__(name: str) -> Settings:
+    # `settings` is built on first access rather than as an import side effect
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,29 @@
-"""Monitoring utilities for health checks and metrics."""
+"""Monitoring utilities for health checks and metrics.
+
+`metrics` is the process-wide collector. Besides per-endpoint success and
+failure counts it keeps latency histograms for HTTP endpoints and EasyPost
+operations, in-flight gauges, executor queue depth/wait and EasyPost
+response status counts (429s included). Everything is guarded by one lock,
+so routers, middleware, SDK hooks and executor threads can all record
+into it. `get_metrics()` returns JSON-ready dicts and
+`render_prometheus()` the Prometheus text exposition format.
+
+`trace_api_calls()` additionally collects the EasyPost calls made by one
+tool call (including those offloaded to an `InstrumentedThreadPoolExecutor`)
+into an `ApiCallTrace` for that tool's response.
+"""
 
 import asyncio
+import contextvars
 import logging
+import re
+import threading
 import time
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Iterator, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import UTC, datetime
 from typing import Any
 
@@ -79,17 +100,110 @@ async def check_easypost(api_key: str) -> dict[str, Any]:
             return {"status": "unhealthy", "error": str(e)}
 
 
+# Upper bounds (seconds) shared by every latency histogram
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PROMETHEUS_PREFIX = "easypost_mcp"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# EasyPost object ids in request paths ("/shipments/shp_abc123/buy")
+_OBJECT_ID = re.compile(r"^[a-z]+_[0-9A-Za-z]+$")
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram with Prometheus-style cumulative buckets.
+
+    Not thread-safe on its own; `MetricsCollector` serializes access.
+    Percentiles are interpolated within a bucket, so they are accurate to
+    the bucket width, which is plenty to tell milliseconds from seconds.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        seconds = max(0.0, seconds)
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Estimated `q` quantile (0..1) in seconds; 0.0 when empty."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                upper = min(upper, self.max)
+                lower = min(lower, upper)
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.max
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """(le, cumulative count) pairs including "+Inf"."""
+        pairs = []
+        running = 0
+        for bound, bucket_count in zip((*self.buckets, None), self.counts, strict=True):
+            running += bucket_count
+            pairs.append(("+Inf" if bound is None else _format_value(bound), running))
+        return pairs
+
+    def summary(self) -> dict[str, float]:
+        """Count plus mean/p50/p95/p99/max in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum / self.count * 1000, 2) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.50) * 1000, 2),
+            "p95_ms": round(self.quantile(0.95) * 1000, 2),
+            "p99_ms": round(self.quantile(0.99) * 1000, 2),
+            "max_ms": round(self.max * 1000, 2),
+        }
+
+
+def easypost_operation(method: Any, path: str) -> str:
+    """
+    Low-cardinality label for an EasyPost request ("POST /shipments/:id/buy").
+
+    `method` is a string from the async transport or the SDK's
+    `RequestMethod` enum (value "post") from its hooks.
+    """
+    method = str(getattr(method, "value", method))
+    path = path.split("?", 1)[0]
+    if "/v2/" in path:
+        path = path.split("/v2/", 1)[1]
+    segments = [":id" if _OBJECT_ID.match(part) else part for part in path.strip("/").split("/")]
+    return f"{method.upper()} /{'/'.join(segments)}"
+
+
 class MetricsCollector:
-    """Collect and track application metrics."""
+    """Collect and track application metrics (thread-safe)."""
 
     def __init__(self):
         self.start_time = time.time()
         self.error_count = 0
         self.api_calls = {}  # Track calls per endpoint
+        self._lock = threading.Lock()
+        self._http_latency: dict[tuple[str, str], Histogram] = {}
+        self._http_responses: defaultdict[tuple[str, str, int], int] = defaultdict(int)
+        self._easypost_latency: dict[str, Histogram] = {}
+        self._easypost_responses: defaultdict[tuple[str, int], int] = defaultdict(int)
+        self._easypost_bytes: defaultdict[str, list[int]] = defaultdict(lambda: [0, 0])
+        self._in_flight: defaultdict[str, int] = defaultdict(int)
+        self._executors: dict[str, dict[str, Any]] = {}
 
     def record_error(self):
         """Record an error."""
-        self.error_count += 1
+        with self._lock:
+            self.error_count += 1
 
     def track_api_call(self, endpoint: str, success: bool):
         """
@@ -99,28 +213,415 @@ def track_api_call(self, endpoint: str, success: bool):
             endpoint: API endpoint name
             success: Whether the call succeeded
         """
-        if endpoint not in self.api_calls:
-            self.api_calls[endpoint] = {"success": 0, "failure": 0}
+        with self._lock:
+            if endpoint not in self.api_calls:
+                self.api_calls[endpoint] = {"success": 0, "failure": 0}
+
+            if success:
+                self.api_calls[endpoint]["success"] += 1
+            else:
+                self.api_calls[endpoint]["failure"] += 1
+                self.error_count += 1
+
+    def observe_request(self, method: str, endpoint: str, status: int, seconds: float) -> None:
+        """Record one HTTP request served by `endpoint` (a route template, not a raw path)."""
+        with self._lock:
+            key = (method, endpoint)
+            histogram = self._http_latency.get(key)
+            if histogram is None:
+                histogram = self._http_latency[key] = Histogram()
+            histogram.observe(seconds)
+            self._http_responses[(method, endpoint, status)] += 1
+
+    def observe_easypost(
+        self,
+        operation: str,
+        status: int,
+        seconds: float | None,
+        request_bytes: int = 0,
+        response_bytes: int = 0,
+    ) -> None:
+        """Record one EasyPost API response (`seconds` None when the latency is unknown)."""
+        with self._lock:
+            self._easypost_responses[(operation, status)] += 1
+            sizes = self._easypost_bytes[operation]
+            sizes[0] += request_bytes
+            sizes[1] += response_bytes
+            if seconds is None:
+                return
+            histogram = self._easypost_latency.get(operation)
+            if histogram is None:
+                histogram = self._easypost_latency[operation] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def in_flight(self, name: str) -> Iterator[None]:
+        """Count the wrapped block in the `name` in-flight gauge."""
+        with self._lock:
+            self._in_flight[name] += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight[name] -= 1
+
+    def executor_event(self, name: str, event: str, wait_seconds: float = 0.0) -> None:
+        """
+        Executor bookkeeping for `InstrumentedThreadPoolExecutor`.
 
-        if success:
-            self.api_calls[endpoint]["success"] += 1
-        else:
-            self.api_calls[endpoint]["failure"] += 1
-            self.record_error()
+        `event` is "submitted", "started" (with the time spent queued),
+        "finished" or "dropped" (cancelled or rejected before it ran).
+        """
+        with self._lock:
+            state = self._executors.get(name)
+            if state is None:
+                state = self._executors[name] = {
+                    "queued": 0,
+                    "running": 0,
+                    "completed": 0,
+                    "wait": Histogram(),
+                }
+            if event == "submitted":
+                state["queued"] += 1
+            elif event == "started":
+                state["queued"] -= 1
+                state["running"] += 1
+                state["wait"].observe(wait_seconds)
+            elif event == "finished":
+                state["running"] -= 1
+                state["completed"] += 1
+            elif event == "dropped":
+                state["queued"] -= 1
 
     def get_metrics(self) -> dict[str, Any]:
         """Get current metrics."""
-        uptime_seconds = int(time.time() - self.start_time)
-        total_calls = sum(stats["success"] + stats["failure"] for stats in self.api_calls.values())
+        with self._lock:
+            uptime_seconds = int(time.time() - self.start_time)
+            api_calls = {endpoint: dict(stats) for endpoint, stats in self.api_calls.items()}
+            total_calls = sum(stats["success"] + stats["failure"] for stats in api_calls.values())
+
+            latency = {
+                f"{method} {endpoint}": histogram.summary()
+                for (method, endpoint), histogram in sorted(self._http_latency.items())
+            }
+            easypost: dict[str, dict[str, Any]] = {}
+            for (operation, status), count in sorted(self._easypost_responses.items()):
+                entry = easypost.setdefault(operation, {"responses": {}})
+                entry["responses"][str(status)] = count
+            for operation, histogram in self._easypost_latency.items():
+                easypost.setdefault(operation, {"responses": {}}).update(histogram.summary())
+            for operation, (sent, received) in self._easypost_bytes.items():
+                entry = easypost.setdefault(operation, {"responses": {}})
+                entry["request_bytes"] = sent
+                entry["response_bytes"] = received
+            rate_limited = sum(
+                count for (_op, status), count in self._easypost_responses.items() if status == 429
+            )
+            executors = {
+                name: {
+                    "queue_depth": state["queued"],
+                    "running": state["running"],
+                    "completed": state["completed"],
+                    "queue_wait": state["wait"].summary(),
+                }
+                for name, state in self._executors.items()
+            }
+
+            return {
+                "uptime_seconds": uptime_seconds,
+                "total_calls": total_calls,
+                "error_count": self.error_count,
+                "error_rate": round(self.error_count / max(total_calls, 1), 4),
+                "api_calls": api_calls,
+                "latency": latency,
+                "easypost": easypost,
+                "easypost_rate_limited": rate_limited,
+                "in_flight": dict(self._in_flight),
+                "executors": executors,
+                "timestamp": datetime.now(UTC).isoformat(),
+            }
+
+    def render_prometheus(
+        self, caches: Mapping[str, Mapping[str, Any] | None] | None = None
+    ) -> str:
+        """
+        Metrics in the Prometheus text exposition format (version 0.0.4).
+
+        Args:
+            caches: Optional `TTLCache.stats()` dicts by cache name, exported
+                as hit/miss counters and a hit-ratio gauge
+        """
+        out = _PrometheusWriter()
+        with self._lock:
+            out.metric("uptime_seconds", "gauge", "Seconds since the collector started.")
+            out.sample("uptime_seconds", {}, time.time() - self.start_time)
+
+            out.metric("api_calls_total", "counter", "Endpoint calls by outcome.")
+            for endpoint, stats in sorted(self.api_calls.items()):
+                for outcome in ("success", "failure"):
+                    out.sample(
+                        "api_calls_total",
+                        {"endpoint": endpoint, "outcome": outcome},
+                        stats[outcome],
+                    )
+            out.metric("errors_total", "counter", "Failed endpoint calls.")
+            out.sample("errors_total", {}, self.error_count)
+
+            out.metric("http_requests_total", "counter", "HTTP responses by route and status.")
+            for (method, endpoint, status), count in sorted(self._http_responses.items()):
+                labels = {"method": method, "endpoint": endpoint, "status": str(status)}
+                out.sample("http_requests_total", labels, count)
+            out.metric(
+                "http_request_duration_seconds", "histogram", "HTTP request latency by route."
+            )
+            for (method, endpoint), histogram in sorted(self._http_latency.items()):
+                out.histogram(
+                    "http_request_duration_seconds",
+                    {"method": method, "endpoint": endpoint},
+                    histogram,
+                )
+
+            out.metric("easypost_responses_total", "counter", "EasyPost API responses by status.")
+            for (operation, status), count in sorted(self._easypost_responses.items()):
+                labels = {"operation": operation, "status": str(status)}
+                out.sample("easypost_responses_total", labels, count)
+            out.metric(
+                "easypost_rate_limited_total", "counter", "EasyPost 429 responses by operation."
+            )
+            for (operation, status), count in sorted(self._easypost_responses.items()):
+                if status == 429:
+                    out.sample("easypost_rate_limited_total", {"operation": operation}, count)
+            out.metric("easypost_request_bytes_total", "counter", "EasyPost request payload bytes.")
+            for operation, (sent, _received) in sorted(self._easypost_bytes.items()):
+                out.sample("easypost_request_bytes_total", {"operation": operation}, sent)
+            out.metric("easypost_response_bytes_total", "counter", "EasyPost response body bytes.")
+            for operation, (_sent, received) in sorted(self._easypost_bytes.items()):
+                out.sample("easypost_response_bytes_total", {"operation": operation}, received)
+            out.metric(
+                "easypost_request_duration_seconds",
+                "histogram",
+                "EasyPost API latency by operation (excludes rate-limiter wait).",
+            )
+            for operation, histogram in sorted(self._easypost_latency.items()):
+                out.histogram(
+                    "easypost_request_duration_seconds", {"operation": operation}, histogram
+                )
+
+            out.metric("in_flight", "gauge", "Work currently in progress.")
+            for name, count in sorted(self._in_flight.items()):
+                out.sample("in_flight", {"scope": name}, count)
+
+            out.metric("executor_queue_depth", "gauge", "Executor tasks waiting for a worker.")
+            for name, state in sorted(self._executors.items()):
+                out.sample("executor_queue_depth", {"executor": name}, state["queued"])
+            out.metric("executor_running", "gauge", "Executor tasks currently running.")
+            for name, state in sorted(self._executors.items()):
+                out.sample("executor_running", {"executor": name}, state["running"])
+            out.metric(
+                "executor_queue_wait_seconds",
+                "histogram",
+                "Time executor tasks spent queued before a worker picked them up.",
+            )
+            for name, state in sorted(self._executors.items()):
+                out.histogram("executor_queue_wait_seconds", {"executor": name}, state["wait"])
+
+        caches = {name: stats for name, stats in (caches or {}).items() if stats}
+        out.metric("cache_hits_total", "counter", "Cache lookups served from the cache.")
+        for name, stats in sorted(caches.items()):
+            out.sample("cache_hits_total", {"cache": name}, stats.get("hits", 0))
+        out.metric("cache_misses_total", "counter", "Cache lookups that missed.")
+        for name, stats in sorted(caches.items()):
+            out.sample("cache_misses_total", {"cache": name}, stats.get("misses", 0))
+        out.metric("cache_hit_ratio", "gauge", "Hits / lookups since start.")
+        for name, stats in sorted(caches.items()):
+            out.sample("cache_hit_ratio", {"cache": name}, stats.get("hit_rate", 0.0))
+        return out.text()
+
+
+class ApiCallTrace:
+    """
+    EasyPost calls made inside one `trace_api_calls()` block, per operation.
+
+    Records arrive from SDK hooks on executor threads and from the async
+    transport on the event loop, so updates take a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations: dict[str, dict[str, Any]] = {}
+        self.started = time.perf_counter()
+
+    def record(
+        self,
+        operation: str,
+        status: int,
+        seconds: float | None,
+        request_bytes: int = 0,
+        response_bytes: int = 0,
+    ) -> None:
+        with self._lock:
+            entry = self._operations.get(operation)
+            if entry is None:
+                entry = self._operations[operation] = {
+                    "calls": 0,
+                    "errors": 0,
+                    "rate_limited": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "request_bytes": 0,
+                    "response_bytes": 0,
+                }
+            entry["calls"] += 1
+            entry["errors"] += 1 if status >= 400 else 0
+            entry["rate_limited"] += 1 if status == 429 else 0
+            if seconds is not None:
+                entry["total_ms"] += seconds * 1000
+                entry["max_ms"] = max(entry["max_ms"], seconds * 1000)
+            entry["request_bytes"] += request_bytes
+            entry["response_bytes"] += response_bytes
+
+    def summary(self) -> dict[str, Any]:
+        """
+        Totals plus per-operation entries, slowest (by summed time) first.
+
+        `api_time_ms` sums concurrent calls, so it can exceed `wall_ms`.
+        """
+        with self._lock:
+            operations = {
+                operation: {
+                    **entry,
+                    "total_ms": round(entry["total_ms"], 1),
+                    "max_ms": round(entry["max_ms"], 1),
+                    "mean_ms": round(entry["total_ms"] / entry["calls"], 1),
+                }
+                for operation, entry in sorted(
+                    self._operations.items(), key=lambda item: -item[1]["total_ms"]
+                )
+            }
         return {
-            "uptime_seconds": uptime_seconds,
-            "total_calls": total_calls,
-            "error_count": self.error_count,
-            "error_rate": round(self.error_count / max(total_calls, 1), 4),
-            "api_calls": self.api_calls,
-            "timestamp": datetime.now(UTC).isoformat(),
+            "calls": sum(entry["calls"] for entry in operations.values()),
+            "api_time_ms": round(sum(entry["total_ms"] for entry in operations.values()), 1),
+            "wall_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "by_operation": operations,
         }
 
 
+_api_trace: contextvars.ContextVar[ApiCallTrace | None] = contextvars.ContextVar(
+    "easypost_api_trace", default=None
+)
+
+
+@contextmanager
+def trace_api_calls(enabled: bool = True) -> Iterator[ApiCallTrace | None]:
+    """
+    Collect EasyPost calls started inside the block into an `ApiCallTrace`.
+
+    Tasks created inside the block inherit the trace; yields None (and
+    records nothing) when `enabled` is false.
+    """
+    if not enabled:
+        yield None
+        return
+    trace = ApiCallTrace()
+    token = _api_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _api_trace.reset(token)
+
+
+def current_api_trace() -> ApiCallTrace | None:
+    """The trace active in this context, if any."""
+    return _api_trace.get()
+
+
+class InstrumentedThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    ThreadPoolExecutor that reports queue depth, running tasks and queue wait.
+
+    `loop.run_in_executor` goes through `submit`, so every offloaded SDK call
+    is counted. The time a task waits for a free worker is what separates
+    "the executor is saturated" from "EasyPost is slow" in a bulk run.
+    Tasks run in a copy of the submitter's context, so an active
+    `trace_api_calls()` block sees the SDK hooks they trigger.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        *,
+        name: str = "default",
+        collector: MetricsCollector | None = None,
+        **kwargs: Any,
+    ):
+        super().__init__(max_workers=max_workers, **kwargs)
+        self.metrics_name = name
+        self._collector = collector or metrics
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        collector, name = self._collector, self.metrics_name
+        enqueued_at = time.perf_counter()
+        context = contextvars.copy_context()
+
+        def run():
+            collector.executor_event(name, "started", time.perf_counter() - enqueued_at)
+            try:
+                return context.run(fn, *args, **kwargs)
+            finally:
+                collector.executor_event(name, "finished")
+
+        collector.executor_event(name, "submitted")
+        try:
+            future = super().submit(run)
+        except BaseException:
+            collector.executor_event(name, "dropped")
+            raise
+
+        def on_done(done: Future) -> None:
+            if done.cancelled():
+                collector.executor_event(name, "dropped")
+
+        future.add_done_callback(on_done)
+        return future
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _PrometheusWriter:
+    """Accumulates exposition-format lines; every name gets `PROMETHEUS_PREFIX`."""
+
+    def __init__(self):
+        self._lines: list[str] = []
+
+    def metric(self, name: str, kind: str, help_text: str) -> None:
+        full = f"{PROMETHEUS_PREFIX}_{name}"
+        self._lines.append(f"# HELP {full} {help_text}")
+        self._lines.append(f"# TYPE {full} {kind}")
+
+    def sample(self, name: str, labels: Mapping[str, str], value: float) -> None:
+        rendered = ",".join(f'{key}="{_escape_label(val)}"' for key, val in labels.items())
+        suffix = f"{{{rendered}}}" if rendered else ""
+        self._lines.append(f"{PROMETHEUS_PREFIX}_{name}{suffix} {_format_value(value)}")
+
+    def histogram(self, name: str, labels: Mapping[str, str], histogram: Histogram) -> None:
+        for le, count in histogram.cumulative():
+            self.sample(f"{name}_bucket", {**labels, "le": le}, count)
+        self.sample(f"{name}_sum", labels, histogram.sum)
+        self.sample(f"{name}_count", labels, histogram.count)
+
+    def text(self) -> str:
+        return "\n".join(self._lines) + "\n"
+
+
 # Global metrics instance
 metrics = MetricsCollector()
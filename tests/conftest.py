@@ -1,6 +1,7 @@
 """Pytest configuration and shared fixtures."""
 
 import os
+from functools import partial
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
 
@@ -20,9 +21,18 @@
 
 from src.dependencies import get_easypost_service
 from src.server import app
+from src.services.easypost_service import EasyPostService
+from src.services.service_registry import service_registry
 from tests.factories import EasyPostFactory
 
 
+@pytest.fixture(scope="session", autouse=True)
+def shared_service_teardown():
+    """Shut the process-wide service down while pytest's log capture is still open."""
+    yield
+    service_registry.shutdown()
+
+
 @pytest.fixture
 def mock_easypost_service():
     """
@@ -40,6 +50,10 @@ def mock_easypost_service():
     mock.list_shipments.return_value = EasyPostFactory.shipment_list()
     mock.get_tracking.return_value = EasyPostFactory.tracking()
 
+    # Page iterators run for real on top of the mocked list_shipments
+    mock.get_shipments_list = mock.list_shipments
+    mock.iter_shipment_pages = partial(EasyPostService.iter_shipment_pages, mock)
+
     # Add api_key as a regular attribute (not a Mock)
     type(mock).api_key = PropertyMock(return_value="test_api_key")
 
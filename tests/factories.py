@@ -87,6 +87,43 @@ def tracking(
         base.update(kwargs)
         return base
 
+    @staticmethod
+    def tracker_event(
+        tracking_code: str = "9400111899223345",
+        status: str = "in_transit",
+        description: str = "tracker.updated",
+        **kwargs,
+    ) -> dict[str, Any]:
+        """Create an EasyPost webhook Event body wrapping a Tracker.
+
+        Matches what EasyPost POSTs to /api/webhooks/easypost
+        """
+        tracker = {
+            "object": "Tracker",
+            "id": f"trk_{tracking_code}",
+            "tracking_code": tracking_code,
+            "status": status,
+            "carrier": "USPS",
+            "shipment_id": "shp_1",
+            "updated_at": "2025-01-01T10:00:00Z",
+            "tracking_details": [
+                {
+                    "object": "TrackingDetail",
+                    "message": status.replace("_", " ").title(),
+                    "status": status,
+                    "datetime": "2025-01-01T10:00:00Z",
+                    "tracking_location": {"city": "New York", "state": "NY"},
+                }
+            ],
+        }
+        tracker.update(kwargs)
+        return {
+            "object": "Event",
+            "id": "evt_1",
+            "description": description,
+            "result": tracker,
+        }
+
     @staticmethod
     def shipment_list(shipments: list[dict] = None) -> dict[str, Any]:
         """Create a mock shipments list response."""
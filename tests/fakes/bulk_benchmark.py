@@ -0,0 +1,281 @@
+"""
+End-to-end bulk benchmark against `FakeEasyPostServer`.
+
+Runs the real MCP tools (`get_shipment_rates` -> `create_shipment` ->
+`buy_shipment_label`) on a real `EasyPostService` pointed at the fake API,
+so parsing, the executor or async transport, rate limiting, retries and
+response handling are all on the measured path. Each tool reports wall
+throughput (lines/s) and per-line latency percentiles:
+
+- get_shipment_rates / create_shipment: the line's stage `timings` total
+- buy_shipment_label: the line's `latency_ms`
+
+`write_baseline()` merges a run into a JSON baseline keyed by transport and
+sheet size; `compare_to_baseline()` lists regressions beyond a tolerance.
+The CLI is `scripts/python/bulk_benchmark.py`.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+from src.mcp_server.tools.bulk_creation_tools import register_shipment_creation_tools
+from src.mcp_server.tools.bulk_tools import register_shipment_tools
+from src.services.easypost_service import EasyPostService
+from src.services.rate_limiter import TokenBucketRateLimiter
+from tests.fakes.easypost_server import FakeEasyPostServer, FakeServerConfig
+
+DEFAULT_SIZES = (10, 100, 1000)
+DEFAULT_BASELINE = Path(__file__).resolve().parents[2] / "benchmarks" / "bulk_e2e_baseline.json"
+TOOLS = ("get_shipment_rates", "create_shipment", "buy_shipment_label")
+FAKE_API_KEY = "EZTK_fake_benchmark"
+
+_DOMESTIC = (
+    "California\tUSPS\t{first}\tDoe\t555-0100\t{first}@example.com\t{number} Main St\t\t"
+    "Los Angeles\tCA\t9{zip:04d}\tUS\tPackage\t12 x 9 x 6\t{weight} lbs\tBeauty products"
+)
+_INTERNATIONAL = (
+    "California\tUSPS\t{first}\tSmith\t+44 20 7946 0958\t{first}@example.co.uk\t"
+    "{number} Baker St\t\tLondon\t\tNW1 6XE\tGB\tPackage\t12 x 9 x 6\t{weight} lbs\t"
+    "Beauty products"
+)
+
+
+def make_sheet(lines: int, international_every: int = 5) -> str:
+    """Tab-separated sheet of distinct lines; every Nth line ships to GB (customs)."""
+    rows = []
+    for index in range(lines):
+        template = (
+            _INTERNATIONAL
+            if international_every and index % international_every == international_every - 1
+            else _DOMESTIC
+        )
+        rows.append(
+            template.format(
+                first=f"Buyer{index}",
+                number=100 + index,
+                zip=index % 10000,
+                weight=round(1 + (index % 20) * 0.25, 2),
+            )
+        )
+    return "\n".join(rows)
+
+
+def build_service(
+    api_base: str,
+    transport: str = "sdk",
+    rate_limit_rps: float = 1000.0,
+    reuse_rating_shipments: bool = False,
+) -> EasyPostService:
+    """
+    Real service against `api_base` with its own limiter.
+
+    The shared 10 rps limiter would make the limiter the benchmark, so runs
+    get a private bucket. Rating-pass shipments are not reused by default so
+    create_shipment pays for its own API calls.
+    """
+    return EasyPostService(
+        FAKE_API_KEY,
+        transport=transport,
+        api_base=api_base,
+        rate_limiter=TokenBucketRateLimiter(rate=rate_limit_rps, burst=int(rate_limit_rps)),
+        plan_cache_ttl=300 if reuse_rating_shipments else 0,
+    )
+
+
+def bulk_tools(service: EasyPostService) -> dict[str, Any]:
+    """The registered tool functions, undecorated, bound to `service`."""
+    tools: dict[str, Any] = {}
+    mcp = MagicMock()
+    mcp.tool.return_value = lambda func: tools.setdefault(func.__name__, func)
+    register_shipment_tools(mcp, service)
+    register_shipment_creation_tools(mcp, service)
+    return tools
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile; None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _tool_result(
+    lines: int, duration: float, successful: int, latencies: list[float], requests: int
+) -> dict[str, Any]:
+    return {
+        "lines": lines,
+        "successful": successful,
+        "duration_s": round(duration, 3),
+        "throughput_per_s": round(lines / duration, 2) if duration > 0 else None,
+        "p50_ms": _percentile(latencies, 50),
+        "p99_ms": _percentile(latencies, 99),
+        "api_requests": requests,
+    }
+
+
+def _cheapest_rate_id(rates: list[dict[str, Any]]) -> str | None:
+    priced = [rate for rate in rates if rate.get("id") and rate.get("rate") is not None]
+    if not priced:
+        return None
+    return min(priced, key=lambda rate: float(rate["rate"]))["id"]
+
+
+async def run_size(
+    server: FakeEasyPostServer,
+    lines: int,
+    *,
+    transport: str = "sdk",
+    max_concurrency: int | None = None,
+    rate_limit_rps: float = 1000.0,
+    reuse_rating_shipments: bool = False,
+) -> dict[str, Any]:
+    """Rate, create and buy a `lines`-line sheet; per-tool results plus raw responses."""
+    service = build_service(server.api_base, transport, rate_limit_rps, reuse_rating_shipments)
+    tools = bulk_tools(service)
+    sheet = make_sheet(lines)
+    results: dict[str, Any] = {}
+    responses: dict[str, Any] = {}
+
+    try:
+        before = server.stats()["total_requests"]
+        started = time.perf_counter()
+        rated = await tools["get_shipment_rates"](
+            sheet, max_concurrency=max_concurrency, bypass_cache=True
+        )
+        duration = time.perf_counter() - started
+        shipments = (rated.get("data") or {}).get("shipments", [])
+        results["get_shipment_rates"] = _tool_result(
+            lines,
+            duration,
+            sum(1 for line in shipments if not line.get("error")),
+            [line["timings"]["total_ms"] for line in shipments if line.get("timings")],
+            server.stats()["total_requests"] - before,
+        )
+        responses["get_shipment_rates"] = rated
+
+        before = server.stats()["total_requests"]
+        started = time.perf_counter()
+        created = await tools["create_shipment"](sheet)
+        duration = time.perf_counter() - started
+        successful = (created.get("data") or {}).get("successful", [])
+        results["create_shipment"] = _tool_result(
+            lines,
+            duration,
+            len(successful),
+            [line["timings"]["total_ms"] for line in successful if line.get("timings")],
+            server.stats()["total_requests"] - before,
+        )
+        responses["create_shipment"] = created
+
+        purchases = [
+            (line["shipment_id"], _cheapest_rate_id(line.get("all_rates") or []))
+            for line in successful
+        ]
+        purchases = [(shipment_id, rate_id) for shipment_id, rate_id in purchases if rate_id]
+        before = server.stats()["total_requests"]
+        started = time.perf_counter()
+        bought = await tools["buy_shipment_label"](
+            [shipment_id for shipment_id, _ in purchases],
+            [rate_id for _, rate_id in purchases],
+            max_concurrency=max_concurrency,
+        )
+        duration = time.perf_counter() - started
+        purchased = (bought.get("data") or {}).get("purchased", [])
+        results["buy_shipment_label"] = _tool_result(
+            len(purchases),
+            duration,
+            len(purchased),
+            [line["latency_ms"] for line in purchased if line.get("latency_ms") is not None],
+            server.stats()["total_requests"] - before,
+        )
+        responses["buy_shipment_label"] = bought
+    finally:
+        await service.aclose()
+
+    return {"results": results, "responses": responses}
+
+
+async def run_benchmark(
+    sizes: tuple[int, ...] = DEFAULT_SIZES,
+    config: FakeServerConfig | None = None,
+    **options: Any,
+) -> dict[str, Any]:
+    """Run every size against one fake server; the baseline-ready report."""
+    config = config or FakeServerConfig()
+    report: dict[str, Any] = {
+        "generated_at": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "transport": options.get("transport", "sdk"),
+        "fake_server": {
+            "median_ms": config.latency.median_ms,
+            "p99_ms": config.latency.p99_ms,
+            "rate_limit_ratio": config.rate_limit_ratio,
+            "server_error_ratio": config.server_error_ratio,
+        },
+        "sizes": {},
+    }
+    with FakeEasyPostServer(config) as server:
+        for size in sizes:
+            report["sizes"][str(size)] = (await run_size(server, size, **options))["results"]
+        report["fake_server"]["stats"] = server.stats()
+    return report
+
+
+def load_baseline(path: Path = DEFAULT_BASELINE) -> dict[str, Any]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def write_baseline(report: dict[str, Any], path: Path = DEFAULT_BASELINE) -> dict[str, Any]:
+    """Merge `report` into the baseline at `path` (same transport/size replaced)."""
+    baseline = load_baseline(path)
+    entry = baseline.setdefault(report["transport"], {"sizes": {}})
+    entry.update({key: value for key, value in report.items() if key != "sizes"})
+    entry["sizes"].update(report["sizes"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+    return baseline
+
+
+def compare_to_baseline(
+    report: dict[str, Any], baseline: dict[str, Any], tolerance: float = 0.2
+) -> list[str]:
+    """Throughput drops or p99 rises beyond `tolerance` versus the baseline."""
+    regressions = []
+    sizes = baseline.get(report["transport"], {}).get("sizes", {})
+    for size, tools in report["sizes"].items():
+        for tool, current in tools.items():
+            previous = sizes.get(size, {}).get(tool)
+            if not previous:
+                continue
+            before, now = previous.get("throughput_per_s"), current.get("throughput_per_s")
+            if before and now is not None and now < before * (1 - tolerance):
+                regressions.append(f"{tool}@{size}: throughput {now}/s vs baseline {before}/s")
+            before, now = previous.get("p99_ms"), current.get("p99_ms")
+            if before and now is not None and now > before * (1 + tolerance):
+                regressions.append(f"{tool}@{size}: p99 {now} ms vs baseline {before} ms")
+    return regressions
+
+
+def format_report(report: dict[str, Any]) -> str:
+    rows = [f"transport={report['transport']} fake={report['fake_server']}"]
+    rows.append(f"{'lines':>6}  {'tool':<20} {'ok':>6} {'lines/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for size, tools in report["sizes"].items():
+        for tool in TOOLS:
+            result = tools.get(tool, {})
+            rows.append(
+                f"{size:>6}  {tool:<20} {result.get('successful', 0):>6} "
+                f"{result.get('throughput_per_s') or 0:>9.1f} "
+                f"{result.get('p50_ms') or 0:>9.1f} {result.get('p99_ms') or 0:>9.1f}"
+            )
+    return "\n".join(rows)
@@ -0,0 +1,450 @@
+"""
+Local stand-in for the EasyPost v2 HTTP API.
+
+`FakeEasyPostServer` runs a threaded HTTP server on 127.0.0.1 that answers
+the endpoints this project uses, so a real `EasyPostService` (SDK or async
+transport, executor, retries, rate limiter, hooks) can be driven end to end
+without network access or charges:
+
+    POST /v2/shipments, GET /v2/shipments[/:id], POST /v2/shipments/:id/buy
+    POST /v2/trackers, GET /v2/trackers/:id
+    POST /v2/addresses[/create_and_verify], GET /v2/addresses/:id
+    POST /v2/customs_items, POST /v2/customs_infos
+
+Each request sleeps for a sample of its route's `LatencyModel` (lognormal),
+and `FakeServerConfig` can turn a fraction of requests into 429s (with
+Retry-After) or 5xx errors. Objects are kept in memory for the server's
+lifetime so buy/retrieve see what create returned.
+
+    with FakeEasyPostServer(FakeServerConfig(rate_limit_ratio=0.02)) as server:
+        service = EasyPostService("EZTK...", api_base=server.api_base)
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import urlsplit
+
+# carrier_account_id -> (carrier, service, base rate, delivery days)
+DEFAULT_CARRIERS = {
+    "ca_8d3eea38c88c408c8d351859d1ed3a1a": ("DHLeCommerce", "DHLParcelExpedited", 9.10, 5),
+    "ca_cc276f79f2c04640bcc2623f6790cde7": ("DHLExpress", "ExpressWorldwide", 41.20, 3),
+    "ca_4dd19ccfd9cf425bbe90fb6e13ebbf6c": ("FedEx", "FEDEX_GROUND", 11.45, 4),
+    "ca_39ef64ac3d674f2b9e332efe5bec379e": ("UPSDAP", "Ground", 12.05, 4),
+    "ca_5e187e0f2e2f419fb347822000e141b8": ("AsendiaUsa", "ePAQSelect", 18.30, 8),
+    "ca_058c52faac6144a3bbc5f653364cb981": ("USPS", "Priority", 8.50, 2),
+}
+
+_Z_99 = 2.326  # standard normal 99th percentile
+
+
+@dataclass
+class LatencyModel:
+    """Lognormal service time with the given median and 99th percentile (ms)."""
+
+    median_ms: float = 20.0
+    p99_ms: float = 60.0
+
+    def sample(self, rng: random.Random) -> float:
+        """One service time in seconds."""
+        if self.median_ms <= 0:
+            return 0.0
+        sigma = max(0.0, math.log(max(self.p99_ms, self.median_ms) / self.median_ms)) / _Z_99
+        return rng.lognormvariate(math.log(self.median_ms), sigma) / 1000
+
+
+@dataclass
+class FakeServerConfig:
+    """
+    Latency and fault injection for `FakeEasyPostServer`.
+
+    Attributes:
+        latency: Default service time for every route
+        route_latency: Overrides by route label ("POST /shipments/:id/buy")
+        rate_limit_ratio: Fraction of requests answered with 429
+        retry_after: Retry-After seconds sent with injected 429s (None omits it)
+        server_error_ratio: Fraction of requests answered with 500-503
+        seed: RNG seed for reproducible latency and fault sequences
+    """
+
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    route_latency: dict[str, LatencyModel] = field(default_factory=dict)
+    rate_limit_ratio: float = 0.0
+    retry_after: float | None = 0.05
+    server_error_ratio: float = 0.0
+    seed: int | None = 1234
+
+
+# Fields EasyPost always returns on an Address (null when unset)
+_ADDRESS_FIELDS = (
+    "name",
+    "company",
+    "street1",
+    "street2",
+    "city",
+    "state",
+    "zip",
+    "country",
+    "phone",
+    "email",
+    "residential",
+    "carrier_facility",
+    "federal_tax_id",
+    "state_tax_id",
+)
+
+
+def _now() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+def _new_id(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex}"
+
+
+def _error(code: str, message: str) -> dict[str, Any]:
+    return {"error": {"code": code, "message": message, "errors": []}}
+
+
+class _FakeState:
+    """In-memory EasyPost objects plus the request/fault counters."""
+
+    def __init__(self, config: FakeServerConfig):
+        self.config = config
+        self.lock = threading.Lock()
+        self.rng = random.Random(config.seed)  # noqa: S311 - simulation, not crypto
+        self.shipments: dict[str, dict[str, Any]] = {}
+        self.trackers: dict[str, dict[str, Any]] = {}
+        self.addresses: dict[str, dict[str, Any]] = {}
+        self.requests: Counter[str] = Counter()
+        self.rate_limited = 0
+        self.server_errors = 0
+
+    def draw(self, route: str) -> tuple[float, int | None]:
+        """(service time, injected status or None) for one request."""
+        with self.lock:
+            self.requests[route] += 1
+            latency = self.config.route_latency.get(route, self.config.latency)
+            delay = latency.sample(self.rng)
+            roll = self.rng.random()
+            if roll < self.config.rate_limit_ratio:
+                self.rate_limited += 1
+                return delay, 429
+            if roll < self.config.rate_limit_ratio + self.config.server_error_ratio:
+                self.server_errors += 1
+                return delay, self.rng.choice((500, 502, 503))
+            return delay, None
+
+    # Object builders -------------------------------------------------------
+
+    def address(self, fields: dict[str, Any], verify: bool = False) -> dict[str, Any]:
+        if "id" in fields and len(fields) == 1:
+            return self.addresses.get(fields["id"], {"id": fields["id"], "object": "Address"})
+        address = {
+            "id": _new_id("adr"),
+            "object": "Address",
+            "mode": "test",
+            **dict.fromkeys(_ADDRESS_FIELDS),
+            **{key: value for key, value in fields.items() if value is not None},
+            "created_at": _now(),
+        }
+        if verify:
+            address["verifications"] = {
+                "delivery": {"success": True, "errors": [], "details": {}},
+                "carrier": {"success": True, "errors": []},
+            }
+        self.addresses[address["id"]] = address
+        return address
+
+    def customs_info(self, fields: dict[str, Any]) -> dict[str, Any]:
+        if "id" in fields and len(fields) == 1:
+            return {"id": fields["id"], "object": "CustomsInfo"}
+        items = [
+            {"id": _new_id("cstitem"), "object": "CustomsItem", **item}
+            for item in fields.get("customs_items") or []
+        ]
+        return {
+            "id": _new_id("cstinfo"),
+            "object": "CustomsInfo",
+            **fields,
+            "customs_items": items,
+        }
+
+    def shipment(self, fields: dict[str, Any]) -> dict[str, Any]:
+        shipment_id = _new_id("shp")
+        parcel = fields.get("parcel") or {}
+        weight = float(parcel.get("weight") or 16)
+        accounts = fields.get("carrier_accounts") or list(DEFAULT_CARRIERS)
+        rates = []
+        for account in accounts:
+            carrier, service, base, days = DEFAULT_CARRIERS.get(
+                account, ("USPS", "Priority", 8.50, 2)
+            )
+            rates.append(
+                {
+                    "id": _new_id("rate"),
+                    "object": "Rate",
+                    "shipment_id": shipment_id,
+                    "carrier_account_id": account,
+                    "carrier": carrier,
+                    "service": service,
+                    "rate": f"{base + weight * 0.05:.2f}",
+                    "currency": "USD",
+                    "delivery_days": days,
+                }
+            )
+        customs = fields.get("customs_info")
+        shipment = {
+            "id": shipment_id,
+            "object": "Shipment",
+            "mode": "test",
+            "status": "unknown",
+            "reference": fields.get("reference"),
+            "to_address": self.address(fields.get("to_address") or {}),
+            "from_address": self.address(fields.get("from_address") or {}),
+            "parcel": {"id": _new_id("prcl"), "object": "Parcel", **parcel},
+            "customs_info": self.customs_info(customs) if customs else None,
+            "rates": rates,
+            "messages": [],
+            "selected_rate": None,
+            "postage_label": None,
+            "tracking_code": None,
+            "created_at": _now(),
+        }
+        self.shipments[shipment_id] = shipment
+        return shipment
+
+    def buy(self, shipment_id: str, body: dict[str, Any]) -> tuple[int, dict[str, Any]]:
+        shipment = self.shipments.get(shipment_id)
+        if shipment is None:
+            return 404, _error("NOT_FOUND", f"Shipment {shipment_id} not found")
+        if shipment["postage_label"] is not None:
+            return 422, _error("SHIPMENT.POSTAGE.EXISTS", "Postage already exists")
+        rate_id = (body.get("rate") or {}).get("id")
+        rate = next((r for r in shipment["rates"] if r["id"] == rate_id), None)
+        if rate is None:
+            return 422, _error("SHIPMENT.RATE.INVALID", f"Rate {rate_id} not found")
+        tracking_code = f"EZ{uuid.uuid4().int % 10**12:012d}"
+        shipment.update(
+            status="purchased",
+            selected_rate=rate,
+            tracking_code=tracking_code,
+            postage_label={
+                "id": _new_id("pl"),
+                "object": "PostageLabel",
+                "label_url": f"https://labels.invalid/{shipment_id}.png",
+            },
+            tracker={"id": _new_id("trk"), "object": "Tracker", "tracking_code": tracking_code},
+        )
+        return 200, shipment
+
+    def tracker(self, tracking_code: str, carrier: str | None = None) -> dict[str, Any]:
+        tracker = self.trackers.get(tracking_code)
+        if tracker is None:
+            tracker = {
+                "id": _new_id("trk"),
+                "object": "Tracker",
+                "tracking_code": tracking_code,
+                "carrier": carrier or "USPS",
+                "status": "in_transit",
+                "status_detail": "arrived_at_facility",
+                "est_delivery_date": None,
+                "created_at": _now(),
+                "updated_at": _now(),
+                "tracking_details": [
+                    {
+                        "object": "TrackingDetail",
+                        "status": "in_transit",
+                        "message": "Arrived at facility",
+                        "datetime": _now(),
+                    }
+                ],
+            }
+            self.trackers[tracking_code] = tracker
+            self.trackers[tracker["id"]] = tracker
+        return tracker
+
+
+_ROUTES: list[tuple[str, re.Pattern[str], str]] = [
+    (method, re.compile(f"^{pattern}$"), label)
+    for method, pattern, label in (
+        ("POST", r"/shipments", "POST /shipments"),
+        ("GET", r"/shipments", "GET /shipments"),
+        ("GET", r"/shipments/(?P<id>[^/]+)", "GET /shipments/:id"),
+        ("POST", r"/shipments/(?P<id>[^/]+)/buy", "POST /shipments/:id/buy"),
+        ("POST", r"/trackers", "POST /trackers"),
+        ("GET", r"/trackers/(?P<id>[^/]+)", "GET /trackers/:id"),
+        ("POST", r"/addresses", "POST /addresses"),
+        ("POST", r"/addresses/create_and_verify", "POST /addresses/create_and_verify"),
+        ("GET", r"/addresses/(?P<id>[^/]+)", "GET /addresses/:id"),
+        ("POST", r"/customs_items", "POST /customs_items"),
+        ("POST", r"/customs_infos", "POST /customs_infos"),
+    )
+]
+
+
+def _match_route(method: str, path: str) -> tuple[str, dict[str, str]] | None:
+    """(route label, path params) for a request, or None if unsupported."""
+    for route_method, pattern, label in _ROUTES:
+        match = pattern.match(path)
+        if route_method == method and match:
+            return label, match.groupdict()
+    return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _FakeHTTPServer
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    # Headers and body go out in separate writes; with Nagle on, delayed ACKs
+    # would add ~40 ms to every response
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        self._dispatch("POST")
+
+    def log_message(self, *_args: Any) -> None:  # quiet
+        return
+
+    def _dispatch(self, method: str) -> None:
+        path = urlsplit(self.path).path.removeprefix("/v2")
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        body = json.loads(raw) if raw else {}
+
+        route = _match_route(method, path)
+        if route is None:
+            self._send(404, _error("NOT_FOUND", f"No fake route for {method} {path}"))
+            return
+        label, params = route
+
+        state = self.server.state
+        delay, injected = state.draw(label)
+        time.sleep(delay)
+        if injected == 429:
+            headers = {}
+            if state.config.retry_after is not None:
+                headers["Retry-After"] = f"{state.config.retry_after:g}"
+            self._send(429, _error("RATE_LIMITED", "Rate limit exceeded"), headers)
+            return
+        if injected is not None:
+            self._send(injected, _error("INTERNAL_SERVER_ERROR", "Injected server error"))
+            return
+
+        with state.lock:
+            status, payload = self._handle(label, params, body, state)
+        self._send(status, payload)
+
+    @staticmethod
+    def _handle(
+        label: str, params: dict[str, str], body: dict[str, Any], state: _FakeState
+    ) -> tuple[int, dict[str, Any]]:
+        if label == "POST /shipments":
+            return 201, state.shipment(body.get("shipment") or {})
+        if label == "GET /shipments":
+            return 200, {"shipments": [], "has_more": False}
+        if label == "GET /shipments/:id":
+            shipment = state.shipments.get(params["id"])
+            if shipment is None:
+                return 404, _error("NOT_FOUND", "Shipment not found")
+            return 200, shipment
+        if label == "POST /shipments/:id/buy":
+            return state.buy(params["id"], body)
+        if label == "POST /trackers":
+            tracker = body.get("tracker") or {}
+            return 201, state.tracker(tracker.get("tracking_code", ""), tracker.get("carrier"))
+        if label == "GET /trackers/:id":
+            return 200, state.tracker(params["id"])
+        if label == "POST /addresses":
+            verify = bool(body.get("verify") or body.get("verify_strict"))
+            return 201, state.address(body.get("address") or {}, verify=verify)
+        if label == "POST /addresses/create_and_verify":
+            return 200, {"address": state.address(body.get("address") or {}, verify=True)}
+        if label == "GET /addresses/:id":
+            address = state.addresses.get(params["id"])
+            if address is None:
+                return 404, _error("NOT_FOUND", "Address not found")
+            return 200, address
+        if label == "POST /customs_items":
+            item = body.get("customs_item") or {}
+            return 201, {"id": _new_id("cstitem"), "object": "CustomsItem", **item}
+        # POST /customs_infos
+        return 201, state.customs_info(body.get("customs_info") or {})
+
+    def _send(
+        self, status: int, payload: dict[str, Any], headers: dict[str, str] | None = None
+    ) -> None:
+        encoded = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(encoded)
+
+
+class _FakeHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, address: tuple[str, int], state: _FakeState):
+        super().__init__(address, _Handler)
+        self.state = state
+
+
+class FakeEasyPostServer:
+    """Threaded fake EasyPost API; use as a context manager or start()/stop()."""
+
+    def __init__(self, config: FakeServerConfig | None = None, host: str = "127.0.0.1"):
+        self.config = config or FakeServerConfig()
+        self._state = _FakeState(self.config)
+        self._httpd = _FakeHTTPServer((host, 0), self._state)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def api_base(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v2"
+
+    def start(self) -> FakeEasyPostServer:
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="fake-easypost", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> FakeEasyPostServer:
+        return self.start()
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.stop()
+
+    def stats(self) -> dict[str, Any]:
+        """Requests per route and injected fault counts."""
+        with self._state.lock:
+            return {
+                "requests": dict(self._state.requests),
+                "total_requests": sum(self._state.requests.values()),
+                "rate_limited": self._state.rate_limited,
+                "server_errors": self._state.server_errors,
+                "shipments": len(self._state.shipments),
+            }
@@ -0,0 +1,134 @@
+"""Benchmark: SDK thread-pool offload vs native async transport.
+
+Both modes serve the same number of concurrent get_rates calls against a
+simulated 50ms EasyPost round trip. The SDK mode is capped by the service's
+4-worker executor; the async mode is bounded only by the connection pool.
+Assertions are on the peak number of calls in flight, not on elapsed time,
+so they hold on a loaded machine; the timings are printed for reference.
+"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from src.services.easypost_service import EasyPostService
+from src.services.rate_limiter import TokenBucketRateLimiter
+
+NUM_CALLS = 64
+API_LATENCY = 0.05
+
+ADDRESS = {
+    "name": "Test",
+    "street1": "1 Main St",
+    "city": "New York",
+    "state": "NY",
+    "zip": "10001",
+    "country": "US",
+}
+PARCEL = {"length": 10, "width": 8, "height": 4, "weight": 16}
+RATE = {
+    "id": "rate_1",
+    "carrier": "USPS",
+    "service": "Priority",
+    "rate": "8.50",
+    "delivery_days": 2,
+}
+
+
+class InFlight:
+    """Thread-safe count of concurrent calls and the peak reached."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+
+    def __enter__(self):
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *_exc):
+        with self._lock:
+            self.current -= 1
+
+
+SDK_IN_FLIGHT = InFlight()
+ASYNC_IN_FLIGHT = InFlight()
+
+
+def _blocking_client(*_args, **_kwargs):
+    def create(**_params):
+        with SDK_IN_FLIGHT:
+            time.sleep(API_LATENCY)
+        return SimpleNamespace(rates=[SimpleNamespace(**RATE)])
+
+    client = MagicMock()
+    client.api_base = "https://api.test/v2"
+    client.shipment.create.side_effect = create
+    return client
+
+
+async def _rates_handler(_request: httpx.Request) -> httpx.Response:
+    with ASYNC_IN_FLIGHT:
+        await asyncio.sleep(API_LATENCY)
+    return httpx.Response(200, json={"id": "shp_1", "rates": [RATE]})
+
+
+async def _run(service: EasyPostService) -> float:
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(service.get_rates(ADDRESS, ADDRESS, PARCEL, bypass_cache=True) for _ in range(NUM_CALLS))
+    )
+    duration = time.perf_counter() - start
+    assert all(r["status"] == "success" for r in results)
+    return duration
+
+
+@pytest.mark.asyncio
+async def test_sdk_vs_async_transport_concurrency():
+    """Benchmark: concurrent get_rates through the executor vs async transport."""
+    with patch("src.services.easypost_service.easypost.EasyPostClient", _blocking_client):
+        # Effectively unlimited bucket: this measures transport concurrency only
+        limiter = TokenBucketRateLimiter(rate=1_000_000, burst=10_000)
+        sdk_service = EasyPostService("EZTK" + "0" * 24, transport="sdk", rate_limiter=limiter)
+        async_service = EasyPostService("EZTK" + "0" * 24, transport="async", rate_limiter=limiter)
+
+    mock_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(_rates_handler), base_url="https://api.test/v2"
+    )
+    async_service.transport._get_client = lambda: mock_client
+
+    try:
+        sdk_duration = await _run(sdk_service)
+        async_duration = await _run(async_service)
+    finally:
+        sdk_service.shutdown()
+        await mock_client.aclose()
+        await async_service.aclose()
+
+    speedup = sdk_duration / async_duration
+
+    print(f"\n{'=' * 60}")
+    print("ASYNC TRANSPORT BENCHMARK")
+    print(f"{'=' * 60}")
+    print(f"Concurrent get_rates: {NUM_CALLS} ({API_LATENCY * 1000:.0f}ms simulated latency)")
+    print(
+        f"SDK (4 threads): {sdk_duration:.2f}s ({NUM_CALLS / sdk_duration:.1f} calls/s), "
+        f"peak {SDK_IN_FLIGHT.peak} in flight"
+    )
+    print(
+        f"Async transport: {async_duration:.2f}s ({NUM_CALLS / async_duration:.1f} calls/s), "
+        f"peak {ASYNC_IN_FLIGHT.peak} in flight"
+    )
+    print(f"Speedup:         {speedup:.1f}x")
+    print(f"{'=' * 60}\n")
+
+    # The executor caps the SDK at its worker count; the async transport is not capped by it
+    assert SDK_IN_FLIGHT.peak <= sdk_service.executor._max_workers
+    assert ASYNC_IN_FLIGHT.peak > sdk_service.executor._max_workers
@@ -0,0 +1,186 @@
+"""
+End-to-end bulk runs against the local fake EasyPost API.
+
+Unlike test_bulk_performance.py (hand-written sleeping mocks), these drive
+the real EasyPostService: SDK/async transport, executor, retries and
+response parsing. Set BULK_BENCHMARK_BASELINE=<path> to merge the measured
+throughput/p99 into a baseline file.
+"""
+
+import logging
+import os
+from pathlib import Path
+
+import pytest
+
+from tests.fakes.bulk_benchmark import (
+    build_service,
+    bulk_tools,
+    compare_to_baseline,
+    load_baseline,
+    make_sheet,
+    run_size,
+    write_baseline,
+)
+from tests.fakes.easypost_server import FakeEasyPostServer, FakeServerConfig, LatencyModel
+
+FAST = LatencyModel(median_ms=1, p99_ms=3)
+
+
+@pytest.fixture(autouse=True)
+def quiet_service_logs():
+    # Per-request service logs slow 1000-line runs considerably
+    logger = logging.getLogger("src")
+    level = logger.level
+    logger.setLevel(logging.CRITICAL)
+    yield
+    logger.setLevel(level)
+
+
+def _report(lines: int, results: dict, transport: str) -> dict:
+    return {
+        "transport": transport,
+        "fake_server": {"median_ms": FAST.median_ms, "p99_ms": FAST.p99_ms},
+        "sizes": {str(lines): results},
+    }
+
+
+@pytest.mark.parametrize("lines", [10, 100, pytest.param(1000, marks=pytest.mark.slow)])
+async def test_bulk_workflow_end_to_end(lines):
+    with FakeEasyPostServer(FakeServerConfig(latency=FAST)) as server:
+        run = await run_size(server, lines)
+        stats = server.stats()
+
+    results = run["results"]
+    for tool in ("get_shipment_rates", "create_shipment", "buy_shipment_label"):
+        assert results[tool]["successful"] == lines, run["responses"][tool].get("message")
+        # One EasyPost request per line: rates complete, no retrieves or retries
+        assert results[tool]["api_requests"] == lines
+        assert results[tool]["throughput_per_s"] > 0
+        assert results[tool]["p99_ms"] >= results[tool]["p50_ms"]
+    assert stats["requests"] == {"POST /shipments": 2 * lines, "POST /shipments/:id/buy": lines}
+
+    baseline = os.getenv("BULK_BENCHMARK_BASELINE")
+    if baseline:
+        write_baseline(_report(lines, results, "sdk"), Path(baseline))
+
+
+async def test_async_transport_end_to_end():
+    with FakeEasyPostServer(FakeServerConfig(latency=FAST)) as server:
+        run = await run_size(server, 10, transport="async")
+
+    assert {tool: result["successful"] for tool, result in run["results"].items()} == {
+        "get_shipment_rates": 10,
+        "create_shipment": 10,
+        "buy_shipment_label": 10,
+    }
+
+
+async def test_rate_limited_requests_are_retried():
+    config = FakeServerConfig(latency=FAST, rate_limit_ratio=0.1, retry_after=0.01)
+    with FakeEasyPostServer(config) as server:
+        run = await run_size(server, 100)
+        stats = server.stats()
+
+    assert stats["rate_limited"] > 0
+    for result in run["results"].values():
+        # A line fails only if all three attempts draw a 429
+        assert result["successful"] >= result["lines"] - 3
+    assert stats["total_requests"] > 300
+
+
+async def test_server_errors_fail_their_lines_without_retry():
+    config = FakeServerConfig(latency=FAST, server_error_ratio=0.3)
+    with FakeEasyPostServer(config) as server:
+        run = await run_size(server, 20)
+        stats = server.stats()
+
+    rates = run["responses"]["get_shipment_rates"]
+    assert rates["status"] == "success"
+    summary = rates["data"]["summary"]
+    assert summary["failed"] > 0
+    assert summary["successful"] + summary["failed"] == 20
+    assert run["results"]["get_shipment_rates"]["api_requests"] == 20
+    assert stats["server_errors"] > 0
+
+
+@pytest.mark.parametrize("transport", ["sdk", "async"])
+async def test_tracking_addresses_and_customs_routes(transport):
+    address = {
+        "name": "Jane Doe",
+        "street1": "123 Main St",
+        "city": "Los Angeles",
+        "state": "CA",
+        "zip": "90001",
+        "country": "US",
+    }
+    with FakeEasyPostServer(FakeServerConfig(latency=FAST)) as server:
+        service = build_service(server.api_base, transport)
+        service.inline_customs = False
+        try:
+            tracking = await service.get_tracking("EZ1000000001")
+            verified = await service.verify_address(address)
+            customs = await service._create_customs_info_async(
+                {"contents_type": "merchandise", "customs_items": [{"description": "Soap"}]},
+                {"weight": 16},
+            )
+        finally:
+            await service.aclose()
+        stats = server.stats()
+
+    assert tracking["status"] == "success"
+    assert tracking["data"]["tracking_number"] == "EZ1000000001"
+    assert verified["status"] == "success"
+    assert customs.id.startswith("cstinfo_")
+    assert stats["requests"] == {
+        "GET /trackers/:id": 1,
+        "POST /addresses": 1,
+        "POST /customs_items": 1,
+        "POST /customs_infos": 1,
+    }
+
+
+async def test_create_shipment_reuses_rating_pass_shipments():
+    # Every 5th line ships to GB, so customs must key the same in both passes
+    with FakeEasyPostServer(FakeServerConfig(latency=FAST)) as server:
+        run = await run_size(server, 10, reuse_rating_shipments=True)
+        stats = server.stats()
+
+    created = run["responses"]["create_shipment"]["data"]["successful"]
+    international = [line for line in created if line["line"] % 5 == 0]
+    assert len(created) == 10 and len(international) == 2
+    assert run["results"]["create_shipment"]["api_requests"] == 0
+    assert stats["requests"] == {"POST /shipments": 10, "POST /shipments/:id/buy": 10}
+
+
+async def test_inline_customs_items_are_reported():
+    with FakeEasyPostServer(FakeServerConfig(latency=FAST)) as server:
+        service = build_service(server.api_base)
+        service.inline_customs = True
+        try:
+            rated = await bulk_tools(service)["get_shipment_rates"](
+                make_sheet(5), bypass_cache=True
+            )
+        finally:
+            await service.aclose()
+
+    international = rated["data"]["shipments"][4]
+    customs = international["detailed_data"]["customs"]
+    assert customs["auto_generated"] is True
+    assert customs["items"]
+    assert all(item["description"] and item["quantity"] for item in customs["items"])
+
+
+def test_baseline_merge_and_compare(tmp_path):
+    path = tmp_path / "baseline.json"
+    result = {"throughput_per_s": 100.0, "p99_ms": 50.0}
+    write_baseline(_report(10, {"create_shipment": result}, "sdk"), path)
+    write_baseline(_report(100, {"create_shipment": result}, "sdk"), path)
+
+    baseline = load_baseline(path)
+    assert set(baseline["sdk"]["sizes"]) == {"10", "100"}
+
+    slower = {"create_shipment": {"throughput_per_s": 70.0, "p99_ms": 65.0}}
+    regressions = compare_to_baseline(_report(10, slower, "sdk"), baseline, tolerance=0.2)
+    assert len(regressions) == 2
+    assert compare_to_baseline(_report(10, slower, "async"), baseline) == []
@@ -3,10 +3,18 @@
 import asyncio
 import time
 from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from src.mcp_server.tools.bulk_tools import parse_dimensions, parse_spreadsheet_line, parse_weight
+from src.mcp_server.tools.bulk_tools import (
+    parse_dimensions,
+    parse_spreadsheet_line,
+    parse_weight,
+    register_shipment_tools,
+)
+
+SAMPLE_LINE = "California\tUSPS\tJohn\tDoe\t555-0100\tjohn@example.com\t123 Main St\t\tLos Angeles\tCA\t90001\tUS\tPackage\t12 x 9 x 6\t1.5 lbs\tBeauty products"
 
 
 class MockEasyPostService:
@@ -256,12 +264,111 @@ async def calculate_carrier_stats(shipments_chunk):
     # but doesn't require it to be faster than sequential processing.
 
 
+class LatencyRatesService:
+    """Mock service whose get_rates simulates a fixed API round trip."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.client = MagicMock()
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def get_rates(
+        self, to_address, from_address, parcel, customs_info=None, bypass_cache=False
+    ):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        return {
+            "status": "success",
+            "data": [{"carrier": "USPS", "service": "Priority", "rate": "8.50"}],
+        }
+
+
+def _rates_tool(service):
+    mcp = MagicMock()
+    tools = {}
+    mcp.tool.return_value = lambda func: tools.setdefault(func.__name__, func)
+    register_shipment_tools(mcp, service)
+    return tools["get_shipment_rates"]
+
+
+@pytest.mark.asyncio
+async def test_pipelined_shipment_rates_throughput():
+    """Benchmark: get_shipment_rates on a 200-line sheet, 1 vs 32 lines in flight."""
+    num_lines = 200
+    sheet = "\n".join(
+        SAMPLE_LINE.replace("John", f"John{i}") for i in range(num_lines - 1)
+    )
+    sheet += "\nnot\ta\tvalid line"
+
+    service = LatencyRatesService(latency=0.02)
+    get_shipment_rates = _rates_tool(service)
+
+    ctx = MagicMock()
+    ctx.info = AsyncMock()
+    ctx.report_progress = AsyncMock()
+
+    start = time.perf_counter()
+    sequential = await get_shipment_rates(sheet, max_concurrency=1)
+    seq_duration = time.perf_counter() - start
+    sequential_peak, service.peak_in_flight = service.peak_in_flight, 0
+
+    start = time.perf_counter()
+    pipelined = await get_shipment_rates(sheet, max_concurrency=32, ctx=ctx)
+    par_duration = time.perf_counter() - start
+
+    speedup = seq_duration / par_duration
+
+    print(f"\n{'=' * 60}")
+    print("PIPELINED SHIPMENT RATES BENCHMARK")
+    print(f"{'=' * 60}")
+    print(f"Lines: {num_lines} (API latency {service.latency * 1000:.0f}ms)")
+    print(f"Sequential: {seq_duration:.2f}s ({num_lines / seq_duration:.1f} lines/s)")
+    print(f"Pipelined:  {par_duration:.2f}s ({num_lines / par_duration:.1f} lines/s)")
+    print(f"Speedup:    {speedup:.1f}x")
+    print(f"{'=' * 60}\n")
+
+    # Concurrency, not wall-clock speedup, so the check holds on a loaded machine
+    assert sequential_peak == 1
+    assert service.peak_in_flight == 32
+
+    shipments = pipelined["data"]["shipments"]
+    assert pipelined["data"]["summary"] == sequential["data"]["summary"]
+    assert pipelined["data"]["summary"]["failed"] == 1
+    assert [s["shipment_number"] for s in shipments] == list(range(1, num_lines + 1))
+    assert shipments[5]["recipient"] == "John5 Doe"
+    # Malformed line fails during parsing without an API call
+    assert service.calls == 2 * (num_lines - 1)
+    assert pipelined["data"]["performance"]["concurrency"] == 32
+    assert pipelined["data"]["performance"]["workers"] == 32
+    assert pipelined["data"]["performance"]["mode"] == "rate_limited"
+
+    # Every rated line carries its stage breakdown; parse failures have none
+    stages = pipelined["data"]["performance"]["stages"]
+    assert list(stages) == ["queue_wait", "parse", "category", "warehouse", "rates"]
+    assert stages["rates"]["count"] == num_lines - 1
+    assert stages["rates"]["p50_ms"] >= service.latency * 1000
+    assert set(shipments[0]["timings"]) >= {"parse", "queue_wait", "rates", "total_ms"}
+    assert "timings" not in shipments[-1]
+
+    progress = [call.args for call in ctx.report_progress.call_args_list]
+    assert progress[0] == (1, num_lines)  # parse failure reported before fan-out
+    assert progress[-1] == (num_lines, num_lines)
+    assert len(progress) == num_lines
+
+
 def test_parsing_performance():
     """Benchmark: Parsing performance for bulk operations."""
     num_lines = 1000
 
     # Sample tab-separated line
-    sample_line = "California\tUSPS\tJohn\tDoe\t555-0100\tjohn@example.com\t123 Main St\t\tLos Angeles\tCA\t90001\tUS\tPackage\t12 x 9 x 6\t1.5 lbs\tBeauty products"
+    sample_line = SAMPLE_LINE
 
     # Benchmark parse_spreadsheet_line
     start = time.time()
@@ -307,6 +414,62 @@ def test_parsing_performance():
     assert weight_duration < 0.5, "Weight parsing should be very fast"
 
 
+def _synthetic_sheet(num_lines):
+    """Flexible-format lines (fewer than 16 columns) that go through field detection."""
+    names = ["Maria Lopez", "John Doe", "Aiko Tanaka", "Omar Haddad", "Lena Moll"]
+    cities = ["Denver", "Springfield", "Phoenix", "Miami", "Boise"]
+    states = ["CA", "IL", "TX", "CO", "OR"]
+    countries = ["US", "United States", "Canada", "GB", "Germany"]
+    return [
+        "\t".join(
+            [
+                names[i % 5],
+                f"555-{i % 1000:03d}-{i % 10000:04d}",
+                f"customer{i}@example.com",
+                f"{100 + i} Main St",
+                cities[i % 5],
+                states[i % 5],
+                f"{10000 + i % 89999:05d}",
+                countries[i % 5],
+                f"{10 + i % 5} x 9 x 6",
+                f"{1 + i % 20}.5 lbs",
+                "Beauty Items",
+            ]
+        )
+        for i in range(num_lines)
+    ]
+
+
+def test_field_detection_microbenchmark():
+    """Benchmark: field detection over a 10k-line synthetic sheet."""
+    from src.mcp_server.tools.bulk_tools import detect_field_type, map_fields_by_detection
+
+    lines = _synthetic_sheet(10_000)
+    rows = [line.split("\t") for line in lines]
+
+    start = time.perf_counter()
+    for parts in rows:
+        map_fields_by_detection(parts)
+    detect_duration = time.perf_counter() - start
+
+    print(f"\nField detection: {len(rows)} lines in {detect_duration * 1000:.0f}ms")
+    print(f"Throughput: {len(rows) / detect_duration:.0f} lines/s")
+
+    assert [detect_field_type(v) for v in rows[7]] == [
+        "name",
+        "phone",
+        "email",
+        "street",
+        "city",
+        "state_code",
+        "postal_code",
+        "country_name",
+        "dimensions",
+        "weight",
+        "name",
+    ]
+
+
 if __name__ == "__main__":
     """Run benchmarks directly."""
     print("\n🚀 M3 Max Performance Benchmarks\n")
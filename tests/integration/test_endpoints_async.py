@@ -47,6 +47,28 @@ async def test_metrics_endpoint(self, async_client):
         assert "uptime_seconds" in data
         assert "total_calls" in data
 
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint_prometheus_format(self, async_client):
+        """Test metrics endpoint serves Prometheus text with route latency."""
+        await async_client.get("/health")
+        response = await async_client.get("/metrics", params={"format": "prometheus"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'easypost_mcp_http_request_duration_seconds_count{method="GET",endpoint="/health"}' in (
+            response.text
+        )
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint_reports_latency(self, async_client):
+        """Test JSON metrics include per-route latency percentiles."""
+        await async_client.get("/health")
+        data = (await async_client.get("/metrics")).json()
+
+        assert data["latency"]["GET /health"]["count"] >= 1
+        assert "p99_ms" in data["latency"]["GET /health"]
+        assert "executors" in data
+
     # ========== Rates Endpoints ==========
 
     @pytest.mark.asyncio
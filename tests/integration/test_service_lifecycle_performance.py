@@ -0,0 +1,115 @@
+"""Benchmark: per-request EasyPostService construction vs the shared registry.
+
+Drives POST /api/rates through the ASGI app with a stubbed EasyPost client and
+reports p50/p99 latency plus threads leaked by abandoned executors.
+"""
+
+import statistics
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from src.dependencies import get_easypost_service
+from src.server import app
+from src.services.easypost_service import EasyPostService
+from src.services.service_registry import ServiceRegistry
+
+NUM_REQUESTS = 200
+
+RATES_PAYLOAD = {
+    "to_address": {
+        "name": "Jane Doe",
+        "street1": "1 Main St",
+        "city": "New York",
+        "state": "NY",
+        "zip": "10001",
+        "country": "US",
+    },
+    "from_address": {
+        "name": "Warehouse",
+        "street1": "2 Origin Ave",
+        "city": "Los Angeles",
+        "state": "CA",
+        "zip": "90001",
+        "country": "US",
+    },
+    "parcel": {"length": 10, "width": 8, "height": 4, "weight": 16},
+}
+
+
+def _stub_client(*_args, **_kwargs):
+    client = MagicMock()
+    client.shipment.create.return_value = SimpleNamespace(
+        rates=[
+            SimpleNamespace(
+                id="rate_1", carrier="USPS", service="Priority", rate="8.50", delivery_days=2
+            )
+        ]
+    )
+    return client
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _drive(provider) -> tuple[list[float], int]:
+    app.dependency_overrides[get_easypost_service] = provider
+    threads_before = threading.active_count()
+    latencies = []
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            for _ in range(NUM_REQUESTS):
+                start = time.perf_counter()
+                response = await ac.post("/api/rates", json=RATES_PAYLOAD)
+                latencies.append((time.perf_counter() - start) * 1000)
+                assert response.status_code == 200
+    finally:
+        app.dependency_overrides.clear()
+    return latencies, threading.active_count() - threads_before
+
+
+@pytest.mark.asyncio
+async def test_rates_latency_per_request_vs_shared_service():
+    """Benchmark: /api/rates with a new service per request vs one shared service."""
+    created: list[EasyPostService] = []
+
+    def per_request_service():
+        service = EasyPostService(api_key="EZTK" + "0" * 24)
+        created.append(service)
+        return service
+
+    with patch("src.services.easypost_service.easypost.EasyPostClient", _stub_client):
+        registry = ServiceRegistry(lambda: EasyPostService(api_key="EZTK" + "0" * 24))
+        try:
+            before, leaked_before = await _drive(per_request_service)
+            after, leaked_after = await _drive(registry.get)
+        finally:
+            for service in created:
+                service.shutdown()
+            registry.shutdown()
+
+    print(f"\n{'=' * 60}")
+    print("/api/rates SERVICE LIFECYCLE BENCHMARK")
+    print(f"{'=' * 60}")
+    print(f"Requests: {NUM_REQUESTS}")
+    print(
+        f"Per-request: p50={statistics.median(before):.2f}ms "
+        f"p99={_percentile(before, 99):.2f}ms threads leaked={leaked_before}"
+    )
+    print(
+        f"Shared:      p50={statistics.median(after):.2f}ms "
+        f"p99={_percentile(after, 99):.2f}ms threads leaked={leaked_after}"
+    )
+    print(f"{'=' * 60}\n")
+
+    assert len(created) == NUM_REQUESTS
+    # Shared service keeps at most its fixed worker pool alive
+    assert leaked_after <= 4
+    assert leaked_before > leaked_after
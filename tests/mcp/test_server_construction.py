@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _run(code: str) -> subprocess.CompletedProcess[str]:
+    env = {**os.environ, "EASYPOST_API_KEY": "EZTK_test", "PYTHONWARNINGS": "ignore"}
+    return subprocess.run(  # noqa: S603 - fixed interpreter
+        [sys.executable, "-c", textwrap.dedent(code)],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def test_importing_package_builds_nothing():
+    result = _run(
+        """
+        import src.mcp_server.tools
+        import src.mcp_server
+        from src.services.service_registry import service_registry
+        from src.utils import config
+
+        assert src.mcp_server._server is None
+        assert service_registry.service is None
+        assert config.get_settings.cache_info().currsize == 0
+        """
+    )
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_entrypoint_and_package_share_one_server():
+    result = _run(
+        """
+        from unittest.mock import patch
+
+        import src.mcp_server as package
+
+        with patch.object(package, "build_mcp_server", wraps=package.build_mcp_server) as build:
+            from src.mcp_server.server import mcp
+
+            assert package.mcp is mcp
+            assert package.easypost_service is package.get_mcp_server()[1]
+        assert build.call_count == 1
+        """
+    )
+
+    assert result.returncode == 0, result.stderr
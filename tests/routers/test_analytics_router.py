@@ -50,3 +50,34 @@ async def test_get_analytics_handles_service_error(async_client, mock_easypost_s
 
     assert response.status_code == 500
     assert "Failed to fetch shipments" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_get_analytics_pages_window_and_reuses_rollups(async_client, mock_easypost_service):
+    created_at = datetime.now(UTC).isoformat()
+    pages = [
+        {
+            "status": "success",
+            "data": [
+                {"id": f"shp_{i}", "carrier": "UPS", "rate": "2", "created_at": created_at}
+                for i in range(100)
+            ],
+            "has_more": True,
+        },
+        {
+            "status": "success",
+            "data": [{"id": "shp_last", "carrier": "UPS", "rate": "2", "created_at": created_at}],
+            "has_more": False,
+        },
+    ]
+    mock_easypost_service.list_shipments.side_effect = pages
+
+    first = await async_client.get("/api/analytics", params={"days": 90})
+    second = await async_client.get("/api/analytics", params={"days": 30})
+
+    assert first.json()["data"]["summary"]["total_shipments"] == 101
+    assert second.json()["data"]["summary"]["total_shipments"] == 101
+    assert mock_easypost_service.list_shipments.await_count == 2
+    last_call = mock_easypost_service.list_shipments.await_args_list[-1]
+    assert last_call.kwargs["before_id"] == "shp_99"
+    assert last_call.kwargs["start_datetime"] is not None
@@ -2,6 +2,7 @@
 
 import pytest
 
+from src.services.shipment_ledger import ShipmentLedger
 from tests.factories import EasyPostFactory
 
 
@@ -59,13 +60,12 @@ async def test_create_shipment_handles_service_failure(async_client, mock_easypo
 
 @pytest.mark.asyncio
 async def test_buy_shipment_flow(async_client, mock_easypost_service):
-    mock_easypost_service.get_rates.return_value = {"status": "success", "data": [{}]}
-    mock_easypost_service.create_shipment.return_value = {
+    buy_payload = {
         "status": "success",
-        "id": "shp_123",
+        "label_url": "http://label",
+        "data": {"shipment_id": "shp_123", "timings_ms": {"create": 1.0, "buy": 1.0}},
     }
-    buy_payload = {"status": "success", "label_url": "http://label"}
-    mock_easypost_service.buy_shipment.return_value = buy_payload
+    mock_easypost_service.purchase_shipment.return_value = buy_payload
 
     request = EasyPostFactory.shipment_request()
     request.update({"rate_id": "rate_123"})
@@ -76,9 +76,30 @@ async def test_buy_shipment_flow(async_client, mock_easypost_service):
     body = response.json()
     assert body["status"] == "success"
     assert body["label_url"] == "http://label"
-    mock_easypost_service.buy_shipment.assert_awaited_once()
-    buy_kwargs = mock_easypost_service.buy_shipment.await_args.kwargs
-    assert buy_kwargs == {"shipment_id": "shp_123", "rate_id": "rate_123"}
+    assert body["data"]["timings_ms"]["create"] == 1.0
+    mock_easypost_service.purchase_shipment.assert_awaited_once()
+    kwargs = mock_easypost_service.purchase_shipment.await_args.kwargs
+    assert kwargs["rate_id"] == "rate_123"
+    assert kwargs["carrier"] == request["carrier"]
+    # The pipeline replaces the separate rates -> create -> buy calls
+    mock_easypost_service.get_rates.assert_not_awaited()
+    mock_easypost_service.create_shipment.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_buy_shipment_failure_returns_400(async_client, mock_easypost_service):
+    mock_easypost_service.purchase_shipment.return_value = {
+        "status": "error",
+        "data": {"timings_ms": {"create": 1.0}},
+        "message": "Failed to create shipment",
+    }
+
+    response = await async_client.post(
+        "/api/shipments/buy", json=EasyPostFactory.shipment_request()
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Failed to create shipment"
 
 
 @pytest.mark.asyncio
@@ -103,3 +124,32 @@ async def test_get_shipment_detail_returns_404_when_missing(async_client, mock_e
 
     assert response.status_code == 404
     assert response.json()["detail"] == "Shipment not found"
+
+
+@pytest.mark.asyncio
+async def test_list_ledger_shipments_reads_local_ledger(async_client, mock_easypost_service):
+    ledger = ShipmentLedger()
+    ledger.record_many(
+        [
+            {"id": "shp_1", "tracking_number": "TRK1", "created_at": "2025-01-01", "carrier": "USPS"},
+            {"id": "shp_2", "tracking_number": "TRK2", "created_at": "2025-01-02", "carrier": "UPS"},
+        ]
+    )
+    mock_easypost_service.ledger = ledger
+
+    response = await async_client.get("/api/shipments/ledger", params={"carrier": "usps"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [s["id"] for s in body["data"]["shipments"]] == ["shp_1"]
+    assert body["pagination"]["total"] == 1
+    mock_easypost_service.list_shipments.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_list_ledger_shipments_requires_ledger(async_client, mock_easypost_service):
+    mock_easypost_service.ledger = None
+
+    response = await async_client.get("/api/shipments/ledger")
+
+    assert response.status_code == 503
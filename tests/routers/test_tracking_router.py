@@ -25,3 +25,31 @@ async def test_track_shipment_handles_failure(async_client, mock_easypost_servic
 
     assert response.status_code == 500
     assert "Error tracking shipment" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_track_shipments_batch_forwards_codes(async_client, mock_easypost_service):
+    mock_easypost_service.get_tracking_batch.return_value = {
+        "status": "success",
+        "data": {"results": [], "summary": {"total": 2, "unique": 1}},
+        "message": "Tracked 1 shipments",
+    }
+
+    response = await async_client.post(
+        "/api/tracking/batch",
+        json={"tracking_numbers": ["TRK1", "TRK1"], "max_concurrency": 4},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["data"]["summary"]["unique"] == 1
+    mock_easypost_service.get_tracking_batch.assert_awaited_once_with(
+        ["TRK1", "TRK1"], max_concurrency=4
+    )
+
+
+@pytest.mark.asyncio
+async def test_track_shipments_batch_rejects_empty_list(async_client, mock_easypost_service):
+    response = await async_client.post("/api/tracking/batch", json={"tracking_numbers": []})
+
+    assert response.status_code == 422
+    mock_easypost_service.get_tracking_batch.assert_not_awaited()
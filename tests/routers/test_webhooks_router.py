@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import hmac
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from src.dependencies import get_easypost_service
+from src.routers import webhooks
+from src.server import app
+from src.services.easypost_service import EasyPostService
+from tests.factories import EasyPostFactory
+
+
+def _webhook_settings(monkeypatch, **overrides):
+    monkeypatch.setattr(webhooks, "settings", dataclasses.replace(webhooks.settings, **overrides))
+
+
+@pytest.fixture
+async def webhook_client(monkeypatch):
+    """
+    Client posting sample tracker events at a real service with a mocked SDK client.
+
+    Unsigned events are allowed (the dev opt-in) unless a test overrides it.
+    """
+    _webhook_settings(monkeypatch, EASYPOST_WEBHOOK_SECRET="", EASYPOST_WEBHOOK_ALLOW_UNSIGNED=True)
+    with patch("src.services.easypost_service.easypost.EasyPostClient") as client_cls:
+        client_cls.return_value = MagicMock()
+        service = EasyPostService("EZAK" + "0" * 24)
+        app.dependency_overrides[get_easypost_service] = lambda: service
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            yield ac, service
+        app.dependency_overrides.clear()
+        service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_tracker_event_updates_tracking_cache(webhook_client):
+    client, service = webhook_client
+
+    response = await client.post(
+        "/api/webhooks/easypost", json=EasyPostFactory.tracker_event(status="out_for_delivery")
+    )
+    tracking = await client.get("/api/tracking/9400111899223345")
+
+    assert response.status_code == 200
+    assert response.json()["data"]["applied"] is True
+    assert tracking.json()["data"]["status_detail"] == "out_for_delivery"
+    service.client.tracker.retrieve.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_non_tracker_event_is_ignored(webhook_client):
+    client, service = webhook_client
+    event = {"object": "Event", "description": "batch.updated", "result": {"object": "Batch"}}
+
+    response = await client.post("/api/webhooks/easypost", json=event)
+
+    assert response.status_code == 200
+    assert response.json()["data"]["applied"] is False
+    assert len(service.tracking_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_signature_required_when_secret_configured(webhook_client, monkeypatch):
+    client, _ = webhook_client
+    secret = "whsec_test"  # noqa: S105 - test fixture secret
+    _webhook_settings(
+        monkeypatch, EASYPOST_WEBHOOK_SECRET=secret, EASYPOST_WEBHOOK_ALLOW_UNSIGNED=False
+    )
+    body = json.dumps(EasyPostFactory.tracker_event()).encode()
+    signature = "hmac-sha256-hex=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+    unsigned = await client.post("/api/webhooks/easypost", content=body)
+    signed = await client.post(
+        "/api/webhooks/easypost", content=body, headers={"X-Hmac-Signature": signature}
+    )
+
+    assert unsigned.status_code == 401
+    assert signed.status_code == 200
+    assert signed.json()["data"]["applied"] is True
+
+
+@pytest.mark.asyncio
+async def test_webhooks_rejected_without_secret(webhook_client, monkeypatch):
+    client, service = webhook_client
+    _webhook_settings(monkeypatch, EASYPOST_WEBHOOK_ALLOW_UNSIGNED=False)
+
+    response = await client.post("/api/webhooks/easypost", json=EasyPostFactory.tracker_event())
+
+    assert response.status_code == 403
+    assert len(service.tracking_cache) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("body", [[EasyPostFactory.tracker_event()], "tracker.updated", 42])
+async def test_non_object_body_returns_400(webhook_client, body):
+    client, _ = webhook_client
+
+    response = await client.post("/api/webhooks/easypost", json=body)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Webhook body must be a JSON object"
+
+
+def test_unsigned_webhooks_refused_in_production():
+    with pytest.raises(ValueError, match="EASYPOST_WEBHOOK_ALLOW_UNSIGNED"):
+        dataclasses.replace(
+            webhooks.settings, ENVIRONMENT="production", EASYPOST_WEBHOOK_ALLOW_UNSIGNED=True
+        ).validate()
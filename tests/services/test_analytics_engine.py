@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.services.analytics_engine import AnalyticsEngine, ShipmentFetchError
+from src.services.easypost_service import EasyPostService
+
+NOW = datetime(2025, 6, 30, 12, 0, tzinfo=UTC)
+
+
+class FakeClock:
+    def __init__(self, now: datetime = NOW):
+        self.now = now.timestamp()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeShipmentService:
+    """Pages newest-first through `shipments` like get_shipments_list with cursors."""
+
+    iter_shipment_pages = EasyPostService.iter_shipment_pages
+
+    def __init__(self, shipments):
+        self.shipments = sorted(shipments, key=lambda s: s["created_at"], reverse=True)
+        self.calls = []
+
+    async def get_shipments_list(
+        self, page_size, purchased, start_datetime, end_datetime, before_id=None, max_age=None
+    ):
+        self.calls.append((start_datetime, end_datetime, before_id))
+        matching = [s for s in self.shipments if start_datetime <= s["created_at"] < end_datetime]
+        if before_id is not None:
+            index = next(i for i, s in enumerate(matching) if s["id"] == before_id)
+            matching = matching[index + 1 :]
+        page = matching[:page_size]
+        return {"status": "success", "data": page, "has_more": len(matching) > page_size}
+
+
+def _shipments(days_back: int, per_day: int):
+    shipments = []
+    for day in range(days_back):
+        for i in range(per_day):
+            created = NOW - timedelta(days=day, minutes=i + 1)
+            shipments.append(
+                {
+                    "id": f"shp_{day}_{i}",
+                    "created_at": created.isoformat(),
+                    "carrier": "USPS" if i % 2 else "UPS",
+                    "rate": "5.00",
+                    "status": "delivered" if i == 0 else "in_transit",
+                    "from_address": {"city": "Denver"},
+                    "to_address": {"city": "Miami"},
+                }
+            )
+    return shipments
+
+
+@pytest.mark.asyncio
+async def test_window_walks_all_pages():
+    service = FakeShipmentService(_shipments(days_back=90, per_day=4))
+    engine = AnalyticsEngine(page_size=25, clock=FakeClock())
+
+    window = await engine.window(service, 90)
+
+    assert window.total_shipments == 360
+    assert window.total_cost == pytest.approx(1800.0)
+    assert window.pages_fetched == len(service.calls) == 15
+    assert len(window.date_stats) == 90
+    assert window.carrier_stats["UPS"] == {"count": 180, "cost": 900.0, "delivered": 90}
+    assert window.route_stats["Denver → Miami"]["count"] == 360
+
+
+@pytest.mark.asyncio
+async def test_repeat_query_served_from_rollups():
+    clock = FakeClock()
+    service = FakeShipmentService(_shipments(days_back=30, per_day=2))
+    engine = AnalyticsEngine(clock=clock)
+
+    await engine.window(service, 30)
+    calls = len(service.calls)
+    again = await engine.window(service, 7)
+
+    assert len(service.calls) == calls
+    assert again.total_shipments == 14
+    assert again.days_fetched == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_recent_days_are_refetched_but_settled_days_are_not():
+    clock = FakeClock()
+    service = FakeShipmentService(_shipments(days_back=60, per_day=1))
+    engine = AnalyticsEngine(recent_ttl=300, settle_days=14, clock=clock)
+
+    await engine.window(service, 60)
+    clock.now += 600
+    service.calls.clear()
+    window = await engine.window(service, 60)
+
+    # Only today and the 14-day settle window go back to EasyPost
+    assert window.days_fetched == 15
+    start, _, _ = service.calls[0]
+    assert start == (NOW - timedelta(days=14)).replace(hour=0, minute=0).isoformat()
+    assert window.total_shipments == 60
+
+
+@pytest.mark.asyncio
+async def test_fetch_error_is_raised_and_nothing_cached():
+    class FailingService:
+        iter_shipment_pages = EasyPostService.iter_shipment_pages
+
+        async def get_shipments_list(self, **_kwargs):
+            return {"status": "error", "message": "boom"}
+
+    engine = AnalyticsEngine(clock=FakeClock())
+
+    with pytest.raises(ShipmentFetchError, match="boom"):
+        await engine.window(FailingService(), 7)
+
+    assert engine.stats()["days"] == 0
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+from easypost.errors import RateLimitError
+
+from src.services.async_transport import AsyncEasyPostTransport
+from src.services.easypost_service import EasyPostService
+
+API_BASE = "https://api.test/v2"
+
+
+def _rate(rate_id: str = "rate_1") -> dict:
+    return {
+        "id": rate_id,
+        "object": "Rate",
+        "carrier": "UPS",
+        "service": "Ground",
+        "rate": "10.00",
+        "delivery_days": 3,
+    }
+
+
+def _address(country: str = "US") -> dict[str, str]:
+    return {
+        "name": "Test",
+        "street1": "10 Downing St",
+        "city": "London",
+        "state": "LN",
+        "zip": "SW1A 2AA",
+        "country": country,
+    }
+
+
+def _parcel() -> dict[str, float]:
+    return {"length": 10.0, "width": 5.0, "height": 4.0, "weight": 16.0}
+
+
+def _wire(transport: AsyncEasyPostTransport, handler) -> None:
+    """Route the transport's pooled client through an in-memory handler."""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url=transport.api_base)
+    transport._get_client = lambda: client
+
+
+@pytest.fixture
+def async_service():
+    with patch("src.services.easypost_service.easypost.EasyPostClient") as client_cls:
+        client_cls.return_value.api_base = API_BASE
+        service = EasyPostService("EZAK" + "0" * 24, transport="async")
+        yield service
+        service.shutdown()
+
+
+def test_unknown_transport_rejected():
+    with (
+        patch("src.services.easypost_service.easypost.EasyPostClient"),
+        pytest.raises(ValueError, match="Unknown EasyPost transport"),
+    ):
+        EasyPostService("EZAK" + "0" * 24, transport="grpc")
+
+
+@pytest.mark.asyncio
+async def test_get_rates_uses_async_transport(async_service):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"id": "shp_1", "rates": [_rate()]})
+
+    _wire(async_service.transport, handler)
+
+    result = await async_service.get_rates(_address("gb"), _address(), _parcel())
+
+    assert result["status"] == "success"
+    assert result["data"] == [
+        {
+            "id": "rate_1",
+            "carrier": "UPS",
+            "service": "Ground",
+            "rate": "10.00",
+            "delivery_days": 3,
+        }
+    ]
+    assert requests[0].url.path == "/v2/shipments"
+    body = json.loads(requests[0].content)
+    assert body["shipment"]["to_address"]["country"] == "GB"
+    assert body["shipment"]["carrier_accounts"] == EasyPostService.CARRIER_ACCOUNTS
+    # Executor untouched: no SDK call was made
+    async_service.client.shipment.create.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_buy_shipment_uses_async_transport(async_service):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            return httpx.Response(
+                200,
+                json={
+                    "id": "shp_1",
+                    "status": "created",
+                    "rates": [_rate()],
+                    "to_address": {"street1": "10 Down", "city": "London", "country": "GB"},
+                    "customs_info": None,
+                },
+            )
+        assert json.loads(request.content) == {"rate": {"id": "rate_1"}}
+        return httpx.Response(
+            200,
+            json={
+                "id": "shp_1",
+                "tracking_code": "trk_1",
+                "postage_label": {"label_url": "http://label"},
+                "selected_rate": _rate(),
+            },
+        )
+
+    _wire(async_service.transport, handler)
+
+    result = await async_service.buy_shipment("shp_1", "rate_1")
+
+    assert result["status"] == "success"
+    assert result["data"]["postage_label_url"] == "http://label"
+    assert result["data"]["purchased_rate"]["carrier"] == "UPS"
+
+
+@pytest.mark.asyncio
+async def test_shipments_list_encodes_query(async_service):
+    seen = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.update(request.url.params)
+        return httpx.Response(200, json={"shipments": [{"id": "shp_1"}], "has_more": False})
+
+    _wire(async_service.transport, handler)
+
+    result = await async_service.get_shipments_list(page_size=5, purchased=True)
+
+    assert result["status"] == "success"
+    assert result["data"][0]["id"] == "shp_1"
+    assert seen == {"page_size": "5", "purchased": "true"}
+
+
+@pytest.mark.asyncio
+async def test_transport_raises_sdk_errors():
+    transport = AsyncEasyPostTransport("EZAK" + "0" * 24, api_base=API_BASE)
+    responses = []
+
+    def handler(_request: httpx.Request) -> httpx.Response:
+        return httpx.Response(429, json={"error": {"code": "RATE_LIMITED", "message": "slow down"}})
+
+    transport.subscribe_to_response_hook(lambda **kwargs: responses.append(kwargs))
+    _wire(transport, handler)
+
+    with pytest.raises(RateLimitError) as exc:
+        await transport.get("/trackers/EZ1")
+
+    assert exc.value.http_status == 429
+    assert responses[0]["http_status"] == 429
+    assert responses[0]["path"] == f"{API_BASE}/trackers/EZ1"
+
+
+def test_new_event_loop_closes_previous_pool():
+    transport = AsyncEasyPostTransport("EZAK" + "0" * 24)
+
+    async def client():
+        return transport._get_client()
+
+    async def request_on_new_loop():
+        def handler(_request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"object": "Tracker", "id": "trk_1"})
+
+        new_client = transport._get_client()
+        new_client._transport = httpx.MockTransport(handler)
+        await transport.get("/trackers/trk_1")
+        return new_client
+
+    first = asyncio.run(client())
+    second = asyncio.run(request_on_new_loop())
+
+    assert second is not first
+    assert first.is_closed
+    assert not second.is_closed
+    asyncio.run(transport.aclose())
+    assert second.is_closed
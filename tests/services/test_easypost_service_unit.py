@@ -6,7 +6,19 @@
 import asyncio
 import pytest
 
-from src.services.easypost_service import EasyPostService
+from src.models.bulk_dto import CustomsInfoDTO, CustomsItemDTO
+from src.services.easypost_service import (
+    EasyPostService,
+    ShipmentFetchError,
+    rate_quote_key,
+    shipment_plan_key,
+)
+from src.services.shipment_ledger import ShipmentLedger
+from src.services.warehouse_registry import WarehouseAddressRegistry
+from src.services.warehouse_utils import get_warehouse_address
+from src.utils.cache import TTLCache
+from src.utils.monitoring import MetricsCollector, trace_api_calls
+from tests.factories import EasyPostFactory
 
 
 @pytest.fixture
@@ -130,6 +142,73 @@ def test_buy_shipment_sync_success(service_with_client):
     client.shipment.buy.assert_called_once_with("shp_123", rate={"id": "rate_1"})
 
 
+class _RateLimited(Exception):
+    http_status = 429
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_buy_retries_only_the_buy(service_with_client):
+    service, client = service_with_client
+    service.CARRIER_ACCOUNTS = []
+    client.shipment.create.return_value = SimpleNamespace(
+        id="shp_123", tracking_code=None, rates=[_simple_rate()]
+    )
+    bought = SimpleNamespace(
+        id="shp_123",
+        tracking_code="trk_123",
+        postage_label=SimpleNamespace(label_url="http://label"),
+        selected_rate=_simple_rate(),
+    )
+    client.shipment.buy.side_effect = [_RateLimited(), bought]
+
+    result = await service.create_shipment(
+        _address_dict(), _address_dict(), _parcel_dict(), rate_id="rate_1"
+    )
+
+    assert result["status"] == "success"
+    client.shipment.create.assert_called_once()
+    assert [call.args[0] for call in client.shipment.buy.call_args_list] == [
+        "shp_123",
+        "shp_123",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_buy_reports_the_created_shipment(service_with_client):
+    service, client = service_with_client
+    service.CARRIER_ACCOUNTS = []
+    client.shipment.create.return_value = SimpleNamespace(
+        id="shp_123", tracking_code=None, rates=[_simple_rate()]
+    )
+    client.shipment.buy.side_effect = _RateLimited("429 Too Many Requests")
+
+    result = await service.create_shipment(
+        _address_dict(), _address_dict(), _parcel_dict(), rate_id="rate_1"
+    )
+
+    assert result["status"] == "error"
+    assert result["shipment_id"] == "shp_123"
+    client.shipment.create.assert_called_once()
+    assert client.shipment.buy.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_create_is_retried(service_with_client):
+    service, client = service_with_client
+    service.CARRIER_ACCOUNTS = []
+    client.shipment.create.side_effect = [
+        _RateLimited(),
+        SimpleNamespace(id="shp_123", tracking_code=None, rates=[_simple_rate()]),
+    ]
+
+    result = await service.create_shipment(
+        _address_dict(), _address_dict(), _parcel_dict(), buy_label=False
+    )
+
+    assert result["status"] == "success"
+    assert client.shipment.create.call_count == 2
+
+
 def test_buy_shipment_sync_missing_rate(service_with_client):
     service, client = service_with_client
 
@@ -231,6 +310,52 @@ async def immediate_sleep(_):
     assert attempts["count"] == 1
 
 
+def test_response_hook_records_operation_latency(monkeypatch, service_with_client):
+    service, _ = service_with_client
+    collector = MetricsCollector()
+    monkeypatch.setattr("src.services.easypost_service.metrics", collector)
+    path = "https://api.easypost.com/v2/shipments/shp_123/buy"
+
+    service._mark_api_request(
+        method="post", path=path, request_uuid="req-1", request_body={"rate": {"id": "rate_1"}}
+    )
+    service._record_api_response(
+        http_status=429, method="post", path=path, request_uuid="req-1", response_body="{}"
+    )
+    service._record_api_response(http_status=200, method="post", path=path, request_uuid="gone")
+
+    operation = collector.get_metrics()["easypost"]["POST /shipments/:id/buy"]
+    assert operation["responses"] == {"200": 1, "429": 1}
+    assert operation["count"] == 1
+    assert operation["request_bytes"] == len('{"rate":{"id":"rate_1"}}')
+    assert operation["response_bytes"] == 2
+    assert service._api_started == {}
+
+
+@pytest.mark.asyncio
+async def test_api_trace_follows_calls_into_the_executor(monkeypatch, service_with_client):
+    service, _ = service_with_client
+    monkeypatch.setattr("src.services.easypost_service.metrics", MetricsCollector())
+    path = "https://api.easypost.com/v2/shipments"
+
+    def sdk_call(uuid):
+        service._mark_api_request(method="post", path=path, request_uuid=uuid)
+        service._record_api_response(
+            http_status=201, method="post", path=path, request_uuid=uuid, response_body="{}"
+        )
+
+    loop = asyncio.get_running_loop()
+    with trace_api_calls() as trace:
+        await asyncio.gather(
+            *(loop.run_in_executor(service.executor, sdk_call, f"req-{i}") for i in range(3))
+        )
+    await loop.run_in_executor(service.executor, sdk_call, "outside")
+
+    summary = trace.summary()
+    assert summary["calls"] == 3
+    assert summary["by_operation"]["POST /shipments"]["response_bytes"] == 6
+
+
 @pytest.mark.asyncio
 async def test_create_shipment_returns_error_when_sync_fails(service_with_client):
     service, _ = service_with_client
@@ -245,3 +370,739 @@ async def test_create_shipment_returns_error_when_sync_fails(service_with_client
 
     assert result["status"] == "error"
     assert result["message"] == "Failed to create shipment"
+
+
+@pytest.mark.asyncio
+async def test_get_rates_serves_repeat_quotes_from_cache(service_with_client):
+    service, client = service_with_client
+    client.shipment.create.return_value = SimpleNamespace(rates=[_simple_rate()])
+
+    first = await service.get_rates(_address_dict("gb"), _address_dict("US"), _parcel_dict())
+    # Different recipient/street at the same destination ZIP, parcel rounding noise
+    other_recipient = {**_address_dict("GB"), "name": "Someone Else", "street1": "1 Other Rd"}
+    parcel = {**_parcel_dict(), "weight": 16.01}
+    second = await service.get_rates(other_recipient, _address_dict("US"), parcel)
+
+    assert client.shipment.create.call_count == 1
+    # The cached ids belong to the first line's shipment: quote references only
+    assert "quote_only" not in first["data"][0]
+    assert second["data"] == [{**rate, "quote_only": True} for rate in first["data"]]
+    assert service.rate_cache.stats()["hits"] == 1
+
+    # Mutating a returned quote must not leak into the cache
+    second["data"][0]["rate"] = "0.00"
+    third = await service.get_rates(_address_dict("gb"), _address_dict("US"), _parcel_dict())
+    assert third["data"][0]["rate"] == "10.00"
+
+
+@pytest.mark.asyncio
+async def test_get_rates_bypass_and_distinct_parcels_hit_api(service_with_client):
+    service, client = service_with_client
+    client.shipment.create.return_value = SimpleNamespace(rates=[_simple_rate()])
+
+    await service.get_rates(_address_dict(), _address_dict(), _parcel_dict())
+    await service.get_rates(_address_dict(), _address_dict(), _parcel_dict(), bypass_cache=True)
+    await service.get_rates(_address_dict(), _address_dict(), {**_parcel_dict(), "weight": 32.0})
+
+    assert client.shipment.create.call_count == 3
+
+
+def _complete_rates() -> list[SimpleNamespace]:
+    return [
+        SimpleNamespace(**{**vars(_simple_rate(f"rate_{i}")), "carrier_account_id": account})
+        for i, account in enumerate(EasyPostService.CARRIER_ACCOUNTS)
+    ]
+
+
+def test_create_shipment_sync_skips_retrieve_when_rates_complete(service_with_client):
+    service, client = service_with_client
+    client.shipment.create.return_value = SimpleNamespace(
+        id="shp_123", tracking_code=None, rates=_complete_rates()
+    )
+
+    result = service._create_shipment_sync(
+        _address_dict(), _address_dict(), _parcel_dict(), "UPS", None, False
+    )
+
+    assert result["status"] == "success"
+    assert len(result["rates"]) == len(EasyPostService.CARRIER_ACCOUNTS)
+    client.shipment.retrieve.assert_not_called()
+    assert service.retrieve_stats()["skipped"] == 1
+
+
+def test_create_shipment_sync_retrieves_when_carrier_missing(service_with_client):
+    service, client = service_with_client
+    rates = _complete_rates()
+    # One account neither quoted nor reported an error message yet
+    client.shipment.create.return_value = SimpleNamespace(
+        id="shp_123", rates=rates[:-1], messages=[]
+    )
+    client.shipment.retrieve.return_value = SimpleNamespace(
+        id="shp_123", tracking_code=None, rates=rates
+    )
+
+    result = service._create_shipment_sync(
+        _address_dict(), _address_dict(), _parcel_dict(), "UPS", None, False
+    )
+
+    assert len(result["rates"]) == len(rates)
+    client.shipment.retrieve.assert_called_once_with("shp_123")
+    assert service.retrieve_stats()["retrieved"] == 1
+
+
+def test_create_shipment_sync_carrier_message_counts_as_reported(service_with_client):
+    service, client = service_with_client
+    rates = _complete_rates()
+    client.shipment.create.return_value = SimpleNamespace(
+        id="shp_123",
+        tracking_code=None,
+        rates=rates[:-1],
+        messages=[{"carrier_account_id": rates[-1].carrier_account_id, "message": "No lane"}],
+    )
+
+    service._create_shipment_sync(
+        _address_dict(), _address_dict(), _parcel_dict(), "UPS", None, False
+    )
+
+    client.shipment.retrieve.assert_not_called()
+
+
+def test_create_shipment_sync_always_mode_retrieves(service_with_client):
+    service, client = service_with_client
+    service.retrieve_mode = "always"
+    client.shipment.create.return_value = SimpleNamespace(id="shp_123", rates=_complete_rates())
+    client.shipment.retrieve.return_value = SimpleNamespace(
+        id="shp_123", tracking_code=None, rates=_complete_rates()
+    )
+
+    service._create_shipment_sync(
+        _address_dict(), _address_dict(), _parcel_dict(), "UPS", None, False
+    )
+
+    client.shipment.retrieve.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_buy_after_create_reuses_phase1_shipment(service_with_client):
+    service, client = service_with_client
+    shipment = SimpleNamespace(
+        id="shp_123",
+        status="created",
+        tracking_code=None,
+        rates=_complete_rates(),
+        to_address=SimpleNamespace(street1="10 Down", city="London", country="GB"),
+        customs_info=None,
+        duty_payment=None,
+    )
+    client.shipment.create.return_value = shipment
+    client.shipment.buy.return_value = SimpleNamespace(
+        id="shp_123", tracking_code="trk_123", postage_label=None, selected_rate=None
+    )
+
+    service._create_shipment_sync(
+        _address_dict(), _address_dict(), _parcel_dict(), "UPS", None, False
+    )
+    assert await service.get_purchasable_shipment("shp_123") is shipment
+    result = await service.buy_shipment("shp_123", "rate_0")
+
+    assert result["status"] == "success"
+    client.shipment.retrieve.assert_not_called()
+    # Purchased shipments leave the cache
+    assert service.shipment_cache.get("shp_123") is None
+
+
+@pytest.mark.asyncio
+async def test_document_calls_use_shared_client(service_with_client):
+    service, client = service_with_client
+    client.shipment.retrieve.return_value = SimpleNamespace(id="shp_9", forms=[])
+    client.shipment.generate_form.return_value = SimpleNamespace(id="shp_9", forms=["ci"])
+
+    shipment = await service.get_shipment_object("shp_9")
+    updated = await service.generate_shipment_form("shp_9", "commercial_invoice")
+
+    assert shipment.id == "shp_9"
+    assert updated.forms == ["ci"]
+    client.shipment.generate_form.assert_called_once_with("shp_9", "commercial_invoice")
+
+
+def _purchase_rates() -> list[SimpleNamespace]:
+    rates = []
+    for i, (account, carrier, service, price) in enumerate(
+        zip(
+            EasyPostService.CARRIER_ACCOUNTS,
+            ["USPS", "USPS", "UPS", "FedEx", "DHLExpress", "USPS"],
+            ["Priority", "GroundAdvantage", "Ground", "FEDEX_GROUND", "Express", "Express"],
+            ["9.00", "6.50", "12.00", "11.00", "40.00", "30.00"],
+            strict=True,
+        )
+    ):
+        rates.append(
+            SimpleNamespace(
+                id=f"rate_new_{i}",
+                carrier=carrier,
+                service=service,
+                rate=price,
+                delivery_days=2,
+                carrier_account_id=account,
+            )
+        )
+    return rates
+
+
+def _purchase_client(client) -> None:
+    client.shipment.create.return_value = SimpleNamespace(
+        id="shp_new",
+        status="created",
+        tracking_code=None,
+        rates=_purchase_rates(),
+        to_address=SimpleNamespace(street1="10 Downing St", city="London", country="US"),
+        customs_info=None,
+        duty_payment=None,
+    )
+    client.shipment.buy.side_effect = lambda shipment_id, rate: SimpleNamespace(
+        id=shipment_id,
+        tracking_code="trk_new",
+        postage_label=SimpleNamespace(label_url="http://label"),
+        selected_rate=next(r for r in _purchase_rates() if r.id == rate["id"]),
+    )
+
+
+@pytest.mark.asyncio
+async def test_purchase_shipment_matches_quoted_rate(service_with_client):
+    service, client = service_with_client
+    _purchase_client(client)
+    to_address, from_address, parcel = _address_dict(), _address_dict(), _parcel_dict()
+    service.rate_cache.set(
+        rate_quote_key(to_address, from_address, parcel, None),
+        [{"id": "rate_quoted", "carrier": "USPS", "service": "Priority", "rate": "9.00"}],
+    )
+
+    result = await service.purchase_shipment(
+        to_address, from_address, parcel, rate_id="rate_quoted"
+    )
+
+    assert result["status"] == "success"
+    assert result["data"]["selected_rate"]["id"] == "rate_new_0"
+    assert set(result["data"]["timings_ms"]) == {"create", "select", "buy", "total"}
+    client.shipment.create.assert_called_once()
+    client.shipment.retrieve.assert_not_called()
+    client.shipment.buy.assert_called_once_with("shp_new", rate={"id": "rate_new_0"})
+
+
+@pytest.mark.asyncio
+async def test_purchase_shipment_does_not_buy_unknown_rate(service_with_client):
+    service, client = service_with_client
+    _purchase_client(client)
+
+    # Quote expired/evicted (or another worker's cache): nothing to match
+    result = await service.purchase_shipment(
+        _address_dict(), _address_dict(), _parcel_dict(), rate_id="rate_expired", carrier="USPS"
+    )
+
+    assert result["status"] == "error"
+    assert "rate_expired" in result["message"]
+    assert set(result["data"]["timings_ms"]) == {"create", "select", "total"}
+    client.shipment.buy.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_purchase_shipment_does_not_buy_withdrawn_service(service_with_client):
+    service, client = service_with_client
+    _purchase_client(client)
+    to_address, from_address, parcel = _address_dict(), _address_dict(), _parcel_dict()
+    service.rate_cache.set(
+        rate_quote_key(to_address, from_address, parcel, None),
+        [{"id": "rate_quoted", "carrier": "USPS", "service": "Retired", "rate": "5.00"}],
+    )
+
+    result = await service.purchase_shipment(
+        to_address, from_address, parcel, rate_id="rate_quoted"
+    )
+
+    assert result["status"] == "error"
+    client.shipment.buy.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_purchase_shipment_selects_best_rate_for_carrier(service_with_client):
+    service, client = service_with_client
+    _purchase_client(client)
+
+    result = await service.purchase_shipment(
+        _address_dict(), _address_dict(), _parcel_dict(), carrier="USPS"
+    )
+
+    # Cheapest USPS rate, not the cheapest overall or the first listed
+    assert result["data"]["selected_rate"]["id"] == "rate_new_1"
+    assert result["data"]["purchased_rate"]["service"] == "GroundAdvantage"
+
+
+@pytest.mark.asyncio
+async def test_purchase_shipment_reports_create_failure(service_with_client):
+    service, client = service_with_client
+    client.shipment.create.side_effect = RuntimeError("address invalid")
+
+    result = await service.purchase_shipment(_address_dict(), _address_dict(), _parcel_dict())
+
+    assert result["status"] == "error"
+    assert "address invalid" in result["message"]
+    assert "create" in result["data"]["timings_ms"]
+    client.shipment.buy.assert_not_called()
+
+
+@pytest.fixture
+def service_with_ledger():
+    with patch("src.services.easypost_service.easypost.EasyPostClient") as client_cls:
+        client = MagicMock()
+        client_cls.return_value = client
+        service = EasyPostService("EZAK" + "0" * 24, ledger=ShipmentLedger())
+        yield service, client
+
+
+def _ledger_shipment(shipment_id: str = "shp_new", created_at: str = "2025-01-01T00:00:00"):
+    return SimpleNamespace(
+        id=shipment_id,
+        status="created",
+        tracking_code=None,
+        created_at=created_at,
+        rates=_complete_rates(),
+        to_address=SimpleNamespace(city="Denver", state="CO"),
+    )
+
+
+@pytest.mark.asyncio
+async def test_retrieve_after_create_is_served_from_ledger(service_with_ledger):
+    service, client = service_with_ledger
+    client.shipment.create.return_value = _ledger_shipment()
+
+    await service.create_shipment(_address_dict(), _address_dict(), _parcel_dict(), buy_label=False)
+    result = await service.retrieve_shipment("shp_new")
+
+    assert result["status"] == "success"
+    assert result["data"]["to"] == "Denver, CO"
+    assert "(ledger)" in result["message"]
+    client.shipment.retrieve.assert_not_called()
+    assert service.ledger.stats()["hits"] == 1
+
+    # max_age=0 forces a round trip
+    client.shipment.retrieve.return_value = _ledger_shipment()
+    await service.retrieve_shipment("shp_new", max_age=0)
+    client.shipment.retrieve.assert_called_once_with("shp_new")
+
+
+@pytest.mark.asyncio
+async def test_refund_is_written_through_to_ledger(service_with_ledger):
+    service, client = service_with_ledger
+    client.shipment.retrieve.return_value = _ledger_shipment()
+    client.shipment.refund.return_value = SimpleNamespace(refund_status="submitted")
+
+    await service.refund_shipment("shp_new")
+
+    assert service.ledger.get("shp_new")["refund_status"] == "submitted"
+
+
+@pytest.mark.asyncio
+async def test_list_shipments_served_from_ledger_after_sync(service_with_ledger):
+    service, client = service_with_ledger
+    client.shipment.all.return_value = SimpleNamespace(
+        shipments=[_ledger_shipment("shp_old", "2025-01-01T00:00:00")]
+    )
+
+    first = await service.list_shipments(page_size=10, purchased=False)
+    client.shipment.create.return_value = _ledger_shipment("shp_fresh", "2025-01-02T00:00:00")
+    await service.create_shipment(_address_dict(), _address_dict(), _parcel_dict(), buy_label=False)
+    second = await service.list_shipments(page_size=10, purchased=False)
+
+    assert [s["id"] for s in first["data"]] == ["shp_old"]
+    assert [s["id"] for s in second["data"]] == ["shp_fresh", "shp_old"]
+    assert "(ledger)" in second["message"]
+    client.shipment.all.assert_called_once()
+
+    # Pagination cursors and larger pages still go to EasyPost
+    await service.list_shipments(page_size=10, purchased=False, before_id="shp_old")
+    await service.list_shipments(page_size=50, purchased=False)
+    assert client.shipment.all.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_ledger_listing_returns_synced_has_more(service_with_ledger):
+    service, client = service_with_ledger
+    client.shipment.all.return_value = SimpleNamespace(
+        shipments=[_ledger_shipment(f"shp_{i}", f"2025-01-0{i + 1}T00:00:00") for i in range(2)],
+        has_more=False,
+    )
+
+    await service.list_shipments(page_size=2, purchased=False)
+    full_page = await service.list_shipments(page_size=2, purchased=False)
+
+    assert "(ledger)" in full_page["message"]
+    assert len(full_page["data"]) == 2
+    assert full_page["has_more"] is False
+
+    # A shipment written through since the sync pushes one row past the page
+    client.shipment.create.return_value = _ledger_shipment("shp_fresh", "2025-01-05T00:00:00")
+    await service.create_shipment(_address_dict(), _address_dict(), _parcel_dict(), buy_label=False)
+    spilled = await service.list_shipments(page_size=2, purchased=False)
+
+    assert [s["id"] for s in spilled["data"]] == ["shp_fresh", "shp_1"]
+    assert spilled["has_more"] is True
+    client.shipment.all.assert_called_once()
+
+
+def _fake_pages(service, total_pages: int, events: list[str], page_size: int = 2):
+    async def get_shipments_list(**kwargs):
+        before_id = kwargs["before_id"]
+        index = 0 if before_id is None else int(before_id.split("_")[1]) + 1
+        events.append(f"fetch {index}")
+        await asyncio.sleep(0)
+        return {
+            "status": "success",
+            "data": [{"id": f"p_{index}_{i}"} for i in range(page_size - 1)]
+            + [{"id": f"p_{index}"}],
+            "has_more": index < total_pages - 1,
+        }
+
+    service.get_shipments_list = get_shipments_list
+
+
+@pytest.mark.asyncio
+async def test_iter_shipment_pages_prefetches_next_page(service_with_client):
+    service, _ = service_with_client
+    events: list[str] = []
+    _fake_pages(service, total_pages=3, events=events)
+
+    pages = []
+    async for page in service.iter_shipment_pages(page_size=2):
+        events.append(f"process {len(pages)}")
+        await asyncio.sleep(0.01)
+        pages.append(page)
+
+    assert [page[-1]["id"] for page in pages] == ["p_0", "p_1", "p_2"]
+    # Page 1 is requested before the caller finishes processing page 0
+    assert events.index("fetch 1") < events.index("process 1")
+    assert events.count("fetch 2") == 1
+
+
+@pytest.mark.asyncio
+async def test_iter_shipments_stops_fetching_on_early_exit(service_with_client):
+    service, _ = service_with_client
+    events: list[str] = []
+    _fake_pages(service, total_pages=100, events=events)
+
+    seen = []
+    async for shipment in service.iter_shipments(page_size=2, prefetch=2):
+        seen.append(shipment["id"])
+        if len(seen) == 3:
+            break
+    await asyncio.sleep(0.01)
+
+    assert seen == ["p_0_0", "p_0", "p_1_0"]
+    # Bounded buffer: only a couple of pages ahead were ever requested
+    assert len([e for e in events if e.startswith("fetch")]) <= 5
+
+
+@pytest.mark.asyncio
+async def test_iter_shipment_pages_raises_on_error(service_with_client):
+    service, client = service_with_client
+    client.shipment.all.side_effect = RuntimeError("boom")
+
+    with pytest.raises(ShipmentFetchError):
+        async for _page in service.iter_shipment_pages():
+            pass
+
+
+def test_shipments_list_uses_reported_has_more(service_with_client):
+    service, client = service_with_client
+    client.shipment.all.return_value = SimpleNamespace(
+        shipments=[_ledger_shipment("shp_1")], has_more=True
+    )
+
+    result = service._get_shipments_list_sync(10, True, None, None, None)
+
+    assert result["has_more"] is True
+
+
+def _tracker(status: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        tracking_code="TRK1", status=status, updated_at="2025-01-01", tracking_details=[]
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_tracking_caches_with_status_dependent_ttl(service_with_client):
+    service, client = service_with_client
+    now = [0.0]
+    service.tracking_cache = TTLCache(maxsize=16, ttl=300, clock=lambda: now[0])
+    client.tracker.retrieve.return_value = _tracker("in_transit")
+
+    first = await service.get_tracking("TRK1")
+    second = await service.get_tracking(" TRK1 ")
+
+    assert first["data"] == second["data"]
+    assert "(cached)" in second["message"]
+    client.tracker.retrieve.assert_called_once_with("TRK1")
+
+    # In-transit entries expire after the short TTL; delivered ones are kept
+    now[0] = 301.0
+    client.tracker.retrieve.return_value = _tracker("delivered")
+    await service.get_tracking("TRK1")
+    now[0] = 301.0 + 3600
+    delivered = await service.get_tracking("TRK1")
+
+    assert client.tracker.retrieve.call_count == 2
+    assert delivered["data"]["status_detail"] == "delivered"
+
+
+def test_ingest_tracker_event_updates_cache_and_ledger(service_with_ledger):
+    service, _ = service_with_ledger
+    service.ledger.record({"id": "shp_1", "status": "in_transit", "created_at": "2025-01-01"})
+
+    data = service.ingest_tracker_event(EasyPostFactory.tracker_event(status="delivered"))
+
+    assert data["status_detail"] == "delivered"
+    assert data["events"][0]["status"] == "delivered"
+    assert service.tracking_cache.get("9400111899223345")["data"] == data
+    assert service.ledger.get("shp_1")["status"] == "delivered"
+    assert service.ingest_tracker_event({"result": {"object": "Batch"}}) is None
+
+
+@pytest.mark.asyncio
+async def test_get_tracking_batch_dedupes_and_bounds_concurrency(service_with_client):
+    service, _ = service_with_client
+    statuses = {"A": "delivered", "B": "in_transit", "C": "return_to_sender", "D": "weird"}
+    in_flight = [0, 0]
+
+    async def get_tracking(code):
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight[1], in_flight[0])
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        if code == "E":
+            return {"status": "error", "message": "Failed to retrieve tracking information"}
+        events = [{"message": "Out there"}]
+        return {"status": "success", "data": {"status_detail": statuses[code], "events": events}}
+
+    service.get_tracking = get_tracking
+    progress = []
+
+    async def on_result(code, entry, done, total):
+        progress.append((code, done, total))
+
+    result = await service.get_tracking_batch(
+        ["A", "B", " A", "C", "D", "E", ""], max_concurrency=2, on_result=on_result
+    )
+
+    summary = result["data"]["summary"]
+    assert summary == {
+        "total": 7,
+        "unique": 5,
+        "delivered": 1,
+        "in_transit": 1,
+        "exception": 1,
+        "unknown": 1,
+        "failed": 1,
+    }
+    assert [entry["tracking_number"] for entry in result["data"]["results"]] == list("ABCDE")
+    assert result["data"]["results"][0]["last_event"] == "Out there"
+    assert result["data"]["results"][4]["error"]
+    assert in_flight[1] == 2
+    assert [done for _, done, _ in progress] == [1, 2, 3, 4, 5]
+
+
+def test_explicit_customs_items_sent_inline(service_with_client):
+    service, client = service_with_client
+    customs = {
+        "customs_signer": "Jane",
+        "customs_items": [
+            {"description": "Jeans", "quantity": 2, "value": 25.0, "hs_tariff_number": "6203"},
+            {"description": "Shirt", "quantity": 1, "value": 30.0, "weight": 6.0},
+        ],
+    }
+
+    payload = service._create_customs_info(customs, _parcel_dict())
+
+    client.customs_item.create.assert_not_called()
+    client.customs_info.create.assert_not_called()
+    assert [item["weight"] for item in payload["customs_items"]] == [16.0, 6.0]
+    assert payload["eel_pfc"] == "NOEEI 30.37(a)"
+    assert payload["customs_signer"] == "Jane"
+
+
+def test_explicit_customs_items_created_when_not_inline(service_with_client):
+    service, client = service_with_client
+    service.inline_customs = False
+    customs = {"customs_items": [{"description": "Jeans"}, {"description": "Shirt"}]}
+
+    service._create_customs_info(customs, _parcel_dict())
+
+    assert client.customs_item.create.call_count == 2
+    client.customs_info.create.assert_called_once()
+
+
+def test_existing_customs_info_referenced_by_id(service_with_client):
+    service, client = service_with_client
+    customs = {"id": "cstinfo_1", "customs_items": [{"description": "Jeans"}]}
+
+    assert service._create_customs_info(customs, _parcel_dict()) == {"id": "cstinfo_1"}
+    client.customs_item.create.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_rates_send_smart_customs_in_one_request(service_with_client):
+    service, client = service_with_client
+    client.shipment.create.return_value = SimpleNamespace(id="shp_1", rates=[_simple_rate()])
+
+    await service.get_rates(
+        _address_dict("GB"),
+        _address_dict(),
+        _parcel_dict(),
+        customs_info={"contents": "(2) Jeans ($22 each) (1) Shirt ($30 each)"},
+    )
+
+    client.customs_item.create.assert_not_called()
+    client.customs_info.create.assert_not_called()
+    sent = client.shipment.create.call_args.kwargs["customs_info"]
+    assert len(sent["customs_items"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_warehouse_origin_sent_as_registered_id(service_with_client):
+    service, client = service_with_client
+    service.warehouse_registry = WarehouseAddressRegistry()
+    client.api_key = service.api_key
+    client.address.create.return_value = SimpleNamespace(id="adr_wh")
+    client.shipment.create.return_value = SimpleNamespace(id="shp_1", rates=[_simple_rate()])
+    warehouse = get_warehouse_address("Nevada", "default")
+
+    await service.get_rates(_address_dict(), warehouse, _parcel_dict(), bypass_cache=True)
+    await service.get_rates(_address_dict(), warehouse, _parcel_dict(), bypass_cache=True)
+    await service.get_rates(_address_dict(), _address_dict(), _parcel_dict(), bypass_cache=True)
+
+    client.address.create.assert_called_once()
+    sent = [call.kwargs["from_address"] for call in client.shipment.create.call_args_list]
+    assert sent[:2] == [{"id": "adr_wh"}, {"id": "adr_wh"}]
+    assert sent[2]["street1"] == "10 Downing St"
+
+
+@pytest.fixture
+def planning_service(service_with_client):
+    service, client = service_with_client
+    service.CARRIER_ACCOUNTS = []  # every rate counts as complete, no retrieve
+    counter = iter(range(100))
+
+    def create(**_params):
+        number = next(counter)
+        return SimpleNamespace(
+            id=f"shp_{number}", tracking_code=None, rates=[_simple_rate(f"rate_{number}")]
+        )
+
+    client.shipment.create.side_effect = create
+    return service, client
+
+
+@pytest.mark.asyncio
+async def test_quoted_rate_id_buys_the_planned_shipment(planning_service):
+    service, client = planning_service
+    client.shipment.buy.return_value = SimpleNamespace(
+        id="shp_0",
+        tracking_code="trk_0",
+        postage_label=SimpleNamespace(label_url="https://label"),
+        selected_rate=_simple_rate("rate_0"),
+    )
+
+    rates = await service.get_rates(_address_dict("GB"), _address_dict(), _parcel_dict())
+    await service.create_shipment(
+        _address_dict("GB"),
+        _address_dict(),
+        _parcel_dict(),
+        buy_label=True,
+        rate_id=rates["data"][0]["id"],
+    )
+
+    client.shipment.create.assert_called_once()
+    client.shipment.buy.assert_called_once_with("shp_0", rate={"id": "rate_0"})
+    # The claimed shipment was created by the rating pass, not by create_shipment
+    assert service.retrieve_stats()["created"] == 0
+
+
+@pytest.mark.asyncio
+async def test_duty_payment_lines_are_not_reused(planning_service):
+    service, client = planning_service
+
+    await service.get_rates(_address_dict("GB"), _address_dict(), _parcel_dict())
+    created = await service.create_shipment(
+        _address_dict("GB"),
+        _address_dict(),
+        _parcel_dict(),
+        buy_label=False,
+        duty_payment={"type": "SENDER"},
+    )
+
+    assert created["id"] == "shp_1"
+
+
+def test_shipment_plan_key_normalizes_line():
+    base = _address_dict("GB")
+    variant = {**base, "street1": "10 Downing St", "street2": "", "country": "United Kingdom"}
+
+    assert shipment_plan_key(base, _address_dict(), _parcel_dict()) == shipment_plan_key(
+        variant, _address_dict(), {**_parcel_dict(), "weight": 16.01}
+    )
+    assert shipment_plan_key(base, _address_dict(), _parcel_dict()) != shipment_plan_key(
+        {**base, "name": "Other"}, _address_dict(), _parcel_dict()
+    )
+
+
+def test_shipment_plan_key_matches_customs_across_shapes():
+    item = {
+        "description": "Jeans",
+        "quantity": 2,
+        "value": 25,
+        "weight": 16,
+        "hs_tariff_number": "6203.42.4011",
+        "origin_country": "US",
+    }
+    inline = {
+        "contents_type": "merchandise",
+        "customs_items": [item],
+        "customs_certify": True,
+        "customs_signer": "Jane",
+        "restriction_type": "none",
+        "restriction_comments": "",
+        "eel_pfc": None,
+        "non_delivery_option": "return",
+    }
+    dto = CustomsInfoDTO(
+        contents_type="merchandise",
+        customs_certify=True,
+        customs_signer="Jane",
+        eel_pfc="NOEEI 30.37(a)",
+        customs_items=[CustomsItemDTO(**item)],
+        incoterm="DDP",
+    ).model_dump(exclude_none=True)
+    sdk = SimpleNamespace(
+        id="cstinfo_1",
+        contents_type="merchandise",
+        customs_certify=True,
+        customs_signer="Jane",
+        eel_pfc="NOEEI 30.37(a)",
+        customs_items=[SimpleNamespace(id="cstitem_1", **{**item, "value": "25.00"})],
+    )
+
+    keys = {
+        shipment_plan_key(_address_dict("GB"), _address_dict(), _parcel_dict(), customs)
+        for customs in (inline, dto, sdk)
+    }
+    assert len(keys) == 1
+    for changed in (
+        {"customs_items": [{**item, "quantity": 3}]},
+        {"customs_signer": "Joe"},
+        {"eel_pfc": "AES X20250101123456"},
+        {"contents_type": "gift"},
+        {"customs_certify": False},
+    ):
+        assert keys != {
+            shipment_plan_key(
+                _address_dict("GB"), _address_dict(), _parcel_dict(), {**inline, **changed}
+            )
+        }
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from src.services.easypost_service import EasyPostService
+from src.services.rate_limiter import TokenBucketRateLimiter, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def _limiter(
+    rate: float = 10.0, burst: int = 2, **kwargs
+) -> tuple[TokenBucketRateLimiter, FakeClock]:
+    clock = FakeClock()
+    return TokenBucketRateLimiter(rate=rate, burst=burst, clock=clock, **kwargs), clock
+
+
+def test_burst_then_paced_at_rate():
+    limiter, clock = _limiter(rate=10.0, burst=2)
+
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == 0
+    # Bucket empty: each further caller queues one refill interval behind the last
+    assert limiter.reserve() == pytest.approx(0.1)
+    assert limiter.reserve() == pytest.approx(0.2)
+
+    clock.advance(1.0)
+    assert limiter.reserve() == 0
+
+
+def test_rate_limited_halves_rate_and_honors_retry_after():
+    limiter, clock = _limiter(rate=10.0, burst=5)
+
+    limiter.record_rate_limited(retry_after=3.0)
+
+    assert limiter.rate == pytest.approx(5.0)
+    assert limiter.reserve() == pytest.approx(3.0)
+
+    snapshot = limiter.snapshot()
+    assert snapshot["rate_limited_responses"] == 1
+    assert snapshot["retry_after_honored"] == 1
+    assert snapshot["throttled"] == 1
+
+
+def test_backoff_applies_once_per_cooldown():
+    limiter, clock = _limiter(rate=10.0, cooldown=1.0)
+
+    limiter.record_rate_limited()
+    limiter.record_rate_limited()
+    assert limiter.rate == pytest.approx(5.0)
+
+    clock.advance(1.0)
+    limiter.record_rate_limited()
+    assert limiter.rate == pytest.approx(2.5)
+
+
+def test_success_recovers_toward_ceiling():
+    limiter, _ = _limiter(rate=10.0, recovery_step=0.25)
+    limiter.record_rate_limited()
+
+    for _ in range(10):
+        limiter.observe_response(200, {})
+
+    assert limiter.rate == pytest.approx(10.0)
+
+
+def test_observe_response_reads_retry_after_header():
+    limiter, _ = _limiter()
+
+    limiter.observe_response(429, {"Retry-After": "2"})
+
+    assert limiter.snapshot()["blocked_for_seconds"] == pytest.approx(2.0)
+
+
+def test_parse_retry_after_formats():
+    assert parse_retry_after({"retry-after": "1.5"}) == 1.5
+    assert parse_retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+    assert parse_retry_after({"Retry-After": "soon"}) is None
+    assert parse_retry_after(None) is None
+
+
+@pytest.mark.asyncio
+async def test_acquire_sleeps_for_reserved_wait(monkeypatch):
+    limiter, _ = _limiter(rate=10.0, burst=1)
+    slept = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+
+    monkeypatch.setattr("src.services.rate_limiter.asyncio.sleep", fake_sleep)
+
+    await limiter.acquire()
+    await limiter.acquire()
+
+    assert slept == [pytest.approx(0.1)]
+
+
+def test_service_hooks_feed_limiter():
+    limiter, _ = _limiter(rate=10.0, burst=1)
+    with patch("src.services.easypost_service.easypost.EasyPostClient"):
+        service = EasyPostService("EZAK" + "0" * 24, rate_limiter=limiter)
+
+    try:
+        service._throttle_sdk_request(method="get", path="/shipments")
+        service._observe_rate_limit(http_status=429, headers={"Retry-After": "4"})
+
+        snapshot = limiter.snapshot()
+        assert snapshot["acquired"] == 1
+        assert snapshot["rate_limited_responses"] == 1
+        assert snapshot["blocked_for_seconds"] == pytest.approx(4.0)
+    finally:
+        service.shutdown()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.dependencies import get_easypost_service
+from src.lifespan import app_lifespan
+from src.services.easypost_service import EasyPostService
+from src.services.service_registry import ServiceRegistry
+
+
+def _registry():
+    created = []
+
+    def factory():
+        service = MagicMock()
+        service.aclose = AsyncMock()
+        service.transport.aclose = AsyncMock()
+        created.append(service)
+        return service
+
+    return ServiceRegistry(factory), created
+
+
+def test_get_returns_same_instance():
+    registry, created = _registry()
+
+    assert registry.get() is registry.get()
+    assert len(created) == 1
+
+
+def test_release_keeps_service_for_bound_callers():
+    registry, created = _registry()
+
+    first = registry.acquire()
+    second = registry.acquire()
+    assert first is second
+
+    registry.release()
+    registry.release()
+
+    # Tools and app state bound to the instance must not see a dead executor
+    first.shutdown.assert_not_called()
+    assert registry.service is first
+    assert registry.refcount == 0
+
+    # A restarted lifespan gets the same instance, not a second service
+    assert registry.acquire() is first
+    assert registry.get() is first
+    assert len(created) == 1
+
+
+def test_shutdown_discards_service():
+    registry, created = _registry()
+    service = registry.acquire()
+
+    registry.shutdown()
+
+    service.shutdown.assert_called_once()
+    assert registry.service is None
+    assert registry.refcount == 0
+
+
+def test_release_without_acquire_is_noop():
+    registry, created = _registry()
+    registry.get()
+
+    registry.release()
+
+    created[0].shutdown.assert_not_called()
+    assert registry.refcount == 0
+
+
+def test_dependency_fallback_reuses_shared_service(monkeypatch):
+    registry, created = _registry()
+    monkeypatch.setattr("src.services.service_registry.service_registry", registry)
+
+    assert get_easypost_service() is get_easypost_service()
+    assert len(created) == 1
+
+
+@pytest.mark.asyncio
+async def test_lifespan_acquires_and_releases(monkeypatch):
+    registry, created = _registry()
+    monkeypatch.setattr("src.lifespan.service_registry", registry)
+
+    async with app_lifespan(None) as state:
+        assert state["easypost_service"] is registry.get()
+        assert registry.refcount == 1
+
+    # Only the loop-bound connection pool closes; the service stays usable
+    created[0].transport.aclose.assert_awaited_once()
+    created[0].aclose.assert_not_called()
+    created[0].shutdown.assert_not_called()
+    assert registry.refcount == 0
+
+    async with app_lifespan(None) as state:
+        assert state["easypost_service"] is created[0]
+    assert len(created) == 1
+
+
+def test_service_shutdown_is_idempotent():
+    with patch("src.services.easypost_service.easypost.EasyPostClient"):
+        service = EasyPostService("EZAK" + "0" * 24)
+    service.executor.shutdown()
+    service.executor = MagicMock()
+
+    service.shutdown()
+    service.shutdown()
+
+    service.executor.shutdown.assert_called_once()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import sqlite3
+
+from src.services.shipment_ledger import ShipmentLedger
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _shipment(shipment_id: str, created_at: str, carrier: str = "", tracking: str = ""):
+    return {
+        "id": shipment_id,
+        "tracking_number": tracking,
+        "status": "created",
+        "created_at": created_at,
+        "carrier": carrier,
+        "to_address": {"city": "Denver"},
+    }
+
+
+def test_record_and_get_respects_max_age():
+    clock = FakeClock()
+    ledger = ShipmentLedger(clock=clock)
+    ledger.record(_shipment("shp_1", "2025-01-01T00:00:00"))
+
+    assert ledger.get("shp_1", max_age=60)["to_address"] == {"city": "Denver"}
+    clock.now += 120
+    assert ledger.get("shp_1", max_age=60) is None
+    assert ledger.get("shp_1")["id"] == "shp_1"
+    assert ledger.get("shp_missing") is None
+
+
+def test_query_filters_and_orders_newest_first():
+    ledger = ShipmentLedger()
+    ledger.record_many(
+        [
+            _shipment("shp_1", "2025-01-01T00:00:00", "USPS", "TRK1"),
+            _shipment("shp_2", "2025-01-02T00:00:00", "UPS", "TRK2"),
+            _shipment("shp_3", "2025-01-03T00:00:00"),
+        ]
+    )
+
+    assert [s["id"] for s in ledger.query(10)] == ["shp_3", "shp_2", "shp_1"]
+    assert [s["id"] for s in ledger.query(10, purchased=True)] == ["shp_2", "shp_1"]
+    assert [s["id"] for s in ledger.query(10, carrier="usps")] == ["shp_1"]
+    assert [s["id"] for s in ledger.query(10, before_id="shp_2")] == ["shp_1"]
+    assert [s["id"] for s in ledger.query(10, start_datetime="2025-01-02")] == [
+        "shp_3",
+        "shp_2",
+    ]
+    assert ledger.get_by_tracking_code("TRK2")["id"] == "shp_2"
+
+
+def test_update_patches_fields():
+    ledger = ShipmentLedger()
+    ledger.record(_shipment("shp_1", "2025-01-01T00:00:00", "USPS"))
+
+    ledger.update("shp_1", refund_status="submitted", status="cancelled")
+    ledger.update("shp_unknown", status="cancelled")
+
+    record = ledger.get("shp_1")
+    assert record["refund_status"] == "submitted"
+    assert ledger.query(1)[0]["status"] == "cancelled"
+    assert ledger.get("shp_unknown") is None
+
+
+def test_list_freshness_covers_page_size_and_start():
+    clock = FakeClock()
+    ledger = ShipmentLedger(clock=clock)
+    ledger.mark_list_synced("purchased=False", 20, "2025-01-01")
+
+    assert ledger.list_is_fresh("purchased=False", 20, 60, "2025-01-01")
+    assert ledger.list_is_fresh("purchased=False", 10, 60, "2025-02-01")
+    assert not ledger.list_is_fresh("purchased=False", 50, 60, "2025-01-01")
+    assert not ledger.list_is_fresh("purchased=False", 20, 60, None)
+    assert not ledger.list_is_fresh("purchased=True", 20, 60, "2025-01-01")
+    assert not ledger.list_is_fresh("purchased=False", 20, 0, "2025-01-01")
+    clock.now += 120
+    assert not ledger.list_is_fresh("purchased=False", 20, 60, "2025-01-01")
+
+
+def test_list_sync_remembers_has_more():
+    ledger = ShipmentLedger()
+    assert ledger.list_has_more("purchased=False")
+
+    ledger.mark_list_synced("purchased=False", 20, has_more=False)
+    ledger.mark_list_synced("purchased=True", 20, has_more=True)
+
+    assert not ledger.list_has_more("purchased=False")
+    assert ledger.list_has_more("purchased=True")
+
+
+def test_older_ledger_file_gains_has_more_column(tmp_path):
+    path = tmp_path / "shipments.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE list_syncs (query TEXT PRIMARY KEY, start_datetime TEXT,"
+        " page_size INTEGER NOT NULL, synced_at REAL NOT NULL)"
+    )
+    conn.execute("INSERT INTO list_syncs VALUES ('purchased=True', NULL, 20, 1000.0)")
+    conn.commit()
+    conn.close()
+
+    ledger = ShipmentLedger(path)
+
+    assert ledger.list_has_more("purchased=True")
+    ledger.mark_list_synced("purchased=True", 20, has_more=False)
+    assert not ledger.list_has_more("purchased=True")
+    ledger.close()
+
+
+def test_file_ledger_persists_across_instances(tmp_path):
+    path = tmp_path / "ledger" / "shipments.sqlite3"
+    ledger = ShipmentLedger(path)
+    ledger.record(_shipment("shp_1", "2025-01-01T00:00:00", "USPS"))
+    ledger.close()
+
+    reopened = ShipmentLedger(path)
+    assert reopened.get("shp_1")["carrier"] == "USPS"
+    assert reopened.stats()["shipments"] == 1
+    reopened.close()
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.services.warehouse_registry import (
+    WarehouseAddressRegistry,
+    address_content_hash,
+    warehouse_addresses,
+)
+from src.services.warehouse_utils import get_warehouse_address
+from src.utils.cache import SQLiteStore
+
+WAREHOUSE = get_warehouse_address("California", "bedding")
+
+
+def _client(api_key="EZTK123"):
+    client = MagicMock()
+    client.api_key = api_key
+    counter = iter(range(1000))
+    client.address.create.side_effect = lambda **_kw: SimpleNamespace(id=f"adr_{next(counter)}")
+    return client
+
+
+def test_registers_each_warehouse_once():
+    registry = WarehouseAddressRegistry()
+    client = _client()
+
+    first = registry.resolve(client, WAREHOUSE)
+    again = registry.resolve(client, dict(WAREHOUSE))
+
+    assert first == again == "adr_0"
+    assert registry.lookup(client, WAREHOUSE) == "adr_0"
+    client.address.create.assert_called_once()
+    assert client.address.create.call_args.kwargs["street1"] == "8500 Beverly Blvd"
+
+
+def test_custom_sender_is_never_registered():
+    registry = WarehouseAddressRegistry()
+    client = _client()
+    custom = {**WAREHOUSE, "name": "Someone Else"}
+
+    assert registry.resolve(client, custom) is None
+    client.address.create.assert_not_called()
+
+
+def test_changed_warehouse_content_registers_again():
+    edited = {**WAREHOUSE, "phone": "310-555-0100"}
+    registry = WarehouseAddressRegistry([WAREHOUSE, edited])
+    client = _client()
+
+    assert registry.resolve(client, WAREHOUSE) == "adr_0"
+    assert registry.resolve(client, edited) == "adr_1"
+    assert address_content_hash(WAREHOUSE) != address_content_hash(edited)
+
+
+def test_ids_are_per_account():
+    registry = WarehouseAddressRegistry()
+
+    assert registry.resolve(_client("EZTK1"), WAREHOUSE) == "adr_0"
+    assert registry.lookup(_client("EZAK2"), WAREHOUSE) is None
+
+
+def test_concurrent_first_use_shares_one_create():
+    registry = WarehouseAddressRegistry()
+    client = MagicMock(api_key="EZTK123")
+
+    def slow_create(**_kw):
+        time.sleep(0.05)
+        return SimpleNamespace(id="adr_1")
+
+    client.address.create.side_effect = slow_create
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(registry.resolve(client, WAREHOUSE)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["adr_1"] * 5
+    client.address.create.assert_called_once()
+
+
+def test_failure_falls_back_and_backs_off():
+    now = [0.0]
+    registry = WarehouseAddressRegistry(clock=lambda: now[0])
+    client = MagicMock(api_key="EZTK123")
+    client.address.create.side_effect = RuntimeError("boom")
+
+    assert registry.resolve(client, WAREHOUSE) is None
+    assert registry.resolve(client, WAREHOUSE) is None
+    assert client.address.create.call_count == 1
+
+    now[0] += 301
+    client.address.create.side_effect = None
+    client.address.create.return_value = SimpleNamespace(id="adr_9")
+    assert registry.resolve(client, WAREHOUSE) == "adr_9"
+    assert registry.stats()["failures"] == 1
+
+
+def test_ids_persist_across_registries(tmp_path):
+    path = tmp_path / "warehouses.sqlite3"
+    client = _client()
+    WarehouseAddressRegistry(store=SQLiteStore(path)).resolve(client, WAREHOUSE)
+
+    reloaded = WarehouseAddressRegistry(store=SQLiteStore(path))
+
+    assert reloaded.resolve(client, WAREHOUSE) == "adr_0"
+    client.address.create.assert_called_once()
+
+
+def test_register_all_covers_distinct_warehouses():
+    registry = WarehouseAddressRegistry()
+    client = _client()
+
+    counts = registry.register_all(client)
+
+    assert counts == {"registered": len(warehouse_addresses()), "failed": 0}
+    assert client.address.create.call_count == len(warehouse_addresses())
+
+
+def test_register_all_uses_the_constructor_addresses():
+    other = {**WAREHOUSE, "name": "Other Warehouse"}
+    registry = WarehouseAddressRegistry([WAREHOUSE, dict(WAREHOUSE), other])
+    client = _client()
+
+    counts = registry.register_all(client)
+
+    assert counts == {"registered": 2, "failed": 0}
+    assert registry.stats()["warehouses"] == 2
+    assert client.address.create.call_count == 2
+    assert registry.lookup(client, other) is not None
+
+
+@pytest.mark.parametrize("address", [None, "adr_123", {}])
+def test_non_dict_or_empty_addresses_are_ignored(address):
+    assert WarehouseAddressRegistry().lookup(_client(), address) is None
@@ -1,5 +1,8 @@
 """Unit tests for shipment creation tools."""
 
+import asyncio
+import time
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 
 from src.mcp_server.tools.bulk_creation_tools import register_shipment_creation_tools
@@ -25,3 +28,135 @@ def test_register_shipment_creation_tools(self):
 # The registration test above verifies that tools are properly registered with MCP.
 # Integration tests in test_server_endpoints.py cover the actual functionality.
 # Database integration tests verify that batch operations and shipments are properly stored.
+
+
+def _buy_tool(service):
+    tools = {}
+    mcp = MagicMock()
+    mcp.tool.return_value = lambda func: tools.setdefault(func.__name__, func)
+    register_shipment_creation_tools(mcp, service)
+    return tools["buy_shipment_label"]
+
+
+def _phase1_shipment(shipment_id: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=shipment_id,
+        rates=[
+            SimpleNamespace(
+                id=f"rate_{shipment_id}", carrier="USPS", service="Priority", rate="5.00"
+            )
+        ],
+        to_address=SimpleNamespace(name="Jane", country="US"),
+        customs_info=None,
+    )
+
+
+class TestBuyShipmentLabel:
+    """Test batch label purchase."""
+
+    async def test_buys_with_sliding_window_in_input_order(self):
+        service = MagicMock()
+        service.get_purchasable_shipment = AsyncMock(side_effect=_phase1_shipment)
+
+        async def buy(shipment_id, _rate_id):
+            # First label is slow; a chunk barrier would stall every later chunk
+            await asyncio.sleep(0.2 if shipment_id == "shp_0" else 0.02)
+            return {
+                "status": "success",
+                "data": {"tracking_code": f"trk_{shipment_id}", "postage_label_url": "http://l"},
+            }
+
+        service.buy_shipment = AsyncMock(side_effect=buy)
+        buy_shipment_label = _buy_tool(service)
+        shipment_ids = [f"shp_{i}" for i in range(9)]
+
+        start = time.perf_counter()
+        result = await buy_shipment_label(
+            shipment_ids, [f"rate_{s}" for s in shipment_ids], max_concurrency=2
+        )
+        duration = time.perf_counter() - start
+
+        purchased = result["data"]["purchased"]
+        assert [p["shipment_id"] for p in purchased] == shipment_ids
+        assert all(p["latency_ms"] > 0 for p in purchased)
+        assert result["data"]["summary"]["latency_ms"]["max"] >= 200
+        assert result["data"]["summary"]["total_cost"] == 45.0
+        # Slow label overlaps with the other 8 (~0.2s) instead of 0.2 + 4 x 0.02 in chunks
+        assert duration < 0.3
+        service.client.shipment.retrieve.assert_not_called()
+
+    async def test_reports_missing_rate(self):
+        service = MagicMock()
+        service.get_purchasable_shipment = AsyncMock(side_effect=_phase1_shipment)
+        service.buy_shipment = AsyncMock()
+        buy_shipment_label = _buy_tool(service)
+
+        result = await buy_shipment_label(["shp_1"], ["rate_other"])
+
+        assert result["data"]["failed"][0]["error"].startswith("Rate rate_other not found")
+        service.buy_shipment.assert_not_called()
+
+
+def _create_tool(service):
+    tools = {}
+    mcp = MagicMock()
+    mcp.tool.return_value = lambda func: tools.setdefault(func.__name__, func)
+    register_shipment_creation_tools(mcp, service)
+    return tools["create_shipment"]
+
+
+SHEET_LINE = (
+    "California\tUSPS\tJohn\tDoe\t555-0100\tjohn@example.com\t123 Main St\t\t"
+    "Los Angeles\tCA\t90001\tUS\tPackage\t12 x 9 x 6\t1.5 lbs\tBeauty products"
+)
+
+
+class TestCreateShipment:
+    """Test bulk shipment creation (phase 1)."""
+
+    async def test_lines_carry_stage_timings(self):
+        service = MagicMock()
+
+        async def create(**_kwargs):
+            await asyncio.sleep(0.02)
+            return {"status": "success", "id": "shp_1", "rates": []}
+
+        service.create_shipment = AsyncMock(side_effect=create)
+        create_shipment = _create_tool(service)
+
+        result = await create_shipment(f"{SHEET_LINE}\n{SHEET_LINE.replace('John', 'Jane')}")
+
+        shipments = result["data"]["shipments"]
+        assert [s["status"] for s in shipments] == ["success", "success"]
+        assert shipments[0]["timings"]["create"] >= 20
+        stages = result["data"]["summary"]["stages"]
+        assert list(stages) == [
+            "queue_wait",
+            "parse",
+            "category",
+            "warehouse",
+            "address_verification",
+            "create",
+        ]
+        assert stages["create"]["count"] == 2
+
+    async def test_queue_wait_records_time_behind_the_window(self):
+        service = MagicMock()
+
+        async def create(**_kwargs):
+            await asyncio.sleep(0.05)
+            return {"status": "success", "id": "shp_1", "rates": []}
+
+        service.create_shipment = AsyncMock(side_effect=create)
+        create_shipment = _create_tool(service)
+        names = [f"Buyer{i}" for i in range(6)]
+
+        result = await create_shipment("\n".join(SHEET_LINE.replace("John", n) for n in names))
+
+        shipments = result["data"]["shipments"]
+        assert [s["recipient"].split()[0] for s in shipments] == names
+        waits = [s["timings"]["queue_wait"] for s in shipments]
+        # 4 in flight at once: the rest wait for a slot, i.e. for a 50ms create to
+        # finish. Only lower bounds and ordering, so a loaded machine cannot fail it.
+        assert min(waits[4:]) > max(waits[:4])
+        assert min(waits[4:]) >= 40
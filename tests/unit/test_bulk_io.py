@@ -9,12 +9,29 @@
 
 import pytest
 
+from src.mcp_server.tools import bulk_io
 from src.mcp_server.tools.bulk_io import (
     create_shipment_with_rates,
     prepare_customs_if_international,
     verify_address_if_needed,
 )
-from src.models.bulk_dto import AddressDTO, CustomsInfoDTO, ParcelDTO, ShipmentRequestDTO
+from src.models.bulk_dto import (
+    AddressDTO,
+    CustomsInfoDTO,
+    ParcelDTO,
+    ShipmentRequestDTO,
+    VerifiedAddressDTO,
+)
+from src.services.address_utils import address_fingerprint
+from src.utils.cache import SQLiteStore, TTLCache
+
+
+@pytest.fixture(autouse=True)
+def verification_cache(monkeypatch):
+    """Fresh address verification cache per test."""
+    cache = TTLCache(maxsize=16, ttl=60)
+    monkeypatch.setattr(bulk_io, "_verification_cache", cache)
+    return cache
 
 
 @pytest.fixture
@@ -159,6 +176,136 @@ async def test_handles_verification_failure(self, sample_address, mock_easypost_
         assert result.verification_success is False
         assert len(result.errors) > 0
 
+    @pytest.mark.asyncio
+    async def test_repeat_recipient_address_served_from_cache(
+        self, mock_easypost_service, verification_cache
+    ):
+        """Same postal address (any case/spacing, any recipient) is verified once."""
+        mock_easypost_service.verify_address = AsyncMock(
+            return_value={
+                "status": "success",
+                "data": {
+                    "verification_success": True,
+                    "address": {
+                        "id": "adr_1",
+                        "name": "Recipient",
+                        "street1": "10 RUE DE RIVOLI",
+                        "city": "PARIS",
+                        "zip": "75001",
+                        "country": "FR",
+                    },
+                },
+            }
+        )
+        first = AddressDTO(
+            name="Anne", street1="10 rue de Rivoli", city="Paris", zip="75001", country="FR"
+        )
+        second = AddressDTO(
+            name="Marc",
+            phone="+33 1 00 00 00 00",
+            street1=" 10  Rue de Rivoli ",
+            city="paris",
+            zip="75001",
+            country="France",
+        )
+
+        verified_first = await verify_address_if_needed(
+            first, mock_easypost_service, is_international=True, carrier_preference="FedEx"
+        )
+        verified_second = await verify_address_if_needed(
+            second, mock_easypost_service, is_international=True, carrier_preference="fedex"
+        )
+
+        mock_easypost_service.verify_address.assert_awaited_once()
+        assert verified_first.address.street1 == "10 RUE DE RIVOLI"
+        assert verified_second.address.street1 == "10 RUE DE RIVOLI"
+        assert verified_second.address.name == "Marc"
+        assert verified_second.address.phone == "+33 1 00 00 00 00"
+        assert verification_cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_is_keyed_by_the_line_carrier(
+        self, mock_easypost_service, verification_cache
+    ):
+        """A UPS line does not reuse a FedEx line's verification of the same address."""
+        mock_easypost_service.verify_address = AsyncMock(
+            return_value={
+                "status": "success",
+                "data": {
+                    "verification_success": True,
+                    "address": {
+                        "name": "Anne",
+                        "street1": "1 MAIN",
+                        "city": "TORONTO",
+                        "zip": "M5H 2N2",
+                        "country": "CA",
+                    },
+                },
+            }
+        )
+        address = AddressDTO(
+            name="Anne", street1="1 Main", city="Toronto", zip="M5H 2N2", country="CA"
+        )
+
+        for carrier in ("FedEx", "UPS", "ups"):
+            await verify_address_if_needed(
+                address, mock_easypost_service, is_international=True, carrier_preference=carrier
+            )
+
+        assert mock_easypost_service.verify_address.await_count == 2
+        assert len(verification_cache) == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_verification_is_not_cached(
+        self, mock_easypost_service, verification_cache
+    ):
+        """API errors are retried on the next line instead of being remembered."""
+        mock_easypost_service.verify_address = AsyncMock(
+            return_value={"status": "error", "message": "timeout", "data": {}}
+        )
+        address = AddressDTO(
+            name="Anne", street1="1 Main", city="Toronto", zip="M5H 2N2", country="CA"
+        )
+
+        for _ in range(2):
+            await verify_address_if_needed(
+                address, mock_easypost_service, is_international=True, carrier_preference="FedEx"
+            )
+
+        assert mock_easypost_service.verify_address.await_count == 2
+        assert len(verification_cache) == 0
+
+    def test_verification_results_persist_to_sqlite(self, tmp_path):
+        """Cached DTOs round-trip through the on-disk store."""
+        path = tmp_path / "verify.sqlite3"
+        result = VerifiedAddressDTO(
+            address=AddressDTO(
+                name="Anne", street1="1 Main", city="Toronto", zip="M5H 2N2", country="CA"
+            ),
+            verification_success=False,
+            errors=["E.ADDRESS.NOT_FOUND"],
+        )
+
+        def store():
+            return SQLiteStore(
+                path,
+                encode=bulk_io._encode_verification,
+                decode=VerifiedAddressDTO.model_validate_json,
+            )
+
+        TTLCache(ttl=60, store=store()).set("key", result)
+
+        assert TTLCache(ttl=60, store=store()).get("key") == result
+
+
+def test_address_fingerprint_ignores_case_spacing_and_contact():
+    base = {"name": "A", "street1": "1 Main St", "city": "Leeds", "zip": "LS1", "country": "GB"}
+    variant = {**base, "name": "B", "street1": " 1  MAIN st ", "country": "United Kingdom"}
+
+    assert address_fingerprint(base, "fedex") == address_fingerprint(variant, "FedEx")
+    assert address_fingerprint(base, "fedex") != address_fingerprint(base, "ups")
+    assert address_fingerprint(base) != address_fingerprint({**base, "zip": "LS2"})
+
 
 class TestPrepareCustomsIfInternational:
     """Tests for prepare_customs_if_international()."""
@@ -0,0 +1,61 @@
+"""Unit tests for bulk line stage timings."""
+
+import pytest
+
+from src.mcp_server.tools.bulk_timing import StageTimer, summarize_stage_timings
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestStageTimer:
+    def test_accumulates_repeated_stages(self):
+        clock = FakeClock()
+        timer = StageTimer(clock)
+
+        with timer.stage("parse"):
+            clock.now += 0.002
+        with timer.stage("rates"):
+            clock.now += 0.250
+        with timer.stage("parse"):
+            clock.now += 0.001
+
+        assert timer.as_dict() == {"parse": 3.0, "rates": 250.0, "total_ms": 253.0}
+
+    def test_records_stage_that_raises(self):
+        clock = FakeClock()
+        timer = StageTimer(clock)
+
+        with pytest.raises(TimeoutError), timer.stage("create"):
+            clock.now += 1.5
+            raise TimeoutError
+
+        assert timer.as_dict()["create"] == 1500.0
+
+
+class TestSummarizeStageTimings:
+    def test_percentiles_order_and_share(self):
+        lines = [
+            {"rates": float(ms), "queue_wait": 1.0, "total_ms": ms + 1.0} for ms in range(1, 101)
+        ]
+        lines.append(None)  # line that failed before timing
+
+        summary = summarize_stage_timings(lines)
+
+        assert list(summary) == ["queue_wait", "rates"]
+        rates = summary["rates"]
+        assert rates["count"] == 100
+        assert rates["p50_ms"] == 51.0
+        assert rates["p95_ms"] == 95.0
+        assert rates["p99_ms"] == 99.0
+        assert rates["max_ms"] == 100.0
+        assert rates["total_ms"] == 5050.0
+        assert rates["share"] == round(5050 / 5150, 4)
+
+    def test_empty_run(self):
+        assert summarize_stage_timings([]) == {}
@@ -3,11 +3,11 @@
 import pytest
 
 from src.mcp_server.tools.bulk_tools import (
-    CA_STORE_ADDRESSES,
     parse_dimensions,
     parse_spreadsheet_line,
     parse_weight,
 )
+from src.services.warehouse_utils import CA_STORE_ADDRESSES
 
 
 class TestBulkToolsParsing:
@@ -232,3 +232,14 @@ def test_military_address_detection(self):
         assert detect_field_type("APO AE 09012") == "street"
         assert detect_field_type("FPO AP 96374") == "street"
         assert detect_field_type("DPO AA 34004") == "street"
+
+    def test_country_detection_matches_partial_names(self):
+        """Test country codes/names, including substrings of known names."""
+        from src.mcp_server.tools.bulk_tools import detect_field_type
+
+        assert detect_field_type("gb") == "country_code"
+        assert detect_field_type("Germany") == "country_name"
+        assert detect_field_type("united king") == "country_name"
+        assert detect_field_type("CA") == "country_code"
+        assert detect_field_type("NV") == "state_code"
+        assert detect_field_type("Denver") == "city"
@@ -0,0 +1,196 @@
+"""Unit tests for shipment document download tools."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+
+from src.mcp_server.tools import download_tools
+from src.mcp_server.tools.download_tools import download_file, register_download_tools
+
+BODY = b"%PDF-" + b"x" * 200_000
+
+
+def _document_server(etag='W/"v1"', delay=0.0, calls=None):
+    """MockTransport handler serving BODY with ETag / If-None-Match support."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if calls is not None:
+            calls.append(request)
+        await asyncio.sleep(delay)
+        if request.url.path.endswith("/missing"):
+            return httpx.Response(404)
+        if etag and request.headers.get("if-none-match") == etag:
+            return httpx.Response(304)
+        headers = {"content-length": str(len(BODY))}
+        if etag:
+            headers["etag"] = etag
+        return httpx.Response(200, headers=headers, content=BODY)
+
+    return handler
+
+
+def _client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestDownloadFile:
+    """Test the streaming downloader."""
+
+    async def test_streams_to_disk_and_records_etag(self, tmp_path):
+        target = tmp_path / "label.png"
+        async with _client(_document_server()) as client:
+            assert await download_file(client, "https://files/label", target) == "downloaded"
+
+        assert target.read_bytes() == BODY
+        assert (tmp_path / "label.png.etag").read_text() == 'W/"v1"'
+        assert not (tmp_path / "label.png.part").exists()
+
+    async def test_skips_when_etag_matches(self, tmp_path):
+        calls = []
+        target = tmp_path / "label.png"
+        async with _client(_document_server(calls=calls)) as client:
+            await download_file(client, "https://files/label", target)
+            assert await download_file(client, "https://files/label", target) == "skipped"
+
+        assert calls[1].headers["if-none-match"] == 'W/"v1"'
+
+    async def test_skips_when_size_matches_without_etag(self, tmp_path):
+        target = tmp_path / "label.png"
+        target.write_bytes(b"y" * len(BODY))
+        async with _client(_document_server(etag=None)) as client:
+            assert await download_file(client, "https://files/label", target) == "skipped"
+
+        assert target.read_bytes() != BODY
+
+    async def test_redownloads_when_etag_changes(self, tmp_path):
+        target = tmp_path / "label.png"
+        target.write_bytes(BODY)
+        (tmp_path / "label.png.etag").write_text('W/"old"')
+        async with _client(_document_server()) as client:
+            assert await download_file(client, "https://files/label", target) == "downloaded"
+
+        assert (tmp_path / "label.png.etag").read_text() == 'W/"v1"'
+
+    async def test_failure_leaves_no_partial_file(self, tmp_path):
+        target = tmp_path / "label.png"
+        async with _client(_document_server()) as client:
+            assert await download_file(client, "https://files/missing", target) is None
+
+        assert list(tmp_path.iterdir()) == []
+
+
+def _download_tool(service):
+    tools = {}
+    mcp = MagicMock()
+    mcp.tool.return_value = lambda func: tools.setdefault(func.__name__, func)
+    register_download_tools(mcp, service)
+    return tools["download_shipment_documents"]
+
+
+def _purchased_shipment(shipment_id):
+    return SimpleNamespace(
+        id=shipment_id,
+        tracking_code=f"trk_{shipment_id}",
+        postage_label=SimpleNamespace(label_url=f"https://files/{shipment_id}/label"),
+        forms=[
+            SimpleNamespace(form_type="cn23", form_url=f"https://files/{shipment_id}/cn23"),
+        ],
+    )
+
+
+class TestDownloadShipmentDocuments:
+    """Test the download tool."""
+
+    async def test_downloads_concurrently_with_shared_service(self, tmp_path, monkeypatch):
+        handler = _document_server(delay=0.05)
+        monkeypatch.setattr(
+            download_tools, "create_download_client", lambda _limit: _client(handler)
+        )
+        service = MagicMock()
+        service.get_shipment_object = AsyncMock(side_effect=_purchased_shipment)
+        download = _download_tool(service)
+        shipment_ids = [f"shp_{i}" for i in range(10)]
+
+        result = await download(
+            shipment_ids + ["shp_0", " "],
+            request="label and customs",
+            download_path=str(tmp_path),
+            max_concurrency=10,
+        )
+
+        assert result["status"] == "success"
+        assert list(result["data"]) == shipment_ids
+        assert result["summary"]["labels_downloaded"] == 10
+        assert result["summary"]["customs_downloaded"] == 10
+        assert result["summary"]["skipped"] == 0
+        # 20 documents at 50ms each overlap instead of running back to back (~1s)
+        assert result["duration_seconds"] < 0.5
+        assert service.get_shipment_object.await_count == 10
+        assert (tmp_path / "trk_shp_3_cn23.pdf").read_bytes() == BODY
+
+        again = await download(shipment_ids, request="label", download_path=str(tmp_path))
+        assert again["summary"]["skipped"] == 10
+        assert again["summary"]["labels_downloaded"] == 0
+        assert again["data"]["shp_0"]["label"]["skipped"] is True
+
+    async def test_generates_invoice_via_service(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            download_tools,
+            "create_download_client",
+            lambda _limit: _client(_document_server()),
+        )
+        service = MagicMock()
+        service.get_shipment_object = AsyncMock(side_effect=_purchased_shipment)
+        service.generate_shipment_form = AsyncMock(
+            return_value=SimpleNamespace(
+                forms=[
+                    SimpleNamespace(
+                        form_type="commercial_invoice", form_url="https://files/shp_1/ci"
+                    )
+                ]
+            )
+        )
+        download = _download_tool(service)
+
+        result = await download("shp_1", request="invoice", download_path=str(tmp_path))
+
+        service.generate_shipment_form.assert_awaited_once_with("shp_1", "commercial_invoice")
+        assert result["data"]["shp_1"]["invoice"]["downloaded"] is True
+        assert result["summary"]["invoices_downloaded"] == 1
+
+    async def test_reports_retrieve_failure(self, tmp_path):
+        service = MagicMock()
+        service.get_shipment_object = AsyncMock(side_effect=RuntimeError("not found"))
+        download = _download_tool(service)
+
+        result = await download(["shp_bad"], download_path=str(tmp_path))
+
+        assert result["status"] == "success"
+        assert "not found" in result["data"]["shp_bad"]["error"]
+
+    async def test_reports_per_shipment_failure_without_aborting(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            download_tools,
+            "create_download_client",
+            lambda _limit: _client(_document_server()),
+        )
+        real_jobs = download_tools._download_jobs
+
+        def failing_jobs(shipment, shipment_id, *args):
+            if shipment_id == "shp_bad":
+                raise OSError("disk full")
+            return real_jobs(shipment, shipment_id, *args)
+
+        monkeypatch.setattr(download_tools, "_download_jobs", failing_jobs)
+        service = MagicMock()
+        service.get_shipment_object = AsyncMock(side_effect=_purchased_shipment)
+        download = _download_tool(service)
+
+        result = await download(["shp_1", "shp_bad"], request="label", download_path=str(tmp_path))
+
+        assert result["status"] == "success"
+        assert "disk full" in result["data"]["shp_bad"]["error"]
+        assert result["data"]["shp_1"]["label"]["downloaded"] is True
+        assert result["summary"]["labels_downloaded"] == 1
@@ -1,12 +1,25 @@
 """Unit tests for smart customs generation."""
 
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.services import smart_customs
 from src.services.smart_customs import (
     HTS_CODE_PATTERNS,
     VALUE_ESTIMATES,
+    build_customs_payload,
     calculate_item_weight,
+    customs_cache_key,
     detect_hs_code_from_description,
     estimate_believable_value,
+    extract_customs_smart,
+    get_or_create_customs,
 )
+from src.utils.cache import TTLCache
 
 
 class TestCalculateItemWeight:
@@ -350,3 +363,85 @@ def test_hts_code_extraction(self):
             match = re.search(pattern, contents, re.IGNORECASE)
             assert match is not None
             assert match.group(1) == expected_hs
+
+
+class TestCustomsCache:
+    """Test get_or_create_customs caching behaviour."""
+
+    @pytest.fixture
+    def fresh_cache(self, monkeypatch):
+        cache = TTLCache(maxsize=16, ttl=60)
+        monkeypatch.setattr(smart_customs, "_customs_cache", cache)
+        return cache
+
+    def test_key_normalizes_whitespace_and_weight(self):
+        client = SimpleNamespace(api_key="EZTK123")
+
+        assert customs_cache_key("Jeans  x 2", 84.0, client) == customs_cache_key(
+            "Jeans x 2", 84.00001, client
+        )
+        assert customs_cache_key("Jeans", 84.0, client) != customs_cache_key("Jeans", 85.0, client)
+        # customs_info ids are per account
+        assert customs_cache_key("Jeans", 84.0, client) != customs_cache_key(
+            "Jeans", 84.0, SimpleNamespace(api_key="EZAK456")
+        )
+
+    def test_concurrent_identical_requests_create_once(self, fresh_cache, monkeypatch):
+        calls = []
+
+        def slow_create(*_args):
+            calls.append(1)
+            time.sleep(0.05)
+            return SimpleNamespace(id="cstinfo_1")
+
+        monkeypatch.setattr(smart_customs, "extract_customs_smart", slow_create)
+        client = SimpleNamespace(api_key="EZTK123")
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            results = list(
+                pool.map(lambda w: get_or_create_customs("Jeans", w, client), [84.0] * 6)
+            )
+
+        assert len(calls) == 1
+        assert {r.id for r in results} == {"cstinfo_1"}
+        assert fresh_cache.stats()["coalesced"] + fresh_cache.stats()["hits"] == 5
+
+
+class TestInlineCustomsPayload:
+    """Test customs payloads built locally for inline shipment requests."""
+
+    CONTENTS = "(2) Denim Jeans ($22 each) (3) Relaxed Jeans ($24 each) HTS: 6203.42.4011"
+
+    def test_multi_item_payload_nests_items(self):
+        payload = build_customs_payload(self.CONTENTS, 32.0, customs_signer="Jane")
+
+        assert [item["quantity"] for item in payload["customs_items"]] == [2, 3]
+        assert {item["hs_tariff_number"] for item in payload["customs_items"]} == {"6203.42.4011"}
+        total_weight = sum(item["weight"] for item in payload["customs_items"])
+        assert total_weight == pytest.approx(calculate_item_weight(32.0))
+        assert payload["eel_pfc"] == "NOEEI 30.37(a)"
+        assert payload["customs_signer"] == "Jane"
+
+    def test_high_value_still_requires_itn(self):
+        with pytest.raises(ValueError, match="AES ITN"):
+            build_customs_payload("(1) Laptop HTS: 8471.30.0100 ($3000)", 48.0)
+
+    def test_extract_creates_the_same_items(self):
+        client = MagicMock()
+        client.customs_item.create.side_effect = lambda **item: item
+        client.customs_info.create.side_effect = lambda **info: info
+
+        created = extract_customs_smart(self.CONTENTS, 32.0, client)
+
+        assert client.customs_item.create.call_count == 2
+        assert created == build_customs_payload(self.CONTENTS, 32.0)
+
+    def test_get_or_create_inline_makes_no_api_calls(self, monkeypatch):
+        monkeypatch.setattr(smart_customs, "_customs_cache", TTLCache(maxsize=4, ttl=60))
+        client = MagicMock()
+
+        payload = get_or_create_customs(self.CONTENTS, 32.0, client, inline=True)
+
+        assert len(payload["customs_items"]) == 2
+        client.customs_item.create.assert_not_called()
+        client.customs_info.create.assert_not_called()
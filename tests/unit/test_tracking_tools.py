@@ -251,3 +251,26 @@ async def get_tracking(tracking_number: str, ctx):
 
         assert result["status"] == "error"
         mock_easypost_service.get_tracking.assert_called_once_with("invalid123")
+
+
+@pytest.mark.asyncio
+async def test_get_tracking_batch_tool_reports_progress():
+    tools = {}
+    mcp = MagicMock()
+    mcp.tool.return_value = lambda func: tools.setdefault(func.__name__, func)
+    service = MagicMock()
+
+    async def get_tracking_batch(codes, max_concurrency, on_result):
+        entry = {"tracking_number": codes[0], "group": "delivered", "status_detail": "delivered"}
+        await on_result(codes[0], entry, 1, 1)
+        return {"status": "success", "data": {"codes": codes, "limit": max_concurrency}}
+
+    service.get_tracking_batch = get_tracking_batch
+    register_tracking_tools(mcp, service)
+    ctx = AsyncMock()
+    ctx.request_context.lifespan_context = {}
+
+    result = await tools["get_tracking_batch"]("TRK1, TRK2\nTRK3", max_concurrency=3, ctx=ctx)
+
+    assert result["data"] == {"codes": ["TRK1", " TRK2", "TRK3"], "limit": 3}
+    ctx.report_progress.assert_awaited_once_with(1, 1, "TRK1: delivered")
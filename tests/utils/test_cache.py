@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.utils.cache import SQLiteStore, TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_get_returns_value_until_ttl_expires():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=4, ttl=10, clock=clock)
+
+    cache.set("a", 1)
+    clock.now = 9.9
+    assert cache.get("a") == 1
+
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_set_ttl_overrides_default_per_entry():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=4, ttl=10, clock=clock)
+
+    cache.set("short", 1)
+    cache.set("long", 2, ttl=100)
+    clock.now = 50.0
+
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+
+def test_lru_eviction_keeps_recently_used_entries():
+    cache = TTLCache(maxsize=2, ttl=60)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_zero_ttl_disables_cache():
+    cache = TTLCache(ttl=0)
+
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+    assert cache.stats()["enabled"] is False
+    assert cache.stats()["misses"] == 0
+
+
+def test_get_or_create_is_single_flight_across_threads():
+    cache = TTLCache(ttl=60)
+    calls = []
+
+    def factory():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(cache.get_or_create, "key", factory) for _ in range(8)]
+        results = [f.result() for f in futures]
+
+    assert results == ["value"] * 8
+    assert len(calls) == 1
+    assert cache.get("key") == "value"
+
+
+def test_get_or_create_does_not_cache_failures():
+    cache = TTLCache(ttl=60)
+
+    def boom():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_create("key", boom)
+
+    assert cache.get_or_create("key", lambda: "ok") == "ok"
+
+
+def test_sqlite_store_survives_new_cache_instance(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    first = TTLCache(ttl=60, store=SQLiteStore(path))
+    first.set("key", {"id": "cstinfo_1"})
+    first.store.close()
+
+    second = TTLCache(ttl=60, store=SQLiteStore(path))
+
+    assert second.get("key") == {"id": "cstinfo_1"}
+    assert second.stats()["store_hits"] == 1
+
+
+def test_sqlite_store_skips_unserializable_values(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    cache = TTLCache(ttl=60, store=SQLiteStore(path))
+
+    cache.set("key", object())
+
+    # Still cached in memory, just not persisted
+    assert cache.get("key") is not None
+    assert TTLCache(ttl=60, store=SQLiteStore(path)).get("key") is None
+
+
+def test_store_reload_keeps_the_stored_expiry(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    wall = FakeClock()
+    first = TTLCache(ttl=60, store=SQLiteStore(path, clock=wall))
+    first.set("key", "value")
+    first.store.close()
+
+    wall.now = 50.0
+    clock = FakeClock()
+    second = TTLCache(ttl=60, store=SQLiteStore(path, clock=wall), clock=clock)
+    assert second.get("key") == "value"
+
+    # 10s were left when it was read back, not a fresh 60s
+    clock.now = 11.0
+    wall.now = 61.0
+    assert second.get("key") is None
+
+
+def test_expired_store_rows_are_misses(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    wall = FakeClock()
+    store = SQLiteStore(path, clock=wall)
+    TTLCache(ttl=60, store=store).set("key", "value")
+
+    wall.now = 60.0
+    cache = TTLCache(ttl=60, store=store)
+
+    assert cache.get("key") is None
+    assert cache.stats()["misses"] == 1
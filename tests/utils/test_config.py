@@ -36,6 +36,13 @@ def test_build_settings_parses_values(monkeypatch):
     monkeypatch.setenv("CORS_ALLOW_METHODS", "GET,POST")
     monkeypatch.setenv("CORS_ALLOW_CREDENTIALS", "false")
     monkeypatch.setenv("MAX_BULK_CONCURRENCY", "8")
+    monkeypatch.setenv("EASYPOST_TRANSPORT", "Async")
+    monkeypatch.setenv("EASYPOST_MAX_CONNECTIONS", "32")
+    monkeypatch.setenv("EASYPOST_RATE_LIMIT_RPS", "2.5")
+    monkeypatch.setenv("EASYPOST_RATE_LIMIT_BURST", "5")
+    monkeypatch.setenv("RATE_CACHE_TTL_SECONDS", "0")
+    monkeypatch.setenv("RATE_CACHE_MAX_SIZE", "64")
+    monkeypatch.setenv("EASYPOST_SHIPMENT_RETRIEVE", "Always")
 
     settings = config._build_settings()
 
@@ -44,3 +51,28 @@ def test_build_settings_parses_values(monkeypatch):
     assert settings.CORS_ALLOW_METHODS == ("GET", "POST")
     assert settings.CORS_ALLOW_CREDENTIALS is False
     assert settings.MAX_BULK_CONCURRENCY == 8
+    assert settings.EASYPOST_TRANSPORT == "async"
+    assert settings.EASYPOST_MAX_CONNECTIONS == 32
+    assert settings.EASYPOST_RATE_LIMIT_RPS == 2.5
+    assert settings.EASYPOST_RATE_LIMIT_BURST == 5
+    assert settings.RATE_CACHE_TTL_SECONDS == 0
+    assert settings.RATE_CACHE_MAX_SIZE == 64
+    assert settings.EASYPOST_SHIPMENT_RETRIEVE == "always"
+
+
+def test_build_settings_rejects_unknown_transport(monkeypatch):
+    monkeypatch.setattr(config, "_initialise_environment", _no_env_load)
+    monkeypatch.setenv("EASYPOST_API_KEY", "key")
+    monkeypatch.setenv("EASYPOST_TRANSPORT", "grpc")
+
+    with pytest.raises(ValueError, match="EASYPOST_TRANSPORT"):
+        config._build_settings()
+
+
+def test_settings_attribute_is_built_on_first_access(monkeypatch):
+    monkeypatch.setattr(config, "_initialise_environment", _no_env_load)
+    monkeypatch.setenv("EASYPOST_API_KEY", "key")
+    assert config.get_settings.cache_info().currsize == 0
+
+    assert config.settings is config.get_settings()
+    assert config.get_settings.cache_info().currsize == 1
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import threading
+import time
 from types import SimpleNamespace
 
 import pytest
 
-from src.utils.monitoring import HealthCheck, MetricsCollector
+from src.utils.monitoring import (
+    HealthCheck,
+    Histogram,
+    InstrumentedThreadPoolExecutor,
+    MetricsCollector,
+    current_api_trace,
+    easypost_operation,
+    trace_api_calls,
+)
 
 
 @pytest.mark.asyncio
@@ -50,3 +60,159 @@ def test_metrics_collector_tracks_calls():
     assert metrics["error_count"] == 1
     assert metrics["api_calls"]["rates"]["success"] == 1
     assert metrics["api_calls"]["rates"]["failure"] == 1
+
+
+def test_histogram_percentiles_fall_in_the_right_buckets():
+    histogram = Histogram()
+    for _ in range(90):
+        histogram.observe(0.02)
+    for _ in range(10):
+        histogram.observe(2.0)
+
+    summary = histogram.summary()
+
+    assert summary["count"] == 100
+    assert 10 <= summary["p50_ms"] <= 25
+    assert 1000 <= summary["p95_ms"] <= 2000
+    assert summary["max_ms"] == 2000.0
+    assert histogram.cumulative()[-1] == ("+Inf", 100)
+
+
+def test_concurrent_tracking_loses_no_updates():
+    collector = MetricsCollector()
+
+    def worker():
+        for _ in range(1000):
+            collector.track_api_call("rates", True)
+            collector.observe_easypost("POST /shipments", 200, 0.1)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    snapshot = collector.get_metrics()
+    assert snapshot["api_calls"]["rates"]["success"] == 8000
+    assert snapshot["easypost"]["POST /shipments"]["count"] == 8000
+
+
+def test_easypost_operation_collapses_object_ids():
+    assert (
+        easypost_operation("post", "https://api.easypost.com/v2/shipments/shp_abc123/buy")
+        == "POST /shipments/:id/buy"
+    )
+    assert easypost_operation("GET", "/trackers?tracking_code=EZ1") == "GET /trackers"
+
+
+def test_easypost_operation_accepts_sdk_request_method():
+    from easypost.requestor import RequestMethod
+
+    assert (
+        easypost_operation(RequestMethod.POST, "http://127.0.0.1:9/v2/shipments")
+        == "POST /shipments"
+    )
+
+
+def test_rate_limited_responses_are_counted():
+    collector = MetricsCollector()
+    collector.observe_easypost("POST /shipments", 429, 0.05)
+    collector.observe_easypost("POST /shipments", 201, None)
+
+    snapshot = collector.get_metrics()
+
+    assert snapshot["easypost_rate_limited"] == 1
+    assert snapshot["easypost"]["POST /shipments"]["responses"] == {"201": 1, "429": 1}
+    assert snapshot["easypost"]["POST /shipments"]["count"] == 1
+
+
+def test_in_flight_gauge_returns_to_zero():
+    collector = MetricsCollector()
+
+    with collector.in_flight("http_requests"):
+        assert collector.get_metrics()["in_flight"]["http_requests"] == 1
+
+    assert collector.get_metrics()["in_flight"]["http_requests"] == 0
+
+
+def test_instrumented_executor_reports_queue_depth_and_wait():
+    collector = MetricsCollector()
+    release = threading.Event()
+    executor = InstrumentedThreadPoolExecutor(1, name="test", collector=collector)
+    try:
+        blocker = executor.submit(release.wait)
+        queued = executor.submit(lambda: "done")
+        time.sleep(0.05)
+
+        state = collector.get_metrics()["executors"]["test"]
+        assert state["running"] == 1
+        assert state["queue_depth"] == 1
+
+        release.set()
+        assert queued.result(timeout=1) == "done"
+        blocker.result(timeout=1)
+    finally:
+        executor.shutdown(wait=True)
+
+    state = collector.get_metrics()["executors"]["test"]
+    assert (state["queue_depth"], state["running"], state["completed"]) == (0, 0, 2)
+    assert state["queue_wait"]["count"] == 2
+    assert state["queue_wait"]["max_ms"] >= 40
+
+
+def test_cancelled_executor_tasks_leave_the_queue():
+    collector = MetricsCollector()
+    release = threading.Event()
+    executor = InstrumentedThreadPoolExecutor(1, name="test", collector=collector)
+    executor.submit(release.wait)
+    pending = executor.submit(lambda: None)
+
+    assert pending.cancel()
+    release.set()
+    executor.shutdown(wait=True)
+
+    assert collector.get_metrics()["executors"]["test"]["queue_depth"] == 0
+
+
+def test_prometheus_exposition():
+    collector = MetricsCollector()
+    collector.track_api_call("get_rates", True)
+    collector.observe_request("POST", "/api/rates", 200, 0.03)
+    collector.observe_easypost('POST /shipments "x"', 429, 0.2)
+
+    text = collector.render_prometheus({"rate_cache": {"hits": 3, "misses": 1, "hit_rate": 0.75}})
+
+    assert "# TYPE easypost_mcp_http_request_duration_seconds histogram" in text
+    assert (
+        'easypost_mcp_http_request_duration_seconds_bucket{method="POST",'
+        'endpoint="/api/rates",le="0.05"} 1'
+    ) in text
+    assert (
+        'easypost_mcp_http_request_duration_seconds_count{method="POST",endpoint="/api/rates"} 1'
+    ) in text
+    assert 'easypost_mcp_easypost_rate_limited_total{operation="POST /shipments \\"x\\""} 1' in text
+    assert 'easypost_mcp_api_calls_total{endpoint="get_rates",outcome="success"} 1' in text
+    assert 'easypost_mcp_cache_hit_ratio{cache="rate_cache"} 0.75' in text
+    assert text.endswith("\n")
+
+
+def test_api_trace_summarizes_by_operation():
+    with trace_api_calls() as trace:
+        current_api_trace().record("POST /shipments", 201, 0.3, 800, 4000)
+        current_api_trace().record("POST /shipments", 429, 0.1, 800, 50)
+        current_api_trace().record("GET /trackers", 200, 0.05)
+
+    assert current_api_trace() is None
+    summary = trace.summary()
+    assert summary["calls"] == 3
+    assert list(summary["by_operation"]) == ["POST /shipments", "GET /trackers"]
+    shipments = summary["by_operation"]["POST /shipments"]
+    assert shipments["total_ms"] == 400.0
+    assert shipments["rate_limited"] == shipments["errors"] == 1
+    assert shipments["response_bytes"] == 4050
+
+
+def test_disabled_trace_records_nothing():
+    with trace_api_calls(enabled=False) as trace:
+        assert trace is None
+        assert current_api_trace() is None